@@ -0,0 +1,270 @@
+"""Typo-tolerant airport matching with a SymSpell-style deletion index.
+
+Substring search finds nothing for misspelt input such as ``heathrw`` or ``frankfrut``.
+This module indexes every word of the airport names, cities and keywords by the strings
+obtained by deleting up to ``max_distance`` characters from its first ``prefix_length``
+characters. A query word generates its own deletions, and every indexed word sharing one
+is a candidate. The candidates are then checked with a bounded optimal-string-alignment
+distance, so lookups touch a few dozen words instead of the whole vocabulary.
+
+Example:
+    >>> matcher = AirportFuzzyMatcher.from_airports(airports)
+    >>> matcher.match("heathrw", limit=1)
+    ['LHR']
+
+"""
+
+import heapq
+import re
+from collections.abc import Iterable
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def osa_distance(a: str, b: str, max_distance: int) -> int:
+    """Get the optimal-string-alignment distance between two strings, bounded.
+
+    Insertions, deletions, substitutions and adjacent transpositions each cost 1. Common
+    prefixes and suffixes are skipped and only the diagonal band of width
+    ``2 * max_distance + 1`` is computed, since cells outside it cannot be within bounds.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or ``max_distance + 1`` if it exceeds ``max_distance``
+
+    """
+    if a == b:
+        return 0
+    too_far = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return too_far
+
+    # Typos leave most of a word intact, so trim the shared ends first
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b)
+
+    length_b = len(b)
+    previous2: list[int] = []
+    previous = [j if j <= max_distance else too_far for j in range(length_b + 1)]
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        current = [too_far] * (length_b + 1)
+        current[0] = i if i <= max_distance else too_far
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(length_b, i + max_distance) + 1):
+            char_b = b[j - 1]
+            value = previous[j - 1] + (char_a != char_b)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (
+                i > 1
+                and j > 1
+                and char_a == b[j - 2]
+                and a[i - 2] == char_b
+                and previous2[j - 2] + 1 < value
+            ):
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous2, previous = previous, current
+    return min(previous[length_b], too_far)
+
+
+class SymSpellIndex:
+    """Deletion index over a vocabulary of words."""
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        """Initialize an empty index.
+
+        Args:
+            max_distance: Largest edit distance supported by lookups
+            prefix_length: Number of leading characters whose deletions are indexed
+
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._deletes: dict[str, list[str]] = {}
+        self._words: set[str] = set()
+
+    def _variants(self, word: str, max_distance: int) -> set[str]:
+        """Get the word prefix and every string formed by deleting characters from it."""
+        prefix = word[: self.prefix_length]
+        variants = {prefix}
+        frontier = variants
+        for _ in range(max_distance):
+            frontier = {
+                variant[:i] + variant[i + 1 :]
+                for variant in frontier
+                if len(variant) > 1
+                for i in range(len(variant))
+            }
+            variants |= frontier
+        return variants
+
+    def add(self, word: str) -> None:
+        """Add a word to the vocabulary."""
+        if word in self._words:
+            return
+        self._words.add(word)
+        for variant in self._variants(word, self.max_distance):
+            self._deletes.setdefault(variant, []).append(word)
+
+    def __contains__(self, word: str) -> bool:
+        """Check whether a word is in the vocabulary."""
+        return word in self._words
+
+    def __len__(self) -> int:
+        """Get the vocabulary size."""
+        return len(self._words)
+
+    def lookup(self, word: str, max_distance: int | None = None) -> list[tuple[str, int]]:
+        """Find vocabulary words within an edit distance of a word.
+
+        Args:
+            word: Query word
+            max_distance: Largest distance returned (at most the index's ``max_distance``)
+
+        Returns:
+            ``(word, distance)`` pairs, closest first
+
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        seen: set[str] = set()
+        found = []
+        for variant in self._variants(word, max_distance):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = osa_distance(word, candidate, max_distance)
+                if distance <= max_distance:
+                    found.append((candidate, distance))
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+
+def words(text: str) -> list[str]:
+    """Split text into lower-case words."""
+    return _WORD.findall(text.lower())
+
+
+def allowed_distance(word: str, max_distance: int = 2) -> int:
+    """Get the edit distance tolerated for a query word.
+
+    Words of up to three characters must match exactly, up to five characters may have one
+    typo and longer words two, so short words do not match half the vocabulary.
+    """
+    if len(word) <= 3:
+        return 0
+    return min(max_distance, 1 if len(word) <= 5 else 2)
+
+
+class AirportFuzzyMatcher:
+    """Rank airports by how closely their names, cities and keywords match a query."""
+
+    # Lower ranks win ties: a city match beats a name match beats a keyword match, and all
+    # of them beat a name match on an airport without curated translations
+    CITY, NAME, KEYWORD, OTHER = 0, 1, 2, 3
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        """Initialize an empty matcher.
+
+        Args:
+            max_distance: Largest edit distance tolerated per query word
+            prefix_length: Prefix length of the deletion index
+
+        """
+        self.index = SymSpellIndex(max_distance, prefix_length)
+        self._airports: dict[str, dict[str, int]] = {}
+
+    def add(self, code: str, text: str, rank: int) -> None:
+        """Index the words of a field of an airport.
+
+        Args:
+            code: Airport IATA code
+            text: Field text (name, city or keyword)
+            rank: Field rank, one of ``CITY``, ``NAME``, ``KEYWORD`` or ``OTHER``
+
+        """
+        field_words = words(text)
+        if rank == self.CITY and len(field_words) > 1:
+            # Also match cities typed without spaces, e.g. "newyork"
+            field_words.append("".join(field_words))
+        for word in field_words:
+            if len(word) < 2:
+                continue
+            self.index.add(word)
+            codes = self._airports.setdefault(word, {})
+            if rank < codes.get(code, rank + 1):
+                codes[code] = rank
+
+    @classmethod
+    def from_airports(
+        cls, airports: Iterable, max_distance: int = 2, prefix_length: int = 7
+    ) -> "AirportFuzzyMatcher":
+        """Build a matcher from ``AirportInfo``-like records.
+
+        Args:
+            airports: Records with ``code``, name, city and keyword fields
+            max_distance: Largest edit distance tolerated per query word
+            prefix_length: Prefix length of the deletion index
+
+        Returns:
+            The matcher
+
+        """
+        matcher = cls(max_distance, prefix_length)
+        for airport in airports:
+            curated = bool(airport.city_en or airport.city_cn)
+            for text in (airport.city_en, airport.city_cn):
+                matcher.add(airport.code, text, cls.CITY)
+            for text in (airport.name_en, airport.name_cn):
+                matcher.add(airport.code, text, cls.NAME if curated else cls.OTHER)
+            for text in (*airport.keywords_en, *airport.keywords_cn):
+                matcher.add(airport.code, text, cls.KEYWORD)
+        return matcher
+
+    def match(self, query: str, limit: int = 10) -> list[str]:
+        """Find the airports best matching a possibly misspelt query.
+
+        Every query word is matched on its own. Airports matching more of the words rank
+        first, then those with the smallest total edit distance and the best field ranks.
+
+        Args:
+            query: Search query
+            limit: Maximum number of airport codes returned
+
+        Returns:
+            Airport codes, best match first
+
+        """
+        scores: dict[str, list[int]] = {}
+        for word in dict.fromkeys(words(query)):
+            best: dict[str, tuple[int, int]] = {}
+            for term, distance in self.index.lookup(word, allowed_distance(word)):
+                for code, rank in self._airports[term].items():
+                    if (distance, rank) < best.get(code, (distance + 1, 0)):
+                        best[code] = (distance, rank)
+            for code, (distance, rank) in best.items():
+                score = scores.setdefault(code, [0, 0, 0])
+                score[0] -= 1
+                score[1] += distance
+                score[2] += rank
+        return heapq.nsmallest(limit, scores, key=lambda code: (*scores[code], code))
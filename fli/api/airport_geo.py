@@ -0,0 +1,197 @@
+"""Airport coordinates and a spatial index for nearby-airport lookups.
+
+Coordinates come from ``fli/data/airport_coords.csv``, generated from ``data/airports.csv``
+by ``scripts/generate_enums.py``. Airports with curated translation entries are flagged as
+major airports so that searches can skip nearby airfields without scheduled service.
+
+Airports are bucketed into a fixed grid of ``CELL_DEGREES`` cells so a radius query only
+measures the airports in the handful of cells the search circle overlaps instead of the
+whole table.
+
+Example:
+    >>> [airport.code for airport in nearby("JFK", 40, major_only=True)]
+    ['JFK', 'LGA', 'EWR']
+
+"""
+
+import csv
+import json
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEGREES = 1.0
+DATA_DIR = Path(__file__).parent.parent / "data"
+COORDS_PATH = DATA_DIR / "airport_coords.csv"
+MAJOR_AIRPORTS_PATH = DATA_DIR / "translations" / "airports_enhanced_cn.json"
+
+
+@dataclass(frozen=True, slots=True)
+class NearbyAirport:
+    """An airport found by a radius query."""
+
+    code: str
+    distance_km: float
+    major: bool = False
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Get the great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class AirportGeoIndex:
+    """Uniform latitude/longitude grid over airport coordinates."""
+
+    def __init__(
+        self,
+        coordinates: dict[str, tuple[float, float]],
+        major: set[str] | frozenset[str] = frozenset(),
+        cell_degrees: float = CELL_DEGREES,
+    ):
+        """Build the index.
+
+        Args:
+            coordinates: Mapping of IATA code to ``(latitude, longitude)``
+            major: Codes of major (scheduled-service) airports
+            cell_degrees: Grid cell size in degrees
+
+        """
+        self.coordinates = coordinates
+        self.major = frozenset(major)
+        self.cell_degrees = cell_degrees
+        self._columns = round(360 / cell_degrees)
+        self._cells: dict[tuple[int, int], list[tuple[str, float, float]]] = {}
+        for code, (lat, lon) in coordinates.items():
+            self._cells.setdefault(self._cell(lat, lon), []).append((code, lat, lon))
+
+    @classmethod
+    def from_files(
+        cls, coords_path: Path = COORDS_PATH, major_path: Path = MAJOR_AIRPORTS_PATH
+    ) -> "AirportGeoIndex":
+        """Load the coordinate table and the set of major airports.
+
+        Args:
+            coords_path: Coordinate table
+            major_path: Airport translation file whose keys are the major airports
+
+        Returns:
+            The index (empty if the coordinate table is missing)
+
+        """
+        try:
+            with open(coords_path, encoding="utf-8") as csv_file:
+                coordinates = {
+                    row["Code"]: (float(row["Latitude"]), float(row["Longitude"]))
+                    for row in csv.DictReader(csv_file)
+                }
+        except FileNotFoundError:
+            coordinates = {}
+        try:
+            with open(major_path, encoding="utf-8") as json_file:
+                major = set(json.load(json_file))
+        except FileNotFoundError:
+            major = set()
+        return cls(coordinates, major)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        """Get the grid cell containing a point."""
+        row = math.floor((lat + 90) / self.cell_degrees)
+        column = math.floor((lon + 180) / self.cell_degrees) % self._columns
+        return row, column
+
+    def __contains__(self, code: str) -> bool:
+        """Check whether coordinates are known for an airport."""
+        return code in self.coordinates
+
+    def __len__(self) -> int:
+        """Get the number of indexed airports."""
+        return len(self.coordinates)
+
+    def near_point(
+        self, lat: float, lon: float, radius_km: float, major_only: bool = False
+    ) -> list[NearbyAirport]:
+        """Find airports within a radius of a point.
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            radius_km: Search radius in kilometres
+            major_only: Only return major airports
+
+        Returns:
+            Airports within the radius, nearest first
+
+        """
+        lat_span = math.degrees(radius_km / EARTH_RADIUS_KM)
+        # Longitude degrees shrink towards the poles; near them every column is in range
+        cos_lat = math.cos(math.radians(min(89.0, abs(lat) + lat_span)))
+        lon_span = 180.0 if cos_lat <= 0 or lat_span >= 89 else lat_span / cos_lat
+
+        first_row, first_column = self._cell(max(-90.0, lat - lat_span), lon - lon_span)
+        last_row, last_column = self._cell(min(89.999, lat + lat_span), lon + lon_span)
+        columns = min(self._columns, (last_column - first_column) % self._columns + 1)
+        if lon_span >= 180:
+            columns = self._columns
+
+        found = []
+        for row in range(first_row, last_row + 1):
+            for offset in range(columns):
+                cell = self._cells.get((row, (first_column + offset) % self._columns))
+                for code, airport_lat, airport_lon in cell or ():
+                    major = code in self.major
+                    if major_only and not major:
+                        continue
+                    distance = haversine_km(lat, lon, airport_lat, airport_lon)
+                    if distance <= radius_km:
+                        found.append(NearbyAirport(code, round(distance, 1), major))
+        found.sort(key=lambda airport: (airport.distance_km, airport.code))
+        return found
+
+    def nearby(self, code: str, radius_km: float, major_only: bool = False) -> list[NearbyAirport]:
+        """Find airports within a radius of another airport.
+
+        Args:
+            code: IATA code of the centre airport
+            radius_km: Search radius in kilometres
+            major_only: Only return major airports (the centre airport is always included)
+
+        Returns:
+            Airports within the radius including the centre airport itself, nearest first;
+            just the centre airport if its coordinates are unknown
+
+        """
+        code = code.upper()
+        position = self.coordinates.get(code)
+        centre = NearbyAirport(code, 0.0, code in self.major)
+        if position is None:
+            return [centre]
+        found = self.near_point(*position, radius_km, major_only)
+        if major_only and not centre.major:
+            found.insert(0, centre)
+        return found
+
+
+_index: AirportGeoIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_geo_index() -> AirportGeoIndex:
+    """Get the shared airport index, loading it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AirportGeoIndex.from_files()
+    return _index
+
+
+def nearby(code: str, radius_km: float, major_only: bool = False) -> list[NearbyAirport]:
+    """Find airports within ``radius_km`` of an airport using the shared index."""
+    return get_geo_index().nearby(code, radius_km, major_only)
@@ -2,15 +2,23 @@
 
 Provides comprehensive airport search functionality including:
 - Fuzzy search by airport name, city, or country
+- Typo-tolerant fallback for misspelt queries (edit distance up to 2)
 - Search by airport code
 - Multi-language support (English/Chinese)
 - Keyword-based search
+- Batched search and code resolution for autocomplete front ends
 """
 
 import json
-from dataclasses import dataclass
+import threading
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
 
+from fli.api.airport_fuzzy import AirportFuzzyMatcher
+from fli.api.airport_geo import nearby
 from fli.models import Airport
 from fli.models.google_flights.base import Language
 
@@ -31,13 +39,86 @@ class AirportInfo:
     keywords_cn: list[str]
 
 
+@dataclass(frozen=True, slots=True)
+class AirportMatch:
+    """Compact, immutable airport search result shared between batched lookups."""
+
+    code: str
+    name: str
+    city: str
+    country: str
+    region: str
+    name_en: str
+    name_cn: str
+
+    def to_dict(self) -> dict:
+        """Get the result in the same shape as the single-query methods return."""
+        return asdict(self)
+
+
+# Order in which the substring indexes are scanned; English keys are lower-cased
+_SEARCH_ORDER = (
+    ("by_name_en", True),
+    ("by_name_cn", False),
+    ("by_city_en", True),
+    ("by_city_cn", False),
+    ("by_country_en", True),
+    ("by_country_cn", False),
+    ("by_keywords_en", True),
+    ("by_keywords_cn", False),
+)
+_SEPARATOR = "\x00"
+
+
+class _Haystack:
+    """All keys of one substring index joined into a single string.
+
+    A query is located with ``str.find`` over the joined keys instead of a Python-level
+    ``in`` test per key; each hit is mapped back to its key by bisecting the key offsets.
+    """
+
+    __slots__ = ("text", "starts", "airports")
+
+    def __init__(self, index: dict[str, AirportInfo | list[AirportInfo]]):
+        """Join the keys of an index, keeping its insertion order."""
+        self.starts: list[int] = []
+        self.airports: list[list[AirportInfo]] = []
+        offset = 0
+        for key, value in index.items():
+            self.starts.append(offset)
+            self.airports.append(value if isinstance(value, list) else [value])
+            offset += len(key) + 1
+        self.text = _SEPARATOR.join(index) + _SEPARATOR
+
+    def matches(self, query: str) -> Iterable[list[AirportInfo]]:
+        """Yield the airports of every key containing the query, in index order."""
+        if not query:
+            yield from self.airports
+            return
+        if _SEPARATOR in query:
+            return
+        find, position = self.text.find, 0
+        while (position := find(query, position)) != -1:
+            entry = bisect_right(self.starts, position) - 1
+            yield self.airports[entry]
+            # Resume at the next key so every key is reported at most once
+            if entry + 1 >= len(self.starts):
+                return
+            position = self.starts[entry + 1]
+
+
 class AirportSearchAPI:
     """Comprehensive airport search API with multi-language support."""
 
+    MATCH_CACHE_SIZE = 4096
+
     def __init__(self):
         """Initialize the search API with translation data."""
         self._load_airport_data()
         self._build_search_index()
+        self._match = lru_cache(maxsize=self.MATCH_CACHE_SIZE)(self._build_match)
+        self._fuzzy: AirportFuzzyMatcher | None = None
+        self._fuzzy_lock = threading.Lock()
 
     def _load_airport_data(self):
         """Load airport translation data from JSON files."""
@@ -153,6 +234,10 @@ class AirportSearchAPI:
                 )
                 self.search_index["by_code"][code] = basic_info
 
+        self._haystacks = [
+            (_Haystack(self.search_index[name]), lowercase) for name, lowercase in _SEARCH_ORDER
+        ]
+
     def get_airport_by_code(
         self, code: str, language: Language = Language.ENGLISH
     ) -> dict | None:
@@ -172,79 +257,161 @@ class AirportSearchAPI:
         return None
 
     def search_airports(
-        self, query: str, language: Language = Language.ENGLISH, limit: int = 10
+        self,
+        query: str,
+        language: Language = Language.ENGLISH,
+        limit: int = 10,
+        fuzzy: bool = False,
     ) -> list[dict]:
-        """Comprehensive airport search with fuzzy matching.
+        """Comprehensive airport search by substring, with optional fuzzy matching.
 
         Args:
             query: Search query (airport name, city, country, or keywords)
             language: Language for response
             limit: Maximum number of results to return
+            fuzzy: Fall back to typo-tolerant matching when nothing contains the query (off
+                by default so existing callers keep exact substring results)
 
         Returns:
             List of matching airports
 
         """
-        results = []
-        query_lower = query.lower()
+        return [
+            self._format_airport_response(airport, language)
+            for airport in self._find(query, limit, fuzzy)
+        ]
+
+    def search_fuzzy(
+        self, query: str, language: Language = Language.ENGLISH, limit: int = 10
+    ) -> list[dict]:
+        """Typo-tolerant airport search.
 
-        # Search by airport code (exact match)
-        if len(query) == 3 and query.upper() in self.search_index["by_code"]:
-            results.append(self.search_index["by_code"][query.upper()])
+        Every query word may be up to two edits (insertions, deletions, substitutions or
+        adjacent transpositions) away from a word of an airport's name, city or keywords,
+        so "heathrw" finds LHR and "frankfrut" finds FRA. Words of up to three characters
+        must match exactly and five-character words allow one edit.
 
-        # Search by names (fuzzy match)
-        for name, airport_info in self.search_index["by_name_en"].items():
-            if query_lower in name and airport_info not in results:
-                results.append(airport_info)
+        Args:
+            query: Possibly misspelt search query
+            language: Language for response
+            limit: Maximum number of results to return
 
-        for name, airport_info in self.search_index["by_name_cn"].items():
-            if query in name and airport_info not in results:
-                results.append(airport_info)
+        Returns:
+            List of matching airports, best match first
 
-        # Search by cities
-        for city, airport_list in self.search_index["by_city_en"].items():
-            if query_lower in city:
-                for airport_info in airport_list:
-                    if airport_info not in results:
-                        results.append(airport_info)
+        """
+        by_code = self.search_index["by_code"]
+        return [
+            self._format_airport_response(by_code[code], language)
+            for code in self._fuzzy_matcher().match(query, limit)
+        ]
 
-        for city, airport_list in self.search_index["by_city_cn"].items():
-            if query in city:
-                for airport_info in airport_list:
-                    if airport_info not in results:
-                        results.append(airport_info)
+    def search_many(
+        self,
+        queries: Iterable[str],
+        language: Language = Language.ENGLISH,
+        limit: int = 10,
+        fuzzy: bool = False,
+    ) -> dict[str, list[AirportMatch]]:
+        """Search many queries at once, e.g. every field of an autocomplete form.
 
-        # Search by countries
-        for country, airport_list in self.search_index["by_country_en"].items():
-            if query_lower in country:
-                for airport_info in airport_list:
-                    if airport_info not in results:
-                        results.append(airport_info)
+        Matching is the same as ``search_airports``. Duplicate queries are searched once and
+        the results are shared, cached ``AirportMatch`` records rather than new dictionaries,
+        so a batch costs far less than the equivalent single-query calls.
 
-        for country, airport_list in self.search_index["by_country_cn"].items():
-            if query in country:
-                for airport_info in airport_list:
-                    if airport_info not in results:
-                        results.append(airport_info)
+        Args:
+            queries: Search queries (airport names, cities, countries, codes or keywords)
+            language: Language for response
+            limit: Maximum number of results per query
+            fuzzy: Fall back to typo-tolerant matching for queries without substring matches
 
-        # Search by keywords
-        for keyword, airport_list in self.search_index["by_keywords_en"].items():
-            if query_lower in keyword:
-                for airport_info in airport_list:
-                    if airport_info not in results:
-                        results.append(airport_info)
+        Returns:
+            Dictionary mapping each distinct query, in input order, to its matches
 
-        for keyword, airport_list in self.search_index["by_keywords_cn"].items():
-            if query in keyword:
-                for airport_info in airport_list:
-                    if airport_info not in results:
+        """
+        results = {}
+        for query in queries:
+            if query not in results:
+                results[query] = [
+                    self._match(airport.code, language)
+                    for airport in self._find(query, limit, fuzzy)
+                ]
+        return results
+
+    def resolve_codes(
+        self, codes: Iterable[str], language: Language = Language.ENGLISH
+    ) -> dict[str, AirportMatch | None]:
+        """Resolve many airport codes at once.
+
+        Args:
+            codes: Airport IATA codes (case-insensitive)
+            language: Language for response
+
+        Returns:
+            Dictionary mapping each code as given to its airport, or None if unknown
+
+        """
+        by_code = self.search_index["by_code"]
+        return {
+            code: self._match(code.upper(), language) if code.upper() in by_code else None
+            for code in codes
+        }
+
+    def _find(self, query: str, limit: int, fuzzy: bool = False) -> list[AirportInfo]:
+        """Find airports matching a query, in ``search_airports`` ranking order.
+
+        An exact code match comes first, followed by substring matches on names, cities,
+        countries and keywords, English before Chinese.
+
+        Args:
+            query: Search query
+            limit: Maximum number of airports
+            fuzzy: Use typo-tolerant matching if nothing matched exactly
+
+        Returns:
+            Matching airports without duplicates
+
+        """
+        results: list[AirportInfo] = []
+        if limit <= 0:
+            return results
+        seen: set[str] = set()
+        code_match = self.search_index["by_code"].get(query.upper()) if len(query) == 3 else None
+        if code_match is not None:
+            results.append(code_match)
+            seen.add(code_match.code)
+            if len(results) >= limit:
+                return results
+
+        query_lower = query.lower()
+        for haystack, lowercase in self._haystacks:
+            for airports in haystack.matches(query_lower if lowercase else query):
+                for airport_info in airports:
+                    if airport_info.code not in seen:
+                        seen.add(airport_info.code)
                         results.append(airport_info)
+                        if len(results) >= limit:
+                            return results
+        if fuzzy and not results:
+            by_code = self.search_index["by_code"]
+            results = [by_code[code] for code in self._fuzzy_matcher().match(query, limit)]
+        return results
+
+    def _fuzzy_matcher(self) -> AirportFuzzyMatcher:
+        """Get the typo-tolerant matcher, building its index on first use."""
+        if self._fuzzy is None:
+            with self._fuzzy_lock:
+                if self._fuzzy is None:
+                    self._fuzzy = AirportFuzzyMatcher.from_airports(
+                        self.search_index["by_code"].values()
+                    )
+        return self._fuzzy
 
-        # Format and limit results
-        formatted_results = [
-            self._format_airport_response(airport, language) for airport in results[:limit]
-        ]
-        return formatted_results
+    def _build_match(self, code: str, language: Language) -> AirportMatch:
+        """Build the cached result record of an airport (wrapped in an LRU per instance)."""
+        return AirportMatch(
+            **self._format_airport_response(self.search_index["by_code"][code], language)
+        )
 
     def search_by_city(self, city: str, language: Language = Language.ENGLISH) -> list[dict]:
         """Search airports by city name.
@@ -313,6 +480,39 @@ class AirportSearchAPI:
 
         return [self._format_airport_response(airport, language) for airport in unique_results]
 
+    def search_nearby(
+        self,
+        code: str,
+        radius_km: float,
+        language: Language = Language.ENGLISH,
+        limit: int = 10,
+        major_only: bool = False,
+    ) -> list[dict]:
+        """Search airports within a radius of another airport.
+
+        Args:
+            code: Airport IATA code of the centre airport
+            radius_km: Search radius in kilometres
+            language: Language for response
+            limit: Maximum number of results, including the centre airport
+            major_only: Only return major airports
+
+        Returns:
+            List of airports nearest first, each with a ``distance_km`` field
+
+        """
+        results = []
+        for found in nearby(code, radius_km, major_only):
+            airport_info = self.search_index["by_code"].get(found.code)
+            if airport_info is None:
+                continue
+            airport = self._format_airport_response(airport_info, language)
+            airport["distance_km"] = found.distance_km
+            results.append(airport)
+            if len(results) >= limit:
+                break
+        return results
+
     def _format_airport_response(self, airport_info: AirportInfo, language: Language) -> dict:
         """Format airport information for API response.
 
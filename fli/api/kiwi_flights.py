@@ -5,13 +5,24 @@ Supports both one-way and round-trip searches with multi-language and multi-curr
 """
 
 import asyncio
-import json
 import logging
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Optional, Any
 import httpx
 
+from fli.api.kiwi_parser import find_hidden_destination
+from fli.core.jsonio import loads
+from fli.core.metrics import HTTP_RETRIES, KIWI_PAGES, PARSE_FAILURES, record_request
+from fli.core.ratelimit import TokenBucket
+from fli.core.resilience import (
+    BREAKERS,
+    CircuitBreakers,
+    CircuitOpenError,
+    RetryBudget,
+    is_transient,
+)
+from fli.core.tracing import span
 from fli.models.google_flights.base import LocalizationConfig, Language, Currency
 
 # Configure logging
@@ -20,6 +31,12 @@ logger = logging.getLogger(__name__)
 # Kiwi API Configuration
 KIWI_GRAPHQL_ENDPOINT = "https://api.skypicker.com/umbrella/v2/graphql"
 
+# Attempts per GraphQL request; retries back off exponentially and draw on the retry budget
+KIWI_MAX_ATTEMPTS = 3
+
+# Retry budget shared by every Kiwi API wrapper without its own
+KIWI_RETRY_BUDGET = RetryBudget()
+
 # Headers for Kiwi API (from kiwi_api_test.py)
 KIWI_HEADERS = {
     'content-type': 'application/json',
@@ -287,15 +304,26 @@ query SearchReturnHiddenCityQuery(
 class KiwiFlightsAPI:
     """Kiwi Flights API client for hidden city flight searches."""
     
-    def __init__(self, localization_config: LocalizationConfig = None):
+    def __init__(self, localization_config: LocalizationConfig = None,
+                 limiter: TokenBucket | None = None, timeout: float = 30.0,
+                 retry_budget: RetryBudget | None = None,
+                 breakers: CircuitBreakers | None = None):
         """Initialize the Kiwi API client.
         
         Args:
             localization_config: Configuration for language and currency settings
+            limiter: Optional rate limiter every GraphQL request waits on
+            timeout: Request timeout in seconds
+            retry_budget: Budget capping retries (defaults to ``KIWI_RETRY_BUDGET``)
+            breakers: Per-host circuit breakers (defaults to the process-wide ``BREAKERS``)
+
         """
         self.localization_config = localization_config or LocalizationConfig()
         self.headers = KIWI_HEADERS.copy()
-        self.timeout = 30.0
+        self.timeout = timeout
+        self.limiter = limiter
+        self.retry_budget = retry_budget or KIWI_RETRY_BUDGET
+        self.breakers = breakers or BREAKERS
     
     def _build_search_variables(self, origin: str, destination: str,
                                departure_date: str, adults: int = 1, cabin_class: str = "ECONOMY",
@@ -417,7 +445,8 @@ class KiwiFlightsAPI:
                                        departure_date: str, adults: int = 1,
                                        limit: int = 50, cabin_class: str = "ECONOMY",
                                        enable_pagination: bool = True, max_pages: int = 10,
-                                       hidden_city_only: bool = False) -> Dict[str, Any]:
+                                       hidden_city_only: bool = False,
+                                       raw_itineraries: bool = False) -> dict[str, Any]:
         """Search for one-way flights with automatic pagination.
 
         Args:
@@ -430,6 +459,8 @@ class KiwiFlightsAPI:
             enable_pagination: Whether to automatically fetch all pages (default: True)
             max_pages: Maximum number of pages to fetch (default: 10)
             hidden_city_only: If True, search only hidden city flights. If False, search all flight types.
+            raw_itineraries: If True, return the raw GraphQL itineraries under "itineraries"
+                instead of extracted flight dictionaries under "flights"
 
         Returns:
             Dictionary containing search results and metadata from all pages
@@ -527,18 +558,21 @@ query SearchItinerariesQuery(
             # 根据是否启用分页选择不同的处理方式
             if enable_pagination:
                 return await self._search_with_pagination(
-                    paginated_query, variables, search_id, limit, max_pages
+                    paginated_query, variables, search_id, limit, max_pages, raw_itineraries
                 )
             else:
                 # 传统的单页搜索
                 async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(api_url, headers=self.headers, json=payload)
+                    response = await self._post(client, api_url, payload, "oneway", page=1)
 
                     logger.info(f"[{search_id}] Response status: {response.status_code}")
 
                     if response.status_code == 200:
-                        response_data = response.json()
-                        return self._parse_oneway_response(response_data, search_id, limit)
+                        with span("kiwi.decode"):
+                            response_data = loads(response.content)
+                        return self._parse_oneway_response(
+                            response_data, search_id, limit, raw_itineraries
+                        )
                     else:
                         logger.error(f"[{search_id}] Request failed: {response.status_code} - {response.text}")
                         return {
@@ -547,6 +581,8 @@ query SearchItinerariesQuery(
                             "details": response.text
                         }
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"[{search_id}] Search failed: {e}")
             return {
@@ -557,7 +593,8 @@ query SearchItinerariesQuery(
     async def search_roundtrip_hidden_city(self, origin: str, destination: str,
                                           departure_date: str, return_date: str,
                                           adults: int = 1, limit: int = 50, cabin_class: str = "ECONOMY",
-                                          hidden_city_only: bool = False) -> Dict[str, Any]:
+                                          hidden_city_only: bool = False,
+                                          raw_itineraries: bool = False) -> dict[str, Any]:
         """Search for round-trip flights.
 
         Args:
@@ -569,6 +606,8 @@ query SearchItinerariesQuery(
             limit: Maximum number of results to return
             cabin_class: Cabin class ('ECONOMY', 'BUSINESS', 'FIRST')
             hidden_city_only: If True, search only hidden city flights. If False, search all flight types.
+            raw_itineraries: If True, return the raw GraphQL itineraries under "itineraries"
+                instead of extracted flight dictionaries under "flights"
 
         Returns:
             Dictionary containing search results and metadata
@@ -589,13 +628,16 @@ query SearchItinerariesQuery(
             api_url = f"{KIWI_GRAPHQL_ENDPOINT}?featureName=SearchReturnItinerariesQuery"
 
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(api_url, headers=self.headers, json=payload)
+                response = await self._post(client, api_url, payload, "roundtrip", page=1)
 
                 logger.info(f"[{search_id}] Response status: {response.status_code}")
 
                 if response.status_code == 200:
-                    response_data = response.json()
-                    return self._parse_roundtrip_response(response_data, search_id, limit)
+                    with span("kiwi.decode"):
+                        response_data = loads(response.content)
+                    return self._parse_roundtrip_response(
+                        response_data, search_id, limit, raw_itineraries
+                    )
                 else:
                     logger.error(f"[{search_id}] Request failed: {response.status_code} - {response.text}")
                     return {
@@ -604,6 +646,8 @@ query SearchItinerariesQuery(
                         "details": response.text
                     }
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"[{search_id}] Search failed: {e}")
             return {
@@ -612,13 +656,15 @@ query SearchItinerariesQuery(
             }
 
     def _parse_oneway_response(self, response_data: Dict[str, Any],
-                              search_id: str, limit: int) -> Dict[str, Any]:
+                              search_id: str, limit: int,
+                              raw_itineraries: bool = False) -> dict[str, Any]:
         """Parse one-way flight search response.
 
         Args:
             response_data: Raw response from Kiwi API
             search_id: Search identifier for logging
             limit: Maximum number of results to return
+            raw_itineraries: If True, keep the raw itineraries instead of extracting flights
 
         Returns:
             Parsed response with flight information
@@ -661,6 +707,11 @@ query SearchItinerariesQuery(
 
             logger.info(f"[{search_id}] Found {len(itineraries)} flights")
 
+            if raw_itineraries:
+                return self._raw_itineraries_response(
+                    itineraries[:limit], metadata, search_id, "oneway"
+                )
+
             # Parse all flights and count hidden city ones
             all_flights = []
             hidden_city_count = 0
@@ -692,13 +743,15 @@ query SearchItinerariesQuery(
             }
 
     def _parse_roundtrip_response(self, response_data: Dict[str, Any],
-                                 search_id: str, limit: int) -> Dict[str, Any]:
+                                 search_id: str, limit: int,
+                                 raw_itineraries: bool = False) -> dict[str, Any]:
         """Parse round-trip flight search response.
 
         Args:
             response_data: Raw response from Kiwi API
             search_id: Search identifier for logging
             limit: Maximum number of results to return
+            raw_itineraries: If True, keep the raw itineraries instead of extracting flights
 
         Returns:
             Parsed response with flight information
@@ -741,6 +794,11 @@ query SearchItinerariesQuery(
 
             logger.info(f"[{search_id}] Found {len(itineraries)} round-trip flights")
 
+            if raw_itineraries:
+                return self._raw_itineraries_response(
+                    itineraries[:limit], metadata, search_id, "roundtrip"
+                )
+
             # Parse all flights and count hidden city ones
             all_flights = []
             hidden_city_count = 0
@@ -771,6 +829,37 @@ query SearchItinerariesQuery(
                 "raw_response": response_data
             }
 
+    def _raw_itineraries_response(self, itineraries: list[dict[str, Any]],
+                                  metadata: dict[str, Any], search_id: str,
+                                  trip_type: str) -> dict[str, Any]:
+        """Build a successful search response that carries raw itineraries.
+
+        Args:
+            itineraries: Raw itineraries from the GraphQL response
+            metadata: Itineraries metadata block
+            search_id: Search identifier
+            trip_type: "oneway" or "roundtrip"
+
+        Returns:
+            Search response with the itineraries under "itineraries"
+
+        """
+        hidden_city_count = sum(
+            1 for itinerary in itineraries
+            if (itinerary.get('travelHack') or {}).get('isTrueHiddenCity')
+        )
+        return {
+            "success": True,
+            "search_id": search_id,
+            "trip_type": trip_type,
+            "total_count": metadata.get('itinerariesCount', 0),
+            "hidden_city_count": hidden_city_count,
+            "has_more": metadata.get('hasMorePending', False),
+            "itineraries": itineraries,
+            "currency": self.localization_config.currency.value,
+            "language": self.localization_config.language.value
+        }
+
     def _extract_oneway_flight_info(self, itinerary: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract key information from one-way flight itinerary.
 
@@ -856,6 +945,7 @@ query SearchItinerariesQuery(
             }
 
         except Exception as e:
+            PARSE_FAILURES.inc(source="kiwi", kind="itinerary")
             logger.error(f"Failed to extract one-way flight info: {e}")
             return None
 
@@ -942,49 +1032,20 @@ query SearchItinerariesQuery(
             }
 
         except Exception as e:
+            PARSE_FAILURES.inc(source="kiwi", kind="itinerary")
             logger.error(f"Failed to extract round-trip flight info: {e}")
             return None
 
     def _find_hidden_destination(self, segments: list) -> dict:
         """Adaptively find hidden destination information in flight segments.
 
-        Different query types may have hidden destination in different locations:
-        - Economy vs Business class
-        - Direct vs connecting flights
-        - Different routes
-
         Args:
             segments: List of flight segments
 
         Returns:
             Hidden destination information or empty dict if not found
         """
-        if not segments:
-            return {}
-
-        # Strategy 1: Check all segments for hidden destination (most common)
-        for seg in segments:
-            segment_data = seg.get('segment', {})
-            hidden_dest = segment_data.get('hiddenDestination')
-            if hidden_dest:
-                return hidden_dest
-
-        # Strategy 2: Check if any segment has a different final destination
-        # This handles cases where hidden city info might be implicit
-        if len(segments) > 1:
-            last_segment = segments[-1].get('segment', {})
-            last_destination = last_segment.get('destination', {})
-
-            # Check if the last segment's destination differs from expected
-            # This is a fallback for cases where hiddenDestination field is missing
-            for i, seg in enumerate(segments[:-1]):
-                segment_data = seg.get('segment', {})
-                dest = segment_data.get('destination', {})
-                if dest and dest != last_destination:
-                    # Potential hidden city scenario
-                    return dest.get('station', {})
-
-        return {}
+        return find_hidden_destination(segments)
 
     def _extract_complete_route_info(self, segments: list) -> dict:
         """Extract complete route information including all segments.
@@ -1048,13 +1109,71 @@ query SearchItinerariesQuery(
 
         return query_type
 
+    async def _post(self, client: httpx.AsyncClient, api_url: str, payload: dict,
+                    query: str, page: int) -> httpx.Response:
+        """Send one GraphQL request, tracing it and updating the request metrics.
+
+        Connection errors, HTTP 5xx and 429 responses are retried with exponential
+        backoff while the retry budget allows, and reported to the host's circuit breaker.
+
+        Args:
+            client: Open HTTP client
+            api_url: GraphQL endpoint including the feature name
+            payload: Query and variables
+            query: Query kind used as metric label (``oneway`` or ``roundtrip``)
+            page: Page number for the trace span
+
+        Returns:
+            The HTTP response (any status; the last one if every attempt failed)
+
+        Raises:
+            CircuitOpenError: If the Kiwi circuit breaker is open
+            httpx.HTTPError: If the last attempt got no response
+
+        """
+        breaker = self.breakers.for_url(api_url)
+        self.retry_budget.record_request()
+        attempt = 1
+        while True:
+            breaker.before_request()
+            if self.limiter is not None:
+                await self.limiter.acquire_async()
+            response = None
+            start = time.perf_counter()
+            try:
+                with span("kiwi.request", page=page):
+                    response = await client.post(api_url, headers=self.headers, json=payload)
+            except httpx.HTTPError:
+                if attempt >= KIWI_MAX_ATTEMPTS or not self.retry_budget.try_spend():
+                    raise
+            finally:
+                status = response.status_code if response is not None else None
+                breaker.record(status)
+                record_request(api_url, "POST", status or "error", time.perf_counter() - start)
+
+            if response is not None:
+                if response.status_code == 200:
+                    KIWI_PAGES.inc(query=query)
+                if (
+                    not is_transient(response.status_code)
+                    or attempt >= KIWI_MAX_ATTEMPTS
+                    or not self.retry_budget.try_spend()
+                ):
+                    return response
+
+            HTTP_RETRIES.inc()
+            with span("http.retry_backoff"):
+                await asyncio.sleep(2 ** (attempt - 1))
+            attempt += 1
+
     async def _search_with_pagination(
         self,
         query: str,
         base_variables: Dict[str, Any],
         search_id: str,
         limit: int,
-        max_pages: int
+        max_pages: int,
+        raw_itineraries: bool = False
     ) -> Dict[str, Any]:
         """执行分页搜索以获取所有可用航班
 
@@ -1064,11 +1183,13 @@ query SearchItinerariesQuery(
             search_id: 搜索ID用于日志
             limit: 每页限制数量
             max_pages: 最大页数
+            raw_itineraries: 为True时返回原始itineraries（"itineraries"键），不提取航班字典
 
         Returns:
             包含所有页面航班数据的字典
         """
         all_flights = []
+        all_itineraries = []  # 原始模式下的itineraries
         all_flight_ids = set()  # 用于去重
         page_count = 0
         server_token = None
@@ -1099,13 +1220,16 @@ query SearchItinerariesQuery(
                     }
 
                     # 发送请求
-                    response = await client.post(api_url, headers=self.headers, json=payload)
+                    response = await self._post(
+                        client, api_url, payload, "oneway", page=page_count
+                    )
 
                     if response.status_code != 200:
                         logger.error(f"[{search_id}] Page {page_count} failed: {response.status_code}")
                         break
 
-                    response_data = response.json()
+                    with span("kiwi.decode"):
+                        response_data = loads(response.content)
 
                     # 检查响应格式
                     if 'data' not in response_data or 'onewayItineraries' not in response_data['data']:
@@ -1135,6 +1259,18 @@ query SearchItinerariesQuery(
                     # 处理航班数据
                     page_new_flights = 0
                     for itinerary in itineraries:
+                        if raw_itineraries:
+                            # 原始模式：只做去重，解析交给调用方
+                            flight_id = itinerary.get('id', '')
+                            if flight_id and flight_id not in all_flight_ids:
+                                all_flight_ids.add(flight_id)
+                                all_itineraries.append(itinerary)
+                                page_new_flights += 1
+
+                                if (itinerary.get('travelHack') or {}).get('isTrueHiddenCity'):
+                                    hidden_city_count += 1
+                            continue
+
                         flight_info = self._extract_oneway_flight_info(itinerary)
                         if flight_info:
                             flight_id = flight_info.get('id', '')
@@ -1169,9 +1305,30 @@ query SearchItinerariesQuery(
                     server_token = new_server_token
 
                     # 避免请求过快
-                    await asyncio.sleep(1)
+                    with span("kiwi.page_delay"):
+                        await asyncio.sleep(1)
+
+            unique_count = len(all_itineraries) if raw_itineraries else len(all_flights)
+            logger.info(
+                f"[{search_id}] Pagination complete: {unique_count} unique flights "
+                f"from {page_count} pages"
+            )
 
-            logger.info(f"[{search_id}] Pagination complete: {len(all_flights)} unique flights from {page_count} pages")
+            if raw_itineraries:
+                return {
+                    "success": True,
+                    "search_id": search_id,
+                    "trip_type": "oneway",
+                    "total_count": total_api_count,
+                    "hidden_city_count": hidden_city_count,
+                    "has_more": False,
+                    "itineraries": all_itineraries,
+                    "pagination_info": {
+                        "pages_fetched": page_count,
+                        "max_pages": max_pages,
+                        "unique_flights": unique_count,
+                    }
+                }
 
             return {
                 "success": True,
@@ -1189,12 +1346,15 @@ query SearchItinerariesQuery(
                 }
             }
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"[{search_id}] Pagination failed: {e}")
             return {
                 "success": False,
                 "error": f"Pagination error: {str(e)}",
                 "flights": all_flights,  # 返回已获取的航班
+                "itineraries": all_itineraries,
                 "pagination_info": {
                     "pages_fetched": page_count,
                     "error_on_page": page_count + 1 if page_count < max_pages else None
@@ -0,0 +1,278 @@
+"""Kiwi GraphQL itinerary parser.
+
+Converts raw Kiwi ``ItineraryOneWay`` / ``ItineraryReturn`` objects straight into
+``FlightResult`` and ``FlightLeg`` models in a single pass, without building the
+intermediate flight-info dictionaries used by the legacy ``KiwiFlightsAPI`` response format.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from fli.models import Airline, Airport, FlightLeg, FlightResult
+from fli.models.google_flights.base import LocalizationConfig
+
+# Fallback members used when a code is missing or unknown. Resolved once at import time
+# instead of materializing ``list(Airline)`` / ``list(Airport)`` on every miss.
+DEFAULT_AIRLINE = next(iter(Airline))
+DEFAULT_AIRPORT = next(iter(Airport))
+
+_EMPTY: dict[str, Any] = {}
+
+
+@lru_cache(maxsize=4096)
+def lookup_airline(airline_code: str) -> Airline:
+    """Convert an airline code to an Airline enum member.
+
+    Args:
+        airline_code: Airline code (e.g., "CA", "9C")
+
+    Returns:
+        Airline enum member, or DEFAULT_AIRLINE if the code is unknown
+
+    """
+    if not airline_code:
+        return DEFAULT_AIRLINE
+    if airline_code[0].isdigit():
+        airline_code = f"_{airline_code}"
+    return Airline.__members__.get(airline_code, DEFAULT_AIRLINE)
+
+
+@lru_cache(maxsize=16384)
+def lookup_airport(airport_code: str) -> Airport:
+    """Convert an airport code to an Airport enum member.
+
+    Args:
+        airport_code: Airport IATA code (e.g., "LHR", "PEK")
+
+    Returns:
+        Airport enum member, or DEFAULT_AIRPORT if the code is unknown
+
+    """
+    if not airport_code:
+        return DEFAULT_AIRPORT
+    return Airport.__members__.get(airport_code, DEFAULT_AIRPORT)
+
+
+def parse_kiwi_datetime(datetime_str: str | None) -> datetime:
+    """Parse a Kiwi ISO-8601 timestamp.
+
+    ``datetime.fromisoformat`` covers every format Kiwi returns (with or without
+    fractional seconds or a trailing ``Z``). Any UTC suffix or offset is dropped so the
+    result is naive like every other datetime in the models.
+
+    Args:
+        datetime_str: Datetime string from Kiwi API
+
+    Returns:
+        Parsed datetime object or current time as fallback
+
+    """
+    if datetime_str:
+        try:
+            return datetime.fromisoformat(datetime_str).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            pass
+    return datetime.now()
+
+
+def parse_price(amount: Any) -> float:
+    """Convert a Kiwi price amount (string or number) to float.
+
+    Args:
+        amount: Raw ``price.amount`` value
+
+    Returns:
+        Price as float, 0.0 if missing or invalid
+
+    """
+    if amount is None:
+        return 0.0
+    try:
+        return float(amount)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def find_hidden_destination(segments: list) -> dict:
+    """Adaptively find hidden destination information in flight segments.
+
+    Different query types may have hidden destination in different locations:
+    - Economy vs Business class
+    - Direct vs connecting flights
+    - Different routes
+
+    Args:
+        segments: List of Kiwi ``sectorSegments`` entries
+
+    Returns:
+        Hidden destination information or empty dict if not found
+
+    """
+    if not segments:
+        return {}
+
+    # Strategy 1: Check all segments for hidden destination (most common)
+    for seg in segments:
+        hidden_dest = (seg.get("segment") or _EMPTY).get("hiddenDestination")
+        if hidden_dest:
+            return hidden_dest
+
+    # Strategy 2: An intermediate destination that differs from the final one
+    if len(segments) > 1:
+        last_destination = (segments[-1].get("segment") or _EMPTY).get("destination", {})
+        for seg in segments[:-1]:
+            dest = (seg.get("segment") or _EMPTY).get("destination", {})
+            if dest and dest != last_destination:
+                return dest.get("station", {})
+
+    return {}
+
+
+def _parse_sector(segments: list) -> tuple[list[FlightLeg], list[dict]]:
+    """Build flight legs and route segment summaries from Kiwi sector segments.
+
+    Args:
+        segments: List of Kiwi ``sectorSegments`` entries
+
+    Returns:
+        Tuple of (flight legs, route segment summaries)
+
+    """
+    legs = []
+    route_segments = []
+    for seg in segments:
+        segment = seg.get("segment") or _EMPTY
+        source = segment.get("source") or _EMPTY
+        destination = segment.get("destination") or _EMPTY
+        from_code = (source.get("station") or _EMPTY).get("code", "")
+        to_code = (destination.get("station") or _EMPTY).get("code", "")
+        carrier_code = (segment.get("carrier") or _EMPTY).get("code", "")
+        flight_number = segment.get("code", "")
+        departure_time = source.get("localTime", "")
+        arrival_time = destination.get("localTime", "")
+        duration = segment.get("duration") or 0
+
+        legs.append(
+            FlightLeg(
+                airline=lookup_airline(carrier_code),
+                flight_number=flight_number,
+                departure_airport=lookup_airport(from_code),
+                arrival_airport=lookup_airport(to_code),
+                departure_datetime=parse_kiwi_datetime(departure_time),
+                arrival_datetime=parse_kiwi_datetime(arrival_time),
+                duration=duration // 60,  # Convert to minutes
+            )
+        )
+        route_segments.append(
+            {
+                "from": from_code,
+                "to": to_code,
+                "carrier": carrier_code,
+                "flight_number": flight_number,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "duration": duration,
+            }
+        )
+    return legs, route_segments
+
+
+def parse_oneway_itinerary(
+    itinerary: dict, localization_config: LocalizationConfig | None = None
+) -> FlightResult | None:
+    """Convert a raw Kiwi one-way itinerary into a FlightResult.
+
+    Args:
+        itinerary: ``ItineraryOneWay`` object from the GraphQL response
+        localization_config: Configuration used to localize the hidden destination name
+
+    Returns:
+        FlightResult with one leg per segment, or None if the itinerary has no segments
+
+    Raises:
+        pydantic.ValidationError: If the itinerary data does not form a valid FlightResult
+
+    """
+    segments = (itinerary.get("sector") or _EMPTY).get("sectorSegments") or []
+    if not segments:
+        return None
+
+    legs, route_segments = _parse_sector(segments)
+    travel_hack = itinerary.get("travelHack") or _EMPTY
+    hidden_destination = find_hidden_destination(segments)
+    hidden_code = hidden_destination.get("code", "") if hidden_destination else ""
+    hidden_name = hidden_destination.get("name", "") if hidden_destination else ""
+    if hidden_destination and localization_config is not None:
+        hidden_name = localization_config.get_airport_name(hidden_code, hidden_name)
+
+    return FlightResult(
+        price=parse_price((itinerary.get("price") or _EMPTY).get("amount")),
+        duration=(itinerary.get("duration") or 0) // 60,
+        stops=len(segments) - 1,
+        legs=legs,
+        hidden_city_info={
+            "is_hidden_city": travel_hack.get("isTrueHiddenCity", False),
+            "hidden_destination_code": hidden_code,
+            "hidden_destination_name": hidden_name,
+            "is_throwaway": travel_hack.get("isThrowawayTicket", False),
+            "route_segments": route_segments,
+        },
+    )
+
+
+def parse_roundtrip_itinerary(
+    itinerary: dict, localization_config: LocalizationConfig | None = None
+) -> tuple[FlightResult, FlightResult] | None:
+    """Convert a raw Kiwi return itinerary into an (outbound, inbound) FlightResult pair.
+
+    The total price is split evenly between both directions, matching how Google Flights
+    round-trip pairs are summed for display.
+
+    Args:
+        itinerary: ``ItineraryReturn`` object from the GraphQL response
+        localization_config: Configuration used to localize hidden destination names
+
+    Returns:
+        Tuple of (outbound, inbound) FlightResults, or None if either direction is empty
+
+    Raises:
+        pydantic.ValidationError: If the itinerary data does not form a valid FlightResult
+
+    """
+    total_price = parse_price((itinerary.get("price") or _EMPTY).get("amount"))
+    direction_price = total_price / 2 if total_price > 0 else 0
+
+    pair = []
+    for direction in ("outbound", "inbound"):
+        sector = itinerary.get(direction) or _EMPTY
+        segments = sector.get("sectorSegments") or []
+        if not segments:
+            return None
+
+        legs, route_segments = _parse_sector(segments)
+        hidden_destination = find_hidden_destination(segments)
+        hidden_code = hidden_destination.get("code", "") if hidden_destination else ""
+        hidden_name = hidden_destination.get("name", "") if hidden_destination else ""
+        if hidden_destination and localization_config is not None:
+            hidden_name = localization_config.get_airport_name(hidden_code, hidden_name)
+
+        duration = (sector.get("duration") or 0) // 60 or sum(leg.duration for leg in legs)
+        pair.append(
+            FlightResult(
+                price=direction_price,
+                duration=duration,
+                stops=len(segments) - 1,
+                legs=legs,
+                hidden_city_info={
+                    "is_hidden_city": bool(hidden_destination),
+                    "hidden_destination_code": hidden_code,
+                    "hidden_destination_name": hidden_name,
+                    "direction": direction,
+                    "total_price": total_price,
+                    "route_segments": route_segments,
+                },
+            )
+        )
+
+    return pair[0], pair[1]
@@ -1,5 +1,23 @@
 """CLI module for the fli package."""
 
-from fli.cli.main import cli
+import sys
+
+
+def cli():
+    """Entry point for the CLI.
+
+    Search commands are forwarded to a running ``fli serve`` daemon when one is reachable,
+    so the enum tables and HTTP stack are only imported when running in-process.
+    """
+    from fli.daemon.client import forward_cli
+
+    exit_code = forward_cli(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from fli.cli.main import cli as run_cli
+
+    run_cli()
+
 
 __all__ = ["cli"]
@@ -1,6 +1,8 @@
 """Command functions for the CLI."""
 
+from fli.cli.commands.batch import batch
 from fli.cli.commands.cheap import cheap
 from fli.cli.commands.search import search
+from fli.cli.commands.serve import serve
 
-__all__ = ["search", "cheap"]
+__all__ = ["search", "cheap", "batch", "serve"]
@@ -73,7 +73,7 @@ def airport_search_command(
         elif by_country:
             results = airport_search_api.search_by_country(query, lang, limit)
         else:
-            results = airport_search_api.search_airports(query, lang, limit)
+            results = airport_search_api.search_airports(query, lang, limit, fuzzy=True)
 
         if not results:
             console.print(f"[red]No airports found for query: {query}[/red]")
@@ -0,0 +1,391 @@
+"""Batch CLI command.
+
+Runs many flight (``search``) and calendar (``cheap``) queries from a CSV or JSONL file in
+a single process, sharing one HTTP client and result cache between worker threads, and
+streams one NDJSON record per query as soon as it completes.
+"""
+
+import csv
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from threading import Lock
+from typing import Annotated, Any
+
+import typer
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+
+from fli.cli.commands.cheap import build_date_filters
+from fli.cli.commands.search import build_flight_filters
+from fli.cli.console import err_console
+from fli.cli.output import NDJSONWriter, result_to_dict
+from fli.cli.utils import parse_localization
+from fli.models import TripType
+from fli.search import SearchCache, SearchDates, SearchFlights, SearchKiwiFlights
+from fli.search.client import Client, get_client
+
+TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+
+
+def load_queries(source: str) -> list[dict]:
+    """Load query specs from a CSV or JSONL file, or from stdin when source is ``-``.
+
+    The format is taken from the file extension (``.csv`` or ``.jsonl``/``.ndjson``/
+    ``.json``); for stdin or unknown extensions it is sniffed from the first character.
+
+    Args:
+        source: Path to the query file, or ``-`` for stdin
+
+    Returns:
+        List of query spec dictionaries in file order
+
+    Raises:
+        ValueError: If a JSONL line is not a JSON object
+
+    """
+    if source == "-":
+        text = sys.stdin.read()
+        suffix = ""
+    else:
+        path = Path(source)
+        text = path.read_text(encoding="utf-8-sig")
+        suffix = path.suffix.lower()
+
+    if suffix not in (".csv", ".jsonl", ".ndjson", ".json"):
+        suffix = ".jsonl" if text.lstrip().startswith("{") else ".csv"
+
+    if suffix == ".csv":
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    queries = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        spec = json.loads(line)
+        if not isinstance(spec, dict):
+            raise ValueError(f"Line {number}: expected a JSON object")
+        queries.append(spec)
+    return queries
+
+
+def normalize_query(spec: dict) -> dict:
+    """Lower-case keys and drop empty values (blank CSV cells) from a query spec."""
+    return {
+        str(key).strip().lower(): value.strip() if isinstance(value, str) else value
+        for key, value in spec.items()
+        if key is not None and value not in (None, "")
+    }
+
+
+def _as_bool(value: Any) -> bool:
+    """Interpret a CSV/JSON value as a boolean flag."""
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
+
+
+def _as_list(value: Any) -> list[str] | None:
+    """Interpret a CSV/JSON value as a list of codes (space or comma separated)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.replace(",", " ").split()
+    return [str(item) for item in value]
+
+
+def _as_time(value: Any) -> tuple[int, int] | None:
+    """Interpret a CSV/JSON value as an hour range such as ``6-20``."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        start, end = map(int, value.split("-"))
+        return start, end
+    start, end = value
+    return int(start), int(end)
+
+
+def query_kind(spec: dict) -> str:
+    """Get the query kind: ``search`` for flights on a date, ``cheap`` for a date range."""
+    kind = str(spec.get("type", "search" if "date" in spec else "cheap")).lower()
+    if kind not in ("search", "cheap"):
+        raise ValueError(f"Unknown query type: {kind}")
+    return kind
+
+
+def build_query(spec: dict):
+    """Build search filters and localization from a normalized query spec.
+
+    Recognized keys mirror the ``search`` and ``cheap`` options: ``type``, ``from``,
+    ``to``, ``date``, ``return``, ``from_date``, ``to_date``, ``duration``, ``round``,
+    ``time``, ``airlines``, ``class``, ``stops``, ``sort``, ``nearby``, ``language``,
+    ``currency`` and ``top_n``. Flight searches may also set ``provider`` to ``kiwi``
+    (optionally with ``hidden_city_only``) to search Kiwi.com instead of Google Flights.
+    ``nearby`` is a radius in km; the major airports within it of the origin and
+    destination are searched too.
+
+    Args:
+        spec: Normalized query spec
+
+    Returns:
+        Tuple of (kind, filters, localization_config)
+
+    Raises:
+        ValueError: If a required key is missing or a value is invalid
+
+    """
+    missing = [key for key in ("from", "to") if key not in spec]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+
+    kind = query_kind(spec)
+    localization_config = parse_localization(
+        str(spec.get("language", "en")), str(spec.get("currency", "USD"))
+    )
+    seat = str(spec.get("class", spec.get("seat", "ECONOMY")))
+    stops = str(spec.get("stops", "ANY"))
+    nearby_km = float(spec.get("nearby", 0))
+
+    if kind == "search":
+        if "date" not in spec:
+            raise ValueError("Missing required field(s): date")
+        return_date = spec.get("return")
+        filters = build_flight_filters(
+            trip_type=TripType.ROUND_TRIP if return_date else TripType.ONE_WAY,
+            from_airport=str(spec["from"]),
+            to_airport=str(spec["to"]),
+            date=str(spec["date"]),
+            return_date=str(return_date) if return_date else None,
+            time=_as_time(spec.get("time")),
+            airlines=_as_list(spec.get("airlines")),
+            seat=seat,
+            stops=stops,
+            sort=str(spec.get("sort", "CHEAPEST")),
+            nearby_km=nearby_km,
+        )
+    else:
+        if "from_date" not in spec or "to_date" not in spec:
+            raise ValueError("Missing required field(s): from_date, to_date")
+        filters = build_date_filters(
+            from_airport=str(spec["from"]),
+            to_airport=str(spec["to"]),
+            from_date=str(spec["from_date"]),
+            to_date=str(spec["to_date"]),
+            duration=int(spec.get("duration", 3)),
+            airlines=_as_list(spec.get("airlines")),
+            round_trip=_as_bool(spec.get("round", False)),
+            stops=stops,
+            seat=seat,
+            time=_as_time(spec.get("time")),
+            nearby_km=nearby_km,
+        )
+    return kind, filters, localization_config
+
+
+class BatchRunner:
+    """Execute query specs concurrently through one client and one result cache."""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        client: Client | None = None,
+        cache: SearchCache | None = None,
+        top_n: int = 5,
+    ):
+        """Initialize the runner.
+
+        Args:
+            concurrency: Number of queries in flight at once
+            client: HTTP client shared by every searcher (defaults to the shared client)
+            cache: Result cache shared by every searcher
+            top_n: Default number of outbound flights paired for round-trip searches
+
+        """
+        self.concurrency = max(1, concurrency)
+        self.client = client or get_client()
+        self.cache = cache if cache is not None else SearchCache()
+        self.top_n = top_n
+        self._searchers: dict[tuple, SearchFlights | SearchDates | SearchKiwiFlights] = {}
+        self._lock = Lock()
+
+    def searcher(self, kind: str, localization_config, spec: dict | None = None):
+        """Get (or create) the searcher for a query kind, provider and localization."""
+        spec = spec or {}
+        provider = str(spec.get("provider", "google")).lower()
+        if provider not in ("google", "kiwi"):
+            raise ValueError(f"Unknown provider: {provider}")
+        if provider == "kiwi" and kind != "search":
+            raise ValueError("The kiwi provider only supports flight searches")
+        hidden_city_only = _as_bool(spec.get("hidden_city_only", False))
+
+        key = (
+            kind,
+            provider,
+            hidden_city_only,
+            localization_config.language,
+            localization_config.currency,
+        )
+        with self._lock:
+            searcher = self._searchers.get(key)
+            if searcher is None:
+                if provider == "kiwi":
+                    searcher = SearchKiwiFlights(
+                        localization_config, hidden_city_only=hidden_city_only, cache=self.cache
+                    )
+                else:
+                    searcher_class = SearchFlights if kind == "search" else SearchDates
+                    searcher = searcher_class(
+                        localization_config, client=self.client, cache=self.cache
+                    )
+                self._searchers[key] = searcher
+            return searcher
+
+    def warm_up(self, localization_config) -> None:
+        """Create the searchers for a localization ahead of the first query."""
+        self.searcher("search", localization_config)
+        self.searcher("cheap", localization_config)
+        self.searcher("search", localization_config, {"provider": "kiwi"})
+
+    def run_query(self, index: int, spec: dict) -> dict:
+        """Run a single query spec and build its output record.
+
+        Failures are reported in the record instead of raised, so one bad row never
+        stops the batch.
+
+        Args:
+            index: Zero-based position of the query in the input
+            spec: Raw query spec
+
+        Returns:
+            Output record with ``status`` set to ``ok``, ``empty`` or ``error``
+
+        """
+        start = time.perf_counter()
+        record = {"index": index}
+        try:
+            spec = normalize_query(spec)
+            if "id" in spec:
+                record["id"] = spec["id"]
+            kind, filters, localization_config = build_query(spec)
+            record["type"] = kind
+            searcher = self.searcher(kind, localization_config, spec)
+            if kind == "search":
+                results = searcher.search(filters, top_n=int(spec.get("top_n", self.top_n)))
+            else:
+                results = searcher.search(filters)
+            results = results or []
+            record["status"] = "ok" if results else "empty"
+            record["count"] = len(results)
+            record["results"] = [result_to_dict(result, filters.trip_type) for result in results]
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+        record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        record["query"] = spec
+        return record
+
+    def run(self, queries: list[dict], on_record=None) -> list[dict]:
+        """Run every query, invoking on_record as each one completes.
+
+        Args:
+            queries: Raw query specs
+            on_record: Callback receiving each output record in completion order
+
+        Returns:
+            Output records in completion order
+
+        """
+        records = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [
+                executor.submit(self.run_query, index, spec) for index, spec in enumerate(queries)
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                records.append(record)
+                if on_record is not None:
+                    on_record(record)
+        return records
+
+
+def batch(
+    queries_file: Annotated[
+        str, typer.Argument(help="CSV or JSONL file of query specs ('-' reads stdin)")
+    ],
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Write NDJSON results to this file (default: stdout)"),
+    ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-j", min=1, help="Number of queries run in parallel"),
+    ] = 4,
+    top_n: Annotated[
+        int,
+        typer.Option("--top-n", "-n", min=1, help="Outbound flights paired for round trips"),
+    ] = 5,
+    cache_ttl: Annotated[
+        float,
+        typer.Option("--cache-ttl", help="Seconds identical requests are served from cache"),
+    ] = 300.0,
+    progress: Annotated[
+        bool,
+        typer.Option("--progress/--no-progress", help="Show aggregate progress on stderr"),
+    ] = True,
+):
+    """Run many searches from a file and stream NDJSON results.
+
+    Each row is a ``search`` (flights on a date) or ``cheap`` (cheapest dates in a range)
+    query using the same option names as those commands, e.g. a JSONL line
+    {"id": "q1", "from": "JFK", "to": "LHR", "date": "2025-10-25", "stops": "0"}
+    or a CSV file with columns type,from,to,from_date,to_date,round,duration.
+
+    Example:
+        fli batch routes.csv -j 8 -o results.ndjson
+
+    """
+    try:
+        queries = load_queries(queries_file)
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: {str(e)}", err=True)
+        raise typer.Exit(1) from e
+
+    runner = BatchRunner(concurrency=concurrency, cache=SearchCache(ttl=cache_ttl), top_n=top_n)
+    stream = output.open("w", encoding="utf-8") if output else sys.stdout
+    writer = NDJSONWriter(stream)
+    failed = 0
+
+    try:
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("{task.fields[failed]} failed"),
+            TimeElapsedColumn(),
+            console=err_console,
+            disable=not progress,
+            transient=True,
+        ) as bar:
+            task = bar.add_task("Searching", total=len(queries), failed=0)
+
+            def on_record(record: dict) -> None:
+                nonlocal failed
+                writer.write(record)
+                failed += record["status"] == "error"
+                bar.update(task, advance=1, failed=failed)
+
+            runner.run(queries, on_record)
+    finally:
+        if output:
+            stream.close()
+
+    stats = runner.cache.stats
+    if progress:
+        err_console.print(
+            f"{len(queries)} queries, {failed} failed, "
+            f"cache hit ratio {stats.hit_ratio:.0%} ({stats.hits}/{stats.hits + stats.misses})"
+        )
+    if failed:
+        raise typer.Exit(1)
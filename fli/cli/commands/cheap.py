@@ -1,15 +1,21 @@
+import sys
 from datetime import datetime, timedelta
 from typing import Annotated
 
 import typer
 
-from fli.cli.enums import DayOfWeek
+from fli.cli.enums import DayOfWeek, OutputFormat
+from fli.cli.output import write_results
 from fli.cli.utils import (
     display_date_results,
     filter_dates_by_days,
     parse_airlines,
+    parse_localization,
     parse_stops,
+    profile_search,
+    shared_searcher,
     validate_date,
+    validate_output_format,
     validate_time_range,
 )
 from fli.models import (
@@ -21,8 +27,83 @@ from fli.models import (
     TimeRestrictions,
     TripType,
 )
-from fli.models.google_flights.base import Currency, Language, LocalizationConfig
-from fli.search import SearchDates
+from fli.search import SearchDates, expand_nearby
+
+
+def build_date_filters(
+    from_airport: str,
+    to_airport: str,
+    from_date: str,
+    to_date: str,
+    duration: int = 3,
+    airlines: list[str] | None = None,
+    round_trip: bool = False,
+    stops: str = "ANY",
+    seat: str = "ECONOMY",
+    time: tuple[int, int] | str | None = None,
+    nearby_km: float = 0,
+) -> DateSearchFilters:
+    """Build calendar search filters from command-line style options.
+
+    A positive ``nearby_km`` also searches the major airports within that distance of the
+    origin and destination.
+    """
+    departure_airport = getattr(Airport, from_airport.upper())
+    arrival_airport = getattr(Airport, to_airport.upper())
+    trip_type = TripType.ROUND_TRIP if round_trip else TripType.ONE_WAY
+    max_stops = parse_stops(stops)
+    seat_type = getattr(SeatType, seat.upper())
+    airlines = parse_airlines(airlines)
+
+    # Parse time restrictions
+    time_restrictions = None
+    if time:
+        if isinstance(time, tuple):
+            start_hour, end_hour = time
+        else:
+            start_hour, end_hour = map(int, time.split("-"))
+        time_restrictions = TimeRestrictions(
+            earliest_departure=start_hour,
+            latest_departure=end_hour,
+            earliest_arrival=None,
+            latest_arrival=None,
+        )
+
+    # Create flight segment
+    flight_segment = FlightSegment(
+        departure_airport=[[departure_airport, 0]],
+        arrival_airport=[[arrival_airport, 0]],
+        travel_date=from_date,
+        time_restrictions=time_restrictions,
+    )
+
+    # Handle round trip
+    if trip_type == TripType.ROUND_TRIP:
+        return_flight_segment = FlightSegment(
+            departure_airport=[[arrival_airport, 0]],
+            arrival_airport=[[departure_airport, 0]],
+            travel_date=(
+                datetime.strptime(flight_segment.travel_date, "%Y-%m-%d") + timedelta(days=duration)
+            ).strftime("%Y-%m-%d"),
+            time_restrictions=time_restrictions,
+        )
+
+        flight_segments = [flight_segment, return_flight_segment]
+    else:
+        flight_segments = [flight_segment]
+
+    filters = DateSearchFilters(
+        trip_type=trip_type,
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=flight_segments,
+        stops=max_stops,
+        seat_type=seat_type,
+        airlines=airlines,
+        from_date=from_date,
+        to_date=to_date,
+        duration=duration if trip_type == TripType.ROUND_TRIP else None,
+    )
+    return expand_nearby(filters, nearby_km) if nearby_km > 0 else filters
 
 
 def cheap(
@@ -162,6 +243,30 @@ def cheap(
             help="Currency for pricing (USD, CNY)",
         ),
     ] = "USD",
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format (table, json, ndjson, csv)",
+            callback=validate_output_format,
+        ),
+    ] = "table",
+    nearby_km: Annotated[
+        float,
+        typer.Option(
+            "--nearby",
+            help="Also search major airports within this many km of each end (e.g., 100)",
+            min=0,
+        ),
+    ] = 0,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Print a per-stage timing breakdown to stderr",
+        ),
+    ] = False,
 ):
     """Find the cheapest dates to fly between two airports.
 
@@ -170,78 +275,32 @@ def cheap(
 
     """
     try:
-        # Parse parameters
-        departure_airport = getattr(Airport, from_airport.upper())
-        arrival_airport = getattr(Airport, to_airport.upper())
         trip_type = TripType.ROUND_TRIP if round_trip else TripType.ONE_WAY
-        max_stops = parse_stops(stops)
-        seat_type = getattr(SeatType, seat.upper())
-        airlines = parse_airlines(airlines)
-
-        # Create localization config
-        lang = (
-            Language.CHINESE if language.lower() in ["zh", "zh-cn", "chinese"] else Language.ENGLISH
-        )
-        curr = Currency.CNY if currency.upper() == "CNY" else Currency.USD
-        localization_config = LocalizationConfig(language=lang, currency=curr)
-
-        # Parse time restrictions
-        time_restrictions = None
-        if time:
-            if isinstance(time, tuple):
-                start_hour, end_hour = time
-            else:
-                start_hour, end_hour = map(int, time.split("-"))
-            time_restrictions = TimeRestrictions(
-                earliest_departure=start_hour,
-                latest_departure=end_hour,
-                earliest_arrival=None,
-                latest_arrival=None,
-            )
-
-        # Create flight segment
-        flight_segment = FlightSegment(
-            departure_airport=[[departure_airport, 0]],
-            arrival_airport=[[arrival_airport, 0]],
-            travel_date=from_date,
-            time_restrictions=time_restrictions,
-        )
-
-        # Handle round trip
-        if trip_type == TripType.ROUND_TRIP:
-            return_flight_segment = FlightSegment(
-                departure_airport=[[arrival_airport, 0]],
-                arrival_airport=[[departure_airport, 0]],
-                travel_date=(
-                    datetime.strptime(flight_segment.travel_date, "%Y-%m-%d")
-                    + timedelta(days=duration)
-                ).strftime("%Y-%m-%d"),
-                time_restrictions=time_restrictions,
-            )
-
-            flight_segments = [flight_segment, return_flight_segment]
-        else:
-            flight_segments = [flight_segment]
-
-        # Create search filters
-        filters = DateSearchFilters(
-            trip_type=trip_type,
-            passenger_info=PassengerInfo(adults=1),
-            flight_segments=flight_segments,
-            stops=max_stops,
-            seat_type=seat_type,
-            airlines=airlines,
+        filters = build_date_filters(
+            from_airport=from_airport,
+            to_airport=to_airport,
             from_date=from_date,
             to_date=to_date,
-            duration=duration if trip_type == TripType.ROUND_TRIP else None,
+            duration=duration,
+            airlines=airlines,
+            round_trip=round_trip,
+            stops=stops,
+            seat=seat,
+            time=time,
+            nearby_km=nearby_km,
         )
+        localization_config = parse_localization(language, currency)
 
         # Perform search
-        search_client = SearchDates(localization_config)
-        dates = search_client.search(filters)
+        search_client = shared_searcher("cheap", localization_config) or SearchDates(
+            localization_config
+        )
+        with profile_search(profile):
+            dates = search_client.search(filters)
 
+        table = output_format == OutputFormat.TABLE
         if not dates:
-            typer.echo("No flights found for these dates.")
+            typer.echo("No flights found for these dates.", err=not table)
             raise typer.Exit(1)
 
         # Filter by days if any day filters are specified
@@ -265,7 +324,7 @@ def cheap(
             dates = filter_dates_by_days(dates, selected_days, trip_type)
 
         if not dates:
-            typer.echo("No flights found for the selected days.")
+            typer.echo("No flights found for the selected days.", err=not table)
             raise typer.Exit(1)
 
         # Sort dates by price if sort flag is enabled
@@ -273,7 +332,10 @@ def cheap(
             dates.sort(key=lambda x: x.price)
 
         # Display results
-        display_date_results(dates, trip_type, localization_config)
+        if table:
+            display_date_results(dates, trip_type, localization_config)
+        else:
+            write_results(dates, output_format, sys.stdout)
 
     except (AttributeError, ValueError) as e:
         if "module 'fli.search' has no attribute 'SearchDates'" in str(e):
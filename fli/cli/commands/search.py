@@ -1,12 +1,19 @@
+import sys
 from typing import Annotated
 
 import typer
 
+from fli.cli.enums import OutputFormat
+from fli.cli.output import write_results
 from fli.cli.utils import (
     display_flight_results,
     parse_airlines,
+    parse_localization,
     parse_stops,
+    profile_search,
+    shared_searcher,
     validate_date,
+    validate_output_format,
     validate_time_range,
 )
 from fli.models import (
@@ -17,17 +24,11 @@ from fli.models import (
     SeatType,
     SortBy,
 )
-from fli.models.google_flights.base import (
-    Currency,
-    Language,
-    LocalizationConfig,
-    TimeRestrictions,
-    TripType,
-)
-from fli.search import SearchFlights
+from fli.models.google_flights.base import TimeRestrictions, TripType
+from fli.search import SearchFlights, expand_nearby
 
 
-def search_flights(
+def build_flight_filters(
     trip_type: TripType,
     from_airport: str,
     to_airport: str,
@@ -38,73 +39,109 @@ def search_flights(
     seat: str = "ECONOMY",
     stops: str = "ANY",
     sort: str = "CHEAPEST",
-    language: str = "en",
-    currency: str = "USD",
-):
-    """Core flight search functionality."""
-    try:
-        # Parse parameters
-        departure_airport = getattr(Airport, from_airport.upper())
-        arrival_airport = getattr(Airport, to_airport.upper())
-        seat_type = getattr(SeatType, seat.upper())
-        max_stops = parse_stops(stops)
-        airlines = parse_airlines(airlines)
-        sort_by = getattr(SortBy, sort.upper())
-
-        # Create localization config
-        lang = (
-            Language.CHINESE if language.lower() in ["zh", "zh-cn", "chinese"] else Language.ENGLISH
+    nearby_km: float = 0,
+) -> FlightSearchFilters:
+    """Build flight search filters from command-line style options.
+
+    A positive ``nearby_km`` also searches the major airports within that distance of the
+    origin and destination.
+    """
+    departure_airport = getattr(Airport, from_airport.upper())
+    arrival_airport = getattr(Airport, to_airport.upper())
+    seat_type = getattr(SeatType, seat.upper())
+    max_stops = parse_stops(stops)
+    airlines = parse_airlines(airlines)
+    sort_by = getattr(SortBy, sort.upper())
+
+    time_restrictions = None
+    if time:
+        start_hour, end_hour = time
+        time_restrictions = TimeRestrictions(
+            earliest_departure=start_hour, latest_departure=end_hour
         )
-        curr = Currency.CNY if currency.upper() == "CNY" else Currency.USD
-        localization_config = LocalizationConfig(language=lang, currency=curr)
-
-        time_restrictions = None
-        if time:
-            start_hour, end_hour = time
-            time_restrictions = TimeRestrictions(
-                earliest_departure=start_hour, latest_departure=end_hour
-            )
 
-        # Create flight segments
-        flight_segments = [
+    # Create flight segments
+    flight_segments = [
+        FlightSegment(
+            departure_airport=[[departure_airport, 0]],
+            arrival_airport=[[arrival_airport, 0]],
+            travel_date=date,
+            time_restrictions=time_restrictions,
+        )
+    ]
+    if return_date:
+        flight_segments.append(
             FlightSegment(
-                departure_airport=[[departure_airport, 0]],
-                arrival_airport=[[arrival_airport, 0]],
-                travel_date=date,
+                departure_airport=[[arrival_airport, 0]],
+                arrival_airport=[[departure_airport, 0]],
+                travel_date=return_date,
                 time_restrictions=time_restrictions,
             )
-        ]
-        if return_date:
-            flight_segments.append(
-                FlightSegment(
-                    departure_airport=[[arrival_airport, 0]],
-                    arrival_airport=[[departure_airport, 0]],
-                    travel_date=return_date,
-                    time_restrictions=time_restrictions,
-                )
-            )
+        )
+
+    filters = FlightSearchFilters(
+        trip_type=trip_type,
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=flight_segments,
+        stops=max_stops,
+        seat_type=seat_type,
+        airlines=airlines,
+        sort_by=sort_by,
+    )
+    return expand_nearby(filters, nearby_km) if nearby_km > 0 else filters
+
 
-        # Create search filters
-        filters = FlightSearchFilters(
+def search_flights(
+    trip_type: TripType,
+    from_airport: str,
+    to_airport: str,
+    date: str,
+    return_date: str | None = None,
+    time: tuple[int, int] | None = None,
+    airlines: list[str] | None = None,
+    seat: str = "ECONOMY",
+    stops: str = "ANY",
+    sort: str = "CHEAPEST",
+    language: str = "en",
+    currency: str = "USD",
+    output_format: OutputFormat = OutputFormat.TABLE,
+    profile: bool = False,
+    nearby_km: float = 0,
+):
+    """Core flight search functionality."""
+    try:
+        filters = build_flight_filters(
             trip_type=trip_type,
-            passenger_info=PassengerInfo(adults=1),
-            flight_segments=flight_segments,
-            stops=max_stops,
-            seat_type=seat_type,
+            from_airport=from_airport,
+            to_airport=to_airport,
+            date=date,
+            return_date=return_date,
+            time=time,
             airlines=airlines,
-            sort_by=sort_by,
+            seat=seat,
+            stops=stops,
+            sort=sort,
+            nearby_km=nearby_km,
         )
+        localization_config = parse_localization(language, currency)
 
         # Perform search
-        search_client = SearchFlights(localization_config)
-        flights = search_client.search(filters)
+        search_client = shared_searcher("search", localization_config) or SearchFlights(
+            localization_config
+        )
+        with profile_search(profile):
+            flights = search_client.search(filters)
 
+        table = output_format == OutputFormat.TABLE
         if not flights:
-            typer.echo("No flights found.")
+            typer.echo("No flights found.", err=not table)
             raise typer.Exit(1)
 
         # Display results
-        display_flight_results(flights, localization_config)
+        if table:
+            display_flight_results(flights, localization_config, filters.trip_type)
+        else:
+            write_results(flights, output_format, sys.stdout, filters.trip_type)
 
     except (AttributeError, ValueError) as e:
         typer.echo(f"Error: {str(e)}")
@@ -181,11 +218,36 @@ def search(
             help="Currency for pricing (USD, CNY)",
         ),
     ] = "USD",
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format (table, json, ndjson, csv)",
+            callback=validate_output_format,
+        ),
+    ] = "table",
+    nearby_km: Annotated[
+        float,
+        typer.Option(
+            "--nearby",
+            help="Also search major airports within this many km of each end (e.g., 100)",
+            min=0,
+        ),
+    ] = 0,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Print a per-stage timing breakdown to stderr",
+        ),
+    ] = False,
 ):
     """Search for flights with flexible filtering options.
 
     Example:
         fli search JFK LHR 2025-10-25 --time 6-20 --airlines BA KL --stops NON_STOP
+        fli search JFK LHR 2025-10-25 --nearby 100
 
     """
     search_flights(
@@ -201,4 +263,7 @@ def search(
         sort=sort,
         language=language,
         currency=currency,
+        output_format=output_format,
+        profile=profile,
+        nearby_km=nearby_km,
     )
@@ -0,0 +1,103 @@
+"""Serve CLI command.
+
+Starts the long-lived search daemon. While it is running, ``fli search`` and ``fli cheap``
+forward their arguments to it instead of importing everything in a fresh process.
+"""
+
+import asyncio
+import contextlib
+from typing import Annotated
+
+import typer
+
+from fli.cli.console import err_console
+from fli.daemon.client import DaemonClient, default_address
+from fli.search import SearchCache
+
+
+def serve(
+    address: Annotated[
+        str | None,
+        typer.Option(
+            "--address",
+            "-A",
+            help="Unix socket path or host:port to listen on (default: $FLI_DAEMON_ADDRESS "
+            "or a per-user socket)",
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-j", min=1, help="Worker threads for searches"),
+    ] = 8,
+    cache_ttl: Annotated[
+        float,
+        typer.Option("--cache-ttl", help="Seconds identical requests are served from cache"),
+    ] = 300.0,
+    cache_size: Annotated[
+        int,
+        typer.Option("--cache-size", min=1, help="Maximum number of cached responses"),
+    ] = 4096,
+    stop: Annotated[
+        bool,
+        typer.Option("--stop", help="Stop the daemon running at the address"),
+    ] = False,
+    status: Annotated[
+        bool,
+        typer.Option("--status", help="Show whether a daemon is running at the address"),
+    ] = False,
+    metrics: Annotated[
+        bool,
+        typer.Option("--metrics", help="Print the running daemon's metrics and exit"),
+    ] = False,
+):
+    """Run a local search daemon that keeps clients, caches and tables warm.
+
+    Example:
+        fli serve &
+        fli search JFK LHR 2025-10-25   # forwarded to the daemon
+
+    Set FLI_NO_DAEMON=1 to always run commands in-process.
+
+    """
+    address = address or default_address()
+    client = DaemonClient(address, timeout=5.0)
+
+    if stop or status or metrics:
+        running = client.is_running()
+        if stop and running:
+            client.shutdown()
+            typer.echo(f"Stopped daemon at {address}")
+        elif metrics and running:
+            typer.echo(client.metrics(), nl=False)
+        elif status and running:
+            health = client.request("GET", "/health")[1]
+            cache = health["cache"]
+            typer.echo(
+                f"Daemon running at {address} (pid {health['pid']}, up {health['uptime']}s, "
+                f"cache hit ratio {cache['hit_ratio']:.0%})"
+            )
+        else:
+            typer.echo(f"No daemon running at {address}")
+            raise typer.Exit(1)
+        return
+
+    from fli.daemon.server import SearchDaemon
+
+    daemon = SearchDaemon(
+        address,
+        concurrency=concurrency,
+        cache=SearchCache(maxsize=cache_size, ttl=cache_ttl),
+    )
+    daemon.warm_up()
+
+    async def run():
+        try:
+            await daemon.start()
+        except (OSError, RuntimeError) as e:
+            typer.echo(f"Error: {str(e)}", err=True)
+            raise typer.Exit(1) from e
+        err_console.print(f"Serving on {address} (Ctrl+C to stop)")
+        await daemon.serve_forever()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run())
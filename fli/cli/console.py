@@ -1,5 +1,88 @@
-"""Console module for the CLI."""
+"""Console module for the CLI.
+
+``console`` and ``err_console`` forward to the consoles of the current context. A process
+that runs several CLI invocations at once (``fli serve``) gives each one its own output
+with ``capture_output`` instead of swapping these module globals under a lock.
+"""
+
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TextIO
 
 from rich.console import Console
 
-console = Console()
+# (console, err_console, stdout, stderr) of the invocation running in this context
+_captured: ContextVar[tuple | None] = ContextVar("fli_captured_output", default=None)
+_install_lock = threading.Lock()
+
+
+class _ContextProxy:
+    """Forward attribute access to the current context's target, or to a default."""
+
+    def __init__(self, default: Any, slot: int):
+        """Initialize the proxy.
+
+        Args:
+            default: Object used outside ``capture_output``
+            slot: Position of the target in the captured tuple
+
+        """
+        self._default = default
+        self._slot = slot
+
+    def _target(self) -> Any:
+        """Get the object output goes to in the current context."""
+        captured = _captured.get()
+        return self._default if captured is None else captured[self._slot]
+
+    def __getattr__(self, name: str) -> Any:
+        """Look the attribute up on the current target."""
+        return getattr(self._target(), name)
+
+    def __enter__(self):
+        """Enter the current target (rich's ``Live`` uses ``with console``)."""
+        return self._target().__enter__()
+
+    def __exit__(self, *exc_info):
+        """Exit the current target."""
+        return self._target().__exit__(*exc_info)
+
+
+console = _ContextProxy(Console(), 0)
+err_console = _ContextProxy(Console(stderr=True), 1)
+
+
+def _install_streams() -> None:
+    """Route ``sys.stdout``/``sys.stderr`` through the per-context proxies."""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextProxy):
+            sys.stdout = _ContextProxy(sys.stdout, 2)
+        if not isinstance(sys.stderr, _ContextProxy):
+            sys.stderr = _ContextProxy(sys.stderr, 3)
+
+
+@contextmanager
+def capture_output(stdout: TextIO, stderr: TextIO, **options) -> Iterator[None]:
+    """Send the CLI output of the current context to the given streams.
+
+    Covers the rich consoles above as well as plain ``print``/``typer.echo`` output, which
+    goes through proxies installed on ``sys.stdout``/``sys.stderr`` on first use. Other
+    threads and contexts keep writing to their own output.
+
+    Args:
+        stdout: Stream receiving standard output
+        stderr: Stream receiving error output
+        **options: Options for the two rich consoles (e.g. ``width``, ``force_terminal``)
+
+    """
+    _install_streams()
+    token = _captured.set(
+        (Console(file=stdout, **options), Console(file=stderr, **options), stdout, stderr)
+    )
+    try:
+        yield
+    finally:
+        _captured.reset(token)
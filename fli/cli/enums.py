@@ -11,3 +11,12 @@ class DayOfWeek(Enum):
     FRIDAY = "friday"
     SATURDAY = "saturday"
     SUNDAY = "sunday"
+
+
+class OutputFormat(Enum):
+    """Output formats for search results."""
+
+    TABLE = "table"
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
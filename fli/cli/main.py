@@ -4,8 +4,10 @@ import sys
 
 import typer
 
+from fli.cli.commands.batch import batch
 from fli.cli.commands.cheap import cheap
 from fli.cli.commands.search import search
+from fli.cli.commands.serve import serve
 
 app = typer.Typer(
     help="Search for flights using Google Flights data",
@@ -13,8 +15,10 @@ app = typer.Typer(
 )
 
 # Register commands
+app.command(name="batch")(batch)
 app.command(name="cheap")(cheap)
 app.command(name="search")(search)
+app.command(name="serve")(serve)
 
 
 @app.callback(invoke_without_command=True)
@@ -37,7 +41,7 @@ def cli():
         args.append("--help")
 
     # If the first argument isn't a command, treat as search
-    if args[0] not in ["cheap", "search", "--help", "-h"]:
+    if args[0] not in ["batch", "cheap", "search", "serve", "--help", "-h"]:
         sys.argv.insert(1, "search")
 
     app()
@@ -0,0 +1,265 @@
+"""Machine-readable output helpers for the CLI.
+
+Search results are converted to plain JSON-compatible records with airport and airline
+codes (instead of display names) and ISO-8601 timestamps, so they can be piped into other
+tools without going through the rich renderer. ``orjson`` is used for serialization when
+it is installed (``pip install smart-flights[fast]``).
+"""
+
+import csv
+import json
+import threading
+from collections.abc import Iterable
+from typing import Any, TextIO
+
+from fli.cli.enums import OutputFormat
+from fli.models import FlightLeg, FlightResult, TripType
+from fli.search import DatePrice
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+FLIGHT_COLUMNS = [
+    "price",
+    "duration",
+    "stops",
+    "departure_airport",
+    "arrival_airport",
+    "departure_datetime",
+    "arrival_datetime",
+    "airlines",
+    "flight_numbers",
+]
+DATE_COLUMNS = ["date", "return_date", "price"]
+
+
+def enum_code(member) -> str:
+    """Get the IATA code for an airport or airline enum member."""
+    return member.name.lstrip("_")
+
+
+def leg_to_dict(leg: FlightLeg) -> dict:
+    """Convert a flight leg to a JSON-compatible record."""
+    return {
+        "airline": enum_code(leg.airline),
+        "flight_number": leg.flight_number,
+        "departure_airport": enum_code(leg.departure_airport),
+        "arrival_airport": enum_code(leg.arrival_airport),
+        "departure_datetime": leg.departure_datetime.isoformat(),
+        "arrival_datetime": leg.arrival_datetime.isoformat(),
+        "duration": leg.duration,
+    }
+
+
+def flight_to_dict(flight: FlightResult) -> dict:
+    """Convert a flight result to a JSON-compatible record."""
+    record = {
+        "price": flight.price,
+        "duration": flight.duration,
+        "stops": flight.stops,
+        "legs": [leg_to_dict(leg) for leg in flight.legs],
+    }
+    if flight.hidden_city_info:
+        record["hidden_city_info"] = flight.hidden_city_info
+    return record
+
+
+def date_price_to_dict(date_price: DatePrice) -> dict:
+    """Convert a calendar price to a JSON-compatible record."""
+    record = {"date": date_price.date[0].date().isoformat(), "price": date_price.price}
+    if len(date_price.date) > 1:
+        record["return_date"] = date_price.date[1].date().isoformat()
+    return record
+
+
+def is_itinerary(result: Any, trip_type: TripType | None = None) -> bool:
+    """Check whether a result is a multi-city itinerary rather than a round-trip pair.
+
+    Multi-city searches return one flight per leg as a tuple. Tuples of any length other
+    than two are itineraries; two-flight tuples are round-trip pairs unless ``trip_type``
+    says the search was multi-city.
+    """
+    return isinstance(result, tuple) and (len(result) != 2 or trip_type == TripType.MULTI_CITY)
+
+
+def result_to_dict(result: Any, trip_type: TripType | None = None) -> dict:
+    """Convert any search result item to a JSON-compatible record.
+
+    Handles one-way flights, (outbound, return) flight pairs, multi-city itineraries,
+    round-trip dictionaries returned by the Kiwi searcher, and calendar prices.
+
+    Args:
+        result: A single item of a search result list
+        trip_type: Trip type of the search, used to tell two-leg itineraries from pairs
+
+    Returns:
+        JSON-compatible dictionary
+
+    Raises:
+        TypeError: If the item type is not a known search result
+
+    """
+    if isinstance(result, FlightResult):
+        return flight_to_dict(result)
+    if isinstance(result, DatePrice):
+        return date_price_to_dict(result)
+    if is_itinerary(result, trip_type):
+        return {
+            "price": sum(flight.price for flight in result),
+            "legs": [flight_to_dict(flight) for flight in result],
+        }
+    if isinstance(result, tuple):
+        outbound, inbound = result
+        return {
+            "price": outbound.price + inbound.price,
+            "outbound": flight_to_dict(outbound),
+            "return": flight_to_dict(inbound),
+        }
+    if isinstance(result, dict) and "outbound" in result:
+        return {
+            "price": result.get("total_price", result["outbound"].price),
+            "outbound": flight_to_dict(result["outbound"]),
+            "return": flight_to_dict(result["return"]),
+        }
+    raise TypeError(f"Unsupported result type: {type(result).__name__}")
+
+
+def dumps(record: Any) -> str:
+    """Serialize a record as compact single-line JSON."""
+    if orjson is not None:
+        return orjson.dumps(record, default=str).decode()
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def flight_row(flight: FlightResult, prefix: str = "") -> dict:
+    """Flatten a flight result into a CSV row keyed by (prefixed) FLIGHT_COLUMNS."""
+    first, last = flight.legs[0], flight.legs[-1]
+    row = {
+        "price": flight.price,
+        "duration": flight.duration,
+        "stops": flight.stops,
+        "departure_airport": enum_code(first.departure_airport),
+        "arrival_airport": enum_code(last.arrival_airport),
+        "departure_datetime": first.departure_datetime.isoformat(),
+        "arrival_datetime": last.arrival_datetime.isoformat(),
+        "airlines": " ".join(enum_code(leg.airline) for leg in flight.legs),
+        "flight_numbers": " ".join(leg.flight_number for leg in flight.legs),
+    }
+    return {f"{prefix}{key}": value for key, value in row.items()}
+
+
+def result_row(result: Any, trip_type: TripType | None = None) -> dict:
+    """Flatten any search result item into a CSV row."""
+    if isinstance(result, DatePrice):
+        return date_price_to_dict(result)
+    if isinstance(result, FlightResult):
+        return flight_row(result)
+    if is_itinerary(result, trip_type):
+        row = {"price": sum(flight.price for flight in result)}
+        for number, flight in enumerate(result, 1):
+            row.update(flight_row(flight, f"leg{number}_"))
+        return row
+    if isinstance(result, dict):
+        outbound, inbound = result["outbound"], result["return"]
+        price = result.get("total_price", outbound.price + inbound.price)
+    else:
+        outbound, inbound = result
+        price = outbound.price + inbound.price
+    return {"price": price, **flight_row(outbound, "outbound_"), **flight_row(inbound, "return_")}
+
+
+def csv_columns(result: Any, trip_type: TripType | None = None) -> list[str]:
+    """Get the CSV header matching the type of a search result item."""
+    if isinstance(result, DatePrice):
+        return DATE_COLUMNS
+    if isinstance(result, FlightResult):
+        return FLIGHT_COLUMNS
+    if is_itinerary(result, trip_type):
+        return ["price"] + [
+            f"leg{number}_{column}"
+            for number in range(1, len(result) + 1)
+            for column in FLIGHT_COLUMNS
+        ]
+    return (
+        ["price"]
+        + [f"outbound_{column}" for column in FLIGHT_COLUMNS]
+        + [f"return_{column}" for column in FLIGHT_COLUMNS]
+    )
+
+
+def write_results(
+    results: Iterable,
+    output_format: OutputFormat,
+    stream: TextIO,
+    trip_type: TripType | None = None,
+) -> int:
+    """Write search results incrementally in a machine-readable format.
+
+    Each item is converted and written as soon as it is reached, so nothing is buffered
+    beyond a single record.
+
+    Args:
+        results: Search result items (flights, flight pairs, multi-city itineraries or
+            calendar prices)
+        output_format: JSON array, NDJSON lines or CSV with a header row
+        stream: Text stream receiving the output
+        trip_type: Trip type of the search, used to tell two-leg itineraries from pairs
+
+    Returns:
+        Number of results written
+
+    Raises:
+        ValueError: If output_format is the table format
+
+    """
+    count = 0
+    if output_format == OutputFormat.CSV:
+        writer = None
+        for result in results:
+            if writer is None:
+                writer = csv.DictWriter(
+                    stream, fieldnames=csv_columns(result, trip_type), extrasaction="ignore"
+                )
+                writer.writeheader()
+            writer.writerow(result_row(result, trip_type))
+            count += 1
+    elif output_format == OutputFormat.NDJSON:
+        for result in results:
+            stream.write(dumps(result_to_dict(result, trip_type)) + "\n")
+            count += 1
+    elif output_format == OutputFormat.JSON:
+        stream.write("[")
+        for result in results:
+            record = dumps(result_to_dict(result, trip_type))
+            stream.write(("," if count else "") + "\n" + record)
+            count += 1
+        stream.write("\n]\n" if count else "]\n")
+    else:
+        raise ValueError(f"Not a machine-readable format: {output_format.value}")
+    stream.flush()
+    return count
+
+
+class NDJSONWriter:
+    """Thread-safe writer emitting one JSON document per line, flushed as it goes."""
+
+    def __init__(self, stream: TextIO):
+        """Initialize the writer.
+
+        Args:
+            stream: Text stream receiving the lines
+
+        """
+        self.stream = stream
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, record: Any) -> None:
+        """Write a single record followed by a newline."""
+        line = dumps(record)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+            self.count += 1
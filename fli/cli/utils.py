@@ -1,5 +1,8 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 
+import click
 import typer
 from click import Context, Parameter
 from rich import box
@@ -9,9 +12,10 @@ from rich.table import Table
 from rich.text import Text
 
 from fli.cli.console import console
-from fli.cli.enums import DayOfWeek
+from fli.cli.enums import DayOfWeek, OutputFormat
+from fli.core.tracing import TraceCollector, use_tracer
 from fli.models import Airline, Airport, MaxStops, TripType
-from fli.models.google_flights.base import LocalizationConfig
+from fli.models.google_flights.base import Currency, Language, LocalizationConfig
 
 
 def validate_date(ctx: Context, param: Parameter, value: str) -> str | None:
@@ -42,6 +46,15 @@ def validate_time_range(
         raise typer.BadParameter("Time range must be in format 'start-end' (e.g., 6-20)") from e
 
 
+def validate_output_format(ctx: Context, param: Parameter, value: str) -> OutputFormat:
+    """Validate and parse the output format option."""
+    try:
+        return OutputFormat(value.lower())
+    except ValueError as e:
+        choices = ", ".join(output_format.value for output_format in OutputFormat)
+        raise typer.BadParameter(f"Output format must be one of: {choices}") from e
+
+
 def parse_airlines(airlines: list[str] | None) -> list[Airline] | None:
     """Parse airlines from list of airline codes."""
     if not airlines:
@@ -76,6 +89,51 @@ def parse_stops(stops: str) -> MaxStops:
             raise typer.BadParameter(f"Invalid stops value: {stops}") from e
 
 
+def parse_localization(language: str = "en", currency: str = "USD") -> LocalizationConfig:
+    """Build a localization config from language and currency options."""
+    lang = Language.CHINESE if language.lower() in ["zh", "zh-cn", "chinese"] else Language.ENGLISH
+    curr = Currency.CNY if currency.upper() == "CNY" else Currency.USD
+    return LocalizationConfig(language=lang, currency=curr)
+
+
+@contextmanager
+def profile_search(enabled: bool = False) -> Iterator[TraceCollector | None]:
+    """Record tracing spans for the enclosed search and print a per-stage breakdown.
+
+    The breakdown is written to stderr so it never mixes with machine-readable output.
+    """
+    if not enabled:
+        yield None
+        return
+
+    collector = TraceCollector()
+    try:
+        with use_tracer(collector):
+            yield collector
+    finally:
+        typer.echo(collector.report(), err=True)
+
+
+def shared_searcher(kind: str, localization_config: LocalizationConfig):
+    """Get the host process's searcher for a command, if it provides one.
+
+    ``fli serve`` invokes forwarded commands with its ``BatchRunner`` as the click context
+    object, so they reuse the daemon's searchers and result cache instead of building
+    uncached ones.
+
+    Args:
+        kind: ``"search"`` for flight searches or ``"cheap"`` for calendar searches
+        localization_config: Language and currency of the command
+
+    Returns:
+        The shared searcher, or None when the command runs standalone
+
+    """
+    ctx = click.get_current_context(silent=True)
+    runner = ctx.find_root().obj if ctx is not None else None
+    return runner.searcher(kind, localization_config) if runner is not None else None
+
+
 def parse_trip_type(trip_type: str) -> TripType:
     """Convert trip type parameter to TripType enum."""
     match trip_type.upper():
@@ -139,13 +197,20 @@ def format_price(price: float, currency_symbol: str = "¥") -> str:
     return f"{currency_symbol}{price:,.2f}"
 
 
-def display_flight_results(flights: list, localization_config: LocalizationConfig = None):
+def display_flight_results(
+    flights: list,
+    localization_config: LocalizationConfig = None,
+    trip_type: TripType | None = None,
+):
     """Display flight results in a beautiful format.
 
     Args:
-        flights: List of either FlightResult objects (one-way)
-        or tuples of (outbound, return) FlightResults (round-trip)
+        flights: List of either FlightResult objects (one-way), tuples of (outbound, return)
+            FlightResults (round-trip) or tuples of one FlightResult per leg (multi-city)
         localization_config: Configuration for currency and language display
+        trip_type: Trip type of the search. Needed to show a two-leg multi-city itinerary
+            as legs rather than outbound and return; when omitted it is inferred from the
+            number of flights per result
 
     """
     if localization_config is None:
@@ -154,18 +219,22 @@ def display_flight_results(flights: list, localization_config: LocalizationConfi
         console.print(Panel("No flights found matching your criteria", style="red"))
         return
 
-    for i, flight_data in enumerate(flights, 1):
-        is_round_trip = isinstance(flight_data, tuple)
-        flight_segments = [flight_data] if not is_round_trip else [flight_data[0], flight_data[1]]
+    localized = localization_config.localize_results(flights, format_airport)
+    for i, (flight_data, localized_flights) in enumerate(zip(flights, localized, strict=True), 1):
+        flight_segments = list(flight_data) if isinstance(flight_data, tuple) else [flight_data]
+        if trip_type is None:
+            is_round_trip = len(flight_segments) == 2
+            is_multi_city = len(flight_segments) > 2
+        else:
+            is_round_trip = trip_type == TripType.ROUND_TRIP
+            is_multi_city = trip_type == TripType.MULTI_CITY
 
         # Create main flight info table
         table = Table(show_header=False, box=box.SIMPLE)
         table.add_column("Label", style="blue")
         table.add_column("Value", style="green")
 
-        total_price = flight_segments[0].price
-        if is_round_trip:
-            total_price += flight_segments[1].price
+        total_price = sum(flight.price for flight in flight_segments)
         table.add_row(
             localization_config.get_text("total_price"),
             format_price(total_price, localization_config.currency_symbol),
@@ -180,6 +249,12 @@ def display_flight_results(flights: list, localization_config: LocalizationConfi
                 localization_config.get_text("return_price"),
                 format_price(flight_segments[1].price, localization_config.currency_symbol),
             )
+        elif is_multi_city:
+            for number, flight in enumerate(flight_segments, 1):
+                table.add_row(
+                    localization_config.get_text("leg_price").format(number=number),
+                    format_price(flight.price, localization_config.currency_symbol),
+                )
 
         total_duration = sum(flight.duration for flight in flight_segments)
         table.add_row(
@@ -191,12 +266,14 @@ def display_flight_results(flights: list, localization_config: LocalizationConfi
         # Create segments tables for each direction
         all_segments = []
         for idx, flight in enumerate(flight_segments):
-            if idx == 0:
+            if is_multi_city:
+                direction_text = localization_config.get_text("leg_flight_segments").format(
+                    number=idx + 1
+                )
+            elif idx == 0:
                 direction_text = localization_config.get_text("outbound_flight_segments")
-            elif is_round_trip:
-                direction_text = localization_config.get_text("return_flight_segments")
             else:
-                direction_text = localization_config.get_text("outbound_flight_segments")
+                direction_text = localization_config.get_text("return_flight_segments")
 
             segments = Table(
                 title=direction_text,
@@ -209,34 +286,24 @@ def display_flight_results(flights: list, localization_config: LocalizationConfi
             segments.add_column(localization_config.get_text("to"), style="yellow", width=30)
             segments.add_column(localization_config.get_text("arrival"), style="green")
 
-            for leg in flight.legs:
-                # Get localized airline and airport names
-                airline_name = localization_config.get_airline_name(
-                    leg.airline.name, leg.airline.value
-                )
-                departure_airport_name = localization_config.get_airport_name(
-                    leg.departure_airport.name, format_airport(leg.departure_airport)
-                )
-                arrival_airport_name = localization_config.get_airport_name(
-                    leg.arrival_airport.name, format_airport(leg.arrival_airport)
-                )
-
+            for leg, names in zip(flight.legs, localized_flights[idx], strict=True):
                 segments.add_row(
-                    airline_name,
+                    names.airline,
                     leg.flight_number,
-                    departure_airport_name,
+                    names.departure_airport,
                     leg.departure_datetime.strftime("%H:%M %d-%b"),
-                    arrival_airport_name,
+                    names.arrival_airport,
                     leg.arrival_datetime.strftime("%H:%M %d-%b"),
                 )
             all_segments.extend([segments, Text("")])
 
         # Display in a panel
-        title_text = (
-            localization_config.get_text("round_trip_flight_option")
-            if is_round_trip
-            else localization_config.get_text("one_way_flight_option")
-        )
+        if is_multi_city:
+            title_text = localization_config.get_text("multi_city_flight_option")
+        elif is_round_trip:
+            title_text = localization_config.get_text("round_trip_flight_option")
+        else:
+            title_text = localization_config.get_text("one_way_flight_option")
         console.print(
             Panel(
                 Group(
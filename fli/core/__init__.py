@@ -0,0 +1,42 @@
+"""Cross-cutting infrastructure shared by the API clients, searchers and CLI.
+
+Modules here must not import ``fli.search`` or ``fli.api`` so that both can depend on them.
+"""
+
+from fli.core.metrics import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    record_request,
+    render_metrics,
+)
+from fli.core.tracing import (
+    RecordingTracer,
+    Span,
+    TraceCollector,
+    Tracer,
+    get_tracer,
+    set_tracer,
+    span,
+    use_tracer,
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "record_request",
+    "render_metrics",
+    "RecordingTracer",
+    "Span",
+    "TraceCollector",
+    "Tracer",
+    "get_tracer",
+    "set_tracer",
+    "span",
+    "use_tracer",
+]
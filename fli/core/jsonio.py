@@ -0,0 +1,156 @@
+"""Pluggable JSON decoding for API responses.
+
+Google Flights responses are several hundred kilobytes of JSON behind an anti-XSSI
+``)]}'`` prefix, with the useful payload embedded as a JSON *string* inside the outer
+array, and Kiwi GraphQL responses are similarly large. Decoding them with the standard
+library means first decoding the body bytes to ``str`` and then copying it again to strip
+the prefix.
+
+This module decodes response bytes directly with the fastest installed backend
+(``orjson``, then ``msgspec``, falling back to the standard library). The prefix is skipped
+by offset through a ``memoryview`` so the body is never copied for the fast backends.
+``orjson`` ships with the ``fast`` extra (``pip install smart-flights[fast]``); the
+``FLI_JSON_BACKEND`` environment variable or ``set_backend`` pins a specific backend.
+
+Example:
+    >>> payload = loads_embedded(response.content)  # Google Flights shopping response
+    >>> data = loads(response.content)  # Kiwi GraphQL response
+    >>> backend_name()
+    'orjson'
+
+"""
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+# Characters of the anti-XSSI prefix; the stdlib path stripped any leading run of these
+XSSI_CHARS = b")]}'"
+BACKEND_ENV = "FLI_JSON_BACKEND"
+
+logger = logging.getLogger(__name__)
+
+Buffer = bytes | bytearray | memoryview | str
+
+
+def _stdlib_loads(data: Buffer) -> Any:
+    """Decode with the standard library, which does not accept memoryviews."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _available_backends() -> dict[str, Callable[[Buffer], Any]]:
+    """Get the decoders of the installed backends, fastest first."""
+    backends: dict[str, Callable[[Buffer], Any]] = {}
+    if orjson is not None:
+        backends["orjson"] = orjson.loads
+    if msgspec is not None:
+        backends["msgspec"] = msgspec.json.decode
+    backends["json"] = _stdlib_loads
+    return backends
+
+
+BACKENDS = _available_backends()
+
+_backend_name = next(iter(BACKENDS))
+_loads = BACKENDS[_backend_name]
+
+
+def backend_name() -> str:
+    """Get the name of the active backend (``orjson``, ``msgspec`` or ``json``)."""
+    return _backend_name
+
+
+def set_backend(name: str) -> None:
+    """Select the JSON backend used by ``loads`` and ``loads_embedded``.
+
+    Args:
+        name: ``orjson``, ``msgspec`` or ``json``
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+
+    """
+    global _backend_name, _loads
+    if name not in BACKENDS:
+        available = ", ".join(BACKENDS)
+        raise ValueError(f"JSON backend {name!r} is not available (available: {available})")
+    _backend_name, _loads = name, BACKENDS[name]
+
+
+def xssi_offset(data: Buffer) -> int:
+    """Get the index of the first character after a leading anti-XSSI prefix."""
+    if isinstance(data, str):
+        return len(data) - len(data.lstrip(")]}'"))
+    offset = 0
+    end = len(data)
+    while offset < end and data[offset] in XSSI_CHARS:
+        offset += 1
+    return offset
+
+
+def loads(data: Buffer) -> Any:
+    """Decode a JSON document from bytes (or ``str``) with the active backend.
+
+    Args:
+        data: Raw JSON, typically ``response.content``
+
+    Returns:
+        Decoded JSON value
+
+    """
+    return _loads(data)
+
+
+def loads_xssi(data: Buffer) -> Any:
+    """Decode a JSON document behind an anti-XSSI ``)]}'`` prefix without copying it.
+
+    Args:
+        data: Raw response body, typically ``response.content``
+
+    Returns:
+        Decoded JSON value
+
+    """
+    offset = xssi_offset(data)
+    if not offset:
+        return _loads(data)
+    if isinstance(data, str):
+        return _loads(data[offset:])
+    return _loads(memoryview(data)[offset:])
+
+
+def loads_embedded(data: Buffer) -> Any:
+    """Decode a Google Flights response whose payload is a JSON string at ``[0][2]``.
+
+    Args:
+        data: Raw response body, typically ``response.content``
+
+    Returns:
+        Decoded payload, or None if the response carries no payload
+
+    """
+    embedded = loads_xssi(data)[0][2]
+    if not embedded:
+        return None
+    return _loads(embedded)
+
+
+if os.environ.get(BACKEND_ENV):
+    try:
+        set_backend(os.environ[BACKEND_ENV])
+    except ValueError as e:
+        logger.warning("Ignoring %s: %s", BACKEND_ENV, e)
@@ -0,0 +1,453 @@
+"""In-process metrics registry with a Prometheus text-exposition snapshot.
+
+Counters, gauges and histograms are kept in memory and need no external service. The HTTP
+client, the Kiwi API, the parsers and ``SearchCache`` update the metrics defined at the
+bottom of this module; a wrapper service scrapes them by serving ``render_metrics()`` (the
+``fli serve`` daemon exposes it at ``GET /metrics``).
+
+Example:
+    >>> HTTP_REQUESTS.inc(host="www.google.com", method="POST", status="200")
+    >>> print(render_metrics())
+
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from time import perf_counter
+from urllib.parse import urlsplit
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way the exposition format expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a label set as ``{name="value",...}``."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base class holding a metric's name, help text and label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the metric.
+
+        Args:
+            name: Metric name (``fli_`` prefixed, snake case)
+            documentation: One-line help text
+            labelnames: Names of the labels every sample must carry
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> LabelValues:
+        """Convert keyword labels to the tuple used as storage key."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield ``(sample name, rendered labels, value)`` for every series."""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        """Render the metric in text-exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the counter."""
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase the counter.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Value for every label name
+
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        """Get the current value for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def total(self) -> float:
+        """Get the sum over every label set."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def series(self) -> dict[LabelValues, float]:
+        """Get a snapshot of every label set and its value."""
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield one sample per label set."""
+        for key, value in sorted(self.series().items()):
+            yield self.name, _format_labels(self.labelnames, key), value
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Metric):
+    """Value that can go up and down, optionally computed when scraped."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Callable[[], Iterable[tuple[LabelValues, float]]] | None = None,
+    ):
+        """Initialize the gauge.
+
+        Args:
+            name: Metric name
+            documentation: One-line help text
+            labelnames: Label names
+            callback: Function returning ``(label values, value)`` pairs at scrape time;
+                replaces stored values when given
+
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        """Set the gauge for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: object) -> float:
+        """Get the current value for a label set."""
+        key = self._key(labels)
+        if self.callback is not None:
+            return dict(self.callback()).get(key, 0.0)
+        return self._values.get(key, 0.0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield one sample per label set."""
+        if self.callback is not None:
+            series = dict(self.callback())
+        else:
+            with self._lock:
+                series = dict(self._values)
+        for key, value in sorted(series.items()):
+            yield self.name, _format_labels(self.labelnames, key), value
+
+    def reset(self) -> None:
+        """Drop every stored value."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: One-line help text
+            labelnames: Label names (``le`` is reserved)
+            buckets: Sorted upper bounds; ``+Inf`` is added automatically
+
+        """
+        super().__init__(name, documentation, labelnames)
+        if "le" in self.labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (non-cumulative, last is +Inf), sum, count
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value (seconds for latencies)
+            **labels: Value for every label name
+
+        """
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observe the wall time of the enclosed block."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def count(self, **labels: object) -> int:
+        """Get the number of observations for a label set."""
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def sum(self, **labels: object) -> float:
+        """Get the sum of observations for a label set."""
+        series = self._series.get(self._key(labels))
+        return series[1][0] if series else 0.0
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield the cumulative buckets, sum and count of every label set."""
+        with self._lock:
+            snapshot = {
+                key: (list(counts), total[0]) for key, (counts, total) in self._series.items()
+            }
+        bounds = [*self.buckets, math.inf]
+        for key, (counts, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                labels = _format_labels((*self.labelnames, "le"), (*key, _format_value(bound)))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric, returning the existing one if the name is already registered.
+
+        Raises:
+            ValueError: If a different kind of metric already uses the name
+
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered differently")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create or get a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Callable[[], Iterable[tuple[LabelValues, float]]] | None = None,
+    ) -> Gauge:
+        """Create or get a gauge."""
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create or get a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Metric | None:
+        """Look up a metric by name."""
+        return self._metrics.get(name)
+
+    def __iter__(self) -> Iterator[Metric]:
+        """Iterate over the registered metrics in registration order."""
+        with self._lock:
+            return iter(list(self._metrics.values()))
+
+    def exposition(self) -> str:
+        """Render every metric in Prometheus text-exposition format."""
+        return "".join(metric.expose() + "\n" for metric in self)
+
+    def reset(self) -> None:
+        """Reset every metric's recorded values (the metrics stay registered)."""
+        for metric in self:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "fli_http_requests_total",
+    "Upstream HTTP requests by host, method and response status.",
+    ("host", "method", "status"),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "fli_http_request_duration_seconds",
+    "Upstream HTTP request latency.",
+    ("host", "method"),
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "fli_http_retries_total",
+    "Requests retried by the HTTP client after a failure.",
+)
+HTTP_RETRIES_DENIED = REGISTRY.counter(
+    "fli_http_retries_denied_total",
+    "Failed requests not retried because the retry budget was spent.",
+)
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "fli_circuit_rejections_total",
+    "Requests failed fast because the host's circuit breaker was open.",
+    ("host",),
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    "fli_circuit_state",
+    "Circuit breaker state by host (0 closed, 1 half-open, 2 open).",
+    ("host",),
+)
+RATE_LIMIT_WAITS = REGISTRY.counter(
+    "fli_rate_limit_waits_total",
+    "Times a request had to wait for the client-side rate limit.",
+)
+RATE_LIMIT_SLEEP = REGISTRY.counter(
+    "fli_rate_limit_sleep_seconds_total",
+    "Time spent sleeping on the client-side rate limit.",
+)
+KIWI_PAGES = REGISTRY.counter(
+    "fli_kiwi_pages_total",
+    "Result pages fetched from the Kiwi GraphQL API.",
+    ("query",),
+)
+PARSE_FAILURES = REGISTRY.counter(
+    "fli_parse_failures_total",
+    "Records skipped because they could not be parsed.",
+    ("source", "kind"),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "fli_cache_lookups_total",
+    "Search cache lookups by cache name and result (hit, stale or miss).",
+    ("cache", "result"),
+)
+CACHE_REFRESHES = REGISTRY.counter(
+    "fli_cache_refreshes_total",
+    "Background refreshes of stale search cache entries by result (ok or error).",
+    ("cache", "result"),
+)
+
+
+def _cache_hit_ratios() -> Iterator[tuple[LabelValues, float]]:
+    """Compute the hit ratio of every cache from the lookup counter."""
+    totals: dict[str, list[float]] = {}
+    for (cache, result), value in CACHE_LOOKUPS.series().items():
+        hits_and_lookups = totals.setdefault(cache, [0.0, 0.0])
+        hits_and_lookups[1] += value
+        if result in ("hit", "stale"):
+            hits_and_lookups[0] += value
+    for cache, (hits, lookups) in totals.items():
+        yield (cache,), hits / lookups if lookups else 0.0
+
+
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "fli_cache_hit_ratio",
+    "Fraction of search cache lookups answered from the cache.",
+    ("cache",),
+    callback=_cache_hit_ratios,
+)
+
+
+def record_request(url: str, method: str, status: int | str, seconds: float) -> None:
+    """Count an upstream request and observe its latency.
+
+    Args:
+        url: Requested URL (only the host is used as a label)
+        method: HTTP method
+        status: Response status code, or ``"error"`` when no response was received
+        seconds: Request wall time
+
+    """
+    host = urlsplit(url).hostname or "unknown"
+    HTTP_REQUESTS.inc(host=host, method=method, status=status)
+    HTTP_REQUEST_DURATION.observe(seconds, host=host, method=method)
+
+
+def render_metrics(registry: MetricsRegistry | None = None) -> str:
+    """Render a text-exposition snapshot of the registry (the global one by default)."""
+    return (registry or REGISTRY).exposition()
@@ -0,0 +1,173 @@
+"""Token-bucket rate limiting shared by threads and asyncio tasks.
+
+A ``TokenBucket`` refills at ``rate`` tokens per second up to ``burst`` tokens. Each
+request takes one token, waiting for the next one when the bucket is empty. Unlike a
+decorator-level limit, a bucket is an object: clients built for different
+``SearchContext`` instances can share one budget or each get their own.
+
+Waits are counted in the rate-limit metrics and traced as ``http.rate_limit_wait`` spans.
+
+A ``SharedTokenBucket`` keeps its state in shared memory so the worker processes of a
+sweep draw from one aggregate budget.
+
+Example:
+    >>> limiter = TokenBucket(rate=10)  # 10 requests per second, bursts of 10
+    >>> limiter.acquire()
+    0.0
+
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing.context import BaseContext
+
+from fli.core.metrics import RATE_LIMIT_SLEEP, RATE_LIMIT_WAITS
+from fli.core.tracing import span
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (defaults to ``rate``, and at least one token)
+            clock: Monotonic time source (injectable for tests)
+            sleep: Blocking sleep used by ``acquire`` (injectable for tests)
+
+        Raises:
+            ValueError: If the rate is not positive
+
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens, possibly going into debt, and get how long to wait for them.
+
+        Reserving instead of polling keeps waiters in arrival order: each caller is
+        assigned the moment its tokens will have been refilled.
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if they are available right now."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, blocking until they are available.
+
+        Returns:
+            Seconds spent waiting
+
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            RATE_LIMIT_WAITS.inc()
+            RATE_LIMIT_SLEEP.inc(wait)
+            with span("http.rate_limit_wait"):
+                self.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Take tokens, yielding to the event loop until they are available.
+
+        Returns:
+            Seconds spent waiting
+
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            RATE_LIMIT_WAITS.inc()
+            RATE_LIMIT_SLEEP.inc(wait)
+            with span("http.rate_limit_wait"):
+                await asyncio.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket shared by several processes.
+
+    The token count and last refill time live in a shared-memory array guarded by a
+    process lock, and time comes from the system-wide monotonic clock, so every process
+    holding the bucket reserves from the same budget. Pass the bucket to child processes
+    when they are created (as ``Process`` arguments or a pool initializer argument); like
+    other multiprocessing primitives it cannot be sent through a queue afterwards.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        mp_context: BaseContext | None = None,
+    ):
+        """Initialize a full bucket in shared memory.
+
+        Args:
+            rate: Tokens added per second, across all processes
+            burst: Bucket capacity (defaults to ``rate``, and at least one token)
+            clock: Monotonic time source, which must be comparable across processes
+            sleep: Blocking sleep used by ``acquire``
+            mp_context: Multiprocessing context that creates the shared state and lock
+                (must match the context of the processes sharing the bucket)
+
+        Raises:
+            ValueError: If the rate is not positive
+
+        """
+        mp_context = mp_context or multiprocessing.get_context()
+        self._state = mp_context.RawArray("d", 2)
+        super().__init__(rate, burst, clock, sleep)
+        self._lock = mp_context.Lock()
+
+    @property
+    def _tokens(self) -> float:
+        """Get the shared token count."""
+        return self._state[0]
+
+    @_tokens.setter
+    def _tokens(self, value: float) -> None:
+        """Set the shared token count."""
+        self._state[0] = value
+
+    @property
+    def _updated(self) -> float:
+        """Get the shared last refill time."""
+        return self._state[1]
+
+    @_updated.setter
+    def _updated(self, value: float) -> None:
+        """Set the shared last refill time."""
+        self._state[1] = value
@@ -0,0 +1,262 @@
+"""Retry budgets and per-host circuit breakers for upstream requests.
+
+Retrying every failed request a fixed number of times multiplies traffic exactly when the
+upstream is struggling: during a brownout every concurrent search sends three requests
+instead of one and then waits out the backoff. Two guards keep failures cheap:
+
+- a ``RetryBudget`` allows retries only up to a fraction of the requests made in a recent
+  window (plus a small floor so an idle client can still retry), shared by every search
+  that uses the same client
+- a ``CircuitBreaker`` per host opens after consecutive transient failures (connection
+  errors, HTTP 5xx and 429) and then rejects requests immediately with
+  ``CircuitOpenError`` until ``reset_timeout`` has passed; it then lets a limited number
+  of probe requests through (half-open) and closes again on the first success
+
+Breaker states are exported as the ``fli_circuit_state`` gauge, and rejected requests and
+denied retries are counted in the metrics registry.
+
+Example:
+    >>> breaker = BREAKERS.for_url("https://www.google.com/_/FlightsFrontendUi")
+    >>> breaker.before_request()  # raises CircuitOpenError while the circuit is open
+    >>> breaker.record(response.status_code)
+
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import IntEnum
+from urllib.parse import urlsplit
+
+from fli.core.metrics import CIRCUIT_REJECTIONS, CIRCUIT_STATE, HTTP_RETRIES_DENIED
+
+
+def is_transient(status: int | None) -> bool:
+    """Check whether a response status (None for no response) is worth retrying."""
+    return status is None or status == 429 or status >= 500
+
+
+class RetryBudget:
+    """Cap retries to a fraction of the requests made in a sliding window."""
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 0.5,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty budget.
+
+        Args:
+            ratio: Retries allowed per request made in the window
+            min_per_second: Retries allowed per second of window regardless of traffic
+            window: Length of the sliding window in seconds
+            clock: Monotonic time source (injectable for tests)
+
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self.clock = clock
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        """Drop events that have left the window."""
+        horizon = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] <= horizon:
+                events.popleft()
+
+    def record_request(self) -> None:
+        """Count a new (first-attempt) request, which earns retry budget."""
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget if any is left.
+
+        Returns:
+            True if the caller may retry, False if the budget is spent
+
+        """
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            allowed = self.ratio * len(self._requests) + self.min_per_second * self.window
+            if len(self._retries) + 1 > allowed:
+                HTTP_RETRIES_DENIED.inc()
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitState(IntEnum):
+    """State of a circuit breaker (values are exported as the state gauge)."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_after: float):
+        """Initialize the error.
+
+        Args:
+            host: Host the request was for
+            retry_after: Seconds until the breaker lets a probe request through
+
+        """
+        super().__init__(f"Circuit open for {host}; retry in {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker for one upstream host."""
+
+    def __init__(
+        self,
+        host: str = "",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            host: Host name, used in errors and metric labels
+            failure_threshold: Consecutive transient failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_probes: Requests allowed in flight while probing
+            clock: Monotonic time source (injectable for tests)
+
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Switch state and publish it (called with the lock held)."""
+        self._state = state
+        self._probes = 0
+        CIRCUIT_STATE.set(int(state), host=self.host)
+
+    def _current(self) -> CircuitState:
+        """Get the state, moving from open to half-open once the timeout has passed."""
+        if (
+            self._state is CircuitState.OPEN
+            and self.clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def state(self) -> CircuitState:
+        """Get the current state."""
+        with self._lock:
+            return self._current()
+
+    def before_request(self) -> None:
+        """Admit a request or fail fast.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with every probe slot
+                taken
+
+        """
+        with self._lock:
+            state = self._current()
+            if state is CircuitState.CLOSED:
+                return
+            if state is CircuitState.HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return
+            retry_after = max(0.0, self._opened_at + self.reset_timeout - self.clock())
+        CIRCUIT_REJECTIONS.inc(host=self.host)
+        raise CircuitOpenError(self.host, retry_after)
+
+    def record_success(self) -> None:
+        """Record a healthy response, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+            if self._state is not CircuitState.CLOSED:
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a transient failure, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            state = self._current()
+            if state is CircuitState.HALF_OPEN or (
+                state is CircuitState.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self.clock()
+                self._set_state(CircuitState.OPEN)
+
+    def record(self, status: int | None) -> None:
+        """Record the outcome of a request from its status (None when it got no response).
+
+        Client errors other than 429 count as successes: the host answered.
+        """
+        if is_transient(status):
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+class CircuitBreakers:
+    """Registry of circuit breakers, one per host, created on first use."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the registry with the settings used for every breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        """Get (or create) the breaker of a host."""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host,
+                    self.failure_threshold,
+                    self.reset_timeout,
+                    self.half_open_probes,
+                    self.clock,
+                )
+            return breaker
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """Get (or create) the breaker of a URL's host."""
+        return self.for_host(urlsplit(url).hostname or "unknown")
+
+
+# Process-wide breakers shared by every client without its own registry
+BREAKERS = CircuitBreakers()
@@ -0,0 +1,250 @@
+"""Lightweight tracing for the search pipeline.
+
+Searchers, the HTTP client and the Kiwi API wrap each stage of a search (filter encoding,
+rate-limit waits, HTTP requests, JSON decoding, parsing, round-trip fan-out) in a
+``span``. By default the installed tracer is a no-op and a span costs one attribute lookup
+and a call returning a shared null context manager. Installing a ``TraceCollector``
+records every span so a per-stage breakdown can be printed.
+
+Spans nest through a context variable, so nesting is tracked correctly both across worker
+threads and across asyncio tasks.
+
+Example:
+    >>> collector = TraceCollector()
+    >>> with use_tracer(collector):
+    ...     SearchFlights().search(filters)
+    >>> print(collector.report())
+
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+_current_span: ContextVar["Span | None"] = ContextVar("fli_current_span", default=None)
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        """Ignore attributes."""
+
+
+NULL_SPAN = _NullSpan()
+
+
+@dataclass(eq=False)
+class Span:
+    """A timed stage of a search."""
+
+    name: str
+    attrs: dict[str, Any]
+    tracer: "RecordingTracer"
+    parent: "Span | None" = None
+    start: float = 0.0
+    end: float = 0.0
+    child_time: float = 0.0
+    error: str | None = None
+    _token: Any = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> float:
+        """Get the wall time of the span in seconds."""
+        return self.end - self.start
+
+    @property
+    def self_time(self) -> float:
+        """Get the span's wall time not covered by its child spans."""
+        return max(0.0, self.duration - self.child_time)
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes discovered while the span is open."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        """Start timing and become the current span."""
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Stop timing, restore the parent span and record the span."""
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        if self.parent is not None:
+            self.parent.child_time += self.duration
+        self.tracer.record(self)
+
+
+class Tracer:
+    """No-op tracer; the default while instrumentation is disabled."""
+
+    enabled = False
+
+    def span(self, name: str, **attrs: Any):
+        """Open a span; returns the shared null span."""
+        return NULL_SPAN
+
+
+class RecordingTracer(Tracer):
+    """Tracer that times spans and passes each finished span to hook callbacks."""
+
+    enabled = True
+
+    def __init__(self, hooks: list[Callable[[Span], None]] | None = None):
+        """Initialize the tracer.
+
+        Args:
+            hooks: Callbacks invoked with every finished span
+
+        """
+        self.hooks = list(hooks or [])
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        """Open a timed span.
+
+        Args:
+            name: Stage name, dotted by component (e.g. ``flights.parse``)
+            **attrs: Attributes recorded with the span
+
+        Returns:
+            Context manager timing the enclosed block
+
+        """
+        return Span(name, attrs, self)
+
+    def record(self, span: Span) -> None:
+        """Deliver a finished span to the hooks."""
+        for hook in self.hooks:
+            hook(span)
+
+
+@dataclass
+class StageStats:
+    """Aggregated timings for one span name."""
+
+    count: int = 0
+    total: float = 0.0
+    self_total: float = 0.0
+    max: float = 0.0
+    errors: int = 0
+
+
+class TraceCollector(RecordingTracer):
+    """Recording tracer that keeps every span and renders a per-stage breakdown."""
+
+    def __init__(self, hooks: list[Callable[[Span], None]] | None = None):
+        """Initialize an empty collector."""
+        super().__init__(hooks)
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        """Store a finished span and run the hooks."""
+        with self._lock:
+            self.spans.append(span)
+        super().record(span)
+
+    def summary(self) -> dict[str, StageStats]:
+        """Aggregate the recorded spans by name, in order of first completion."""
+        stages: dict[str, StageStats] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stats = stages.setdefault(span.name, StageStats())
+            stats.count += 1
+            stats.total += span.duration
+            stats.self_total += span.self_time
+            stats.max = max(stats.max, span.duration)
+            stats.errors += span.error is not None
+        return stages
+
+    def wall_time(self) -> float:
+        """Get the total wall time of the top-level spans."""
+        with self._lock:
+            return sum(span.duration for span in self.spans if span.parent is None)
+
+    def report(self) -> str:
+        """Render the per-stage breakdown as a text table.
+
+        ``self`` is the time spent in a stage outside its child stages, so the ``self``
+        column of all rows adds up to the wall time when nothing ran concurrently.
+        """
+        stages = self.summary()
+        wall = self.wall_time()
+        width = max([len("stage")] + [len(name) for name in stages])
+        lines = [
+            f"{'stage':<{width}}  {'count':>5}  {'total ms':>10}  {'self ms':>10}  "
+            f"{'max ms':>9}  {'self %':>6}"
+        ]
+        for name, stats in sorted(stages.items(), key=lambda item: -item[1].self_total):
+            share = stats.self_total / wall * 100 if wall else 0.0
+            errors = f"  ({stats.errors} failed)" if stats.errors else ""
+            lines.append(
+                f"{name:<{width}}  {stats.count:>5}  {stats.total * 1e3:>10.1f}  "
+                f"{stats.self_total * 1e3:>10.1f}  {stats.max * 1e3:>9.1f}  {share:>5.1f}%"
+                f"{errors}"
+            )
+        lines.append(f"{'wall time':<{width}}  {'':>5}  {wall * 1e3:>10.1f}")
+        return "\n".join(lines)
+
+
+_tracer: Tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer | None) -> Tracer:
+    """Install a process-wide tracer (None restores the no-op tracer).
+
+    Returns:
+        The previously installed tracer
+
+    """
+    global _tracer
+    previous = _tracer
+    _tracer = tracer or Tracer()
+    return previous
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Install a tracer for the duration of a block."""
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def span(name: str, **attrs: Any):
+    """Open a span on the process-wide tracer.
+
+    Args:
+        name: Stage name, dotted by component (e.g. ``http.request``)
+        **attrs: Attributes recorded with the span
+
+    Returns:
+        Context manager timing the enclosed block (a shared no-op while disabled)
+
+    """
+    return _tracer.span(name, **attrs)
@@ -0,0 +1,8 @@
+"""Long-lived local search daemon (``fli serve``) and its client.
+
+Only the lightweight client is imported here; the server lives in ``fli.daemon.server``.
+"""
+
+from fli.daemon.client import DaemonClient, default_address, forward_cli
+
+__all__ = ["DaemonClient", "default_address", "forward_cli"]
@@ -0,0 +1,212 @@
+"""Client side of the ``fli serve`` daemon.
+
+This module only uses the standard library so that forwarding a CLI invocation to a
+running daemon does not import the airport/airline enum tables, pydantic models or the
+HTTP stack; the daemon already has all of them loaded.
+"""
+
+import http.client
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+from urllib.parse import quote
+
+DEFAULT_TCP_PORT = 8743
+CONNECT_TIMEOUT = 0.25
+FORWARDED_COMMANDS = ("search", "cheap")
+LOCAL_COMMANDS = ("batch", "serve", "--help", "-h", "--install-completion", "--show-completion")
+
+
+def default_address() -> str:
+    """Get the daemon address.
+
+    ``FLI_DAEMON_ADDRESS`` takes precedence. Otherwise a per-user Unix socket is used, or
+    a loopback TCP port on platforms without Unix sockets.
+
+    Returns:
+        A socket path or a ``host:port`` string
+
+    """
+    address = os.environ.get("FLI_DAEMON_ADDRESS")
+    if address:
+        return address
+    if not hasattr(socket, "AF_UNIX"):
+        return f"127.0.0.1:{DEFAULT_TCP_PORT}"
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+        tempfile.gettempdir(), f"fli-{os.getuid()}"
+    )
+    return os.path.join(runtime_dir, "fli.sock")
+
+
+def parse_address(address: str) -> tuple[str, str | tuple[str, int]]:
+    """Split an address into its transport and target.
+
+    Args:
+        address: A socket path (optionally prefixed with ``unix:``) or ``host:port``
+
+    Returns:
+        ("unix", path) or ("tcp", (host, port))
+
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:") :]
+    host, sep, port = address.rpartition(":")
+    if hasattr(socket, "AF_UNIX") and (not sep or not port.isdigit() or os.sep in address):
+        return "unix", address
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: float | None = None):
+        """Initialize the connection for a socket path."""
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        """Connect to the Unix socket."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class DaemonClient:
+    """Minimal JSON-over-HTTP client for the search daemon."""
+
+    def __init__(self, address: str | None = None, timeout: float | None = 120.0):
+        """Initialize the client.
+
+        Args:
+            address: Daemon address (defaults to ``default_address()``)
+            timeout: Read timeout in seconds for a single request
+
+        """
+        self.address = address or default_address()
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Open a connection using a short connect timeout."""
+        transport, target = parse_address(self.address)
+        if transport == "unix":
+            connection = _UnixHTTPConnection(target, timeout=CONNECT_TIMEOUT)
+        else:
+            host, port = target
+            connection = http.client.HTTPConnection(host, port, timeout=CONNECT_TIMEOUT)
+        connection.connect()
+        connection.sock.settimeout(self.timeout)
+        return connection
+
+    def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+        """Send a request and decode the JSON response.
+
+        Args:
+            method: HTTP method
+            path: Request path including any query string
+            payload: JSON body for the request
+
+        Returns:
+            Tuple of (status code, decoded JSON body)
+
+        Raises:
+            OSError: If the daemon is not reachable
+
+        """
+        status, body = self._send(method, path, payload)
+        return status, json.loads(body or b"{}")
+
+    def _send(self, method: str, path: str, payload: dict | None = None) -> tuple[int, bytes]:
+        """Send a request and return the status code and raw response body."""
+        connection = self._connection()
+        try:
+            body = json.dumps(payload).encode() if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def is_running(self) -> bool:
+        """Check whether a daemon answers at the address."""
+        try:
+            status, _ = self.request("GET", "/health")
+        except (OSError, ValueError, http.client.HTTPException):
+            return False
+        return status == 200
+
+    def search(self, spec: dict) -> dict:
+        """Run a query spec (as used by ``fli batch``) and return its result record."""
+        return self.request("POST", "/search", spec)[1]
+
+    def airports(self, query: str, language: str = "en", limit: int = 10) -> list[dict]:
+        """Search airports through the daemon's warm index."""
+        path = f"/airports?q={quote(query)}&language={quote(language)}&limit={limit}"
+        return self.request("GET", path)[1].get("results", [])
+
+    def resolve_airports(
+        self,
+        queries: list[str] | None = None,
+        codes: list[str] | None = None,
+        language: str = "en",
+        limit: int = 10,
+    ) -> dict:
+        """Search many airport queries and resolve many codes in a single request."""
+        payload = {
+            "queries": queries or [],
+            "codes": codes or [],
+            "language": language,
+            "limit": limit,
+        }
+        return self.request("POST", "/airports/resolve", payload)[1]
+
+    def metrics(self) -> str:
+        """Get the daemon's metrics in Prometheus text-exposition format."""
+        return self._send("GET", "/metrics")[1].decode()
+
+    def shutdown(self) -> None:
+        """Ask the daemon to stop."""
+        self.request("POST", "/shutdown", {})
+
+
+def forward_cli(args: list[str], address: str | None = None) -> int | None:
+    """Run a CLI invocation on a running daemon, if there is one.
+
+    Only the ``search`` and ``cheap`` commands (including the implicit ``search`` form
+    ``fli JFK LHR 2025-10-25``) are forwarded; anything else, ``FLI_NO_DAEMON=1``, or an
+    unreachable daemon returns None so the caller runs the command locally.
+
+    Args:
+        args: Command-line arguments without the program name
+        address: Daemon address (defaults to ``default_address()``)
+
+    Returns:
+        The command's exit code, or None if the invocation was not forwarded
+
+    """
+    if not args or os.environ.get("FLI_NO_DAEMON") or args[0] in LOCAL_COMMANDS:
+        return None
+    if args[0] not in FORWARDED_COMMANDS:
+        if args[0].startswith("-"):
+            return None
+        args = ["search", *args]
+
+    payload = {
+        "argv": args,
+        "width": shutil.get_terminal_size().columns,
+        "color": sys.stdout.isatty() and not os.environ.get("NO_COLOR"),
+    }
+    try:
+        status, response = DaemonClient(address, timeout=None).request("POST", "/cli", payload)
+    except (OSError, ValueError, http.client.HTTPException):
+        return None
+    if status != 200:
+        return None
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("exit_code", 0))
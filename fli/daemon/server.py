@@ -0,0 +1,383 @@
+"""Asyncio HTTP server behind ``fli serve``.
+
+The daemon keeps one process warm: the airport/airline enum tables and translations are
+imported once, and a single ``BatchRunner`` holds the shared HTTP client, result cache and
+the ``SearchFlights``/``SearchDates``/``SearchKiwiFlights`` instances. Identical requests
+that arrive while one is in flight are coalesced onto the same future.
+
+Endpoints (JSON in, JSON out):
+    GET  /health                 liveness, uptime and cache statistics
+    GET  /metrics                metrics in Prometheus text-exposition format
+    POST /search                 run a query spec as accepted by ``fli batch``
+    GET  /airports?q=&language=  search airports in the warm index
+    GET  /airports/<code>        look up a single airport
+    POST /airports/resolve       search many queries and resolve many codes in one request
+    POST /cli                    run a forwarded ``search``/``cheap`` invocation
+    POST /shutdown               stop the daemon
+"""
+
+import asyncio
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from fli.api.airport_search import airport_search_api
+from fli.cli.commands.batch import BatchRunner, normalize_query
+from fli.cli.output import dumps
+from fli.core.metrics import render_metrics
+from fli.daemon.client import DaemonClient, parse_address
+from fli.models.google_flights.base import Language, LocalizationConfig
+from fli.search import SearchCache
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+MAX_BODY = 1 << 20
+
+
+class DaemonError(Exception):
+    """Request error mapped to an HTTP status code."""
+
+    def __init__(self, status: int, message: str):
+        """Initialize the error with a status code and message."""
+        super().__init__(message)
+        self.status = status
+
+
+class SearchDaemon:
+    """Serve searches from a warm process over a Unix socket or loopback TCP."""
+
+    def __init__(
+        self,
+        address: str,
+        concurrency: int = 8,
+        cache: SearchCache | None = None,
+        runner: BatchRunner | None = None,
+    ):
+        """Initialize the daemon.
+
+        Args:
+            address: Unix socket path or ``host:port`` to listen on
+            concurrency: Worker threads available for searches
+            cache: Result cache shared by every searcher
+            runner: Pre-built runner (created from concurrency and cache if omitted)
+
+        """
+        self.address = address
+        self.runner = runner or BatchRunner(concurrency=concurrency, cache=cache)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.runner.concurrency, thread_name_prefix="fli-daemon"
+        )
+        self.started_at = time.time()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._stopped: asyncio.Event | None = None
+
+    def warm_up(self) -> None:
+        """Load translations and create searchers so the first request pays nothing extra."""
+        for language in (Language.ENGLISH, Language.CHINESE):
+            config = LocalizationConfig(language=language)
+            config.get_airline_name("CA", "Air China")
+            self.runner.warm_up(config)
+
+        # Importing the CLI app pulls in every command module
+        from fli.cli.main import app  # noqa: F401
+
+    async def start(self) -> None:
+        """Bind the listening socket."""
+        self._stopped = asyncio.Event()
+        transport, target = parse_address(self.address)
+        if transport == "unix":
+            if os.path.exists(target):
+                if DaemonClient(self.address).is_running():
+                    raise RuntimeError(f"A daemon is already running at {target}")
+                os.unlink(target)
+            os.makedirs(os.path.dirname(target) or ".", mode=0o700, exist_ok=True)
+            self._server = await asyncio.start_unix_server(self._handle, path=target)
+            os.chmod(target, 0o600)
+        else:
+            host, port = target
+            self._server = await asyncio.start_server(self._handle, host=host, port=port)
+
+    async def serve_forever(self) -> None:
+        """Serve until ``/shutdown`` is requested or the task is cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening, remove the socket file and shut down the workers."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            transport, target = parse_address(self.address)
+            if transport == "unix" and os.path.exists(target):
+                os.unlink(target)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read one HTTP/1.1 request, dispatch it and write the JSON response."""
+        try:
+            try:
+                method, target, body = await self._read_request(reader)
+                status, payload = 200, await self.dispatch(method, target, body)
+            except DaemonError as e:
+                status, payload = e.status, {"error": str(e)}
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                status, payload = 400, {"error": str(e) or "Malformed request"}
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+
+            if isinstance(payload, str):
+                data, content_type = payload.encode(), "text/plain; version=0.0.4"
+            else:
+                data, content_type = dumps(payload).encode(), "application/json"
+            head = (
+                f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1") + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+        """Parse the request line, headers and body."""
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, body
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> dict | str:
+        """Route a request to its handler.
+
+        Args:
+            method: HTTP method
+            target: Request target (path and query string)
+            body: Raw request body
+
+        Returns:
+            JSON-compatible response payload, or text for ``/metrics``
+
+        Raises:
+            DaemonError: For unknown routes or invalid requests
+
+        """
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        payload = _json_body(body) if method == "POST" else {}
+
+        if path == "/health" and method == "GET":
+            return self.health()
+        if path == "/metrics" and method == "GET":
+            return render_metrics()
+        if path == "/search" and method == "POST":
+            return await self.search(payload)
+        if path == "/airports" and method == "GET":
+            return {"results": self.airports(query)}
+        if path == "/airports/resolve" and method == "POST":
+            return self.resolve_airports(payload)
+        if path.startswith("/airports/") and method == "GET":
+            language = _language(query.get("language", "en"))
+            airport = airport_search_api.get_airport_by_code(path.rsplit("/", 1)[1], language)
+            if airport is None:
+                raise DaemonError(404, "Airport not found")
+            return airport
+        if path == "/cli" and method == "POST":
+            return await self.cli(payload)
+        if path == "/shutdown" and method == "POST":
+            asyncio.get_running_loop().call_soon(self._stopped.set)
+            return {"status": "stopping"}
+        if path in (
+            "/health",
+            "/metrics",
+            "/search",
+            "/airports",
+            "/airports/resolve",
+            "/cli",
+            "/shutdown",
+        ):
+            raise DaemonError(405, f"{method} not allowed for {path}")
+        raise DaemonError(404, f"Unknown path: {path}")
+
+    def health(self) -> dict:
+        """Get liveness information and cache statistics."""
+        stats = self.runner.cache.stats
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "inflight": len(self._inflight),
+            "cache": {
+                "entries": len(self.runner.cache),
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "stale_hits": stats.stale_hits,
+                "hit_ratio": round(stats.hit_ratio, 4),
+            },
+        }
+
+    async def search(self, spec: dict) -> dict:
+        """Run a query spec, sharing the result with identical in-flight requests."""
+        normalized = normalize_query(spec)
+        key = dumps({k: v for k, v in sorted(normalized.items()) if k != "id"})
+        record = dict(await self._coalesce(key, self.runner.run_query, 0, normalized))
+        record.pop("index", None)
+        if "id" in normalized:
+            record["id"] = normalized["id"]
+        return record
+
+    async def cli(self, payload: dict) -> dict:
+        """Run a forwarded CLI invocation, sharing the output with identical in-flight ones."""
+        key = dumps({"cli": dict(sorted(payload.items()))})
+        return dict(await self._coalesce(key, self.run_cli, payload))
+
+    async def _coalesce(self, key: str, func, *args):
+        """Run a blocking call on the workers unless an identical one is already in flight."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run_in_executor(func, *args))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def airports(self, query: dict) -> list[dict]:
+        """Search the warm airport index."""
+        if not query.get("q"):
+            raise DaemonError(400, "Missing query parameter: q")
+        try:
+            limit = int(query.get("limit", 10))
+        except ValueError as e:
+            raise DaemonError(400, "limit must be an integer") from e
+        return airport_search_api.search_airports(
+            query["q"], _language(query.get("language", "en")), limit
+        )
+
+    def resolve_airports(self, payload: dict) -> dict:
+        """Search a batch of queries and resolve a batch of codes in one index pass.
+
+        Args:
+            payload: ``queries`` and/or ``codes`` lists plus optional ``language`` and
+                ``limit``
+
+        Returns:
+            Dictionary with ``results`` (matches per query) and ``codes`` (airport or null
+            per code)
+
+        """
+        queries, codes = payload.get("queries", []), payload.get("codes", [])
+        if not isinstance(queries, list) or not isinstance(codes, list):
+            raise DaemonError(400, "queries and codes must be lists")
+        try:
+            limit = int(payload.get("limit", 10))
+        except (TypeError, ValueError) as e:
+            raise DaemonError(400, "limit must be an integer") from e
+        language = _language(str(payload.get("language", "en")))
+        matches = airport_search_api.search_many(map(str, queries), language, limit)
+        resolved = airport_search_api.resolve_codes(map(str, codes), language)
+        return {
+            "results": {
+                query: [match.to_dict() for match in found] for query, found in matches.items()
+            },
+            "codes": {
+                code: match.to_dict() if match is not None else None
+                for code, match in resolved.items()
+            },
+        }
+
+    def run_cli(self, payload: dict) -> dict:
+        """Run a forwarded CLI invocation and capture its output.
+
+        The command runs with the runner as its click context object, so it uses the
+        daemon's shared searchers and result cache. Its console and stdout/stderr output
+        is captured per invocation, so forwarded commands run concurrently.
+
+        Args:
+            payload: ``argv`` plus the caller's terminal ``width`` and ``color`` support
+
+        Returns:
+            Dictionary with ``exit_code``, ``stdout`` and ``stderr``
+
+        """
+        from fli.cli.console import capture_output
+        from fli.cli.main import app
+
+        argv = payload.get("argv")
+        if not isinstance(argv, list) or not argv or argv[0] not in ("search", "cheap"):
+            raise DaemonError(400, "argv must start with 'search' or 'cheap'")
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with capture_output(
+            stdout,
+            stderr,
+            width=int(payload.get("width") or 100),
+            force_terminal=bool(payload.get("color")),
+            color_system="auto" if payload.get("color") else None,
+        ):
+            exit_code = _invoke(app, [str(arg) for arg in argv], self.runner)
+        return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    async def _run_in_executor(self, func, *args):
+        """Run a blocking call on the daemon's worker threads."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+
+def _invoke(app, argv: list[str], obj=None) -> int:
+    """Run the typer app without letting it exit the process."""
+    try:
+        result = app(args=argv, prog_name="fli", standalone_mode=False, obj=obj)
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        return 1
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+def _json_body(body: bytes) -> dict:
+    """Decode a JSON object request body."""
+    if not body:
+        return {}
+    payload = json.loads(body)
+    if not isinstance(payload, dict):
+        raise DaemonError(400, "Request body must be a JSON object")
+    return payload
+
+
+def _language(value: str) -> Language:
+    """Map a language option to the Language enum."""
+    return Language.CHINESE if value.lower() in ("zh", "zh-cn", "chinese") else Language.ENGLISH
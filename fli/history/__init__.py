@@ -0,0 +1,10 @@
+from .archive import ResultArchive
+from .price_history import PriceHistory, PriceObservation, PriceStats, route_key
+
+__all__ = [
+    "PriceHistory",
+    "PriceObservation",
+    "PriceStats",
+    "ResultArchive",
+    "route_key",
+]
@@ -0,0 +1,431 @@
+"""Memory-mapped archive of flight search snapshots.
+
+``PriceHistory`` keeps one price per observation; the archive keeps every result of every
+search, for analytics over months of snapshots. A snapshot is the results of one search
+(a ``FlightTable`` or a list of ``FlightResult`` items) for a route and travel date,
+observed at a point in time.
+
+An archive is a directory of fixed-width record files that are appended to and read back
+with ``numpy.memmap``, so scans touch the pages they need and build no Python objects:
+
+- ``index.bin``: one ``INDEX_DTYPE`` row per snapshot (route, travel and return day,
+  observation time, and the snapshot's range of flight rows)
+- ``flights.bin``: one ``FLIGHT_DTYPE`` row per flight
+- ``legs.bin``: one ``LEG_DTYPE`` row per leg, with airline, flight number and airport
+  codes stored as ids into the string table
+- ``strings.json``: the string table (codes and route keys, each stored once)
+- ``meta.json``: the format version
+
+Days are counted from the Unix epoch and observation times are epoch seconds, treating
+naive datetimes as UTC (as in ``PriceHistory``). Leg times keep the local wall-clock
+epoch of ``fli.models.compact``.
+
+The index row is written last, so a crash mid-append leaves orphan flight and leg rows
+that no snapshot refers to rather than a corrupt snapshot. Only one process may append to
+an archive at a time; any number may read it.
+
+Example:
+    >>> with ResultArchive("archive", writable=True) as archive:
+    ...     archive.append(results, observed_at=datetime.now(UTC))
+    >>> archive = ResultArchive("archive")
+    >>> observed, prices = archive.cheapest("JFK-LHR", date(2025, 6, 1))
+
+"""
+
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from fli.history.price_history import _from_day, _from_epoch, _to_day, _to_epoch, route_key
+from fli.models import FlightResult
+from fli.models.columnar import FLIGHT_DTYPE as TABLE_FLIGHT_DTYPE
+from fli.models.columnar import LEG_DTYPE as TABLE_LEG_DTYPE
+from fli.models.columnar import FlightTable
+
+FORMAT_VERSION = 1
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("route", "<u4"),
+        ("travel_day", "<i4"),
+        ("return_day", "<i4"),  # 0 for one-way searches
+        ("observed_at", "<i8"),
+        ("first_flight", "<i8"),
+        ("flight_count", "<i4"),
+    ]
+)
+
+FLIGHT_DTYPE = np.dtype(
+    [
+        ("item", "<i4"),  # result item within the snapshot
+        ("price", "<f8"),
+        ("duration", "<i4"),
+        ("stops", "<i2"),
+        ("leg_count", "<i2"),
+        ("first_leg", "<i8"),
+    ]
+)
+
+LEG_DTYPE = np.dtype(
+    [
+        ("airline", "<u4"),
+        ("flight_number", "<u4"),
+        ("departure_airport", "<u4"),
+        ("arrival_airport", "<u4"),
+        ("departure_time", "<i8"),
+        ("arrival_time", "<i8"),
+        ("duration", "<i4"),
+    ]
+)
+
+_FILES = {"index": INDEX_DTYPE, "flights": FLIGHT_DTYPE, "legs": LEG_DTYPE}
+_STRING_COLUMNS = ("airline", "flight_number", "departure_airport", "arrival_airport")
+_DAY = 86400
+
+
+class ResultArchive:
+    """Append-only, memory-mapped store of flight search snapshots."""
+
+    def __init__(self, path: str | Path, writable: bool = False):
+        """Open an archive, creating it when opened for writing.
+
+        Args:
+            path: Archive directory
+            writable: Allow appending (creates the directory if needed)
+
+        Raises:
+            FileNotFoundError: If a read-only archive does not exist
+            ValueError: If the archive was written by an unsupported format version
+
+        """
+        self.path = Path(path)
+        self.writable = writable
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            if not writable:
+                raise FileNotFoundError(f"No result archive at {self.path}")
+            self.path.mkdir(parents=True, exist_ok=True)
+            meta_path.write_text(json.dumps({"version": FORMAT_VERSION}))
+        version = json.loads(meta_path.read_text()).get("version")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported result archive version: {version}")
+
+        self._maps: dict[str, np.ndarray] = {}
+        self._order: np.ndarray | None = None
+        self._keys: np.ndarray | None = None
+        self._lock = threading.Lock()
+        self._load_strings()
+
+    def _load_strings(self) -> None:
+        """Read the string table from disk."""
+        strings_path = self.path / "strings.json"
+        self._strings: list[str] = (
+            json.loads(strings_path.read_text()) if strings_path.exists() else []
+        )
+        self._string_ids = {value: number for number, value in enumerate(self._strings)}
+        self._strings_array: np.ndarray | None = None
+
+    def __enter__(self) -> "ResultArchive":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Release the memory maps on context exit."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of snapshots."""
+        return len(self.index)
+
+    def close(self) -> None:
+        """Release the memory maps (views handed out earlier stay valid)."""
+        self._maps.clear()
+        self._order = self._keys = None
+
+    def refresh(self) -> None:
+        """Pick up snapshots appended by another process since the archive was opened."""
+        self.close()
+        self._load_strings()
+
+    def _map(self, name: str) -> np.ndarray:
+        """Get the memory-mapped records of one file (an empty array if there are none)."""
+        records = self._maps.get(name)
+        if records is None:
+            dtype = _FILES[name]
+            file = self.path / f"{name}.bin"
+            count = file.stat().st_size // dtype.itemsize if file.exists() else 0
+            # Ignore a partial trailing record left by an interrupted append
+            records = (
+                np.memmap(file, dtype=dtype, mode="r", shape=(count,))
+                if count
+                else np.empty(0, dtype)
+            )
+            self._maps[name] = records
+        return records
+
+    @property
+    def index(self) -> np.ndarray:
+        """Get the snapshot index, one ``INDEX_DTYPE`` row per snapshot in append order."""
+        return self._map("index")
+
+    @property
+    def flight_records(self) -> np.ndarray:
+        """Get every flight row of the archive."""
+        return self._map("flights")
+
+    @property
+    def leg_records(self) -> np.ndarray:
+        """Get every leg row of the archive."""
+        return self._map("legs")
+
+    @property
+    def strings(self) -> list[str]:
+        """Get the string table that leg and route ids refer to."""
+        return self._strings
+
+    def _string_array(self) -> np.ndarray:
+        """Get the string table as an array, for decoding ids in bulk."""
+        if self._strings_array is None or len(self._strings_array) != len(self._strings):
+            self._strings_array = np.array(self._strings)
+        return self._strings_array
+
+    def _string_id(self, value: str) -> int:
+        """Get the id of a string, adding it to the table if it is new."""
+        number = self._string_ids.get(value)
+        if number is None:
+            number = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return number
+
+    def _encode(self, values: np.ndarray) -> np.ndarray:
+        """Replace an array of strings with their string table ids."""
+        unique, inverse = np.unique(values, return_inverse=True)
+        ids = np.array([self._string_id(str(value)) for value in unique], dtype="<u4")
+        return ids[inverse] if len(values) else np.empty(0, "<u4")
+
+    def append(
+        self,
+        results: FlightTable | list[FlightResult | tuple[FlightResult, ...]] | None,
+        route: str | None = None,
+        travel_date: date | None = None,
+        return_date: date | None = None,
+        observed_at: datetime | None = None,
+    ) -> int:
+        """Append the results of one search as a snapshot.
+
+        The route and dates default to those of the first result: the first flight's
+        origin and destination, its departure day and, for round-trip pairs, the return
+        flight's departure day.
+
+        Args:
+            results: Search results, or a ``FlightTable`` of them
+            route: Route key (see ``route_key``)
+            travel_date: Outbound travel date
+            return_date: Return date for round-trip searches
+            observed_at: Observation time, defaults to now
+
+        Returns:
+            Number of the new snapshot
+
+        Raises:
+            PermissionError: If the archive was opened read-only
+            ValueError: If the results are empty and the route or travel date is missing
+
+        """
+        if not self.writable:
+            raise PermissionError("Result archive is opened read-only")
+        table = results if isinstance(results, FlightTable) else FlightTable.from_results(results)
+        if len(table):
+            first = table.flights[0]
+            first_leg = table.legs[first["first_leg"]]
+            last_leg = table.legs[first["first_leg"] + first["leg_count"] - 1]
+            route = route or route_key(
+                str(first_leg["departure_airport"]), str(last_leg["arrival_airport"])
+            )
+            travel_day = _to_day(travel_date) or int(first_leg["departure_time"]) // _DAY
+            pair = table.flights[table.flights["item"] == 0]
+            return_day = _to_day(return_date)
+            if not return_day and len(pair) == 2:
+                return_day = int(table.legs[pair[1]["first_leg"]]["departure_time"]) // _DAY
+        elif route is None or travel_date is None:
+            raise ValueError("Empty results need an explicit route and travel date")
+        else:
+            travel_day, return_day = _to_day(travel_date), _to_day(return_date)
+
+        with self._lock:
+            snapshot = len(self.index)
+            first_leg_row = len(self.leg_records)
+            first_flight_row = len(self.flight_records)
+
+            legs = np.empty(len(table.legs), LEG_DTYPE)
+            for column in _STRING_COLUMNS:
+                legs[column] = self._encode(table.legs[column])
+            for column in ("departure_time", "arrival_time", "duration"):
+                legs[column] = table.legs[column]
+
+            flights = np.empty(len(table.flights), FLIGHT_DTYPE)
+            for column in TABLE_FLIGHT_DTYPE.names:
+                flights[column] = table.flights[column]
+            flights["first_leg"] += first_leg_row
+
+            entry = np.array(
+                [
+                    (
+                        self._string_id(route),
+                        travel_day,
+                        return_day,
+                        _to_epoch(observed_at),
+                        first_flight_row,
+                        len(flights),
+                    )
+                ],
+                INDEX_DTYPE,
+            )
+
+            self._write("legs", legs)
+            self._write("flights", flights)
+            strings_path = self.path / "strings.json"
+            temporary = strings_path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(self._strings))
+            os.replace(temporary, strings_path)
+            self._write("index", entry)
+            self.close()
+            return snapshot
+
+    def _write(self, name: str, records: np.ndarray) -> None:
+        """Append records to a file, first dropping a partial trailing record."""
+        file = self.path / f"{name}.bin"
+        with open(file, "ab") as handle:
+            size = handle.tell()
+            extra = size % records.dtype.itemsize
+            if extra:
+                handle.truncate(size - extra)
+            handle.write(records.tobytes())
+
+    def _sorted_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the snapshot order by (route, travel day, observed_at) and its sorted keys."""
+        if self._order is None:
+            index = self.index
+            keys = (index["route"].astype(np.int64) << 32) | index["travel_day"].astype(np.int64)
+            self._order = np.lexsort((index["observed_at"], keys))
+            self._keys = keys[self._order]
+        return self._order, self._keys
+
+    def find(
+        self,
+        route: str,
+        travel_date: date | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> np.ndarray:
+        """Find snapshots by route, travel date and observation time.
+
+        Args:
+            route: Route key
+            travel_date: Outbound travel date (all dates if None)
+            since: Only include snapshots observed at or after this time
+            until: Only include snapshots observed before this time
+
+        Returns:
+            Snapshot numbers ordered by travel date, then observation time
+
+        """
+        route_id = self._string_ids.get(route)
+        if route_id is None:
+            return np.empty(0, np.int64)
+        order, keys = self._sorted_index()
+        if travel_date is None:
+            low, high = route_id << 32, (route_id + 1) << 32
+        else:
+            low = (route_id << 32) | _to_day(travel_date)
+            high = low + 1
+        start, stop = np.searchsorted(keys, [low, high])
+        snapshots = order[start:stop]
+        if since is not None or until is not None:
+            observed = self.index["observed_at"][snapshots]
+            mask = np.ones(len(snapshots), dtype=bool)
+            if since is not None:
+                mask &= observed >= _to_epoch(since)
+            if until is not None:
+                mask &= observed < _to_epoch(until)
+            snapshots = snapshots[mask]
+        return snapshots
+
+    def snapshot_info(self, snapshot: int) -> tuple[str, date, date | None, datetime]:
+        """Get the route, travel date, return date and observation time of a snapshot."""
+        entry = self.index[snapshot]
+        return (
+            self._strings[entry["route"]],
+            _from_day(int(entry["travel_day"])),
+            _from_day(int(entry["return_day"])),
+            _from_epoch(int(entry["observed_at"])),
+        )
+
+    def flights(self, snapshot: int) -> np.ndarray:
+        """Get the flight rows of a snapshot as a view of the memory map."""
+        entry = self.index[snapshot]
+        start = int(entry["first_flight"])
+        return self.flight_records[start : start + int(entry["flight_count"])]
+
+    def item_prices(self, snapshot: int) -> np.ndarray:
+        """Get the total price of each result item of a snapshot."""
+        flights = self.flights(snapshot)
+        return np.bincount(flights["item"], weights=flights["price"])
+
+    def table(self, snapshot: int) -> FlightTable:
+        """Decode a snapshot into a ``FlightTable`` with plain string codes."""
+        flights = self.flights(snapshot)
+        if not len(flights):
+            return FlightTable(np.empty(0, TABLE_FLIGHT_DTYPE), np.empty(0, TABLE_LEG_DTYPE))
+        first_leg = int(flights["first_leg"][0])
+        last = flights[-1]
+        stored = self.leg_records[first_leg : int(last["first_leg"] + last["leg_count"])]
+
+        strings = self._string_array()
+        legs = np.empty(len(stored), TABLE_LEG_DTYPE)
+        for column in _STRING_COLUMNS:
+            legs[column] = strings[stored[column]]
+        for column in ("departure_time", "arrival_time", "duration"):
+            legs[column] = stored[column]
+
+        table_flights = np.empty(len(flights), TABLE_FLIGHT_DTYPE)
+        for column in TABLE_FLIGHT_DTYPE.names:
+            table_flights[column] = flights[column] - (first_leg if column == "first_leg" else 0)
+        return FlightTable(table_flights, legs)
+
+    def results(self, snapshot: int) -> list[FlightResult | tuple[FlightResult, ...]]:
+        """Decode a snapshot back into ``FlightResult`` models."""
+        return self.table(snapshot).to_models()
+
+    def cheapest(
+        self,
+        route: str,
+        travel_date: date,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get the cheapest item price of each snapshot of a route and travel date.
+
+        Args:
+            route: Route key
+            travel_date: Outbound travel date
+            since: Only include snapshots observed at or after this time
+            until: Only include snapshots observed before this time
+
+        Returns:
+            Observation times (``datetime64[s]``, UTC) and cheapest prices, in time order;
+            snapshots without results are skipped
+
+        """
+        snapshots = [
+            snapshot
+            for snapshot in self.find(route, travel_date, since, until)
+            if self.index[snapshot]["flight_count"]
+        ]
+        observed = self.index["observed_at"][snapshots].astype("datetime64[s]")
+        prices = np.array([self.item_prices(snapshot).min() for snapshot in snapshots])
+        return observed, prices.astype(np.float64)
@@ -0,0 +1,471 @@
+"""Persistent fare history backed by SQLite.
+
+Observations are stored per *series*, one series being a unique
+(route, travel date, return date, cabin, provider) combination. The series table holds
+the strings and the base timestamp once; each observation row then only carries three
+small integers, which SQLite stores as 1-4 byte varints:
+
+- the series id
+- ``observed_at`` delta-encoded as seconds since the series' first observation
+- the price in minor currency units (cents)
+
+Observations live in a ``WITHOUT ROWID`` table clustered on ``(series_id, observed_offset)``
+so "last N days for this route/date" queries are a single index range scan.
+"""
+
+import sqlite3
+import statistics
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from fli.models import Airport, FlightResult, SeatType
+
+_EPOCH = date(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    route TEXT NOT NULL,
+    travel_day INTEGER NOT NULL,
+    return_day INTEGER NOT NULL,
+    cabin INTEGER NOT NULL,
+    provider TEXT NOT NULL,
+    base_time INTEGER NOT NULL,
+    UNIQUE (route, travel_day, return_day, cabin, provider)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    series_id INTEGER NOT NULL REFERENCES series (id),
+    observed_offset INTEGER NOT NULL,
+    price_cents INTEGER NOT NULL,
+    PRIMARY KEY (series_id, observed_offset)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class PriceObservation:
+    """A single observed fare."""
+
+    route: str
+    travel_date: date
+    price: float
+    observed_at: datetime
+    cabin: SeatType = SeatType.ECONOMY
+    provider: str = "google"
+    return_date: date | None = None
+
+
+@dataclass
+class PriceStats:
+    """Aggregate fare statistics for a route and travel date over a time window."""
+
+    count: int
+    min: float
+    median: float
+    latest: float
+    last_observed_at: datetime
+
+
+def route_key(origin: Airport | str, destination: Airport | str) -> str:
+    """Build the route key used by the history store (e.g., ``"JFK-LHR"``).
+
+    Args:
+        origin: Origin airport enum or IATA code
+        destination: Destination airport enum or IATA code
+
+    Returns:
+        Route key string
+
+    """
+    origin_code = origin.name if isinstance(origin, Airport) else origin.upper()
+    destination_code = destination.name if isinstance(destination, Airport) else destination.upper()
+    return f"{origin_code}-{destination_code}"
+
+
+def _to_day(value: date | datetime | None) -> int:
+    """Encode a date as days since the Unix epoch (0 means no date)."""
+    if value is None:
+        return 0
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH).days
+
+
+def _from_day(day: int) -> date | None:
+    """Decode days since the Unix epoch back into a date."""
+    return _EPOCH + timedelta(days=day) if day else None
+
+
+def _to_epoch(value: datetime | None) -> int:
+    """Encode a datetime as epoch seconds, treating naive datetimes as UTC."""
+    if value is None:
+        value = datetime.now(UTC)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+def _from_epoch(seconds: int) -> datetime:
+    """Decode epoch seconds into an aware UTC datetime."""
+    return datetime.fromtimestamp(seconds, UTC)
+
+
+class PriceHistory:
+    """Append-only fare history store with indexed range queries.
+
+    The store is safe to share between threads; writes are serialized on an internal lock.
+
+    Example:
+        >>> history = PriceHistory("fares.db")
+        >>> history.record_dates(SearchDates().search(filters), Airport.JFK, Airport.LHR)
+        >>> history.stats("JFK-LHR", date(2025, 6, 1), days=7).min
+
+    """
+
+    def __init__(self, path: str | Path = ":memory:"):
+        """Open (and create if needed) a history database.
+
+        Args:
+            path: SQLite database path, ``":memory:"`` for a transient store
+
+        """
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._series_cache: dict[tuple, tuple[int, int]] = {}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "PriceHistory":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the database on context exit."""
+        self.close()
+
+    def _series(self, key: tuple, observed_at: int) -> tuple[int, int]:
+        """Get or create the series for a key, returning (series_id, base_time)."""
+        series = self._series_cache.get(key)
+        if series is not None:
+            return series
+
+        row = self._conn.execute(
+            "SELECT id, base_time FROM series WHERE route = ? AND travel_day = ? "
+            "AND return_day = ? AND cabin = ? AND provider = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO series (route, travel_day, return_day, cabin, provider, base_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, observed_at),
+            )
+            row = (cursor.lastrowid, observed_at)
+
+        self._series_cache[key] = row
+        return row
+
+    def record_many(self, observations: Iterable[PriceObservation]) -> int:
+        """Append many observations in a single transaction.
+
+        Repeated observations of the same series at the same second keep the latest price.
+
+        Args:
+            observations: Observations to store
+
+        Returns:
+            Number of observations written
+
+        """
+        with self._lock:
+            try:
+                with self._conn:
+                    rows = []
+                    for obs in observations:
+                        observed_at = _to_epoch(obs.observed_at)
+                        key = (
+                            obs.route,
+                            _to_day(obs.travel_date),
+                            _to_day(obs.return_date),
+                            obs.cabin.value,
+                            obs.provider,
+                        )
+                        series_id, base_time = self._series(key, observed_at)
+                        rows.append((series_id, observed_at - base_time, round(obs.price * 100)))
+
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO observations "
+                        "(series_id, observed_offset, price_cents) VALUES (?, ?, ?)",
+                        rows,
+                    )
+            except Exception:
+                # Series created in the rolled-back transaction must not stay cached
+                self._series_cache.clear()
+                raise
+        return len(rows)
+
+    def record(
+        self,
+        route: str,
+        travel_date: date,
+        price: float,
+        cabin: SeatType = SeatType.ECONOMY,
+        provider: str = "google",
+        observed_at: datetime | None = None,
+        return_date: date | None = None,
+    ) -> None:
+        """Append a single observation.
+
+        Args:
+            route: Route key (see ``route_key``)
+            travel_date: Outbound travel date
+            price: Observed price
+            cabin: Cabin class
+            provider: Data source name (e.g., "google", "kiwi")
+            observed_at: Observation time, defaults to now
+            return_date: Return date for round-trip fares
+
+        """
+        self.record_many(
+            [
+                PriceObservation(
+                    route=route,
+                    travel_date=travel_date,
+                    price=price,
+                    observed_at=observed_at,
+                    cabin=cabin,
+                    provider=provider,
+                    return_date=return_date,
+                )
+            ]
+        )
+
+    def record_dates(
+        self,
+        results: Iterable,
+        origin: Airport | str,
+        destination: Airport | str,
+        cabin: SeatType = SeatType.ECONOMY,
+        provider: str = "google",
+        observed_at: datetime | None = None,
+    ) -> int:
+        """Bulk-append calendar prices returned by ``SearchDates.search``.
+
+        Args:
+            results: DatePrice objects (``None`` is treated as empty)
+            origin: Origin airport
+            destination: Destination airport
+            cabin: Cabin class the search was made for
+            provider: Data source name
+            observed_at: Observation time shared by the batch, defaults to now
+
+        Returns:
+            Number of observations written
+
+        """
+        route = route_key(origin, destination)
+        observed_at = observed_at or datetime.now(UTC)
+        return self.record_many(
+            PriceObservation(
+                route=route,
+                travel_date=date_price.date[0],
+                return_date=date_price.date[1] if len(date_price.date) > 1 else None,
+                price=date_price.price,
+                observed_at=observed_at,
+                cabin=cabin,
+                provider=provider,
+            )
+            for date_price in results or []
+        )
+
+    def record_flights(
+        self,
+        results: Iterable[FlightResult | tuple[FlightResult, FlightResult]],
+        cabin: SeatType = SeatType.ECONOMY,
+        provider: str = "google",
+        observed_at: datetime | None = None,
+    ) -> int:
+        """Append the cheapest fare per route and date from flight search results.
+
+        Round-trip pairs are recorded as one fare (outbound + return price) keyed by both
+        travel dates. Results without legs are skipped.
+
+        Args:
+            results: Results returned by ``SearchFlights.search`` or ``SearchKiwiFlights.search``
+            cabin: Cabin class the search was made for
+            provider: Data source name
+            observed_at: Observation time shared by the batch, defaults to now
+
+        Returns:
+            Number of observations written
+
+        """
+        cheapest: dict[tuple, float] = {}
+        for result in results or []:
+            outbound, inbound = result if isinstance(result, tuple) else (result, None)
+            if not outbound.legs or (inbound is not None and not inbound.legs):
+                continue
+
+            price = outbound.price + (inbound.price if inbound is not None else 0)
+            key = (
+                route_key(outbound.legs[0].departure_airport, outbound.legs[-1].arrival_airport),
+                outbound.legs[0].departure_datetime.date(),
+                inbound.legs[0].departure_datetime.date() if inbound is not None else None,
+            )
+            if key not in cheapest or price < cheapest[key]:
+                cheapest[key] = price
+
+        observed_at = observed_at or datetime.now(UTC)
+        return self.record_many(
+            PriceObservation(
+                route=route,
+                travel_date=travel_date,
+                return_date=return_date,
+                price=price,
+                observed_at=observed_at,
+                cabin=cabin,
+                provider=provider,
+            )
+            for (route, travel_date, return_date), price in cheapest.items()
+        )
+
+    def _select(
+        self,
+        route: str,
+        travel_date: date | None,
+        since: datetime | None,
+        cabin: SeatType | None,
+        provider: str | None,
+        return_date: date | None,
+    ) -> list[tuple[int, int, int, int]]:
+        """Fetch (travel_day, return_day, observed_at, price_cents) rows ordered by time."""
+        clauses = ["s.route = ?"]
+        params: list = [route]
+        if travel_date is not None:
+            clauses.append("s.travel_day = ?")
+            params.append(_to_day(travel_date))
+            if return_date is not None:
+                clauses.append("s.return_day = ?")
+                params.append(_to_day(return_date))
+        if cabin is not None:
+            clauses.append("s.cabin = ?")
+            params.append(cabin.value)
+        if provider is not None:
+            clauses.append("s.provider = ?")
+            params.append(provider)
+
+        # The offset bound keeps the scan on the (series_id, observed_offset) primary key
+        since_clause = ""
+        if since is not None:
+            since_clause = "AND o.observed_offset >= ? - s.base_time"
+            params.append(_to_epoch(since))
+
+        query = (
+            "SELECT s.travel_day, s.return_day, s.base_time + o.observed_offset, o.price_cents "
+            "FROM series s JOIN observations o ON o.series_id = s.id "
+            f"WHERE {' AND '.join(clauses)} {since_clause} "
+            "ORDER BY s.base_time + o.observed_offset"
+        )
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def history(
+        self,
+        route: str,
+        travel_date: date,
+        since: datetime | None = None,
+        cabin: SeatType | None = None,
+        provider: str | None = None,
+        return_date: date | None = None,
+    ) -> list[tuple[datetime, float]]:
+        """Get the observed price series for a route and travel date.
+
+        Args:
+            route: Route key
+            travel_date: Outbound travel date
+            since: Only include observations at or after this time
+            cabin: Restrict to a cabin class (all cabins if None)
+            provider: Restrict to a provider (all providers if None)
+            return_date: Restrict to a return date (all if None)
+
+        Returns:
+            List of (observed_at, price) tuples ordered by observation time
+
+        """
+        rows = self._select(route, travel_date, since, cabin, provider, return_date)
+        return [(_from_epoch(observed), cents / 100) for _, _, observed, cents in rows]
+
+    def stats(
+        self,
+        route: str,
+        travel_date: date,
+        days: int = 30,
+        cabin: SeatType | None = None,
+        provider: str | None = None,
+        return_date: date | None = None,
+    ) -> PriceStats | None:
+        """Get min/median/latest fare for a route and travel date over the last N days.
+
+        Args:
+            route: Route key
+            travel_date: Outbound travel date
+            days: Size of the look-back window in days
+            cabin: Restrict to a cabin class (all cabins if None)
+            provider: Restrict to a provider (all providers if None)
+            return_date: Restrict to a return date (all if None)
+
+        Returns:
+            PriceStats, or None if there are no observations in the window
+
+        """
+        since = datetime.now(UTC) - timedelta(days=days)
+        rows = self._select(route, travel_date, since, cabin, provider, return_date)
+        return self._aggregate(rows)
+
+    def route_stats(
+        self,
+        route: str,
+        days: int = 30,
+        cabin: SeatType | None = None,
+        provider: str | None = None,
+    ) -> dict[tuple[date, date | None], PriceStats]:
+        """Get fare statistics for every travel date observed on a route.
+
+        Args:
+            route: Route key
+            days: Size of the look-back window in days
+            cabin: Restrict to a cabin class (all cabins if None)
+            provider: Restrict to a provider (all providers if None)
+
+        Returns:
+            Mapping of (travel_date, return_date) to PriceStats
+
+        """
+        since = datetime.now(UTC) - timedelta(days=days)
+        grouped: dict[tuple[int, int], list] = {}
+        for row in self._select(route, None, since, cabin, provider, None):
+            grouped.setdefault((row[0], row[1]), []).append(row)
+        return {
+            (_from_day(travel_day), _from_day(return_day)): self._aggregate(rows)
+            for (travel_day, return_day), rows in sorted(grouped.items())
+        }
+
+    @staticmethod
+    def _aggregate(rows: list[tuple[int, int, int, int]]) -> PriceStats | None:
+        """Reduce time-ordered rows to PriceStats."""
+        if not rows:
+            return None
+        prices = [row[3] for row in rows]
+        return PriceStats(
+            count=len(prices),
+            min=min(prices) / 100,
+            median=statistics.median(prices) / 100,
+            latest=prices[-1] / 100,
+            last_observed_at=_from_epoch(rows[-1][2]),
+        )
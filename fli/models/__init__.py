@@ -1,5 +1,7 @@
 from .airline import Airline
 from .airport import Airport
+from .columnar import FlightTable
+from .compact import CompactLeg, CompactResult, HiddenCity, from_compact, to_compact
 from .google_flights import (
     DateSearchFilters,
     FlightLeg,
@@ -19,11 +21,15 @@ from .google_flights import (
 __all__ = [
     "Airline",
     "Airport",
+    "CompactLeg",
+    "CompactResult",
     "DateSearchFilters",
     "FlightLeg",
     "FlightResult",
     "FlightSearchFilters",
     "FlightSegment",
+    "FlightTable",
+    "HiddenCity",
     "LayoverRestrictions",
     "MaxStops",
     "PassengerInfo",
@@ -32,4 +38,6 @@ __all__ = [
     "SortBy",
     "TimeRestrictions",
     "TripType",
+    "from_compact",
+    "to_compact",
 ]
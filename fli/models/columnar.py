@@ -0,0 +1,173 @@
+"""Columnar flight results backed by NumPy structured arrays.
+
+A ``FlightTable`` stores search results (single flights, round-trip pairs or multi-city
+itineraries) as two flat arrays: one row per flight and one row per leg. The arrays hold
+only fixed-width codes and integers, so a table crosses a process boundary or goes to disk
+as a few contiguous buffers instead of a graph of pydantic models, and aggregate
+questions (cheapest item, price histogram) can be answered without building any model.
+
+Rows of ``flights`` that share an ``item`` number belong to the same result item, in leg
+order; ``first_leg``/``leg_count`` point into ``legs``. Times use the epoch-second
+convention of ``fli.models.compact``. Kiwi hidden-city details are not stored.
+
+Example:
+    >>> table = FlightTable.from_results(results)
+    >>> table.item_prices().argmin()
+    3
+    >>> table.to_models() == results
+    True
+
+"""
+
+import numpy as np
+
+from fli.models.compact import CompactItem, CompactLeg, CompactResult, ModelItem
+
+FLIGHT_DTYPE = np.dtype(
+    [
+        ("item", "<i4"),
+        ("price", "<f8"),
+        ("duration", "<i4"),
+        ("stops", "<i2"),
+        ("leg_count", "<i2"),
+        ("first_leg", "<i4"),
+    ]
+)
+
+# NumPy silently truncates longer strings, so from_results rejects them instead
+FLIGHT_NUMBER_WIDTH = 16
+
+LEG_DTYPE = np.dtype(
+    [
+        ("airline", "<U3"),
+        ("flight_number", f"<U{FLIGHT_NUMBER_WIDTH}"),
+        ("departure_airport", "<U3"),
+        ("arrival_airport", "<U3"),
+        ("departure_time", "<i8"),
+        ("arrival_time", "<i8"),
+        ("duration", "<i4"),
+    ]
+)
+
+
+class FlightTable:
+    """Search results as a flight array and a leg array."""
+
+    __slots__ = ("flights", "legs")
+
+    def __init__(self, flights: np.ndarray, legs: np.ndarray):
+        """Initialize the table from its arrays.
+
+        Args:
+            flights: Array of ``FLIGHT_DTYPE`` rows, grouped by consecutive ``item``
+            legs: Array of ``LEG_DTYPE`` rows referenced by the flights
+
+        """
+        self.flights = flights
+        self.legs = legs
+
+    @classmethod
+    def from_results(cls, results: list[ModelItem] | list[CompactItem] | None) -> "FlightTable":
+        """Build a table from search results, pydantic or compact.
+
+        Args:
+            results: Flights, round-trip pairs or itineraries as returned by a search
+
+        Returns:
+            Table with one item per result
+
+        Raises:
+            ValueError: If a flight number is longer than ``FLIGHT_NUMBER_WIDTH``
+
+        """
+        flight_rows = []
+        leg_rows = []
+        for item, result in enumerate(results or ()):
+            for flight in result if isinstance(result, tuple) else (result,):
+                if not isinstance(flight, CompactResult):
+                    flight = CompactResult.from_model(flight)
+                for leg in flight.legs:
+                    if len(leg.flight_number) > FLIGHT_NUMBER_WIDTH:
+                        raise ValueError(
+                            f"Flight number {leg.flight_number!r} is longer than "
+                            f"{FLIGHT_NUMBER_WIDTH} characters"
+                        )
+                flight_rows.append(
+                    (
+                        item,
+                        flight.price,
+                        flight.duration,
+                        flight.stops,
+                        len(flight.legs),
+                        len(leg_rows),
+                    )
+                )
+                leg_rows.extend(
+                    (
+                        leg.airline,
+                        leg.flight_number,
+                        leg.departure_airport,
+                        leg.arrival_airport,
+                        leg.departure_time,
+                        leg.arrival_time,
+                        leg.duration,
+                    )
+                    for leg in flight.legs
+                )
+        return cls(np.array(flight_rows, FLIGHT_DTYPE), np.array(leg_rows, LEG_DTYPE))
+
+    def __len__(self) -> int:
+        """Get the number of result items."""
+        return int(self.flights["item"][-1]) + 1 if len(self.flights) else 0
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two tables array by array."""
+        if not isinstance(other, FlightTable):
+            return NotImplemented
+        return np.array_equal(self.flights, other.flights) and np.array_equal(self.legs, other.legs)
+
+    def __repr__(self) -> str:
+        """Describe the table."""
+        return f"<FlightTable {len(self)} items, {len(self.flights)} flights>"
+
+    @property
+    def nbytes(self) -> int:
+        """Get the size of the arrays in bytes."""
+        return self.flights.nbytes + self.legs.nbytes
+
+    def item_prices(self) -> np.ndarray:
+        """Get the total price of each item (the sum of its flights' prices)."""
+        return np.bincount(self.flights["item"], weights=self.flights["price"], minlength=len(self))
+
+    def _compact_flight(self, row: np.void) -> CompactResult:
+        """Rebuild one flight row as a ``CompactResult``."""
+        start = int(row["first_leg"])
+        legs = tuple(
+            CompactLeg(
+                str(leg["airline"]),
+                str(leg["flight_number"]),
+                str(leg["departure_airport"]),
+                str(leg["arrival_airport"]),
+                int(leg["departure_time"]),
+                int(leg["arrival_time"]),
+                int(leg["duration"]),
+            )
+            for leg in self.legs[start : start + int(row["leg_count"])]
+        )
+        return CompactResult(legs, float(row["price"]), int(row["duration"]), int(row["stops"]))
+
+    def to_compact(self) -> list[CompactItem]:
+        """Rebuild the results as compact records, keeping pairs and itineraries as tuples."""
+        grouped: list[list[CompactResult]] = [[] for _ in range(len(self))]
+        for row in self.flights:
+            grouped[int(row["item"])].append(self._compact_flight(row))
+        return [flights[0] if len(flights) == 1 else tuple(flights) for flights in grouped]
+
+    def to_models(self) -> list[ModelItem]:
+        """Rebuild the results as pydantic models without re-validating them."""
+        return [
+            tuple(flight.to_model() for flight in item)
+            if isinstance(item, tuple)
+            else item.to_model()
+            for item in self.to_compact()
+        ]
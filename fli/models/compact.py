@@ -0,0 +1,225 @@
+"""Compact, immutable flight records for holding large numbers of results in memory.
+
+``FlightLeg`` and ``FlightResult`` are pydantic models: every instance carries a
+``__dict__``, validated enum members and ``datetime`` objects, and Kiwi results also hold a
+``route_segments`` copy of their legs. The slotted records here store the same data as
+interned IATA code strings and integer epoch seconds, which cuts the per-result footprint
+several times over for caches and sweeps that keep millions of results.
+
+Times are the naive local wall-clock times reported by the APIs, stored as seconds since
+``1970-01-01T00:00`` in that same wall clock; converting back yields the original values.
+
+Example:
+    >>> compact = CompactResult.from_model(result)
+    >>> compact.legs[0].departure_airport
+    'JFK'
+    >>> compact.to_model() == result
+    True
+
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from typing import Any
+
+from fli.models.airline import Airline
+from fli.models.airport import Airport
+from fli.models.google_flights.base import FlightLeg, FlightResult
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a datetime to integer epoch seconds (aware values are taken as UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return (value - _EPOCH) // _SECOND
+
+
+def from_epoch(seconds: int) -> datetime:
+    """Convert integer epoch seconds back to a naive datetime."""
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+@cache
+def _code(member: Airport | Airline) -> str:
+    """Get the interned IATA code of an airport or airline member."""
+    return sys.intern(member.name.lstrip("_"))
+
+
+@cache
+def _member(enum: type[Airport] | type[Airline], code: str) -> Airport | Airline:
+    """Look up an airport or airline member by IATA code."""
+    members = enum.__members__
+    member = members.get(code) or members.get(f"_{code}")
+    if member is None:
+        raise KeyError(f"Unknown {enum.__name__.lower()} code: {code}")
+    return member
+
+
+@dataclass(frozen=True, slots=True)
+class CompactLeg:
+    """Slotted counterpart of ``FlightLeg``."""
+
+    airline: str
+    flight_number: str
+    departure_airport: str
+    arrival_airport: str
+    departure_time: int  # epoch seconds, local wall clock
+    arrival_time: int  # epoch seconds, local wall clock
+    duration: int  # in minutes
+
+    @property
+    def departure_datetime(self) -> datetime:
+        """Get the departure time as a datetime."""
+        return from_epoch(self.departure_time)
+
+    @property
+    def arrival_datetime(self) -> datetime:
+        """Get the arrival time as a datetime."""
+        return from_epoch(self.arrival_time)
+
+    @classmethod
+    def from_model(cls, leg: FlightLeg) -> "CompactLeg":
+        """Create a compact leg from a ``FlightLeg``."""
+        return cls(
+            _code(leg.airline),
+            sys.intern(leg.flight_number),
+            _code(leg.departure_airport),
+            _code(leg.arrival_airport),
+            to_epoch(leg.departure_datetime),
+            to_epoch(leg.arrival_datetime),
+            leg.duration,
+        )
+
+    def to_model(self) -> FlightLeg:
+        """Create the equivalent ``FlightLeg`` without re-validating the data."""
+        return FlightLeg.model_construct(
+            airline=_member(Airline, self.airline),
+            flight_number=self.flight_number,
+            departure_airport=_member(Airport, self.departure_airport),
+            arrival_airport=_member(Airport, self.arrival_airport),
+            departure_datetime=from_epoch(self.departure_time),
+            arrival_datetime=from_epoch(self.arrival_time),
+            duration=self.duration,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class HiddenCity:
+    """Slotted form of a Kiwi ``hidden_city_info`` dictionary.
+
+    ``route_segments`` is not stored because it repeats the legs; it is rebuilt from them
+    when converting back.
+    """
+
+    is_hidden_city: bool
+    destination_code: str = ""
+    destination_name: str = ""
+    is_throwaway: bool | None = None  # one-way results only
+    direction: str | None = None  # round-trip results only
+    total_price: float | None = None  # round-trip results only
+
+    @classmethod
+    def from_info(cls, info: dict[str, Any]) -> "HiddenCity":
+        """Create the record from a ``hidden_city_info`` dictionary."""
+        direction = info.get("direction")
+        return cls(
+            bool(info.get("is_hidden_city")),
+            sys.intern(info.get("hidden_destination_code") or ""),
+            info.get("hidden_destination_name") or "",
+            info.get("is_throwaway"),
+            sys.intern(direction) if direction else None,
+            info.get("total_price"),
+        )
+
+    def to_info(self, legs: tuple[CompactLeg, ...]) -> dict[str, Any]:
+        """Rebuild the ``hidden_city_info`` dictionary, including ``route_segments``."""
+        info: dict[str, Any] = {
+            "is_hidden_city": self.is_hidden_city,
+            "hidden_destination_code": self.destination_code,
+            "hidden_destination_name": self.destination_name,
+        }
+        if self.is_throwaway is not None:
+            info["is_throwaway"] = self.is_throwaway
+        if self.direction is not None:
+            info["direction"] = self.direction
+        if self.total_price is not None:
+            info["total_price"] = self.total_price
+        info["route_segments"] = [
+            {
+                "from": leg.departure_airport,
+                "to": leg.arrival_airport,
+                "carrier": leg.airline,
+                "flight_number": leg.flight_number,
+                "departure_time": leg.departure_datetime.isoformat(),
+                "arrival_time": leg.arrival_datetime.isoformat(),
+                "duration": leg.duration * 60,
+            }
+            for leg in legs
+        ]
+        return info
+
+
+@dataclass(frozen=True, slots=True)
+class CompactResult:
+    """Slotted counterpart of ``FlightResult``."""
+
+    legs: tuple[CompactLeg, ...]
+    price: float
+    duration: int  # total duration in minutes
+    stops: int
+    hidden_city: HiddenCity | None = None
+
+    @classmethod
+    def from_model(cls, result: FlightResult) -> "CompactResult":
+        """Create a compact result from a ``FlightResult``."""
+        info = result.hidden_city_info
+        return cls(
+            tuple(CompactLeg.from_model(leg) for leg in result.legs),
+            result.price,
+            result.duration,
+            result.stops,
+            HiddenCity.from_info(info) if info is not None else None,
+        )
+
+    def to_model(self) -> FlightResult:
+        """Create the equivalent ``FlightResult`` without re-validating the data."""
+        return FlightResult.model_construct(
+            legs=[leg.to_model() for leg in self.legs],
+            price=self.price,
+            duration=self.duration,
+            stops=self.stops,
+            hidden_city_info=(
+                self.hidden_city.to_info(self.legs) if self.hidden_city is not None else None
+            ),
+        )
+
+
+CompactItem = CompactResult | tuple[CompactResult, CompactResult]
+ModelItem = FlightResult | tuple[FlightResult, FlightResult]
+
+
+def to_compact(results: list[ModelItem] | None) -> list[CompactItem] | None:
+    """Convert search results (single flights or round-trip pairs) to compact records."""
+    if results is None:
+        return None
+    return [
+        tuple(CompactResult.from_model(flight) for flight in item)
+        if isinstance(item, tuple)
+        else CompactResult.from_model(item)
+        for item in results
+    ]
+
+
+def from_compact(results: list[CompactItem] | None) -> list[ModelItem] | None:
+    """Convert compact records (single flights or round-trip pairs) back to pydantic models."""
+    if results is None:
+        return None
+    return [
+        tuple(flight.to_model() for flight in item) if isinstance(item, tuple) else item.to_model()
+        for item in results
+    ]
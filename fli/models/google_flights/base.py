@@ -4,9 +4,14 @@ This module contains all the data models used for flight searches and results.
 Models are designed to match Google Flights' APIs while providing a clean pythonic interface.
 """
 
+import json
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import cache
+from pathlib import Path
+from types import MappingProxyType
 
 from pydantic import (
     BaseModel,
@@ -47,9 +52,8 @@ class TripType(Enum):
 
     ROUND_TRIP = 1
     ONE_WAY = 2
-
-    # Currently not supported - kept for reference
-    _MULTI_CITY = 3  # Unsupported
+    MULTI_CITY = 3
+    _MULTI_CITY = 3  # Alias kept for backwards compatibility
 
 
 class MaxStops(Enum):
@@ -75,48 +79,16 @@ class Language(Enum):
     CHINESE = "zh-CN"
 
 
-@dataclass
-class LocalizationConfig:
-    """Configuration for language and currency settings.
-
-    Note: Region is fixed to 'US' for optimal Google Flights API performance.
-    Only language and currency can be customized.
-    """
-
-    language: Language = Language.ENGLISH
-    currency: Currency = Currency.USD
-
-    def __post_init__(self):
-        """Initialize after dataclass creation."""
-        pass
-
-    @property
-    def region(self) -> str:
-        """Get the region code. Fixed to 'US' for optimal API performance."""
-        return "US"
-
-    @property
-    def api_language_code(self) -> str:
-        """Get the API language code."""
-        return self.language.value
-
-    @property
-    def api_currency_code(self) -> str:
-        """Get the API currency code."""
-        return self.currency.value
-
-    @property
-    def currency_symbol(self) -> str:
-        """Get the currency symbol for display."""
-        symbols = {Currency.USD: "$", Currency.CNY: "¥"}
-        return symbols.get(self.currency, self.currency.value)
+_TRANSLATIONS_DIR = Path(__file__).parent.parent.parent / "data" / "translations"
 
-    def get_text(self, key: str) -> str:
-        """Get localized text for the given key."""
-        texts = {
-            Language.ENGLISH: {
+# Localization tables are built once at import and shared by every LocalizationConfig
+_TEXTS: Mapping[Language, Mapping[str, str]] = MappingProxyType(
+    {
+        Language.ENGLISH: MappingProxyType(
+            {
                 "one_way_flight_option": "One-way Flight Option",
                 "round_trip_flight_option": "Round-trip Flight Option",
+                "multi_city_flight_option": "Multi-city Flight Option",
                 "total_price": "Total Price",
                 "total_duration": "Total Duration",
                 "total_stops": "Total Stops",
@@ -124,6 +96,8 @@ class LocalizationConfig:
                 "return_price": "Return Price",
                 "outbound_flight_segments": "Outbound Flight Segments",
                 "return_flight_segments": "Return Flight Segments",
+                "leg_price": "Leg {number} Price",
+                "leg_flight_segments": "Leg {number} Flight Segments",
                 "airline": "Airline",
                 "flight": "Flight",
                 "from": "From",
@@ -133,10 +107,13 @@ class LocalizationConfig:
                 "cheapest_dates_to_fly": "Cheapest Dates to Fly",
                 "day": "Day",
                 "price": "Price",
-            },
-            Language.CHINESE: {
+            }
+        ),
+        Language.CHINESE: MappingProxyType(
+            {
                 "one_way_flight_option": "单程航班选项",
                 "round_trip_flight_option": "往返航班选项",
+                "multi_city_flight_option": "多城市航班选项",
                 "total_price": "总价格",
                 "total_duration": "总时长",
                 "total_stops": "总中转次数",
@@ -144,6 +121,8 @@ class LocalizationConfig:
                 "return_price": "返程价格",
                 "outbound_flight_segments": "去程航班段",
                 "return_flight_segments": "返程航班段",
+                "leg_price": "第{number}程价格",
+                "leg_flight_segments": "第{number}程航班段",
                 "airline": "航空公司",
                 "flight": "航班号",
                 "from": "出发地",
@@ -153,91 +132,190 @@ class LocalizationConfig:
                 "cheapest_dates_to_fly": "最便宜的出行日期",
                 "day": "星期",
                 "price": "价格",
-            },
-        }
-        return texts.get(self.language, texts[Language.ENGLISH]).get(key, key)
+            }
+        ),
+    }
+)
+
+_CURRENCY_SYMBOLS: Mapping[Currency, str] = MappingProxyType({Currency.USD: "$", Currency.CNY: "¥"})
+
+# Common airport translations
+_CHINESE_AIRPORT_NAMES: Mapping[str, str] = MappingProxyType(
+    {
+        "LHR": "伦敦希思罗机场",
+        "PEK": "北京首都国际机场",
+        "LAX": "洛杉矶国际机场",
+        "NRT": "东京成田国际机场",
+        "ICN": "首尔仁川国际机场",
+        "CDG": "巴黎戴高乐机场",
+        "JFK": "纽约肯尼迪国际机场",
+        "DXB": "迪拜国际机场",
+        "HKG": "香港国际机场",
+        "PVG": "上海浦东国际机场",
+        "SHA": "上海虹桥国际机场",
+        "CSX": "长沙黄花机场",
+        "SZX": "深圳宝安国际机场",
+        "IST": "伊斯坦布尔新机场",
+        "FRA": "法兰克福机场",
+        "VIE": "维也纳国际机场",
+        "SEA": "西雅图塔科马国际机场",
+        "SFO": "旧金山国际机场",
+        "KIX": "关西国际机场",
+    }
+)
+
+# Used if the airline translation file is not available
+_FALLBACK_CHINESE_AIRLINE_NAMES: Mapping[str, str] = MappingProxyType(
+    {
+        "CA": "中国国际航空",
+        "MU": "中国东方航空",
+        "CZ": "中国南方航空",
+        "HU": "海南航空",
+        "9C": "春秋航空",
+        "HO": "吉祥航空",
+        "3U": "四川航空",
+        "8L": "祥鹏航空",
+        "ZH": "深圳航空",
+        "EK": "阿联酋航空",
+        "TK": "土耳其航空",
+        "CX": "国泰航空",
+        "LH": "汉莎航空",
+        "OS": "奥地利航空",
+        "JL": "日本航空",
+        "NH": "全日空",
+        "KE": "大韩航空",
+        "OZ": "韩亚航空",
+        "SQ": "新加坡航空",
+        "AS": "阿拉斯加航空",
+        "AA": "美国航空",
+        "UA": "美国联合航空",
+        "HA": "夏威夷航空",
+    }
+)
+
+
+@cache
+def _chinese_airline_names() -> Mapping[str, str]:
+    """Load the airline translation file once for the whole process."""
+    try:
+        with open(_TRANSLATIONS_DIR / "airlines_cn.json", encoding="utf-8") as f:
+            return MappingProxyType(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _FALLBACK_CHINESE_AIRLINE_NAMES
+
+
+@dataclass(frozen=True, slots=True)
+class LocalizedLeg:
+    """Display names of one flight leg, as produced by ``localize_results``."""
+
+    airline: str
+    departure_airport: str
+    arrival_airport: str
+
+
+@dataclass
+class LocalizationConfig:
+    """Configuration for language and currency settings.
+
+    Note: Region is fixed to 'US' for optimal Google Flights API performance.
+    Only language and currency can be customized.
+    """
+
+    language: Language = Language.ENGLISH
+    currency: Currency = Currency.USD
+
+    def __post_init__(self):
+        """Initialize after dataclass creation."""
+        pass
+
+    @property
+    def region(self) -> str:
+        """Get the region code. Fixed to 'US' for optimal API performance."""
+        return "US"
+
+    @property
+    def api_language_code(self) -> str:
+        """Get the API language code."""
+        return self.language.value
+
+    @property
+    def api_currency_code(self) -> str:
+        """Get the API currency code."""
+        return self.currency.value
+
+    @property
+    def currency_symbol(self) -> str:
+        """Get the currency symbol for display."""
+        return _CURRENCY_SYMBOLS.get(self.currency, self.currency.value)
+
+    def get_text(self, key: str) -> str:
+        """Get localized text for the given key."""
+        return _TEXTS.get(self.language, _TEXTS[Language.ENGLISH]).get(key, key)
 
     def get_airport_name(self, airport_code: str, english_name: str) -> str:
         """Get localized airport name."""
         if self.language == Language.CHINESE:
-            # Common airport translations
-            chinese_airports = {
-                "LHR": "伦敦希思罗机场",
-                "PEK": "北京首都国际机场",
-                "LAX": "洛杉矶国际机场",
-                "NRT": "东京成田国际机场",
-                "ICN": "首尔仁川国际机场",
-                "CDG": "巴黎戴高乐机场",
-                "JFK": "纽约肯尼迪国际机场",
-                "DXB": "迪拜国际机场",
-                "HKG": "香港国际机场",
-                "PVG": "上海浦东国际机场",
-                "SHA": "上海虹桥国际机场",
-                "CSX": "长沙黄花机场",
-                "SZX": "深圳宝安国际机场",
-                "IST": "伊斯坦布尔新机场",
-                "FRA": "法兰克福机场",
-                "VIE": "维也纳国际机场",
-                "SEA": "西雅图塔科马国际机场",
-                "SFO": "旧金山国际机场",
-                "KIX": "关西国际机场",
-            }
-            return chinese_airports.get(airport_code, f"{english_name}")
+            return _CHINESE_AIRPORT_NAMES.get(airport_code, english_name)
         return english_name
 
     def get_airline_name(self, airline_code: str, english_name: str) -> str:
         """Get localized airline name."""
         if self.language == Language.CHINESE:
-            # Load airline translations from JSON file
-            try:
-                import json
-                from pathlib import Path
-
-                # Get the path to the airlines translation file from package data directory
-                translations_path = (
-                    Path(__file__).parent.parent.parent
-                    / "data"
-                    / "translations"
-                    / "airlines_cn.json"
-                )
-
-                # Load translations if not already cached
-                if not hasattr(self, "_airline_translations"):
-                    with open(translations_path, encoding="utf-8") as f:
-                        self._airline_translations = json.load(f)
-
-                return self._airline_translations.get(airline_code, english_name)
-
-            except (FileNotFoundError, json.JSONDecodeError):
-                # Fallback to hardcoded translations if file is not available
-                chinese_airlines = {
-                    "CA": "中国国际航空",
-                    "MU": "中国东方航空",
-                    "CZ": "中国南方航空",
-                    "HU": "海南航空",
-                    "9C": "春秋航空",
-                    "HO": "吉祥航空",
-                    "3U": "四川航空",
-                    "8L": "祥鹏航空",
-                    "ZH": "深圳航空",
-                    "EK": "阿联酋航空",
-                    "TK": "土耳其航空",
-                    "CX": "国泰航空",
-                    "LH": "汉莎航空",
-                    "OS": "奥地利航空",
-                    "JL": "日本航空",
-                    "NH": "全日空",
-                    "KE": "大韩航空",
-                    "OZ": "韩亚航空",
-                    "SQ": "新加坡航空",
-                    "AS": "阿拉斯加航空",
-                    "AA": "美国航空",
-                    "UA": "美国联合航空",
-                    "HA": "夏威夷航空",
-                }
-                return chinese_airlines.get(airline_code, english_name)
+            return _chinese_airline_names().get(airline_code, english_name)
         return english_name
 
+    def localize_results(
+        self,
+        results: Iterable,
+        airport_name: Callable[[Airport], str] | None = None,
+    ) -> list[tuple[tuple[LocalizedLeg, ...], ...]]:
+        """Get the localized leg names of a whole result list in one pass.
+
+        Each airline and airport is translated once per call, however many legs and
+        results it appears in.
+
+        Args:
+            results: Flight results, or (outbound, return) pairs for round trips
+            airport_name: English display name of an airport (defaults to its full name)
+
+        Returns:
+            One entry per result with a tuple of ``LocalizedLeg`` per flight (one flight
+            for one-way results, two for round-trip pairs)
+
+        """
+        airport_name = airport_name or (lambda airport: airport.value)
+        airlines: dict[Airline, str] = {}
+        airports: dict[Airport, str] = {}
+
+        def airline_text(airline: Airline) -> str:
+            text = airlines.get(airline)
+            if text is None:
+                text = airlines[airline] = self.get_airline_name(airline.name, airline.value)
+            return text
+
+        def airport_text(airport: Airport) -> str:
+            text = airports.get(airport)
+            if text is None:
+                text = airports[airport] = self.get_airport_name(
+                    airport.name, airport_name(airport)
+                )
+            return text
+
+        return [
+            tuple(
+                tuple(
+                    LocalizedLeg(
+                        airline_text(leg.airline),
+                        airport_text(leg.departure_airport),
+                        airport_text(leg.arrival_airport),
+                    )
+                    for leg in flight.legs
+                )
+                for flight in (item if isinstance(item, tuple) else (item,))
+            )
+            for item in results
+        ]
+
 
 class TimeRestrictions(BaseModel):
     """Time constraints for flight departure and arrival in local time.
@@ -111,9 +111,12 @@ class FlightSearchFilters(BaseModel):
                 self.layover_restrictions.max_duration if self.layover_restrictions else None
             )
 
-            # Selected flight (to fetch return flights)
+            # Selected flight (to fetch return flights or the next multi-city leg)
             selected_flights = None
-            if self.trip_type == TripType.ROUND_TRIP and segment.selected_flight is not None:
+            if (
+                self.trip_type in (TripType.ROUND_TRIP, TripType.MULTI_CITY)
+                and segment.selected_flight is not None
+            ):
                 selected_flights = [
                     [
                         serialize(leg.departure_airport.name),
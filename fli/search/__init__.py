@@ -1,9 +1,38 @@
-from .dates import DatePrice, SearchDates
+from .cache import Freshness, SearchCache, SearchResults
+from .combinations import (
+    CombinationOptimizer,
+    CombinationReport,
+    TripOption,
+    TripStructure,
+)
+from .context import SearchContext
+from .dates import DateCalendar, DatePrice, SearchDates
 from .flights import SearchFlights, SearchKiwiFlights
+from .lazy import LazyFlightList
+from .nearby import expand_nearby, nearby_airports
+from .sweep import SweepResult, SweepRunner
+from .watch import ChangeType, FareChange, FareWatcher
 
 __all__ = [
     "SearchFlights",
     "SearchKiwiFlights",
     "SearchDates",
     "DatePrice",
+    "DateCalendar",
+    "SearchCache",
+    "Freshness",
+    "SearchResults",
+    "FareWatcher",
+    "FareChange",
+    "ChangeType",
+    "CombinationOptimizer",
+    "CombinationReport",
+    "TripOption",
+    "TripStructure",
+    "expand_nearby",
+    "nearby_airports",
+    "LazyFlightList",
+    "SearchContext",
+    "SweepRunner",
+    "SweepResult",
 ]
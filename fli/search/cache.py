@@ -0,0 +1,338 @@
+"""In-memory result cache shared between searchers.
+
+Searchers key entries on the exact request they would send (endpoint URL plus encoded
+filters), so two identical queries issued by different callers, threads or batch rows are
+answered by a single HTTP round-trip while the entry is fresh.
+
+With a ``stale_ttl`` the cache also serves stale-while-revalidate: for ``stale_ttl``
+seconds after an entry expires, ``get_or_load`` still returns it immediately and starts
+one background refresh of the key (concurrent lookups of the same key do not start
+another). A failed refresh is logged and the stale entry stays servable until its window
+ends. Searches report how old the data behind their results is as a ``Freshness`` in
+the ``freshness`` attribute of the results they return.
+
+Example:
+    >>> search = SearchFlights(cache=SearchCache(ttl=300, stale_ttl=600))
+    >>> search.search(filters).freshness
+    Freshness(age=412.3, cached=True, stale=True, revalidating=True)
+
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from fli.core.metrics import CACHE_LOOKUPS, CACHE_REFRESHES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    hits: int = 0  # including stale hits
+    misses: int = 0
+    stale_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Get the fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class Freshness:
+    """How old the data behind a search result is."""
+
+    age: float = 0.0  # seconds since the oldest response used was fetched
+    cached: bool = False  # some of the data came from the cache
+    stale: bool = False  # some of the data is past its TTL
+    revalidating: bool = False  # a background refresh was started for stale data
+
+    @classmethod
+    def combine(cls, parts: Iterable["Freshness"]) -> "Freshness":
+        """Summarize the freshness of the responses a result was built from."""
+        parts = list(parts)
+        if not parts:
+            return cls()
+        return cls(
+            max(part.age for part in parts),
+            any(part.cached for part in parts),
+            any(part.stale for part in parts),
+            any(part.revalidating for part in parts),
+        )
+
+
+class SearchResults(list):
+    """List of search results carrying the ``Freshness`` of their data."""
+
+    freshness: Freshness = Freshness()
+
+
+_collected: ContextVar[list[Freshness] | None] = ContextVar("fli_freshness", default=None)
+
+
+@contextmanager
+def collect_freshness() -> Iterator[list[Freshness]]:
+    """Collect the freshness of every lookup made by a search.
+
+    Nested searches (e.g. the return searches of a round trip) add to the outermost
+    collection. Work fanned out to other threads is collected only if it runs in a copy
+    of the caller's context (``contextvars.copy_context().run``).
+    """
+    parts = _collected.get()
+    if parts is not None:
+        yield parts
+        return
+    parts = []
+    token = _collected.set(parts)
+    try:
+        yield parts
+    finally:
+        _collected.reset(token)
+
+
+def _attach_freshness(results: Any, parts: Iterable[Freshness]) -> Any:
+    """Attach the combined freshness to search results.
+
+    Plain lists are returned as a ``SearchResults`` copy; other result containers must
+    have a writable ``freshness`` attribute. None is returned unchanged.
+    """
+    if results is None:
+        return None
+    if type(results) is list:
+        results = SearchResults(results)
+    results.freshness = Freshness.combine(parts)
+    return results
+
+
+def reports_freshness(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorate a search method so its results carry the freshness of their data."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with collect_freshness() as parts:
+            results = method(*args, **kwargs)
+        return _attach_freshness(results, parts)
+
+    return wrapper
+
+
+def _record(freshness: Freshness) -> None:
+    """Add a lookup's freshness to the collection of the running search, if any."""
+    parts = _collected.get()
+    if parts is not None:
+        parts.append(freshness)
+
+
+def load_through(cache: "SearchCache | None", key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Get a value through an optional cache, recording its freshness.
+
+    Args:
+        cache: Cache to answer from, or None to always call the loader
+        key: Cache key
+        loader: Fetches the value (None results are not cached)
+
+    Returns:
+        The cached or loaded value
+
+    """
+    if cache is None:
+        value = loader()
+        _record(Freshness())
+        return value
+    value, freshness = cache.get_or_load(key, loader)
+    _record(freshness)
+    return value
+
+
+class SearchCache:
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    Example:
+        >>> cache = SearchCache(maxsize=512, ttl=600, stale_ttl=600)
+        >>> search = SearchFlights(cache=cache)
+
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "search",
+        stale_ttl: float = 0.0,
+        refresh_workers: int = 2,
+    ):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid after it was stored
+            clock: Monotonic time source (injectable for tests)
+            name: Label identifying the cache in the ``fli_cache_*`` metrics
+            stale_ttl: Seconds after expiry during which ``get_or_load`` serves an entry
+                while refreshing it in the background (0 disables stale serving)
+            refresh_workers: Threads running background refreshes
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.name = name
+        self.stale_ttl = stale_ttl
+        self.refresh_workers = refresh_workers
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of stored entries, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a fresh entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The cached value or default
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is None or entry[0] + self.ttl <= now:
+                if entry is not None and entry[0] + self.ttl + self.stale_ttl <= now:
+                    del self._entries[key]
+                self._count("miss")
+                return default
+            self._entries.move_to_end(key)
+            self._count("hit")
+            return entry[1]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> tuple[Any, Freshness]:
+        """Get an entry, serving it stale while it is refreshed, or load it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Fetches the value; called inline on a miss and on a background thread
+                to refresh a stale entry (None results are not cached)
+
+        Returns:
+            The value and its freshness
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is not None:
+                stored_at, value = entry
+                age = now - stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._count("hit")
+                    return value, Freshness(age, cached=True)
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._count("stale")
+                    revalidating = self._schedule_refresh(key, loader)
+                    return value, Freshness(age, True, True, revalidating)
+                del self._entries[key]
+            self._count("miss")
+
+        value = loader()
+        if value is not None:
+            self.set(key, value)
+        return value, Freshness()
+
+    def _count(self, result: str) -> None:
+        """Count a lookup (called with the lock held)."""
+        if result == "miss":
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            self.stats.stale_hits += result == "stale"
+        CACHE_LOOKUPS.inc(cache=self.name, result=result)
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Any]) -> bool:
+        """Start a background refresh unless one is running (called with the lock held).
+
+        Returns:
+            True if a refresh of the key is running
+
+        """
+        if key in self._refreshing:
+            return True
+        if self._closed:
+            return False
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.refresh_workers, thread_name_prefix=f"fli-cache-{self.name}"
+            )
+        self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, loader)
+        return True
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        """Reload an entry in the background, keeping the stale one if that fails."""
+        try:
+            value = loader()
+        except Exception as e:
+            CACHE_REFRESHES.inc(cache=self.name, result="error")
+            logger.warning("Background refresh of a %s cache entry failed: %s", self.name, e)
+        else:
+            if value is not None:
+                self.set(key, value)
+            CACHE_REFRESHES.inc(cache=self.name, result="ok")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+
+        """
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the background refresh threads; stale entries are then served as is.
+
+        Args:
+            wait: Wait for running refreshes to finish
+
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -2,17 +2,93 @@
 
 This module provides a robust HTTP client that handles:
 - User agent impersonation (to mimic a browser)
-- Rate limiting (10 requests per second)
-- Automatic retries with exponential backoff
-- Session management
+- Rate limiting (10 requests per second by default, see ``fli.core.ratelimit``)
+- Automatic retries with exponential backoff, capped by a shared retry budget
+- Per-host circuit breakers that fail fast with ``CircuitOpenError`` during outages
+- Session management (one session per thread, or one shared connection pool)
+- HTTP/2 and TCP keep-alive tuning
 - Error handling
+- Request, retry and rate-limit metrics (see ``fli.core.metrics``)
+
+By default each thread gets its own curl session, so concurrent searches open separate
+connections. With ``pool_size`` set, every request goes through one curl multi handle
+running on a background event loop: up to ``pool_size`` transfers run at once and
+requests to the same host share connections, multiplexed as HTTP/2 streams when the
+server negotiates HTTP/2. The ``get_async``/``post_async`` methods always use that pool,
+so coroutines on any event loop can await requests without tying up a thread each.
 """
 
+import asyncio
+import threading
+import time
+
 from curl_cffi import requests
-from ratelimit import limits, sleep_and_retry
-from tenacity import retry, stop_after_attempt, wait_exponential
+from curl_cffi.const import CurlHttpVersion, CurlOpt
+from tenacity import AsyncRetrying, RetryCallState, Retrying, stop_after_attempt, wait_exponential
+
+from fli.core.metrics import HTTP_RETRIES, record_request
+from fli.core.ratelimit import TokenBucket
+from fli.core.resilience import (
+    BREAKERS,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    RetryBudget,
+    is_transient,
+)
+from fli.core.tracing import span
 
 client = None
+_client_lock = threading.Lock()
+
+# Requests per second allowed by default, shared by every client without its own limiter
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_LIMITER = TokenBucket(rate=DEFAULT_RATE_LIMIT)
+
+# Concurrent transfers of the shared pool when none is configured (async requests)
+DEFAULT_POOL_SIZE = 10
+
+# Seconds an idle connection is kept for reuse and probed with TCP keep-alives
+DEFAULT_KEEPALIVE = 60.0
+
+# Retry budget shared by every client without its own
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+MAX_ATTEMPTS = 3
+RETRY_POLICY = {
+    "stop": stop_after_attempt(MAX_ATTEMPTS),
+    "wait": wait_exponential(),
+    "reraise": True,
+}
+
+
+def retry_sleep(seconds: float) -> None:
+    """Back off between retries, tracing the time spent as ``http.retry_backoff``."""
+    HTTP_RETRIES.inc()
+    with span("http.retry_backoff"):
+        time.sleep(seconds)
+
+
+async def retry_sleep_async(seconds: float) -> None:
+    """Back off between retries of an async request without blocking the event loop."""
+    HTTP_RETRIES.inc()
+    with span("http.retry_backoff"):
+        await asyncio.sleep(seconds)
+
+
+class RequestFailedError(Exception):
+    """Raised when a request fails, keeping the response status for the retry decision."""
+
+    def __init__(self, message: str, status: int | None):
+        """Initialize the error.
+
+        Args:
+            message: Error message
+            status: Response status code, or None when no response was received
+
+        """
+        super().__init__(message)
+        self.status = status
 
 
 class Client:
@@ -22,19 +98,122 @@ class Client:
         "content-type": "application/x-www-form-urlencoded;charset=UTF-8",
     }
 
-    def __init__(self):
-        """Initialize a new client session with default headers."""
-        self._client = requests.Session()
-        self._client.headers.update(self.DEFAULT_HEADERS)
+    def __init__(
+        self,
+        limiter: TokenBucket | None = None,
+        pool_size: int | None = None,
+        http2: bool = True,
+        keepalive: float | None = DEFAULT_KEEPALIVE,
+        retry_budget: RetryBudget | None = None,
+        breakers: CircuitBreakers | None = None,
+    ):
+        """Initialize the client; sessions are created lazily on first use.
+
+        Args:
+            limiter: Rate limiter for this client (defaults to the process-wide
+                ``DEFAULT_LIMITER`` of 10 requests per second)
+            pool_size: Send every request through one shared connection pool running at
+                most this many transfers at once (one session per thread if None)
+            http2: Negotiate HTTP/2 over TLS when the server supports it
+            keepalive: Seconds idle connections are kept for reuse, with TCP keep-alive
+                probes at that interval (curl defaults if None)
+            retry_budget: Budget capping retries (defaults to the process-wide
+                ``DEFAULT_RETRY_BUDGET``)
+            breakers: Per-host circuit breakers (defaults to the process-wide ``BREAKERS``)
+
+        """
+        self.limiter = limiter or DEFAULT_LIMITER
+        self.pool_size = pool_size
+        self.http2 = http2
+        self.keepalive = keepalive
+        self.retry_budget = retry_budget or DEFAULT_RETRY_BUDGET
+        self.breakers = breakers or BREAKERS
+        self._local = threading.local()
+        self._sessions: list[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._pool: requests.AsyncSession | None = None
+        self._pool_loop: asyncio.AbstractEventLoop | None = None
+        self._pool_thread: threading.Thread | None = None
 
     def __del__(self):
-        """Clean up client session on deletion."""
-        if hasattr(self, "_client"):
-            self._client.close()
+        """Clean up client sessions on deletion."""
+        self.close()
+
+    def close(self) -> None:
+        """Close every session opened by the client and stop the pool's event loop."""
+        with getattr(self, "_sessions_lock", threading.Lock()):
+            sessions, self._sessions = getattr(self, "_sessions", []), []
+            pool, loop, thread = (
+                getattr(self, "_pool", None),
+                getattr(self, "_pool_loop", None),
+                getattr(self, "_pool_thread", None),
+            )
+            self._pool = self._pool_loop = self._pool_thread = None
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+        if pool is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(pool.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def _session_options(self) -> dict:
+        """Get the HTTP version and curl connection options shared by every session."""
+        # Wait for a pending connection to confirm multiplexing instead of opening another
+        options = {CurlOpt.PIPEWAIT: 1}
+        if self.pool_size:
+            options[CurlOpt.MAXCONNECTS] = self.pool_size
+        if self.keepalive:
+            seconds = max(1, int(self.keepalive))
+            options.update(
+                {
+                    CurlOpt.TCP_KEEPALIVE: 1,
+                    CurlOpt.TCP_KEEPIDLE: seconds,
+                    CurlOpt.TCP_KEEPINTVL: seconds,
+                    CurlOpt.MAXAGE_CONN: seconds,
+                }
+            )
+        http_version = CurlHttpVersion.V2TLS if self.http2 else CurlHttpVersion.V1_1
+        return {"http_version": http_version, "curl_options": options}
+
+    @property
+    def _client(self) -> requests.Session:
+        """Get the session bound to the calling thread.
+
+        curl sessions are not safe to share between threads, so each thread gets its own
+        session with the default headers while rate limiting and retries stay shared.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session(**self._session_options())
+            session.headers.update(self.DEFAULT_HEADERS)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _pool_session(self) -> tuple[requests.AsyncSession, asyncio.AbstractEventLoop]:
+        """Get the shared pool session and its event loop, starting them on first use."""
+        with self._sessions_lock:
+            if self._pool is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="fli-http-pool", daemon=True
+                )
+                thread.start()
+                self._pool = asyncio.run_coroutine_threadsafe(self._open_pool(), loop).result()
+                self._pool_loop, self._pool_thread = loop, thread
+            return self._pool, self._pool_loop
+
+    async def _open_pool(self) -> requests.AsyncSession:
+        """Create the pool session on its event loop."""
+        return requests.AsyncSession(
+            max_clients=self.pool_size or DEFAULT_POOL_SIZE,
+            headers=dict(self.DEFAULT_HEADERS),
+            **self._session_options(),
+        )
 
-    @sleep_and_retry
-    @limits(calls=10, period=1)
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(), reraise=True)
     def get(self, url: str, **kwargs) -> requests.Response:
         """Make a rate-limited GET request with automatic retries.
 
@@ -49,16 +228,9 @@ class Client:
             Exception: If request fails after all retries
 
         """
-        try:
-            response = self._client.get(url, **kwargs)
-            response.raise_for_status()
-            return response
-        except Exception as e:
-            raise Exception(f"GET request failed: {str(e)}") from e
+        self.limiter.acquire()
+        return self._request("GET", url, **kwargs)
 
-    @sleep_and_retry
-    @limits(calls=10, period=1)
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(), reraise=True)
     def post(self, url: str, **kwargs) -> requests.Response:
         """Make a rate-limited POST request with automatic retries.
 
@@ -73,12 +245,124 @@ class Client:
             Exception: If request fails after all retries
 
         """
+        self.limiter.acquire()
+        return self._request("POST", url, **kwargs)
+
+    async def get_async(self, url: str, **kwargs) -> requests.Response:
+        """Make a rate-limited GET request through the shared pool, with retries.
+
+        Args:
+            url: Target URL for the request
+            **kwargs: Additional arguments passed to the session's request()
+
+        Returns:
+            Response object from the server
+
+        Raises:
+            Exception: If request fails after all retries
+
+        """
+        await self.limiter.acquire_async()
+        return await self._request_async("GET", url, **kwargs)
+
+    async def post_async(self, url: str, **kwargs) -> requests.Response:
+        """Make a rate-limited POST request through the shared pool, with retries.
+
+        Args:
+            url: Target URL for the request
+            **kwargs: Additional arguments passed to the session's request()
+
+        Returns:
+            Response object from the server
+
+        Raises:
+            Exception: If request fails after all retries
+
+        """
+        await self.limiter.acquire_async()
+        return await self._request_async("POST", url, **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one request on the pool or the calling thread's session."""
+        if self.pool_size:
+            session, loop = self._pool_session()
+            request = session.request(method, url, **kwargs)
+            return asyncio.run_coroutine_threadsafe(request, loop).result()
+        return self._client.request(method, url, **kwargs)
+
+    def _should_retry(self, retry_state: RetryCallState) -> bool:
+        """Retry a transient failure unless the circuit is open or the budget is spent."""
+        error = retry_state.outcome.exception()
+        if error is None or isinstance(error, CircuitOpenError):
+            return False
+        # Answered requests (4xx other than 429) fail the same way when retried
+        if not is_transient(getattr(error, "status", None)):
+            return False
+        if retry_state.attempt_number >= MAX_ATTEMPTS:
+            return False
+        return self.retry_budget.try_spend()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying failed attempts within the retry budget.
+
+        Raises:
+            CircuitOpenError: If the host's circuit breaker is open
+            Exception: If the request fails and is not retried
+
+        """
+        breaker = self.breakers.for_url(url)
+        self.retry_budget.record_request()
+        for attempt in Retrying(sleep=retry_sleep, retry=self._should_retry, **RETRY_POLICY):
+            with attempt:
+                response = self._attempt(breaker, method, url, **kwargs)
+        return response
+
+    def _attempt(
+        self, breaker: CircuitBreaker, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Send one attempt, recording its metrics and outcome."""
+        breaker.before_request()
+        response = None
+        start = time.perf_counter()
         try:
-            response = self._client.post(url, **kwargs)
-            response.raise_for_status()
+            with span("http.request", method=method):
+                response = self._send(method, url, **kwargs)
+                response.raise_for_status()
             return response
         except Exception as e:
-            raise Exception(f"POST request failed: {str(e)}") from e
+            status = response.status_code if response is not None else None
+            raise RequestFailedError(f"{method} request failed: {str(e)}", status) from e
+        finally:
+            status = response.status_code if response is not None else None
+            breaker.record(status)
+            record_request(url, method, status or "error", time.perf_counter() - start)
+
+    async def _request_async(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pool, retrying failed attempts within the budget."""
+        session, loop = self._pool_session()
+        breaker = self.breakers.for_url(url)
+        self.retry_budget.record_request()
+        retrying = AsyncRetrying(sleep=retry_sleep_async, retry=self._should_retry, **RETRY_POLICY)
+        async for attempt in retrying:
+            with attempt:
+                breaker.before_request()
+                response = None
+                start = time.perf_counter()
+                try:
+                    with span("http.request", method=method):
+                        request = session.request(method, url, **kwargs)
+                        response = await asyncio.wrap_future(
+                            asyncio.run_coroutine_threadsafe(request, loop)
+                        )
+                        response.raise_for_status()
+                except Exception as e:
+                    status = response.status_code if response is not None else None
+                    raise RequestFailedError(f"{method} request failed: {str(e)}", status) from e
+                finally:
+                    status = response.status_code if response is not None else None
+                    breaker.record(status)
+                    record_request(url, method, status or "error", time.perf_counter() - start)
+        return response
 
 
 def get_client() -> Client:
@@ -90,5 +374,7 @@ def get_client() -> Client:
     """
     global client
     if not client:
-        client = Client()
+        with _client_lock:
+            if not client:
+                client = Client()
     return client
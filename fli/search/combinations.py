@@ -0,0 +1,278 @@
+"""Cheapest-combination search: two one-way tickets versus a round-trip fare.
+
+Two one-way tickets, possibly from different providers, are often cheaper than a round
+trip. ``CombinationOptimizer`` runs the outbound one-way, return one-way and round-trip
+searches (on Google Flights and optionally Kiwi.com) concurrently, then merges them into
+the cheapest ``top_k`` itineraries.
+
+One-way combinations are enumerated lazily in order of their price sum with a heap seeded
+from the cheapest pair, so finding the best ``k`` combinations costs ``O(k log k)`` and
+the full outbound × return grid is never built.
+
+Example:
+    >>> report = CombinationOptimizer(kiwi=SearchKiwiFlights()).search(round_trip_filters)
+    >>> print(report.summary())
+    Cheapest: two one-ways (google + kiwi) at 612.00, saving 95.00 over the best round trip
+
+"""
+
+import heapq
+import logging
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+
+from fli.core.tracing import span
+from fli.models import FlightResult, FlightSearchFilters
+from fli.models.google_flights.base import TripType
+from fli.search.flights import SearchFlights, SearchKiwiFlights
+
+logger = logging.getLogger(__name__)
+
+
+class TripStructure(Enum):
+    """How an itinerary is ticketed."""
+
+    ROUND_TRIP = "round_trip"
+    TWO_ONE_WAYS = "two_one_ways"
+
+
+@dataclass(frozen=True, slots=True)
+class TripOption:
+    """A bookable outbound/return combination."""
+
+    structure: TripStructure
+    price: float
+    outbound: FlightResult
+    inbound: FlightResult
+    outbound_provider: str
+    inbound_provider: str
+
+    @property
+    def description(self) -> str:
+        """Get a short description of how the option is ticketed."""
+        if self.structure == TripStructure.ROUND_TRIP:
+            return f"round trip ({self.outbound_provider})"
+        return f"two one-ways ({self.outbound_provider} + {self.inbound_provider})"
+
+
+@dataclass
+class CombinationReport:
+    """Result of a cheapest-combination search."""
+
+    options: list[TripOption]
+    best_round_trip: float | None = None
+    best_two_one_ways: float | None = None
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def best(self) -> TripOption | None:
+        """Get the cheapest option, if any."""
+        return self.options[0] if self.options else None
+
+    @property
+    def savings(self) -> float | None:
+        """Get how much the cheaper structure saves over the other one, if both exist."""
+        if self.best_round_trip is None or self.best_two_one_ways is None:
+            return None
+        return abs(self.best_round_trip - self.best_two_one_ways)
+
+    def summary(self) -> str:
+        """Describe the winning structure in one line."""
+        best = self.best
+        if best is None:
+            return "No combinations found"
+        text = f"Cheapest: {best.description} at {best.price:.2f}"
+        if self.savings is not None:
+            other = (
+                "the best two one-ways"
+                if best.structure == TripStructure.ROUND_TRIP
+                else "the best round trip"
+            )
+            text += f", saving {self.savings:.2f} over {other}"
+        return text
+
+
+def smallest_pair_sums(a: Sequence[float], b: Sequence[float]) -> Iterator[tuple[int, int]]:
+    """Yield index pairs of two ascending sequences in ascending order of ``a[i] + b[j]``.
+
+    The heap starts with ``(0, 0)``. Popping ``(i, j)`` pushes ``(i, j + 1)``, and also
+    ``(i + 1, 0)`` when ``j`` is 0, so every pair is produced exactly once and only
+    ``O(k)`` pairs are ever held for the first ``k`` results.
+
+    Args:
+        a: Ascending prices
+        b: Ascending prices
+
+    Yields:
+        ``(i, j)`` index pairs, cheapest sum first
+
+    """
+    if not a or not b:
+        return
+    heap = [(a[0] + b[0], 0, 0)]
+    while heap:
+        _, i, j = heapq.heappop(heap)
+        yield i, j
+        if j + 1 < len(b):
+            heapq.heappush(heap, (a[i] + b[j + 1], i, j + 1))
+        if j == 0 and i + 1 < len(a):
+            heapq.heappush(heap, (a[i + 1] + b[0], i + 1, 0))
+
+
+def split_round_trip(
+    filters: FlightSearchFilters,
+) -> tuple[FlightSearchFilters, FlightSearchFilters]:
+    """Get one-way filters for the outbound and return segments of a round trip.
+
+    Args:
+        filters: Round-trip search filters with two segments
+
+    Returns:
+        Tuple of (outbound, return) one-way filters
+
+    Raises:
+        ValueError: If the filters are not a two-segment round trip
+
+    """
+    if filters.trip_type != TripType.ROUND_TRIP or len(filters.flight_segments) != 2:
+        raise ValueError("Combination search needs round-trip filters with two segments")
+    return tuple(
+        filters.model_copy(
+            update={
+                "trip_type": TripType.ONE_WAY,
+                "flight_segments": [segment.model_copy(update={"selected_flight": None})],
+            }
+        )
+        for segment in filters.flight_segments
+    )
+
+
+def _pair_price(pair: tuple[FlightResult, FlightResult]) -> float:
+    """Get the total price of an (outbound, return) pair."""
+    return pair[0].price + pair[1].price
+
+
+class CombinationOptimizer:
+    """Compare two one-way tickets against round-trip fares across providers."""
+
+    def __init__(
+        self,
+        searcher: SearchFlights | None = None,
+        kiwi: SearchKiwiFlights | None = None,
+        top_n: int = 5,
+    ):
+        """Initialize the optimizer.
+
+        Args:
+            searcher: Google Flights searcher (created if omitted)
+            kiwi: Kiwi.com searcher; Kiwi is only searched when one is given
+            top_n: Outbound flights paired with return flights in round-trip searches, and
+                the number of Kiwi results requested per search
+
+        """
+        self.searcher = searcher or SearchFlights()
+        self.kiwi = kiwi
+        self.top_n = top_n
+
+    def _searches(
+        self, filters: FlightSearchFilters
+    ) -> dict[tuple[str, str], tuple[Callable, FlightSearchFilters]]:
+        """Get every search to run, keyed by (provider, kind)."""
+        outbound, inbound = split_round_trip(filters)
+        providers = {"google": self.searcher}
+        if self.kiwi is not None:
+            providers["kiwi"] = self.kiwi
+        searches = {}
+        for provider, searcher in providers.items():
+            searches[(provider, "outbound")] = (searcher.search, outbound)
+            searches[(provider, "return")] = (searcher.search, inbound)
+            searches[(provider, "round_trip")] = (searcher.search, filters)
+        return searches
+
+    def search(self, filters: FlightSearchFilters, top_k: int = 5) -> CombinationReport:
+        """Find the cheapest ways to ticket a round trip.
+
+        Args:
+            filters: Round-trip search filters
+            top_k: Number of options returned
+
+        Returns:
+            Report with the ``top_k`` cheapest options across both structures
+
+        Raises:
+            ValueError: If the filters are not a two-segment round trip
+            Exception: The first search error if every search failed
+
+        """
+        searches = self._searches(filters)
+        results: dict[tuple[str, str], list] = {}
+        errors: dict[str, str] = {}
+        with span("combinations.search", searches=len(searches)):
+            with ThreadPoolExecutor(
+                max_workers=len(searches), thread_name_prefix="fli-combinations"
+            ) as executor:
+                futures = {
+                    key: executor.submit(search, search_filters, self.top_n)
+                    for key, (search, search_filters) in searches.items()
+                }
+                first_error = None
+                for key, future in futures.items():
+                    try:
+                        results[key] = future.result() or []
+                    except Exception as e:
+                        logger.warning("%s %s search failed: %s", *key, e)
+                        errors[f"{key[0]}.{key[1]}"] = str(e)
+                        first_error = first_error or e
+            if not results:
+                raise first_error
+
+            with span("combinations.merge"):
+                return self._merge(results, errors, top_k)
+
+    @staticmethod
+    def _merge(
+        results: dict[tuple[str, str], list], errors: dict[str, str], top_k: int
+    ) -> CombinationReport:
+        """Merge the search results into the cheapest ``top_k`` options."""
+        legs = {"outbound": [], "return": []}
+        round_trips = []
+        for (provider, kind), found in results.items():
+            if kind == "round_trip":
+                round_trips.extend(
+                    TripOption(
+                        TripStructure.ROUND_TRIP, _pair_price(pair), *pair, provider, provider
+                    )
+                    for pair in found
+                    if isinstance(pair, tuple)
+                )
+            else:
+                legs[kind].extend((flight.price, provider, flight) for flight in found)
+        outbound = sorted(legs["outbound"], key=lambda leg: leg[0])
+        inbound = sorted(legs["return"], key=lambda leg: leg[0])
+        round_trips.sort(key=lambda option: option.price)
+
+        one_ways = (
+            TripOption(
+                TripStructure.TWO_ONE_WAYS,
+                outbound[i][0] + inbound[j][0],
+                outbound[i][2],
+                inbound[j][2],
+                outbound[i][1],
+                inbound[j][1],
+            )
+            for i, j in smallest_pair_sums(
+                [leg[0] for leg in outbound], [leg[0] for leg in inbound]
+            )
+        )
+        options = list(
+            islice(heapq.merge(one_ways, round_trips, key=lambda option: option.price), top_k)
+        )
+        return CombinationReport(
+            options=options,
+            best_round_trip=round_trips[0].price if round_trips else None,
+            best_two_one_ways=(outbound[0][0] + inbound[0][0] if outbound and inbound else None),
+            errors=errors,
+        )
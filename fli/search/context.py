@@ -0,0 +1,241 @@
+"""Shared resources for a group of searchers.
+
+By default every searcher grabs the process-wide HTTP client, builds its own Kiwi API
+wrapper and runs its own event loop, so there is no way to size a process's concurrency
+deliberately or to keep two workloads apart. A ``SearchContext`` owns those resources:
+
+- an HTTP ``Client`` with its own Google Flights rate limiter, optionally sending every
+  request through one shared (HTTP/2 multiplexed) connection pool
+- a rate limiter for the Kiwi GraphQL API
+- retry budgets for both APIs, so one workload's failures cannot spend another's retries
+- an optional result cache, labelled with the context name in the cache metrics (pass a
+  ``SearchCache`` with a ``stale_ttl`` to serve stale results while they are refreshed)
+- a thread pool for running whole searches (``submit``/``map``) and a separate pool for
+  request fan-out inside a search (multi-city legs), so neither can starve the other
+- a background event loop shared by the Kiwi searchers
+- the metrics registry the context reports to
+
+Searchers created through the context (or given ``context=``) use these resources, and
+several contexts (for example one per tenant) can run side by side with separate budgets.
+``close`` (or leaving the ``with`` block) shuts everything down.
+
+Example:
+    >>> with SearchContext(name="tenant-a", rate_limit=5, max_workers=4) as context:
+    ...     flights = context.flights()
+    ...     results = list(context.map(flights.search, [filters_a, filters_b]))
+
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from fli.api.kiwi_flights import KiwiFlightsAPI
+from fli.core.metrics import REGISTRY, MetricsRegistry, render_metrics
+from fli.core.ratelimit import TokenBucket
+from fli.core.resilience import RetryBudget
+from fli.models.google_flights.base import LocalizationConfig
+from fli.search.cache import SearchCache
+from fli.search.client import DEFAULT_RATE_LIMIT, Client
+from fli.search.dates import SearchDates
+from fli.search.flights import SearchFlights, SearchKiwiFlights
+
+
+class SearchContext:
+    """Transports, rate limiters, cache, executors and metrics shared by searchers."""
+
+    def __init__(
+        self,
+        name: str = "default",
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        pool_size: int | None = None,
+        kiwi_rate_limit: float | None = None,
+        max_workers: int = 8,
+        max_fetch_workers: int = 8,
+        cache: SearchCache | bool | None = None,
+        client: Client | None = None,
+        kiwi_timeout: float = 30.0,
+        registry: MetricsRegistry | None = None,
+    ):
+        """Create the context; executors and the event loop start on first use.
+
+        Args:
+            name: Context name, used for thread names and the cache metrics label
+            rate_limit: Google Flights requests per second
+            pool_size: Concurrent transfers of a connection pool shared by every thread
+                (one HTTP session per thread if None)
+            kiwi_rate_limit: Kiwi requests per second (unlimited if None)
+            max_workers: Threads running whole searches via ``submit``/``map``
+            max_fetch_workers: Threads fetching requests inside a search
+            cache: Result cache, True to create one named after the context, or None
+            client: HTTP client to use instead of creating one (``rate_limit`` and
+                ``pool_size`` are then ignored and the client is not closed with the context)
+            kiwi_timeout: Kiwi request timeout in seconds
+            registry: Metrics registry the context reports to (the global one by default)
+
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_fetch_workers = max_fetch_workers
+        self.kiwi_timeout = kiwi_timeout
+        self.metrics = registry or REGISTRY
+        self._owns_client = client is None
+        self.client = client or Client(
+            limiter=TokenBucket(rate=rate_limit), pool_size=pool_size, retry_budget=RetryBudget()
+        )
+        self.limiter = self.client.limiter
+        self.kiwi_retry_budget = RetryBudget()
+        self.kiwi_limiter = TokenBucket(rate=kiwi_rate_limit) if kiwi_rate_limit else None
+        self._owns_cache = cache is True
+        if cache is True:
+            cache = SearchCache(name=name)
+        self.cache = cache if isinstance(cache, SearchCache) else None
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._fetch_executor: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> "SearchContext":
+        """Use the context as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the context."""
+        self.close()
+
+    def __repr__(self) -> str:
+        """Describe the context."""
+        state = "closed" if self._closed else "open"
+        return f"<SearchContext {self.name!r} {state}>"
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the context has been closed."""
+        return self._closed
+
+    def _check_open(self) -> None:
+        """Raise if the context has been closed."""
+        if self._closed:
+            raise RuntimeError(f"Search context {self.name!r} is closed")
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the pool that runs whole searches."""
+        with self._lock:
+            self._check_open()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix=f"fli-{self.name}"
+                )
+            return self._executor
+
+    @property
+    def fetch_executor(self) -> ThreadPoolExecutor:
+        """Get the pool for requests fanned out inside a search.
+
+        Tasks on this pool only send requests and never wait on other tasks, so searches
+        running on ``executor`` can block on them without risking a deadlock.
+        """
+        with self._lock:
+            self._check_open()
+            if self._fetch_executor is None:
+                self._fetch_executor = ThreadPoolExecutor(
+                    self.max_fetch_workers, thread_name_prefix=f"fli-{self.name}-fetch"
+                )
+            return self._fetch_executor
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the background event loop, starting its thread on first use."""
+        with self._lock:
+            self._check_open()
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name=f"fli-{self.name}-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+    def run_async(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the context's event loop and wait for its result.
+
+        Must not be called from the event loop thread itself.
+        """
+        try:
+            loop = self._event_loop()
+        except RuntimeError:
+            coroutine.close()
+            raise
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run a search (or any callable) on the context's worker pool."""
+        return self.executor.submit(func, *args, **kwargs)
+
+    def map(self, func: Callable[..., Any], *iterables: Iterable[Any]) -> Iterator[Any]:
+        """Run ``func`` over the items on the worker pool, yielding results in order."""
+        return self.executor.map(func, *iterables)
+
+    def kiwi_api(self, localization_config: LocalizationConfig | None = None) -> KiwiFlightsAPI:
+        """Create a Kiwi API wrapper using the context's rate limiter, timeout and budget."""
+        return KiwiFlightsAPI(
+            localization_config,
+            limiter=self.kiwi_limiter,
+            timeout=self.kiwi_timeout,
+            retry_budget=self.kiwi_retry_budget,
+        )
+
+    def flights(
+        self, localization_config: LocalizationConfig | None = None, **kwargs
+    ) -> SearchFlights:
+        """Create a ``SearchFlights`` bound to the context."""
+        return SearchFlights(localization_config, context=self, **kwargs)
+
+    def dates(self, localization_config: LocalizationConfig | None = None, **kwargs) -> SearchDates:
+        """Create a ``SearchDates`` bound to the context."""
+        return SearchDates(localization_config, context=self, **kwargs)
+
+    def kiwi(
+        self, localization_config: LocalizationConfig | None = None, **kwargs
+    ) -> SearchKiwiFlights:
+        """Create a ``SearchKiwiFlights`` bound to the context."""
+        return SearchKiwiFlights(localization_config, context=self, **kwargs)
+
+    def render_metrics(self) -> str:
+        """Render the metrics of the registry the context reports to."""
+        return render_metrics(self.metrics)
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the executors and event loop and close the HTTP sessions.
+
+        Closing twice is a no-op; using the context afterwards raises ``RuntimeError``.
+
+        Args:
+            wait: Wait for running searches and requests to finish
+
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            executors = (self._executor, self._fetch_executor)
+            loop, thread = self._loop, self._loop_thread
+        if self._owns_cache:
+            # Before the loop stops, since Kiwi refreshes run on it
+            self.cache.close(wait=wait)
+        for pool in executors:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=not wait)
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            if wait:
+                thread.join()
+                loop.close()
+        if self._owns_client:
+            self.client.close()
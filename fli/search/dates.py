@@ -5,14 +5,23 @@ It uses Google Flights' calendar view API to find the best prices for each date.
 It is intended to be used for finding the cheapest dates to fly, not the cheapest flights.
 """
 
-import json
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
+import numpy as np
 from pydantic import BaseModel
 
+from fli.core.jsonio import loads_embedded
+from fli.core.resilience import CircuitOpenError
+from fli.core.tracing import span
 from fli.models import DateSearchFilters
 from fli.models.google_flights.base import LocalizationConfig, TripType
-from fli.search.client import get_client
+from fli.search.cache import SearchCache, load_through, reports_freshness
+from fli.search.client import Client, get_client
+
+if TYPE_CHECKING:
+    from fli.search.context import SearchContext
 
 
 class DatePrice(BaseModel):
@@ -22,6 +31,179 @@ class DatePrice(BaseModel):
     price: float
 
 
+def _parse_price(item: list[list] | list | None) -> float | None:
+    """Parse price data from a calendar item.
+
+    Args:
+        item: Raw calendar item from the API response
+
+    Returns:
+        Float price value if valid, None if invalid or missing
+
+    """
+    try:
+        if item and isinstance(item, list) and len(item) > 2:
+            if isinstance(item[2], list) and len(item[2]) > 0:
+                if isinstance(item[2][0], list) and len(item[2][0]) > 1:
+                    return float(item[2][0][1])
+    except (IndexError, TypeError, ValueError):
+        pass
+
+    return None
+
+
+class DateCalendar:
+    """Calendar search results stored as parallel NumPy arrays.
+
+    ``departure`` (and ``returns`` for round trips) are ``datetime64[D]`` arrays and
+    ``prices`` is a ``float32`` array, all of the same length and read-only. ``DatePrice``
+    models are only built when an entry is indexed, iterated or converted with
+    ``to_date_prices``, so sweeps over many routes can work on the arrays directly.
+
+    Example:
+        >>> calendar = SearchDates().search_calendar(filters)
+        >>> calendar.departure[calendar.prices.argmin()]
+        numpy.datetime64('2025-10-14')
+
+    """
+
+    __slots__ = ("trip_type", "departure", "returns", "prices", "freshness")
+
+    def __init__(
+        self,
+        trip_type: TripType,
+        departure: np.ndarray,
+        prices: np.ndarray,
+        returns: np.ndarray | None = None,
+    ):
+        """Initialize the calendar from its arrays.
+
+        Args:
+            trip_type: Trip type the calendar was searched for
+            departure: Departure dates (``datetime64[D]``)
+            prices: Prices (``float32``), one per date
+            returns: Return dates (``datetime64[D]``) for round trips
+
+        """
+        self.trip_type = trip_type
+        self.departure = _frozen(departure.astype("datetime64[D]", copy=False))
+        self.prices = _frozen(prices.astype(np.float32, copy=False))
+        self.returns = (
+            _frozen(returns.astype("datetime64[D]", copy=False)) if returns is not None else None
+        )
+        self.freshness = None  # set on calendars returned by a search
+
+    @classmethod
+    def from_items(cls, items: Iterable[list], trip_type: TripType) -> "DateCalendar":
+        """Parse raw calendar items in a single pass.
+
+        Each item's price is read once; items without a positive price are skipped. The
+        ISO date strings are converted to ``datetime64[D]`` by NumPy in one call.
+
+        Args:
+            items: Raw calendar items (``[departure, return, [[..., price]]]``)
+            trip_type: Trip type, which decides whether return dates are read
+
+        Returns:
+            Calendar with one entry per priced item
+
+        """
+        round_trip = trip_type != TripType.ONE_WAY
+        departures: list[str] = []
+        returns: list[str] = []
+        prices: list[float] = []
+        for item in items or ():
+            price = _parse_price(item)
+            if not price:
+                continue
+            departures.append(item[0])
+            if round_trip:
+                returns.append(item[1])
+            prices.append(price)
+
+        return cls(
+            trip_type,
+            np.array(departures, dtype="datetime64[D]"),
+            np.array(prices, dtype=np.float32),
+            np.array(returns, dtype="datetime64[D]") if round_trip else None,
+        )
+
+    @classmethod
+    def concatenate(
+        cls, calendars: Iterable["DateCalendar"], trip_type: TripType
+    ) -> "DateCalendar":
+        """Join calendars (e.g. the chunks of a long date range) into one."""
+        calendars = list(calendars)
+        if not calendars:
+            return cls.from_items((), trip_type)
+        returns = None
+        if trip_type != TripType.ONE_WAY:
+            returns = np.concatenate([calendar.returns for calendar in calendars])
+        return cls(
+            trip_type,
+            np.concatenate([calendar.departure for calendar in calendars]),
+            np.concatenate([calendar.prices for calendar in calendars]),
+            returns,
+        )
+
+    def __len__(self) -> int:
+        """Get the number of dates with a price."""
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        """Get one entry as a ``DatePrice``, or a sub-calendar for slices and index arrays."""
+        if isinstance(index, int | np.integer):
+            return self._date_price(int(index))
+        return DateCalendar(
+            self.trip_type,
+            self.departure[index],
+            self.prices[index],
+            self.returns[index] if self.returns is not None else None,
+        )
+
+    def __iter__(self) -> Iterator[DatePrice]:
+        """Iterate over the entries as ``DatePrice`` models."""
+        return iter(self.to_date_prices())
+
+    def copy(self) -> "DateCalendar":
+        """Get a calendar sharing this one's read-only arrays."""
+        return self[:]
+
+    def sort_by_price(self) -> "DateCalendar":
+        """Get a copy ordered by ascending price (ties keep date order)."""
+        return self[np.argsort(self.prices, kind="stable")]
+
+    def cheapest(self, n: int = 1) -> "DateCalendar":
+        """Get the ``n`` cheapest entries in ascending price order."""
+        return self.sort_by_price()[:n]
+
+    def to_date_prices(self) -> list[DatePrice]:
+        """Materialize every entry as a ``DatePrice`` model."""
+        departures = self.departure.astype("datetime64[s]").tolist()
+        prices = [round(price, 2) for price in self.prices.tolist()]
+        if self.returns is None:
+            dates = [(departure,) for departure in departures]
+        else:
+            dates = zip(departures, self.returns.astype("datetime64[s]").tolist(), strict=True)
+        return [
+            DatePrice.model_construct(date=date, price=price)
+            for date, price in zip(dates, prices, strict=True)
+        ]
+
+    def _date_price(self, index: int) -> DatePrice:
+        """Build the ``DatePrice`` for one entry."""
+        date = (self.departure[index].astype("datetime64[s]").item(),)
+        if self.returns is not None:
+            date += (self.returns[index].astype("datetime64[s]").item(),)
+        return DatePrice.model_construct(date=date, price=round(float(self.prices[index]), 2))
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    """Mark an array read-only so cached calendars can be shared safely."""
+    array.flags.writeable = False
+    return array
+
+
 class SearchDates:
     """Date-based flight search implementation.
 
@@ -35,16 +217,30 @@ class SearchDates:
     }
     MAX_DAYS_PER_SEARCH = 61
 
-    def __init__(self, localization_config: LocalizationConfig = None):
+    def __init__(
+        self,
+        localization_config: LocalizationConfig = None,
+        client: Client | None = None,
+        cache: SearchCache | None = None,
+        context: "SearchContext | None" = None,
+    ):
         """Initialize the search client for date-based searches.
 
         Args:
             localization_config: Configuration for language and currency settings
+            client: HTTP client to use (defaults to the context's client, then the shared
+                client)
+            cache: Optional result cache shared with other searchers (defaults to the
+                context's cache)
+            context: Search context providing the client and cache
 
         """
-        self.client = get_client()
+        self.context = context
+        self.client = client or (context.client if context is not None else get_client())
         self.localization_config = localization_config or LocalizationConfig()
+        self.cache = cache if cache is not None or context is None else context.cache
 
+    @reports_freshness
     def search(self, filters: DateSearchFilters) -> list[DatePrice] | None:
         """Search for flight prices across a date range and search parameters.
 
@@ -55,6 +251,7 @@ class SearchDates:
             List of DatePrice objects containing date and price pairs, or None if no results
 
         Raises:
+            CircuitOpenError: If the Google Flights circuit breaker is open
             Exception: If the search fails or returns invalid data
 
         Notes:
@@ -62,6 +259,35 @@ class SearchDates:
             - We can't search more than 305 days in the future.
 
         """
+        calendar = self.search_calendar(filters)
+        if calendar is None:
+            return None
+        with span("dates.materialize", count=len(calendar)):
+            return calendar.to_date_prices()
+
+    @reports_freshness
+    def search_calendar(self, filters: DateSearchFilters) -> DateCalendar | None:
+        """Search for flight prices across a date range, returning arrays.
+
+        Same request behaviour as ``search``, but the results stay in a ``DateCalendar``
+        of NumPy arrays and no ``DatePrice`` models are built.
+
+        Args:
+            filters: Search parameters including date range, airports, and preferences
+
+        Returns:
+            Calendar of dates and prices, with the age of the data in its ``freshness``
+            attribute, or None if no results
+
+        Raises:
+            Exception: If the search fails or returns invalid data
+
+        """
+        with span("dates.search", trip_type=filters.trip_type.name):
+            return self._search_range(filters)
+
+    def _search_range(self, filters: DateSearchFilters) -> DateCalendar | None:
+        """Search a date range, splitting it into chunks the API accepts."""
         from_date = datetime.strptime(filters.from_date, "%Y-%m-%d")
         to_date = datetime.strptime(filters.to_date, "%Y-%m-%d")
         date_range = (to_date - from_date).days + 1
@@ -70,7 +296,7 @@ class SearchDates:
             return self._search_chunk(filters)
 
         # Split into chunks of MAX_DAYS_PER_SEARCH
-        all_results = []
+        all_results: list[DateCalendar] = []
         current_from = from_date
         while current_from <= to_date:
             current_to = min(current_from + timedelta(days=self.MAX_DAYS_PER_SEARCH - 1), to_date)
@@ -98,95 +324,55 @@ class SearchDates:
 
             chunk_results = self._search_chunk(chunk_filters)
             if chunk_results:
-                all_results.extend(chunk_results)
+                all_results.append(chunk_results)
 
             current_from = current_to + timedelta(days=1)
 
-        return all_results if all_results else None
+        if not all_results:
+            return None
+        return DateCalendar.concatenate(all_results, filters.trip_type)
 
-    def _search_chunk(self, filters: DateSearchFilters) -> list[DatePrice] | None:
+    def _search_chunk(self, filters: DateSearchFilters) -> DateCalendar | None:
         """Search for flight prices for a single date range chunk.
 
         Args:
             filters: Search parameters including date range, airports, and preferences
 
         Returns:
-            List of DatePrice objects containing date and price pairs, or None if no results
+            Calendar of dates and prices, or None if no results
 
         Raises:
             Exception: If the search fails or returns invalid data
 
         """
-        encoded_filters = filters.encode()
-
-        # Build URL with localization parameters
-        url_with_params = f"{self.BASE_URL}?hl={self.localization_config.api_language_code}&gl={self.localization_config.region}&curr={self.localization_config.api_currency_code}"
-
-        try:
-            response = self.client.post(
-                url=url_with_params,
-                data=f"f.req={encoded_filters}",
-                impersonate="chrome",
-                allow_redirects=True,
-            )
-            response.raise_for_status()
-            parsed = json.loads(response.text.lstrip(")]}'"))[0][2]
-            if not parsed:
-                return None
-
-            data = json.loads(parsed)
-            dates_data = [
-                DatePrice(
-                    date=self.__parse_date(item, filters.trip_type),
-                    price=self.__parse_price(item),
+        with span("dates.chunk", from_date=filters.from_date, to_date=filters.to_date):
+            with span("dates.encode"):
+                encoded_filters = filters.encode()
+
+            # Build URL with localization parameters
+            url_with_params = f"{self.BASE_URL}?hl={self.localization_config.api_language_code}&gl={self.localization_config.region}&curr={self.localization_config.api_currency_code}"
+
+            def load() -> DateCalendar | None:
+                response = self.client.post(
+                    url=url_with_params,
+                    data=f"f.req={encoded_filters}",
+                    impersonate="chrome",
+                    allow_redirects=True,
                 )
-                for item in data[-1]
-                if self.__parse_price(item)
-            ]
-            return dates_data
-
-        except Exception as e:
-            raise Exception(f"Search failed: {str(e)}") from e
-
-    @staticmethod
-    def __parse_date(
-        item: list[list] | list | None, trip_type: TripType
-    ) -> tuple[datetime] | tuple[datetime, datetime]:
-        """Parse date data from the API response.
-
-        Args:
-            item: Raw date data from the API response
-            trip_type: Trip type (one-way or round-trip)
-
-        Returns:
-            Tuple of datetime objects
-
-        """
-        if trip_type == TripType.ONE_WAY:
-            return (datetime.strptime(item[0], "%Y-%m-%d"),)
-        else:
-            return (
-                datetime.strptime(item[0], "%Y-%m-%d"),
-                datetime.strptime(item[1], "%Y-%m-%d"),
-            )
-
-    @staticmethod
-    def __parse_price(item: list[list] | list | None) -> float | None:
-        """Parse price data from the API response.
-
-        Args:
-            item: Raw price data from the API response
-
-        Returns:
-            Float price value if valid, None if invalid or missing
-
-        """
-        try:
-            if item and isinstance(item, list) and len(item) > 2:
-                if isinstance(item[2], list) and len(item[2]) > 0:
-                    if isinstance(item[2][0], list) and len(item[2][0]) > 1:
-                        return float(item[2][0][1])
-        except (IndexError, TypeError, ValueError):
-            pass
-
-        return None
+                response.raise_for_status()
+                with span("dates.decode"):
+                    data = loads_embedded(response.content)
+                    if data is None:
+                        return None
+                with span("dates.parse", count=len(data[-1] or [])):
+                    return DateCalendar.from_items(data[-1], filters.trip_type)
+
+            key = ("dates", url_with_params, encoded_filters)
+            try:
+                calendar = load_through(self.cache, key, load)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                raise Exception(f"Search failed: {str(e)}") from e
+            # Callers get their own calendar, so setting its freshness leaves the cache alone
+            return calendar.copy() if calendar is not None else None
@@ -4,11 +4,26 @@ This module provides the core flight search functionality, interfacing with
 Google Flights' API and Kiwi.com API to find available flights and their details.
 """
 
-import json
 import asyncio
+import contextvars
+import heapq
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime
+from typing import TYPE_CHECKING
 
+from fli.api.kiwi_flights import KiwiFlightsAPI
+from fli.api.kiwi_parser import (
+    DEFAULT_AIRLINE,
+    DEFAULT_AIRPORT,
+    parse_oneway_itinerary,
+    parse_roundtrip_itinerary,
+)
+from fli.core.jsonio import loads_embedded
+from fli.core.metrics import PARSE_FAILURES
+from fli.core.resilience import CircuitOpenError
+from fli.core.tracing import span
 from fli.models import (
     Airline,
     Airport,
@@ -16,9 +31,16 @@ from fli.models import (
     FlightResult,
     FlightSearchFilters,
 )
+from fli.models.compact import to_compact
 from fli.models.google_flights.base import LocalizationConfig, TripType
-from fli.search.client import get_client
-from fli.api.kiwi_flights import KiwiFlightsAPI
+from fli.search.cache import SearchCache, load_through, reports_freshness
+from fli.search.client import Client, get_client
+from fli.search.lazy import LazyFlightList, as_lazy, raw_duration, raw_price, raw_stops
+
+if TYPE_CHECKING:
+    from fli.search.context import SearchContext
+
+logger = logging.getLogger(__name__)
 
 
 class SearchFlights:
@@ -32,17 +54,36 @@ class SearchFlights:
     DEFAULT_HEADERS = {
         "content-type": "application/x-www-form-urlencoded;charset=UTF-8",
     }
-
-    def __init__(self, localization_config: LocalizationConfig = None):
+    MAX_CONCURRENT_LEG_SEARCHES = 4
+
+    def __init__(
+        self,
+        localization_config: LocalizationConfig = None,
+        client: Client | None = None,
+        cache: SearchCache | None = None,
+        compact: bool = False,
+        context: "SearchContext | None" = None,
+    ):
         """Initialize the search client for flight searches.
 
         Args:
             localization_config: Configuration for language and currency settings
+            client: HTTP client to use (defaults to the context's client, then the shared
+                client)
+            cache: Optional result cache shared with other searchers (defaults to the
+                context's cache)
+            compact: Return slotted ``CompactResult`` records instead of ``FlightResult``
+                models (see ``fli.models.compact``)
+            context: Search context providing the client, cache and fetch executor
 
         """
-        self.client = get_client()
+        self.context = context
+        self.client = client or (context.client if context is not None else get_client())
         self.localization_config = localization_config or LocalizationConfig()
+        self.cache = cache if cache is not None or context is None else context.cache
+        self.compact = compact
 
+    @reports_freshness
     def search(
         self, filters: FlightSearchFilters, top_n: int = 5, enhanced_search: bool = False
     ) -> list[FlightResult | tuple[FlightResult, FlightResult]] | None:
@@ -50,18 +91,25 @@ class SearchFlights:
 
         Args:
             filters: Full flight search object including airports, dates, and preferences
-            top_n: Number of flights to limit the return flight search to
+            top_n: Number of flights to limit the return flight search to (for multi-city
+                trips, the number of partial itineraries kept per leg)
             enhanced_search: If True, use extended search mode (135+ flights)
                            If False, use basic search mode (12 flights)
 
         Returns:
-            List of FlightResult objects containing flight details, or None if no results
+            List of FlightResult objects containing flight details (CompactResult records
+            when the searcher was created with ``compact=True``), or None if no results.
+            Round trips return (outbound, return) pairs and multi-city trips return one
+            tuple of flights per itinerary, cheapest first. The list's ``freshness``
+            attribute tells how old the (possibly cached) data is.
 
         Raises:
+            CircuitOpenError: If the Google Flights circuit breaker is open
             Exception: If the search fails or returns invalid data
         """
-        return self._search_internal(filters, top_n, enhanced_search)
+        return self._finish(self._search_internal(filters, top_n, enhanced_search))
 
+    @reports_freshness
     def search_extended(
         self, filters: FlightSearchFilters, top_n: int = 50
     ) -> list[FlightResult | tuple[FlightResult, FlightResult]] | None:
@@ -89,8 +137,9 @@ class SearchFlights:
             min(outbound_flights, top_n) × return_flights_per_outbound
             To get more combinations, increase the top_n parameter.
         """
-        return self._search_internal(filters, top_n, enhanced_search=True)
+        return self._finish(self._search_internal(filters, top_n, enhanced_search=True))
 
+    @reports_freshness
     def search_extended_max_combinations(
         self, filters: FlightSearchFilters, max_outbound: int = 100, max_return_per_outbound: int = 50
     ) -> list[FlightResult | tuple[FlightResult, FlightResult]] | None:
@@ -115,10 +164,119 @@ class SearchFlights:
             for round-trip flights, but will take longer to execute.
         """
         if filters.trip_type == TripType.ROUND_TRIP:
-            return self._search_internal(filters, max_outbound, enhanced_search=True)
+            results = self._search_internal(filters, max_outbound, enhanced_search=True)
         else:
             # For one-way flights, use the standard extended search
-            return self._search_internal(filters, max_outbound, enhanced_search=True)
+            results = self._search_internal(filters, max_outbound, enhanced_search=True)
+        return self._finish(results)
+
+    @reports_freshness
+    def search_best_pairs(
+        self,
+        filters: FlightSearchFilters,
+        top_k: int = 10,
+        max_outbound: int | None = None,
+        enhanced_search: bool = False,
+    ) -> list[tuple[FlightResult, FlightResult]] | None:
+        """Find the ``top_k`` cheapest round-trip pairs, skipping return searches early.
+
+        ``search`` fetches the return flights of every one of the first ``top_n`` outbound
+        flights. This method visits the outbound flights cheapest first and stops once the
+        next outbound price plus the cheapest return price seen so far cannot beat the
+        current ``top_k``-th best pair, which usually saves most of the return requests.
+
+        Note:
+            The bound assumes that return fares do not drop below the cheapest return
+            already seen; Google Flights quotes returns per selected outbound, so a
+            later outbound can in rare cases unlock a cheaper return that is not found.
+
+        Args:
+            filters: Round-trip search filters
+            top_k: Number of pairs to return
+            max_outbound: Maximum outbound flights whose returns are fetched (all if None)
+            enhanced_search: If True, use extended search mode
+
+        Returns:
+            Up to ``top_k`` (outbound, return) pairs, cheapest total first, or None if no
+            outbound flights were found
+
+        Raises:
+            ValueError: If the filters are not a round trip or ``top_k`` is less than 1
+            Exception: If the search fails or returns invalid data
+
+        """
+        if filters.trip_type != TripType.ROUND_TRIP:
+            raise ValueError("Best-first pairing needs round-trip filters")
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        with span("flights.best_pairs", top_k=top_k, enhanced=enhanced_search):
+            with span("flights.encode"):
+                encoded_filters = filters.encode(enhanced_search=enhanced_search)
+            try:
+                outbound = self._fetch_flights(self._shopping_url(), encoded_filters)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                raise Exception(f"Search failed: {str(e)}") from e
+            if outbound is None:
+                return None
+            return self._finish(
+                self._best_pairs(filters, outbound, top_k, max_outbound, enhanced_search)
+            )
+
+    def _best_pairs(
+        self,
+        filters: FlightSearchFilters,
+        outbound: list[FlightResult],
+        top_k: int,
+        max_outbound: int | None,
+        enhanced_search: bool,
+    ) -> list[tuple[FlightResult, FlightResult]]:
+        """Pair outbound flights with their returns best-first until the price bound stops.
+
+        The ``top_k`` best pairs are held in a max-heap keyed by negated total price, so
+        the current ``top_k``-th best total is available in constant time.
+        """
+        candidates = as_lazy(outbound).sorted_by("price")[:max_outbound]
+        best: list[tuple[float, int, FlightResult, FlightResult]] = []
+        cheapest_return = None
+        order = 0
+        searched = 0
+        for selected_flight in candidates:
+            if (
+                len(best) == top_k
+                and cheapest_return is not None
+                and selected_flight.price + cheapest_return >= -best[0][0]
+            ):
+                break
+            selected_flight_filters = filters.model_copy(deep=True)
+            selected_flight_filters.flight_segments[0].selected_flight = selected_flight
+            searched += 1
+            return_flights = self._search_internal(
+                selected_flight_filters, enhanced_search=enhanced_search
+            )
+            for return_flight in return_flights or ():
+                total = selected_flight.price + return_flight.price
+                if cheapest_return is None or return_flight.price < cheapest_return:
+                    cheapest_return = return_flight.price
+                order += 1
+                # Among equal totals the pair found last sits at the root and is evicted first
+                entry = (-total, -order, selected_flight, return_flight)
+                if len(best) < top_k:
+                    heapq.heappush(best, entry)
+                elif total < -best[0][0]:
+                    heapq.heapreplace(best, entry)
+        logger.debug(
+            "Best-first pairing searched returns of %d of %d outbound flights",
+            searched,
+            len(candidates),
+        )
+        best.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [(selected_flight, return_flight) for _, _, selected_flight, return_flight in best]
+
+    def _finish(self, results: list | None) -> list | None:
+        """Convert the results to compact records if the searcher was asked to."""
+        return to_compact(results) if self.compact else results
 
     def _search_internal(
         self, filters: FlightSearchFilters, top_n: int = 5, enhanced_search: bool = False
@@ -136,55 +294,219 @@ class SearchFlights:
             Exception: If the search fails or returns invalid data
 
         """
-        encoded_filters = filters.encode(enhanced_search=enhanced_search)
+        if filters.trip_type == TripType.MULTI_CITY:
+            return self._search_multi_city(filters, top_n, enhanced_search)
+
+        # Return-leg searches of a round trip are traced separately from the main search
+        stage = (
+            "flights.return_search"
+            if filters.flight_segments[0].selected_flight is not None
+            else "flights.search"
+        )
+        with span(stage, trip_type=filters.trip_type.name, enhanced=enhanced_search):
+            with span("flights.encode"):
+                encoded_filters = filters.encode(enhanced_search=enhanced_search)
+
+            # Build URL with localization parameters
+            url_with_params = self._shopping_url()
+
+            try:
+                flights = self._fetch_flights(url_with_params, encoded_filters)
+                if flights is None:
+                    return None
+
+                if (
+                    filters.trip_type == TripType.ONE_WAY
+                    or filters.flight_segments[0].selected_flight is not None
+                ):
+                    # Callers get a plain list; parsing stays lazy only for the fan-out below
+                    return list(flights)
+
+                # Get the return flights if round-trip
+                flight_pairs = []
+                # Call the search again with the return flight data
+                for selected_flight in flights[:top_n]:
+                    with span("flights.fanout_copy"):
+                        selected_flight_filters = deepcopy(filters)
+                    selected_flight_filters.flight_segments[0].selected_flight = selected_flight
+                    return_flights = self._search_internal(
+                        selected_flight_filters, top_n=top_n, enhanced_search=enhanced_search
+                    )
+                    if return_flights is not None:
+                        flight_pairs.extend(
+                            (selected_flight, return_flight) for return_flight in return_flights
+                        )
+
+                return flight_pairs
+
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                raise Exception(f"Search failed: {str(e)}") from e
+
+    def _shopping_url(self) -> str:
+        """Get the shopping endpoint URL with the localization parameters."""
+        config = self.localization_config
+        return (
+            f"{self.BASE_URL}?hl={config.api_language_code}&gl={config.region}"
+            f"&curr={config.api_currency_code}"
+        )
+
+    def _search_multi_city(
+        self, filters: FlightSearchFilters, beam_width: int, enhanced_search: bool = False
+    ) -> list[tuple[FlightResult, ...]] | None:
+        """Search a multi-city trip leg by leg with beam pruning.
+
+        Google Flights returns the options for the first leg without a selected flight, so
+        each partial itinerary (the flights chosen for the earlier legs) costs one request
+        per leg. The selection tree is explored breadth-first: every partial itinerary kept
+        at one level is extended with each option for the next leg, and only the
+        ``beam_width`` cheapest extensions survive to the next level. The requests of a
+        level run concurrently, at most ``MAX_CONCURRENT_LEG_SEARCHES`` at a time, so a
+        three-leg trip costs at most ``1 + 2 * beam_width`` requests in three rounds.
 
-        # Build URL with localization parameters
-        url_with_params = f"{self.BASE_URL}?hl={self.localization_config.api_language_code}&gl={self.localization_config.region}&curr={self.localization_config.api_currency_code}"
+        Args:
+            filters: Multi-city filters with one segment per leg
+            beam_width: Partial itineraries kept per level, also the number returned
+            enhanced_search: If True, use extended search mode
 
-        try:
+        Returns:
+            Itineraries as tuples of one flight per leg, cheapest total first, or None if
+            no complete itinerary was found
+
+        Raises:
+            ValueError: If the filters have fewer than two segments
+            Exception: If every search of a level failed
+
+        """
+        legs = len(filters.flight_segments)
+        if legs < 2:
+            raise ValueError("Multi-city search needs at least two flight segments")
+
+        beam: list[tuple[float, tuple[FlightResult, ...]]] = [(0.0, ())]
+        with span("flights.multi_city", legs=legs, beam_width=beam_width):
+            for leg in range(legs):
+                stage_filters = [self._multi_city_stage(filters, chosen) for _, chosen in beam]
+                with span("flights.multi_city_level", leg=leg, requests=len(beam)):
+                    options = self._fetch_legs(stage_filters, enhanced_search)
+                # Rank extensions by the raw prices so only the surviving flights are parsed
+                options = [as_lazy(flights or ()) for flights in options]
+                extensions = heapq.nsmallest(
+                    beam_width,
+                    (
+                        (price + flights.value(index, "price"), chosen, flights, index)
+                        for (price, chosen), flights in zip(beam, options, strict=True)
+                        for index in range(len(flights))
+                    ),
+                    key=lambda item: item[0],
+                )
+                beam = [
+                    (price, chosen + (flights[index],))
+                    for price, chosen, flights, index in extensions
+                ]
+                if not beam:
+                    return None
+        return [chosen for _, chosen in beam]
+
+    @staticmethod
+    def _multi_city_stage(
+        filters: FlightSearchFilters, chosen: tuple[FlightResult, ...]
+    ) -> FlightSearchFilters:
+        """Get the filters that fetch the options for the leg after the chosen flights."""
+        segments = [
+            segment.model_copy(
+                update={"selected_flight": chosen[index] if index < len(chosen) else None}
+            )
+            for index, segment in enumerate(filters.flight_segments)
+        ]
+        return filters.model_copy(update={"flight_segments": segments})
+
+    def _fetch_legs(
+        self, stage_filters: list[FlightSearchFilters], enhanced_search: bool
+    ) -> list[list[FlightResult] | None]:
+        """Fetch the next-leg options of several partial itineraries concurrently.
+
+        Failed requests yield None for their itinerary, which is then dropped from the beam.
+
+        Raises:
+            Exception: If every request failed
+
+        """
+        url = self._shopping_url()
+
+        def fetch(leg_filters: FlightSearchFilters) -> list[FlightResult] | None:
+            with span("flights.encode"):
+                encoded_filters = leg_filters.encode(enhanced_search=enhanced_search)
+            return self._fetch_flights(url, encoded_filters)
+
+        if len(stage_filters) == 1:
+            try:
+                return [fetch(stage_filters[0])]
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                raise Exception(f"Search failed: {str(e)}") from e
+
+        def submit(pool, leg_filters: FlightSearchFilters):
+            # Run in a copy of this context so the fetch's cache freshness is collected
+            return pool.submit(contextvars.copy_context().run, fetch, leg_filters)
+
+        if self.context is not None:
+            pool = self.context.fetch_executor
+            futures = [submit(pool, leg_filters) for leg_filters in stage_filters]
+        else:
+            workers = min(self.MAX_CONCURRENT_LEG_SEARCHES, len(stage_filters))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fli-legs") as pool:
+                futures = [submit(pool, leg_filters) for leg_filters in stage_filters]
+        results, errors = [], []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("Multi-city leg search failed: %s", e)
+                errors.append(e)
+                results.append(None)
+        if len(errors) == len(futures):
+            if isinstance(errors[0], CircuitOpenError):
+                raise errors[0]
+            raise Exception(f"Search failed: {str(errors[0])}") from errors[0]
+        return results
+
+    def _fetch_flights(self, url: str, encoded_filters: str) -> LazyFlightList | None:
+        """Send a single shopping request, answering from the cache when possible.
+
+        Args:
+            url: Endpoint URL including localization parameters
+            encoded_filters: Encoded filters for the request body
+
+        Returns:
+            Flights for this request, parsed on first access, or None if the response had
+            no results
+
+        """
+
+        def load() -> LazyFlightList | None:
             response = self.client.post(
-                url=url_with_params,
+                url=url,
                 data=f"f.req={encoded_filters}",
                 impersonate="chrome",
                 allow_redirects=True,
             )
             response.raise_for_status()
 
-            parsed = json.loads(response.text.lstrip(")]}'"))[0][2]
-            if not parsed:
-                return None
-
-            encoded_filters = json.loads(parsed)
-            flights_data = [
-                item
-                for i in [2, 3]
-                if isinstance(encoded_filters[i], list)
-                for item in encoded_filters[i][0]
-            ]
-            flights = [self._parse_flights_data(flight) for flight in flights_data]
-
-            if (
-                filters.trip_type == TripType.ONE_WAY
-                or filters.flight_segments[0].selected_flight is not None
-            ):
-                return flights
-
-            # Get the return flights if round-trip
-            flight_pairs = []
-            # Call the search again with the return flight data
-            for selected_flight in flights[:top_n]:
-                selected_flight_filters = deepcopy(filters)
-                selected_flight_filters.flight_segments[0].selected_flight = selected_flight
-                return_flights = self._search_internal(selected_flight_filters, top_n=top_n, enhanced_search=enhanced_search)
-                if return_flights is not None:
-                    flight_pairs.extend(
-                        (selected_flight, return_flight) for return_flight in return_flights
-                    )
+            with span("flights.decode"):
+                data = loads_embedded(response.content)
+                if data is None:
+                    return None
 
-            return flight_pairs
+                flights_data = [
+                    item for i in [2, 3] if isinstance(data[i], list) for item in data[i][0]
+                ]
+            # Flights are parsed on first access, so top-N callers only pay for N of them
+            return LazyFlightList(flights_data, self._parse_flights_data)
 
-        except Exception as e:
-            raise Exception(f"Search failed: {str(e)}") from e
+        flights = load_through(self.cache, ("flights", url, encoded_filters), load)
+        return flights.copy() if flights is not None else None
 
     @staticmethod
     def _parse_flights_data(data: list) -> FlightResult:
@@ -199,12 +521,12 @@ class SearchFlights:
         """
         try:
             # Safe access with fallbacks for different data structures
-            price = SearchFlights._safe_get_nested(data, [1, 0, -1], 0)
-            duration = SearchFlights._safe_get_nested(data, [0, 9], 0)
+            price = raw_price(data)
+            duration = raw_duration(data)
 
             # Handle different flight leg structures
             flight_legs_data = SearchFlights._safe_get_nested(data, [0, 2], [])
-            stops = max(0, len(flight_legs_data) - 1) if flight_legs_data else 0
+            stops = raw_stops(data)
 
             legs = []
             for fl in flight_legs_data:
@@ -221,7 +543,8 @@ class SearchFlights:
                     legs.append(leg)
                 except Exception as e:
                     # Log the error but continue processing other legs
-                    print(f"Warning: Failed to parse flight leg: {e}")
+                    PARSE_FAILURES.inc(source="google_flights", kind="leg")
+                    logger.warning("Failed to parse flight leg: %s", e)
                     continue
 
             flight = FlightResult(
@@ -284,7 +607,7 @@ class SearchFlights:
             return SearchFlights._parse_airline(airline_code)
         except Exception:
             # Return a default airline if parsing fails
-            return Airline.UNKNOWN if hasattr(Airline, "UNKNOWN") else list(Airline)[0]
+            return DEFAULT_AIRLINE
 
     @staticmethod
     def _parse_airport_safe(flight_leg: list, index: int) -> Airport:
@@ -308,9 +631,9 @@ class SearchFlights:
                 if airport_code and isinstance(airport_code, str) and len(airport_code) == 3:
                     return SearchFlights._parse_airport(airport_code)
             # If all fails, return a default
-            return list(Airport)[0]
+            return DEFAULT_AIRPORT
         except Exception:
-            return list(Airport)[0]
+            return DEFAULT_AIRPORT
 
     @staticmethod
     def _parse_datetime_safe(
@@ -397,17 +720,38 @@ class SearchKiwiFlights:
     using Kiwi.com's API, with optional hidden city flight filtering.
     """
 
-    def __init__(self, localization_config: LocalizationConfig = None, hidden_city_only: bool = False):
+    MAX_CONCURRENT_PAIRS = 4
+
+    def __init__(
+        self,
+        localization_config: LocalizationConfig = None,
+        hidden_city_only: bool = False,
+        cache: SearchCache | None = None,
+        compact: bool = False,
+        context: "SearchContext | None" = None,
+    ):
         """Initialize the Kiwi search client.
 
         Args:
             localization_config: Configuration for language and currency settings
             hidden_city_only: If True, search only hidden city flights. If False, search all flight types.
+            cache: Optional result cache shared with other searchers
+            compact: Return (and cache) slotted ``CompactResult`` records instead of
+                ``FlightResult`` models
+            context: Search context providing the Kiwi rate limit, cache and event loop
         """
+        self.context = context
         self.localization_config = localization_config or LocalizationConfig()
-        self.kiwi_client = KiwiFlightsAPI(localization_config)
+        self.kiwi_client = (
+            context.kiwi_api(localization_config)
+            if context is not None
+            else KiwiFlightsAPI(localization_config)
+        )
         self.hidden_city_only = hidden_city_only
+        self.cache = cache if cache is not None or context is None else context.cache
+        self.compact = compact
 
+    @reports_freshness
     def search(
         self, filters: FlightSearchFilters, top_n: int = 5
     ) -> list[FlightResult | tuple[FlightResult, FlightResult]] | None:
@@ -418,19 +762,97 @@ class SearchKiwiFlights:
             top_n: Number of flights to return
 
         Returns:
-            List of FlightResult objects or flight pairs for round-trip
+            List of FlightResult objects or flight pairs for round-trip (CompactResult
+            records when the searcher was created with ``compact=True``), with the age of
+            the data in its ``freshness`` attribute
+
+        Raises:
+            CircuitOpenError: If the Kiwi circuit breaker is open
+            Exception: If every airport pair's search failed
+
         """
-        # Run async search in sync context
-        return asyncio.run(self._async_search(filters, top_n))
+        key = (
+            "kiwi",
+            self.hidden_city_only,
+            self.localization_config.api_language_code,
+            self.localization_config.api_currency_code,
+            filters.encode(),
+            top_n,
+            self.compact,
+        )
+
+        def load() -> list | None:
+            # Run async search in sync context
+            with span("kiwi.search", trip_type=filters.trip_type.name):
+                if self.context is not None:
+                    results = self.context.run_async(self._async_search(filters, top_n))
+                else:
+                    results = asyncio.run(self._async_search(filters, top_n))
+            return to_compact(results) if self.compact else results
+
+        results = load_through(self.cache, key, load)
+        return list(results) if results is not None else None
 
     async def _async_search(
         self, filters: FlightSearchFilters, top_n: int = 5
     ) -> list[FlightResult | tuple[FlightResult, FlightResult]] | None:
-        """Async implementation of the search method."""
+        """Async implementation of the search method.
+
+        Kiwi takes a single origin and destination per query, so a segment with several
+        airports per end (e.g. after ``expand_nearby``) is searched as one query per
+        origin/destination pair, at most ``MAX_CONCURRENT_PAIRS`` at a time, and the
+        cheapest ``top_n`` results across all pairs are returned.
+        """
+        segment = filters.flight_segments[0]
+        pairs = [
+            (origin[0].name, destination[0].name)
+            for origin in segment.departure_airport
+            for destination in segment.arrival_airport
+            if origin[0] != destination[0]
+        ]
+        if len(pairs) == 1:
+            return await self._search_pair(filters, *pairs[0], top_n)
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAIRS)
+
+        async def search_pair(origin: str, destination: str):
+            async with semaphore:
+                return await self._search_pair(filters, origin, destination, top_n)
+
+        with span("kiwi.fan_out", pairs=len(pairs)):
+            outcomes = await asyncio.gather(
+                *(search_pair(*pair) for pair in pairs), return_exceptions=True
+            )
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if len(failures) == len(outcomes):
+            raise failures[0]
+        for failure in failures:
+            logger.warning("Kiwi search for one airport pair failed: %s", failure)
+
+        merged = [
+            item
+            for outcome in outcomes
+            if outcome and not isinstance(outcome, BaseException)
+            for item in outcome
+        ]
+        if not merged and all(outcome is None for outcome in outcomes):
+            return None
+        merged.sort(key=self._total_price)
+        return merged[:top_n]
+
+    @staticmethod
+    def _total_price(item: FlightResult | tuple[FlightResult, FlightResult]) -> float:
+        """Get the price of a result or the combined price of a round-trip pair."""
+        if isinstance(item, tuple):
+            return sum(flight.price for flight in item)
+        return item.price
+
+    async def _search_pair(
+        self, filters: FlightSearchFilters, origin: str, destination: str, top_n: int
+    ) -> list[FlightResult | tuple[FlightResult, FlightResult]] | None:
+        """Search a single origin/destination pair."""
         try:
             # Extract search parameters from filters
-            origin = filters.flight_segments[0].departure_airport[0][0].name
-            destination = filters.flight_segments[0].arrival_airport[0][0].name
             departure_date = filters.flight_segments[0].travel_date
             adults = filters.passenger_info.adults
 
@@ -446,21 +868,29 @@ class SearchKiwiFlights:
                     adults=adults,
                     limit=top_n,
                     cabin_class=cabin_class,
-                    hidden_city_only=self.hidden_city_only
+                    hidden_city_only=self.hidden_city_only,
+                    raw_itineraries=True,
                 )
 
                 if result.get("success"):
                     flights = []
-                    for flight_data in result.get("flights", []):
-                        # Return all flights, not just hidden city flights
-                        # This allows users to see both regular and hidden city options
-                        try:
-                            flight_result = self._convert_kiwi_to_flight_result(flight_data)
-                            flights.append(flight_result)
-                        except Exception as e:
-                            # Skip flights that can't be converted
-                            continue
-                    return flights[:top_n]
+                    with span("kiwi.parse"):
+                        for itinerary in result.get("itineraries", []):
+                            # Return all flights, not just hidden city flights
+                            # This allows users to see both regular and hidden city options
+                            try:
+                                flight_result = parse_oneway_itinerary(
+                                    itinerary, self.localization_config
+                                )
+                            except Exception:
+                                # Skip flights that can't be converted
+                                PARSE_FAILURES.inc(source="kiwi", kind="itinerary")
+                                continue
+                            if flight_result is not None:
+                                flights.append(flight_result)
+                                if len(flights) >= top_n:
+                                    break
+                    return flights
 
             elif filters.trip_type == TripType.ROUND_TRIP:
                 # Round trip search
@@ -476,248 +906,37 @@ class SearchKiwiFlights:
                     adults=adults,
                     limit=top_n,
                     cabin_class=cabin_class,
-                    hidden_city_only=self.hidden_city_only
+                    hidden_city_only=self.hidden_city_only,
+                    raw_itineraries=True,
                 )
 
                 if result.get("success"):
                     flight_pairs = []
-                    for flight_data in result.get("flights", []):
-                        # Return all flights, not just hidden city flights
-                        # This allows users to see both regular and hidden city options
-                        try:
-                            outbound = self._convert_kiwi_roundtrip_to_flight_result(
-                                flight_data, "outbound"
-                            )
-                            inbound = self._convert_kiwi_roundtrip_to_flight_result(
-                                flight_data, "inbound"
-                            )
-                            flight_pairs.append((outbound, inbound))
-                        except Exception as e:
-                            # Skip flights that can't be converted
-                            continue
-                    return flight_pairs[:top_n]
+                    with span("kiwi.parse"):
+                        for itinerary in result.get("itineraries", []):
+                            # Return all flights, not just hidden city flights
+                            # This allows users to see both regular and hidden city options
+                            try:
+                                pair = parse_roundtrip_itinerary(
+                                    itinerary, self.localization_config
+                                )
+                            except Exception:
+                                # Skip flights that can't be converted
+                                PARSE_FAILURES.inc(source="kiwi", kind="itinerary")
+                                continue
+                            if pair is not None:
+                                flight_pairs.append(pair)
+                                if len(flight_pairs) >= top_n:
+                                    break
+                    return flight_pairs
 
             return None
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             raise Exception(f"Kiwi search failed: {str(e)}") from e
 
-    def _convert_kiwi_to_flight_result(self, kiwi_flight: dict) -> FlightResult:
-        """Convert Kiwi flight data to FlightResult format with complete route information.
-
-        Args:
-            kiwi_flight: Flight data from Kiwi API
-
-        Returns:
-            FlightResult object compatible with Google Flights format
-        """
-        try:
-            # Create flight legs for all segments
-            legs = []
-            route_segments = kiwi_flight.get("route_segments", [])
-
-            if route_segments:
-                # Multi-segment flight - create leg for each segment
-                for segment in route_segments:
-                    leg = FlightLeg(
-                        airline=self._parse_airline_from_code(segment.get("carrier", "")),
-                        flight_number=segment.get("flight_number", ""),
-                        departure_airport=self._parse_airport_from_code(segment.get("from", "")),
-                        arrival_airport=self._parse_airport_from_code(segment.get("to", "")),
-                        departure_datetime=self._parse_kiwi_datetime(segment.get("departure_time", "")),
-                        arrival_datetime=self._parse_kiwi_datetime(segment.get("arrival_time", "")),
-                        duration=segment.get("duration", 0) // 60,  # Convert to minutes
-                    )
-                    legs.append(leg)
-            else:
-                # Single segment flight - fallback to original logic
-                leg = FlightLeg(
-                    airline=self._parse_airline_from_code(kiwi_flight.get("carrier_code", "")),
-                    flight_number=kiwi_flight.get("flight_number", ""),
-                    departure_airport=self._parse_airport_from_code(kiwi_flight.get("departure_airport", "")),
-                    arrival_airport=self._parse_airport_from_code(kiwi_flight.get("arrival_airport", "")),
-                    departure_datetime=self._parse_kiwi_datetime(kiwi_flight.get("departure_time", "")),
-                    arrival_datetime=self._parse_kiwi_datetime(kiwi_flight.get("arrival_time", "")),
-                    duration=kiwi_flight.get("duration_minutes", 0),
-                )
-                legs.append(leg)
-
-            # Extract and convert price safely
-            price_value = kiwi_flight.get("price", 0)
-            if isinstance(price_value, str):
-                try:
-                    price_value = float(price_value)
-                except (ValueError, TypeError):
-                    price_value = 0
-            elif price_value is None:
-                price_value = 0
-
-            # Create flight result
-            flight_result = FlightResult(
-                price=price_value,
-                duration=kiwi_flight.get("duration_minutes", 0),
-                stops=max(0, kiwi_flight.get("segment_count", 1) - 1),
-                legs=legs,
-                # Add hidden city information as metadata
-                hidden_city_info={
-                    "is_hidden_city": kiwi_flight.get("is_hidden_city", False),
-                    "hidden_destination_code": kiwi_flight.get("hidden_destination_code", ""),
-                    "hidden_destination_name": kiwi_flight.get("hidden_destination_name", ""),
-                    "is_throwaway": kiwi_flight.get("is_throwaway", False),
-                    "route_segments": route_segments,  # Include complete route info
-                }
-            )
-
-            return flight_result
-
-        except Exception as e:
-            raise Exception(f"Failed to convert Kiwi flight data: {e}") from e
-
-    def _convert_kiwi_roundtrip_to_flight_result(self, kiwi_flight: dict, direction: str) -> FlightResult:
-        """Convert Kiwi round-trip flight data to FlightResult format.
-
-        Args:
-            kiwi_flight: Round-trip flight data from Kiwi API
-            direction: "outbound" or "inbound"
-
-        Returns:
-            FlightResult object for the specified direction
-        """
-        try:
-            leg_data = kiwi_flight.get(direction, {})
-
-            # Create flight leg
-            leg = FlightLeg(
-                airline=self._parse_airline_from_code(leg_data.get("carrier_code", "")),
-                flight_number=leg_data.get("flight_number", ""),
-                departure_airport=self._parse_airport_from_code(leg_data.get("departure_airport", "")),
-                arrival_airport=self._parse_airport_from_code(leg_data.get("arrival_airport", "")),
-                departure_datetime=self._parse_kiwi_datetime(leg_data.get("departure_time", "")),
-                arrival_datetime=self._parse_kiwi_datetime(leg_data.get("arrival_time", "")),
-                duration=leg_data.get("duration", 0),
-            )
-
-            # Extract and convert price safely for round-trip
-            total_price = kiwi_flight.get("total_price", 0)
-            if total_price == 0:
-                # Fallback to main price field
-                total_price = kiwi_flight.get("price", 0)
-
-            if isinstance(total_price, str):
-                try:
-                    total_price = float(total_price)
-                except (ValueError, TypeError):
-                    total_price = 0
-            elif total_price is None:
-                total_price = 0
-
-            # Split price for each direction (outbound/inbound)
-            direction_price = total_price / 2 if total_price > 0 else 0
-
-            # Create flight result
-            flight_result = FlightResult(
-                price=direction_price,
-                duration=leg_data.get("duration", 0),
-                stops=0,  # Assuming direct flights for now
-                legs=[leg],
-                # Add hidden city information
-                hidden_city_info={
-                    "is_hidden_city": leg_data.get("is_hidden", False),
-                    "hidden_destination_code": leg_data.get("hidden_destination_code", ""),
-                    "hidden_destination_name": leg_data.get("hidden_destination_name", ""),
-                    "direction": direction,
-                    "total_price": total_price,  # Store total price for reference
-                }
-            )
-
-            return flight_result
-
-        except Exception as e:
-            raise Exception(f"Failed to convert Kiwi round-trip flight data: {e}") from e
-
-    def _parse_airline_from_code(self, airline_code: str) -> Airline:
-        """Convert airline code to Airline enum.
-
-        Args:
-            airline_code: Airline code (e.g., "CA", "BA")
-
-        Returns:
-            Airline enum value or default
-        """
-        try:
-            if not airline_code:
-                return list(Airline)[0]  # Default airline
-
-            # Handle numeric codes
-            if airline_code[0].isdigit():
-                airline_code = f"_{airline_code}"
-
-            # Try to get the airline enum
-            if hasattr(Airline, airline_code):
-                return getattr(Airline, airline_code)
-            else:
-                # Return default if not found
-                return list(Airline)[0]
-
-        except Exception:
-            return list(Airline)[0]
-
-    def _parse_airport_from_code(self, airport_code: str) -> Airport:
-        """Convert airport code to Airport enum.
-
-        Args:
-            airport_code: Airport code (e.g., "LHR", "PEK")
-
-        Returns:
-            Airport enum value or default
-        """
-        try:
-            if not airport_code:
-                return list(Airport)[0]  # Default airport
-
-            # Try to get the airport enum
-            if hasattr(Airport, airport_code):
-                return getattr(Airport, airport_code)
-            else:
-                # Return default if not found
-                return list(Airport)[0]
-
-        except Exception:
-            return list(Airport)[0]
-
-    def _parse_kiwi_datetime(self, datetime_str: str) -> datetime:
-        """Parse Kiwi datetime string to datetime object.
-
-        Args:
-            datetime_str: Datetime string from Kiwi API
-
-        Returns:
-            Parsed datetime object or current time as fallback
-        """
-        try:
-            if not datetime_str:
-                return datetime.now()
-
-            # Try different datetime formats that Kiwi might use
-            formats = [
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%dT%H:%M:%S.%f",
-                "%Y-%m-%dT%H:%M:%SZ",
-            ]
-
-            for fmt in formats:
-                try:
-                    return datetime.strptime(datetime_str, fmt)
-                except ValueError:
-                    continue
-
-            # If all formats fail, return current time
-            return datetime.now()
-
-        except Exception:
-            return datetime.now()
-
     def _convert_seat_type_to_cabin_class(self, seat_type) -> str:
         """Convert SeatType enum to Kiwi API cabin class string.
 
@@ -0,0 +1,238 @@
+"""Lazily parsed flight results.
+
+A Google Flights shopping response holds every flight of both result blocks, up to 135+
+in extended mode, but most searches only look at a handful of them: round trips pair the
+first ``top_n`` outbound flights, multi-city and best-first searches only keep the
+cheapest options. ``LazyFlightList`` keeps the raw flight arrays and builds a
+``FlightResult`` (with its validated legs) only when an item is accessed. Price, duration
+and stop count are read straight from the raw arrays, so sorting or picking the cheapest
+flights parses nothing but the flights returned.
+
+Example:
+    >>> flights = LazyFlightList(raw_flights, SearchFlights._parse_flights_data)
+    >>> cheapest = flights.top(5)  # parses 5 flights
+    >>> flights.parsed_count
+    5
+
+"""
+
+import heapq
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from fli.core.tracing import span
+from fli.models import FlightResult
+
+SortKey = str | Callable[[FlightResult], Any] | None
+
+
+def _nested(data: Any, path: list[int], default: Any = None) -> Any:
+    """Follow a path of indices into nested lists, returning default when it breaks."""
+    try:
+        for index in path:
+            if hasattr(data, "__getitem__") and len(data) > index:
+                data = data[index]
+            else:
+                return default
+        return data
+    except (IndexError, KeyError, TypeError):
+        return default
+
+
+def raw_price(data: list) -> Any:
+    """Get the price of a raw flight array."""
+    return _nested(data, [1, 0, -1], 0)
+
+
+def raw_duration(data: list) -> Any:
+    """Get the total duration in minutes of a raw flight array."""
+    return _nested(data, [0, 9], 0)
+
+
+def raw_stops(data: list) -> int:
+    """Get the number of stops of a raw flight array."""
+    legs = _nested(data, [0, 2], [])
+    return max(0, len(legs) - 1) if legs else 0
+
+
+_RAW_KEYS: dict[str, Callable[[list], Any]] = {
+    "price": raw_price,
+    "duration": raw_duration,
+    "stops": raw_stops,
+}
+
+
+def _sortable(value: Any) -> float:
+    """Get a comparable key, sending missing or malformed values last."""
+    return value if isinstance(value, int | float) else float("inf")
+
+
+class _Slot:
+    """A raw flight and, once parsed, its result (shared by copies and slices)."""
+
+    __slots__ = ("raw", "result")
+
+    def __init__(self, raw: list | None, result: FlightResult | None = None):
+        self.raw = raw
+        self.result = result
+
+
+class LazyFlightList(Sequence[FlightResult]):
+    """Read-only sequence of flights parsed on first access.
+
+    Slices, copies and sorted views share the parsed results, so a flight is parsed at
+    most once however the list is reordered. ``sort`` reorders in place like
+    ``list.sort``; the cheap keys ``"price"``, ``"duration"`` and ``"stops"`` are read from
+    the raw arrays, while callable keys receive (and therefore parse) every flight.
+    """
+
+    __slots__ = ("_slots", "_parse")
+
+    def __init__(self, raw_flights: Iterable[list], parse: Callable[[list], FlightResult]):
+        """Wrap raw flight arrays.
+
+        Args:
+            raw_flights: Raw flight arrays from a shopping response
+            parse: Converts one raw array into a ``FlightResult``
+
+        """
+        self._slots = [_Slot(raw) for raw in raw_flights]
+        self._parse = parse
+
+    @classmethod
+    def _from_slots(
+        cls, slots: list[_Slot], parse: Callable[[list], FlightResult]
+    ) -> "LazyFlightList":
+        """Create a list over existing slots."""
+        instance = cls.__new__(cls)
+        instance._slots = slots
+        instance._parse = parse
+        return instance
+
+    @classmethod
+    def from_results(cls, results: Iterable[FlightResult]) -> "LazyFlightList":
+        """Create a list of flights that are already parsed."""
+        return cls._from_slots([_Slot(None, result) for result in results], _no_raw)
+
+    def _materialize(self, slot: _Slot) -> FlightResult:
+        """Get the result of a slot, parsing it on first access."""
+        result = slot.result
+        if result is None:
+            with span("flights.parse"):
+                result = slot.result = self._parse(slot.raw)
+        return result
+
+    def __len__(self) -> int:
+        """Get the number of flights."""
+        return len(self._slots)
+
+    @overload
+    def __getitem__(self, index: int) -> FlightResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LazyFlightList": ...
+
+    def __getitem__(self, index):
+        """Get a parsed flight, or a lazy view of a slice."""
+        if isinstance(index, slice):
+            return self._from_slots(self._slots[index], self._parse)
+        return self._materialize(self._slots[index])
+
+    def __iter__(self) -> Iterator[FlightResult]:
+        """Iterate over the flights, parsing each as it is reached."""
+        for slot in self._slots:
+            yield self._materialize(slot)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare flight by flight with another sequence of flights."""
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Describe the list without parsing it."""
+        return f"<LazyFlightList {len(self)} flights, {self.parsed_count} parsed>"
+
+    @property
+    def parsed_count(self) -> int:
+        """Get how many of the flights have been parsed."""
+        return sum(slot.result is not None for slot in self._slots)
+
+    def _key(self, key: str) -> Callable[[_Slot], Any]:
+        """Get a slot sort key for a cheap key name."""
+        try:
+            raw_key = _RAW_KEYS[key]
+        except KeyError:
+            raise ValueError(f"Unknown sort key {key!r}; use one of {list(_RAW_KEYS)}") from None
+
+        def slot_key(slot: _Slot) -> float:
+            if slot.result is not None:
+                return getattr(slot.result, key)
+            return _sortable(raw_key(slot.raw))
+
+        return slot_key
+
+    def value(self, index: int, key: str) -> Any:
+        """Get the price, duration or stops of a flight without parsing it.
+
+        Args:
+            index: Flight index
+            key: ``"price"``, ``"duration"`` or ``"stops"``
+
+        Returns:
+            The value (``inf`` if it is missing from the raw data)
+
+        """
+        return self._key(key)(self._slots[index])
+
+    def copy(self) -> "LazyFlightList":
+        """Get a shallow copy that can be reordered independently."""
+        return self._from_slots(list(self._slots), self._parse)
+
+    def sort(self, key: SortKey = None, reverse: bool = False) -> None:
+        """Sort the flights in place.
+
+        Args:
+            key: ``"price"``, ``"duration"``, ``"stops"``, or a callable taking a
+                ``FlightResult`` (which parses every flight); defaults to ``"price"``
+            reverse: Sort in descending order
+
+        """
+        if key is None or isinstance(key, str):
+            self._slots.sort(key=self._key(key or "price"), reverse=reverse)
+        else:
+            self._slots.sort(key=lambda slot: key(self._materialize(slot)), reverse=reverse)
+
+    def sorted_by(self, key: SortKey = None, reverse: bool = False) -> "LazyFlightList":
+        """Get a sorted copy; see ``sort``."""
+        ordered = self.copy()
+        ordered.sort(key, reverse)
+        return ordered
+
+    def top(self, n: int, key: str = "price") -> list[FlightResult]:
+        """Get the ``n`` flights with the smallest cheap key, parsing only those.
+
+        Args:
+            n: Number of flights
+            key: ``"price"``, ``"duration"`` or ``"stops"``
+
+        Returns:
+            Parsed flights in ascending key order (ties keep their original order)
+
+        """
+        slots = heapq.nsmallest(n, self._slots, key=self._key(key))
+        return [self._materialize(slot) for slot in slots]
+
+
+def _no_raw(raw: list) -> FlightResult:
+    """Parser of lists built from results, which never has anything to parse."""
+    raise ValueError("Flight has no raw data to parse")
+
+
+def as_lazy(flights: Sequence[FlightResult]) -> LazyFlightList:
+    """Get flights as a ``LazyFlightList``, wrapping already parsed results if needed."""
+    if isinstance(flights, LazyFlightList):
+        return flights
+    return LazyFlightList.from_results(flights)
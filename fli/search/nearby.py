@@ -0,0 +1,121 @@
+"""Expand search filters to airports near the requested origin and destination.
+
+Google Flights accepts several airports per segment end and searches them in one request,
+so expanding the filters is all a ``SearchFlights``/``SearchDates`` search needs.
+``SearchKiwiFlights`` queries each origin/destination pair of an expanded segment
+concurrently and merges the cheapest results.
+
+Example:
+    >>> filters = expand_nearby(filters, radius_km=150)
+    >>> SearchFlights().search(filters)  # JFK, LGA, EWR, ... to LHR, LGW, STN, ...
+
+"""
+
+from fli.api.airport_geo import nearby
+from fli.models import Airport, DateSearchFilters, FlightSearchFilters
+
+Filters = FlightSearchFilters | DateSearchFilters
+
+DEFAULT_MAX_AIRPORTS = 5
+
+
+def nearby_airports(
+    airport: Airport,
+    radius_km: float,
+    max_airports: int = DEFAULT_MAX_AIRPORTS,
+    major_only: bool = True,
+) -> list[Airport]:
+    """Get an airport and its nearest neighbours within a radius.
+
+    Args:
+        airport: Centre airport
+        radius_km: Search radius in kilometres
+        max_airports: Maximum number of airports returned, including the centre airport
+        major_only: Skip airfields that are not major airports
+
+    Returns:
+        Airports nearest first, starting with the centre airport
+
+    """
+    airports = [airport]
+    for found in nearby(airport.name, radius_km, major_only):
+        member = Airport.__members__.get(found.code)
+        if member is not None and member not in airports:
+            airports.append(member)
+        if len(airports) >= max_airports:
+            break
+    return airports
+
+
+def expand_nearby(
+    filters: Filters,
+    radius_km: float,
+    max_airports: int = DEFAULT_MAX_AIRPORTS,
+    origin: bool = True,
+    destination: bool = True,
+    major_only: bool = True,
+) -> Filters:
+    """Add nearby airports to every segment end that uses the origin or destination.
+
+    The first segment defines the origin and destination; later segments (the return leg of
+    a round trip) are expanded wherever they use one of those airports. Airports already on
+    the other end of a segment are not added.
+
+    Args:
+        filters: Flight or date search filters
+        radius_km: Search radius in kilometres
+        max_airports: Maximum airports per expanded end, including the original one
+        origin: Expand the origin
+        destination: Expand the destination
+        major_only: Only add major airports
+
+    Returns:
+        Expanded copy of the filters (the original is not modified)
+
+    """
+    expanded = filters.model_copy(deep=True)
+    if radius_km <= 0 or not expanded.flight_segments:
+        return expanded
+
+    first = expanded.flight_segments[0]
+    centres = set()
+    if origin:
+        centres.update(entry[0] for entry in first.departure_airport)
+    if destination:
+        centres.update(entry[0] for entry in first.arrival_airport)
+    areas = {
+        airport: nearby_airports(airport, radius_km, max_airports, major_only)
+        for airport in centres
+        if isinstance(airport, Airport)
+    }
+
+    for segment in expanded.flight_segments:
+        arrival_airports = {entry[0] for entry in segment.arrival_airport}
+        segment.departure_airport = _expand_end(segment.departure_airport, areas, arrival_airports)
+        departure_airports = {entry[0] for entry in segment.departure_airport}
+        segment.arrival_airport = _expand_end(segment.arrival_airport, areas, departure_airports)
+    return expanded
+
+
+def _expand_end(
+    entries: list[list], areas: dict[Airport, list[Airport]], exclude: set
+) -> list[list]:
+    """Add the nearby airports of every centre airport in a segment end.
+
+    Args:
+        entries: ``[Airport, int]`` entries of the segment end
+        areas: Nearby airports of each centre airport
+        exclude: Airports on the other end of the segment, which are never added
+
+    Returns:
+        The original entries followed by the added airports
+
+    """
+    result = [list(entry) for entry in entries]
+    seen = exclude | {entry[0] for entry in entries}
+    for entry in entries:
+        for airport in areas.get(entry[0], ()):
+            if airport not in seen:
+                seen.add(airport)
+                result.append([airport, 0])
+    return result
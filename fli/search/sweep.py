@@ -0,0 +1,206 @@
+"""Multi-process sweeps over many flight and calendar queries.
+
+A thread pool (``SearchContext.map`` or the ``batch`` command) shares one interpreter, so
+parsing the responses of a large sweep is bound to a single core. ``SweepRunner`` shards
+the queries across a ``ProcessPoolExecutor`` instead:
+
+- each worker process builds its searchers once, in the pool initializer, around its own
+  HTTP client and cache, and reuses them (and their connections) for every query it runs
+- every worker's client draws from one ``SharedTokenBucket``, so ``rate_limit`` is the
+  aggregate request rate of the whole sweep however many processes run it
+- results come back as ``FlightTable`` (flight searches) or ``DateCalendar`` (calendar
+  searches) NumPy arrays, which pickle as a few flat buffers rather than a graph of
+  pydantic models; call ``to_models`` on a table when models are needed
+
+Example:
+    >>> with SweepRunner(processes=4, rate_limit=20) as runner:
+    ...     for result in runner.map(queries):
+    ...         if result.ok:
+    ...             print(result.index, result.data.item_prices().min())
+
+"""
+
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+
+from fli.core.ratelimit import SharedTokenBucket
+from fli.models import DateSearchFilters, FlightSearchFilters
+from fli.models.columnar import FlightTable
+from fli.models.google_flights.base import LocalizationConfig
+from fli.search.cache import SearchCache
+from fli.search.client import DEFAULT_RATE_LIMIT, Client
+from fli.search.context import SearchContext
+from fli.search.dates import DateCalendar
+
+SweepQuery = FlightSearchFilters | DateSearchFilters
+
+
+@dataclass(frozen=True, slots=True)
+class SweepResult:
+    """Outcome of one sweep query."""
+
+    index: int  # position of the query in the input
+    data: FlightTable | DateCalendar | None  # None when the search failed or found nothing
+    error: str | None = None
+    elapsed: float = 0.0  # seconds spent in the worker
+
+    @property
+    def ok(self) -> bool:
+        """Check whether the query ran without an error."""
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class _WorkerSettings:
+    """Settings shipped to every worker process by the pool initializer."""
+
+    client_factory: Callable[..., Client]
+    localization_config: LocalizationConfig | None
+    top_n: int
+    enhanced_search: bool
+    cache_ttl: float
+
+
+class _SweepWorker:
+    """Per-process search state, created once by the pool initializer."""
+
+    def __init__(self, limiter: SharedTokenBucket, settings: _WorkerSettings):
+        """Build the process's client, cache and searchers."""
+        self.settings = settings
+        self.context = SearchContext(
+            name=f"sweep-{os.getpid()}",
+            client=settings.client_factory(limiter=limiter),
+            cache=SearchCache(ttl=settings.cache_ttl, name="sweep") if settings.cache_ttl else None,
+        )
+        self.flights = self.context.flights(settings.localization_config)
+        self.dates = self.context.dates(settings.localization_config)
+
+    def run(self, index: int, query: SweepQuery) -> SweepResult:
+        """Run one query, reporting a failure in the result instead of raising it."""
+        start = time.perf_counter()
+        try:
+            if isinstance(query, DateSearchFilters):
+                data = self.dates.search_calendar(query)
+            elif isinstance(query, FlightSearchFilters):
+                results = self.flights.search(
+                    query,
+                    top_n=self.settings.top_n,
+                    enhanced_search=self.settings.enhanced_search,
+                )
+                data = FlightTable.from_results(results) if results else None
+            else:
+                raise TypeError(f"Unsupported sweep query: {type(query).__name__}")
+        except Exception as e:
+            return SweepResult(index, None, str(e), time.perf_counter() - start)
+        return SweepResult(index, data, None, time.perf_counter() - start)
+
+
+_worker: _SweepWorker | None = None
+
+
+def _init_worker(limiter: SharedTokenBucket, settings: _WorkerSettings) -> None:
+    """Create the worker state of a pool process."""
+    global _worker
+    _worker = _SweepWorker(limiter, settings)
+
+
+def _run_query(index: int, query: SweepQuery) -> SweepResult:
+    """Run one query in a pool process."""
+    return _worker.run(index, query)
+
+
+class SweepRunner:
+    """Run flight and calendar queries on a pool of worker processes."""
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        top_n: int = 5,
+        enhanced_search: bool = False,
+        cache_ttl: float = 300.0,
+        localization_config: LocalizationConfig | None = None,
+        client_factory: Callable[..., Client] = Client,
+        mp_context: BaseContext | None = None,
+    ):
+        """Initialize the runner; worker processes start on the first query.
+
+        Args:
+            processes: Number of worker processes (defaults to the number of CPUs)
+            rate_limit: Google Flights requests per second, across all workers
+            top_n: Outbound flights paired for round trips (legs kept for multi-city)
+            enhanced_search: Use the extended search mode for flight queries
+            cache_ttl: Seconds each worker caches results for (0 disables the cache)
+            localization_config: Language and currency used by every query
+            client_factory: Callable building each worker's client from a ``limiter``
+                keyword argument; it must be picklable (a class or module-level function)
+            mp_context: Multiprocessing context for the pool and the shared rate limiter
+
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.mp_context = mp_context or multiprocessing.get_context()
+        self.limiter = SharedTokenBucket(rate=rate_limit, mp_context=self.mp_context)
+        self.settings = _WorkerSettings(
+            client_factory, localization_config, top_n, enhanced_search, cache_ttl
+        )
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "SweepRunner":
+        """Use the runner as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Shut the worker processes down."""
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, starting it on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.processes,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(self.limiter, self.settings),
+            )
+        return self._executor
+
+    def map(
+        self, queries: Iterable[SweepQuery], chunksize: int | None = None
+    ) -> Iterator[SweepResult]:
+        """Run the queries on the workers, yielding results in input order.
+
+        Queries are sent to the workers in chunks to amortize the inter-process overhead.
+
+        Args:
+            queries: Flight or calendar search filters
+            chunksize: Queries per chunk (defaults to about four chunks per process)
+
+        Returns:
+            Iterator of one ``SweepResult`` per query
+
+        """
+        queries = list(queries)
+        if chunksize is None:
+            chunksize = max(1, len(queries) // (self.processes * 4))
+        return self.executor.map(_run_query, range(len(queries)), queries, chunksize=chunksize)
+
+    def run(self, queries: Iterable[SweepQuery], chunksize: int | None = None) -> list[SweepResult]:
+        """Run the queries and collect every result, in input order."""
+        return list(self.map(queries, chunksize))
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the worker processes.
+
+        Args:
+            wait: Wait for queued queries to finish instead of cancelling them
+
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
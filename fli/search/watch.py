@@ -0,0 +1,341 @@
+"""Fare-change watcher built on top of calendar searches.
+
+The watcher keeps the last observed price for every travel date in a date range and only
+re-queries dates that are due. A date becomes due once its refresh interval has elapsed;
+the interval shrinks for dates whose price has been moving and grows back towards the
+maximum for dates that stay flat. Due dates are coalesced into the smallest number of
+``SearchDates.MAX_DAYS_PER_SEARCH`` calendar requests, and every change found is emitted
+as a ``FareChange`` event through a callback and/or an asyncio queue.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from enum import Enum
+
+from fli.core.resilience import CircuitOpenError
+from fli.models import DateSearchFilters
+from fli.models.google_flights.base import TripType
+from fli.search.dates import DatePrice, SearchDates
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeType(Enum):
+    """Kinds of fare changes emitted by the watcher."""
+
+    PRICE_DROP = "price_drop"
+    PRICE_RISE = "price_rise"
+    NEW_DATE = "new_date"
+    DATE_UNAVAILABLE = "date_unavailable"
+
+
+@dataclass
+class FareChange:
+    """A detected change for a single travel date."""
+
+    change_type: ChangeType
+    route: str
+    travel_date: date
+    old_price: float | None
+    new_price: float | None
+    observed_at: datetime
+    return_date: date | None = None
+
+
+@dataclass
+class DateState:
+    """Last observation and refresh bookkeeping for one travel date."""
+
+    price: float | None = None
+    checked_at: float | None = None
+    volatility: float = 0.0
+    return_date: date | None = None
+
+
+class FareWatcher:
+    """Watch a calendar of fares and re-query only stale or volatile dates.
+
+    Example:
+        >>> watcher = FareWatcher(filters, on_change=print)
+        >>> watcher.poll()  # first poll establishes the baseline
+        >>> asyncio.run(watcher.run())  # keep polling as dates become due
+
+    """
+
+    def __init__(
+        self,
+        filters: DateSearchFilters,
+        searcher: SearchDates | None = None,
+        on_change: Callable[[FareChange], None] | None = None,
+        queue: asyncio.Queue | None = None,
+        min_interval: float = 15 * 60,
+        max_interval: float = 6 * 60 * 60,
+        volatility_weight: float = 20.0,
+        smoothing: float = 0.3,
+        min_change: float = 0.01,
+        history=None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            filters: Template calendar search; its from_date/to_date define the watched range
+            searcher: SearchDates instance used for refreshes (created if omitted)
+            on_change: Callback invoked for every change event
+            queue: Asyncio queue receiving every change event while ``run`` is active
+            min_interval: Shortest refresh interval in seconds (most volatile dates)
+            max_interval: Longest refresh interval in seconds (flat dates)
+            volatility_weight: How strongly volatility shortens the refresh interval
+            smoothing: EWMA factor for volatility updates (0-1, higher reacts faster)
+            min_change: Smallest absolute price difference reported as a change
+            history: Optional ``fli.history.PriceHistory`` that receives every refreshed chunk
+            clock: Time source in epoch seconds (injectable for tests)
+
+        """
+        self.filters = filters
+        self.searcher = searcher or SearchDates()
+        self.on_change = on_change
+        self.queue = queue
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.volatility_weight = volatility_weight
+        self.smoothing = smoothing
+        self.min_change = min_change
+        self.history = history
+        self.clock = clock
+        self.states: dict[date, DateState] = {}
+
+        segment = filters.flight_segments[0]
+        self._origin = segment.departure_airport[0][0]
+        self._destination = segment.arrival_airport[0][0]
+        self.route = f"{self._origin.name}-{self._destination.name}"
+
+    def watched_dates(self) -> list[date]:
+        """Get the travel dates currently being watched (past dates are dropped)."""
+        today = datetime.fromtimestamp(self.clock()).date()
+        start = max(self.filters.parsed_from_date.date(), today)
+        end = self.filters.parsed_to_date.date()
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    def refresh_interval(self, state: DateState) -> float:
+        """Get the refresh interval for a date, shrinking with its price volatility."""
+        interval = self.max_interval * math.exp(-self.volatility_weight * state.volatility)
+        return max(self.min_interval, interval)
+
+    def due_dates(self) -> list[date]:
+        """Get the watched dates whose refresh interval has elapsed."""
+        now = self.clock()
+        due = []
+        for travel_date in self.watched_dates():
+            state = self.states.get(travel_date)
+            if state is None or state.checked_at is None:
+                due.append(travel_date)
+            elif now - state.checked_at >= self.refresh_interval(state):
+                due.append(travel_date)
+        return due
+
+    def next_due_in(self) -> float:
+        """Get the number of seconds until the next date becomes due (0 if any is due)."""
+        now = self.clock()
+        waits = []
+        for travel_date in self.watched_dates():
+            state = self.states.get(travel_date)
+            if state is None or state.checked_at is None:
+                return 0.0
+            waits.append(state.checked_at + self.refresh_interval(state) - now)
+        return max(0.0, min(waits)) if waits else self.max_interval
+
+    @staticmethod
+    def coalesce(dates: list[date], max_days: int = SearchDates.MAX_DAYS_PER_SEARCH) -> list:
+        """Group dates into the fewest contiguous windows of at most max_days.
+
+        Greedily opening a window at the earliest uncovered date is optimal for covering
+        points on a line with fixed-length intervals.
+
+        Args:
+            dates: Dates to cover
+            max_days: Maximum window length in days
+
+        Returns:
+            List of (start, end) date tuples
+
+        """
+        windows: list[tuple[date, date]] = []
+        for current in sorted(dates):
+            if windows and (current - windows[-1][0]).days < max_days:
+                windows[-1] = (windows[-1][0], current)
+            else:
+                windows.append((current, current))
+        return windows
+
+    def _chunk_filters(self, start: date, end: date) -> DateSearchFilters:
+        """Build calendar filters for a single window, anchored at its first date."""
+        segments = [segment.model_copy() for segment in self.filters.flight_segments]
+        segments[0].travel_date = start.strftime("%Y-%m-%d")
+        if self.filters.trip_type == TripType.ROUND_TRIP and len(segments) > 1:
+            segments[1].travel_date = (start + timedelta(days=self.filters.duration)).strftime(
+                "%Y-%m-%d"
+            )
+        return self.filters.model_copy(
+            update={
+                "flight_segments": segments,
+                "from_date": start.strftime("%Y-%m-%d"),
+                "to_date": end.strftime("%Y-%m-%d"),
+            }
+        )
+
+    def poll(self) -> list[FareChange]:
+        """Refresh all due dates once and emit the resulting change events.
+
+        The first observation of a date only establishes a baseline and emits nothing.
+
+        Returns:
+            List of change events detected in this poll
+
+        """
+        changes = self._refresh()
+        for change in changes:
+            self._emit(change)
+        return changes
+
+    def _refresh(self) -> list[FareChange]:
+        """Query every coalesced window of due dates and collect the changes."""
+        changes = []
+        for start, end in self.coalesce(self.due_dates()):
+            results = self.searcher.search(self._chunk_filters(start, end)) or []
+            changes.extend(self._apply(start, end, results))
+        return changes
+
+    def _apply(self, start: date, end: date, results: list[DatePrice]) -> list[FareChange]:
+        """Merge a refreshed window into the per-date state and collect changes."""
+        now = self.clock()
+        observed_at = datetime.fromtimestamp(now)
+        if self.history is not None:
+            self.history.record_dates(
+                results,
+                self._origin,
+                self._destination,
+                cabin=self.filters.seat_type,
+                observed_at=observed_at.astimezone(),
+            )
+
+        prices = {}
+        for date_price in results:
+            travel_date = date_price.date[0].date()
+            return_date = date_price.date[1].date() if len(date_price.date) > 1 else None
+            prices[travel_date] = (date_price.price, return_date)
+
+        changes = []
+        current = start
+        while current <= end:
+            state = self.states.setdefault(current, DateState())
+            new_price, return_date = prices.get(current, (None, None))
+            change = self._compare(current, state, new_price, return_date, observed_at)
+            if change is not None:
+                changes.append(change)
+
+            if state.checked_at is not None and state.price and new_price is not None:
+                relative_move = abs(new_price - state.price) / state.price
+                state.volatility += self.smoothing * (relative_move - state.volatility)
+            state.price = new_price
+            state.return_date = return_date
+            state.checked_at = now
+            current += timedelta(days=1)
+        return changes
+
+    def _compare(
+        self,
+        travel_date: date,
+        state: DateState,
+        new_price: float | None,
+        return_date: date | None,
+        observed_at: datetime,
+    ) -> FareChange | None:
+        """Compare a fresh observation with the stored state."""
+        if state.checked_at is None:
+            return None
+
+        old_price = state.price
+        if old_price is None and new_price is None:
+            return None
+        if old_price is None:
+            change_type = ChangeType.NEW_DATE
+        elif new_price is None:
+            change_type = ChangeType.DATE_UNAVAILABLE
+        elif new_price <= old_price - self.min_change:
+            change_type = ChangeType.PRICE_DROP
+        elif new_price >= old_price + self.min_change:
+            change_type = ChangeType.PRICE_RISE
+        else:
+            return None
+
+        return FareChange(
+            change_type=change_type,
+            route=self.route,
+            travel_date=travel_date,
+            old_price=old_price,
+            new_price=new_price,
+            observed_at=observed_at,
+            return_date=return_date or state.return_date,
+        )
+
+    def _emit(self, change: FareChange) -> None:
+        """Deliver a change event to the callback and queue."""
+        if self.on_change is not None:
+            self.on_change(change)
+        if self.queue is not None:
+            self.queue.put_nowait(change)
+
+    async def run(
+        self,
+        stop: asyncio.Event | None = None,
+        max_sleep: float = 60.0,
+        retry_delay: float = 5.0,
+    ) -> None:
+        """Poll continuously, sleeping until the next date is due.
+
+        Searches run in a worker thread so the event loop stays responsive. A failed refresh
+        (network error, open circuit breaker, ...) is logged and retried after an exponential
+        backoff instead of ending the watch; an open circuit is never retried before its
+        ``retry_after``.
+
+        Args:
+            stop: Event that ends the loop once set
+            max_sleep: Upper bound on a single sleep, so range changes are noticed
+            retry_delay: Sleep after the first failed refresh, doubled per consecutive
+                failure up to ``max_sleep``
+
+        """
+        stop = stop or asyncio.Event()
+        failures = 0
+        while not stop.is_set():
+            try:
+                changes = await asyncio.to_thread(self._refresh)
+            except Exception as e:
+                failures += 1
+                delay = min(retry_delay * 2 ** (failures - 1), max_sleep)
+                if isinstance(e, CircuitOpenError):
+                    delay = max(delay, e.retry_after)
+                logger.warning(
+                    "Refreshing %s failed (%d in a row), retrying in %.1fs: %s",
+                    self.route,
+                    failures,
+                    delay,
+                    e,
+                )
+            else:
+                failures = 0
+                # Emit from the event loop thread; asyncio queues are not thread-safe
+                for change in changes:
+                    self._emit(change)
+                delay = min(self.next_due_in(), max_sleep)
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except TimeoutError:
+                pass
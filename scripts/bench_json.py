@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Benchmark JSON decoding of Google Flights and Kiwi responses with each backend.
+
+Compares the legacy path (decode the body to ``str``, ``lstrip`` the ``)]}'`` prefix, then
+``json.loads`` twice; ``response.json()`` for Kiwi) with ``fli.core.jsonio`` on the raw
+response bytes for every installed backend.
+
+Usage:
+    python scripts/bench_json.py [RESPONSE_DIR] [--repeat N]
+
+RESPONSE_DIR may contain recorded Google Flights shopping responses (``*.txt``, raw bodies
+including the prefix) and Kiwi GraphQL responses (``*.json``). Without it, a synthetic
+Google response of 150 flights and a synthetic Kiwi response of 500 itineraries are used.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from fli.core import jsonio
+
+CODES = ["LHR", "PEK", "FRA", "IST", "DXB", "CDG", "JFK", "LAX", "HKG", "ICN"]
+
+
+def synthetic_google(flights: int = 150) -> bytes:
+    """Generate a shopping response shaped like Google Flights' nested arrays."""
+    items = []
+    for n in range(flights):
+        legs = [
+            [
+                None,
+                None,
+                None,
+                CODES[(n + s) % len(CODES)],
+                f"{CODES[(n + s) % len(CODES)]} International Airport",
+                f"{CODES[(n + s + 1) % len(CODES)]} International Airport",
+                CODES[(n + s + 1) % len(CODES)],
+                None,
+                [8 + s * 4, 15],
+                None,
+                [11 + s * 4, 40],
+                205,
+                [None] * 8,
+                None,
+                None,
+                None,
+                None,
+                "Boeing 787",
+                None,
+                None,
+                [2030, 6, 1],
+                [2030, 6, 1],
+                ["BA", str(100 + n), None, "British Airways"],
+            ]
+            for s in range(1 + n % 2)
+        ]
+        items.append([["BA", ["British Airways"], legs, 205 * len(legs)], [[None, 300 + n], "x"]])
+    inner = json.dumps([None, None, [items, None], [items[:20], None]])
+    return (")]}'\n\n" + json.dumps([["wrb.fr", None, inner]])).encode()
+
+
+def synthetic_kiwi(itineraries: int = 500) -> bytes:
+    """Generate a GraphQL response shaped like Kiwi's one-way itineraries."""
+    entries = [
+        {
+            "id": f"it-{n}",
+            "price": {"amount": str(300 + n)},
+            "duration": 12300,
+            "sector": {
+                "sectorSegments": [
+                    {
+                        "segment": {
+                            "source": {
+                                "localTime": "2030-06-01T08:15:00",
+                                "station": {"code": CODES[n % 10], "name": CODES[n % 10]},
+                            },
+                            "destination": {
+                                "localTime": "2030-06-01T11:40:00",
+                                "station": {"code": CODES[(n + 1) % 10], "name": "x"},
+                            },
+                            "carrier": {"code": "BA", "name": "British Airways"},
+                            "code": str(100 + n),
+                            "duration": 12300,
+                        }
+                    }
+                ]
+            },
+        }
+        for n in range(itineraries)
+    ]
+    return json.dumps({"data": {"onewayItineraries": {"itineraries": entries}}}).encode()
+
+
+def legacy_google(content: bytes):
+    """Decode a shopping response the way the searchers used to."""
+    parsed = json.loads(content.decode().lstrip(")]}'"))[0][2]
+    return json.loads(parsed) if parsed else None
+
+
+def legacy_kiwi(content: bytes):
+    """Decode a GraphQL response the way ``httpx.Response.json()`` does."""
+    return json.loads(content.decode())
+
+
+def bench(label: str, func, bodies: list[bytes], repeat: int) -> float:
+    """Decode every body with func and print the best total time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            func(body)
+        best = min(best, time.perf_counter() - start)
+    size = sum(len(body) for body in bodies) / 1e6
+    print(f"{label:<32} {best * 1e3:8.2f} ms  ({size / best:7.1f} MB/s)")
+    return best
+
+
+def compare(kind: str, legacy, decode, bodies: list[bytes], repeat: int) -> None:
+    """Benchmark the legacy decoder against every installed backend."""
+    print(f"{kind}: {len(bodies)} responses, {sum(map(len, bodies)) / 1e3:.0f} KB")
+    baseline = bench("  legacy (str + json)", legacy, bodies, repeat)
+    previous = jsonio.backend_name()
+    try:
+        for name in jsonio.BACKENDS:
+            jsonio.set_backend(name)
+            elapsed = bench(f"  jsonio[{name}]", decode, bodies, repeat)
+            print(f"  {'':<30} speedup: {baseline / elapsed:.1f}x")
+    finally:
+        jsonio.set_backend(previous)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("responses", nargs="?", type=Path, help="Directory of recorded bodies")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.responses:
+        google = [path.read_bytes() for path in sorted(args.responses.glob("*.txt"))]
+        kiwi = [path.read_bytes() for path in sorted(args.responses.glob("*.json"))]
+    else:
+        google, kiwi = [synthetic_google()], [synthetic_kiwi()]
+
+    if google:
+        compare("Google Flights", legacy_google, jsonio.loads_embedded, google, args.repeat)
+    if kiwi:
+        compare("Kiwi GraphQL", legacy_kiwi, jsonio.loads, kiwi, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
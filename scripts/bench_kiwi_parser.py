@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Benchmark Kiwi itinerary parsing on recorded (or synthetic) paginated responses.
+
+Compares the legacy two-stage path (``KiwiFlightsAPI._extract_oneway_flight_info`` followed
+by a dict -> ``FlightResult`` conversion using ``strptime`` fallbacks and ``list(Enum)[0]``
+defaults, reproduced below) with the single-pass ``parse_oneway_itinerary`` converter.
+
+Usage:
+    python scripts/bench_kiwi_parser.py [RESPONSE_DIR] [--repeat N]
+
+RESPONSE_DIR should contain one recorded GraphQL response per page (``*.json``).
+Without it, 10 synthetic pages of 50 itineraries each are generated.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fli.api.kiwi_flights import KiwiFlightsAPI
+from fli.api.kiwi_parser import parse_oneway_itinerary
+from fli.models import Airline, Airport, FlightLeg, FlightResult
+
+CODES = ["LHR", "PEK", "FRA", "IST", "DXB", "CDG", "JFK", "LAX", "HKG", "ICN"]
+CARRIERS = ["BA", "CA", "LH", "TK", "EK", "AF", "AA", "CX", "KE", "XX"]
+
+
+def synthetic_pages(pages: int = 10, per_page: int = 50) -> list[dict]:
+    """Generate GraphQL responses shaped like Kiwi's paginated one-way results."""
+    responses = []
+    for page in range(pages):
+        itineraries = []
+        for i in range(per_page):
+            n = page * per_page + i
+            segments = []
+            for s in range(1 + n % 2):
+                src = CODES[(n + s) % len(CODES)]
+                dst = CODES[(n + s + 1) % len(CODES)]
+                segments.append(
+                    {
+                        "segment": {
+                            "source": {
+                                "localTime": f"2030-06-01T{8 + s * 4:02d}:15:00",
+                                "station": {"code": src, "name": src},
+                            },
+                            "destination": {
+                                "localTime": f"2030-06-01T{11 + s * 4:02d}:40:00",
+                                "station": {"code": dst, "name": dst},
+                            },
+                            "hiddenDestination": None,
+                            "carrier": {"code": CARRIERS[n % len(CARRIERS)], "name": "x"},
+                            "code": str(100 + n),
+                            "duration": 12300,
+                        }
+                    }
+                )
+            itineraries.append(
+                {
+                    "id": f"it-{n}",
+                    "price": {"amount": str(300 + n)},
+                    "priceEur": {"amount": str(280 + n)},
+                    "duration": 12300 * len(segments),
+                    "travelHack": {"isTrueHiddenCity": n % 7 == 0, "isThrowawayTicket": False},
+                    "sector": {"sectorSegments": segments},
+                }
+            )
+        responses.append(
+            {
+                "data": {
+                    "onewayItineraries": {"__typename": "Itineraries", "itineraries": itineraries}
+                }
+            }
+        )
+    return responses
+
+
+def legacy_datetime(value: str) -> datetime:
+    """Parse a timestamp the way the legacy converter did."""
+    for fmt in (
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S.%f",
+        "%Y-%m-%dT%H:%M:%SZ",
+    ):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return datetime.now()
+
+
+def legacy_enum(enum, code: str):
+    """Resolve an enum member the way the legacy converter did."""
+    if code and code[0].isdigit():
+        code = f"_{code}"
+    return getattr(enum, code) if code and hasattr(enum, code) else list(enum)[0]
+
+
+def legacy_convert(api: KiwiFlightsAPI, itinerary: dict) -> FlightResult:
+    """Extract a flight-info dict, then re-parse it into a FlightResult."""
+    info = api._extract_oneway_flight_info(itinerary)
+    legs = [
+        FlightLeg(
+            airline=legacy_enum(Airline, seg["carrier"]),
+            flight_number=seg["flight_number"],
+            departure_airport=legacy_enum(Airport, seg["from"]),
+            arrival_airport=legacy_enum(Airport, seg["to"]),
+            departure_datetime=legacy_datetime(seg["departure_time"]),
+            arrival_datetime=legacy_datetime(seg["arrival_time"]),
+            duration=seg["duration"] // 60,
+        )
+        for seg in info["route_segments"]
+    ]
+    return FlightResult(
+        price=float(info["price"]),
+        duration=info["duration_minutes"],
+        stops=max(0, info["segment_count"] - 1),
+        legs=legs,
+        hidden_city_info={
+            "is_hidden_city": info["is_hidden_city"],
+            "hidden_destination_code": info["hidden_destination_code"],
+            "hidden_destination_name": info["hidden_destination_name"],
+            "is_throwaway": info["is_throwaway"],
+            "route_segments": info["route_segments"],
+        },
+    )
+
+
+def load_pages(directory: Path) -> list[dict]:
+    """Load recorded GraphQL responses from a directory."""
+    return [json.loads(path.read_text()) for path in sorted(directory.glob("*.json"))]
+
+
+def bench(label: str, func, itineraries: list[dict], repeat: int) -> float:
+    """Run func over every itinerary and print the best per-itinerary time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for itinerary in itineraries:
+            func(itinerary)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1e3:8.2f} ms  ({best / len(itineraries) * 1e6:6.1f} us/itinerary)")
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("responses", nargs="?", type=Path, help="Directory of recorded pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.responses) if args.responses else synthetic_pages()
+    itineraries = [
+        itinerary
+        for page in pages
+        for itinerary in page["data"]["onewayItineraries"].get("itineraries", [])
+    ]
+    print(f"{len(pages)} pages, {len(itineraries)} itineraries")
+
+    api = KiwiFlightsAPI()
+    legacy = bench(
+        "legacy extract + convert",
+        lambda itinerary: legacy_convert(api, itinerary),
+        itineraries,
+        args.repeat,
+    )
+    direct = bench("direct FlightResult parser", parse_oneway_itinerary, itineraries, args.repeat)
+    print(f"speedup: {legacy / direct:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,14 @@ Python Enum classes. The generated enums are used throughout the application to
 consistent handling of airport and airline codes.
 
 The script expects CSV files in the following locations:
-- data/airports.csv: Contains airport codes and names
+- data/airports.csv: Contains airport codes, names and coordinates
 - data/airlines.csv: Contains airline IATA codes and names
 
-The generated enum files are written to:
+The generated files are written to:
 - fli/models/airport.py: Contains the Airport enum
 - fli/models/airline.py: Contains the Airline enum
+- fli/data/airport_coords.csv: Latitude/longitude of every airport with known coordinates,
+  used by the nearby-airport index
 """
 
 import csv
@@ -108,6 +110,47 @@ def generate_airline_enum():
     print(f"Generated {len(entries)} enums in {airline_enum_path}")
 
 
+def generate_airport_coordinates():
+    """Generate the packaged airport coordinate table from airports.csv data.
+
+    Airports without coordinates in the CSV file are left out of the table.
+
+    Raises:
+        FileNotFoundError: If the airports.csv file is not found
+        ValueError: If there are errors reading or parsing the CSV file
+
+    """
+    airport_csv_path = PROJECT_DIR.joinpath("data", "airports.csv")
+    coords_csv_path = PROJECT_DIR.joinpath("fli", "data", "airport_coords.csv")
+
+    # Validate input file exists
+    if not airport_csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {airport_csv_path}")
+
+    # Read airport coordinates from CSV
+    try:
+        with open(airport_csv_path, encoding="utf-8") as csv_file:
+            reader = csv.DictReader(csv_file)
+            entries = [
+                (row["Code"].strip().upper(), row["Latitude"].strip(), row["Longitude"].strip())
+                for row in reader
+                if row["Latitude"].strip() and row["Longitude"].strip()
+            ]
+    except (KeyError, csv.Error) as e:
+        raise ValueError(f"Error reading CSV file: {e}") from e
+
+    # Ensure output directory exists
+    coords_csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(coords_csv_path, "w", encoding="utf-8", newline="") as output_file:
+        writer = csv.writer(output_file, lineterminator="\n")
+        writer.writerow(["Code", "Latitude", "Longitude"])
+        writer.writerows(entries)
+
+    print(f"Generated {len(entries)} coordinates in {coords_csv_path}")
+
+
 if __name__ == "__main__":
     generate_airport_enum()
     generate_airline_enum()
+    generate_airport_coordinates()
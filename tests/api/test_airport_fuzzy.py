@@ -0,0 +1,83 @@
+"""Tests for typo-tolerant airport matching."""
+
+import random
+import time
+
+import pytest
+
+from fli.api.airport_fuzzy import SymSpellIndex, allowed_distance, osa_distance
+from fli.api.airport_search import airport_search_api
+
+
+def reference_osa(a, b):
+    """Compute the unbounded optimal-string-alignment distance with the full matrix."""
+    rows = [[i] + [0] * len(b) for i in range(len(a) + 1)]
+    rows[0] = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            rows[i][j] = min(
+                rows[i - 1][j] + 1,
+                rows[i][j - 1] + 1,
+                rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+def test_bounded_distance_matches_reference():
+    """Test the banded distance against the full dynamic program."""
+    rng = random.Random(5)
+    for _ in range(3000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        for bound in (0, 1, 2):
+            assert osa_distance(a, b, bound) == min(reference_osa(a, b), bound + 1)
+    assert osa_distance("heathrow", "haethrow", 1) == 1
+
+
+def test_symspell_lookup():
+    """Test lookups within the edit-distance bound, including past the prefix."""
+    index = SymSpellIndex(max_distance=2, prefix_length=4)
+    for word in ("frankfurt", "frankston", "heathrow", "hamburg"):
+        index.add(word)
+    assert index.lookup("frankfrut") == [("frankfurt", 1)]
+    assert index.lookup("hethrw") == [("heathrow", 2)]
+    assert index.lookup("hethrw", max_distance=1) == []
+    assert "hamburg" in index and len(index) == 4
+
+
+@pytest.mark.parametrize(
+    "query, code",
+    [
+        ("heathrw", "LHR"),
+        ("frankfrut", "FRA"),
+        ("londn heathrow", "LHR"),
+        ("san fransisco", "SFO"),
+        ("newyork", "JFK"),
+        ("amsterdm", "AMS"),
+    ],
+)
+def test_misspelt_queries(query, code):
+    """Test that misspelt queries find the intended airport first."""
+    assert airport_search_api.search_fuzzy(query, limit=3)[0]["code"] == code
+    assert airport_search_api.search_airports(query, limit=3, fuzzy=True)[0]["code"] == code
+
+
+def test_fallback_only_when_nothing_matches():
+    """Test that fuzzy matching is opt-in and never replaces exact substring matches."""
+    assert airport_search_api.search_airports("heathrw") == []
+    assert airport_search_api.search_many(["heathrw"]) == {"heathrw": []}
+    exact = airport_search_api.search_airports("london", limit=5)
+    assert exact == airport_search_api.search_airports("london", limit=5, fuzzy=True)
+    assert airport_search_api.search_airports("qzx", fuzzy=True) == []
+    assert allowed_distance("abc") == 0 and allowed_distance("abcde") == 1
+
+
+def test_lookup_is_fast():
+    """Test that a fuzzy lookup stays around a millisecond once the index is built."""
+    airport_search_api.search_fuzzy("warmup")
+    start = time.perf_counter()
+    for _ in range(20):
+        airport_search_api.search_fuzzy("frankfrut", limit=5)
+    assert (time.perf_counter() - start) / 20 < 0.01
@@ -0,0 +1,68 @@
+"""Tests for the airport spatial index."""
+
+import random
+
+import pytest
+
+from fli.api import airport_search_api
+from fli.api.airport_geo import AirportGeoIndex, get_geo_index, haversine_km, nearby
+
+
+def brute_force(coordinates, lat, lon, radius_km):
+    """Find the airports within a radius by measuring every airport."""
+    return sorted(
+        code
+        for code, (airport_lat, airport_lon) in coordinates.items()
+        if haversine_km(lat, lon, airport_lat, airport_lon) <= radius_km
+    )
+
+
+def test_haversine_known_distance():
+    """Test the great-circle distance between JFK and LHR."""
+    assert haversine_km(40.6398, -73.7789, 51.4706, -0.4619) == pytest.approx(5540, abs=10)
+
+
+def test_grid_matches_brute_force():
+    """Test that radius queries match a full scan, including near the poles."""
+    index = get_geo_index()
+    assert len(index) > 5000
+    rng = random.Random(7)
+    points = [(rng.uniform(-89, 89), rng.uniform(-180, 180)) for _ in range(100)]
+    points += [(89.5, 10.0), (-89.5, -170.0)]
+    for lat, lon in points:
+        radius = rng.choice([25, 150, 600, 2500])
+        found = sorted(airport.code for airport in index.near_point(lat, lon, radius))
+        assert found == brute_force(index.coordinates, lat, lon, radius)
+
+
+def test_antimeridian():
+    """Test that queries find airports on the other side of the antimeridian."""
+    index = AirportGeoIndex({"EAST": (0.0, 179.9), "WEST": (0.0, -179.9), "FAR": (0.0, 170.0)})
+    found = index.near_point(0.0, 179.99, 50)
+    assert [airport.code for airport in found] == ["EAST", "WEST"]
+    assert found[0].distance_km < found[1].distance_km
+
+
+def test_nearby_major_only_keeps_centre():
+    """Test major-airport filtering and the unknown-coordinates fallback."""
+    assert [airport.code for airport in nearby("JFK", 40, major_only=True)] == [
+        "JFK",
+        "LGA",
+        "EWR",
+    ]
+    assert "TEB" in {airport.code for airport in nearby("JFK", 40)}
+
+    index = AirportGeoIndex({"AAA": (0.0, 0.0), "BBB": (0.0, 0.1)}, major={"BBB"})
+    assert [airport.code for airport in index.nearby("aaa", 50, major_only=True)] == [
+        "AAA",
+        "BBB",
+    ]
+    assert [airport.code for airport in index.nearby("ZZZ", 50)] == ["ZZZ"]
+
+
+def test_search_nearby_adds_distance():
+    """Test the airport search API's nearby lookup."""
+    results = airport_search_api.search_nearby("LHR", 60, limit=3, major_only=True)
+    assert results[0]["code"] == "LHR" and results[0]["distance_km"] == 0.0
+    assert len(results) == 3
+    assert results[1]["distance_km"] <= results[2]["distance_km"] <= 60
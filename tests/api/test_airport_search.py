@@ -0,0 +1,53 @@
+"""Tests for the batched airport search API."""
+
+import dataclasses
+
+import pytest
+
+from fli.api.airport_search import AirportMatch, AirportSearchAPI
+from fli.models.google_flights.base import Language
+
+
+@pytest.fixture(scope="module")
+def api():
+    """Create a fresh search API so the match cache starts empty."""
+    return AirportSearchAPI()
+
+
+def test_search_many_matches_single_queries(api):
+    """Test that batched results equal the single-query results."""
+    queries = ["lon", "北京", "JFK", "international", "xyz", "lon", "国际"]
+    for language in (Language.ENGLISH, Language.CHINESE):
+        batch = api.search_many(queries, language, limit=5)
+        assert list(batch) == ["lon", "北京", "JFK", "international", "xyz", "国际"]
+        for query, matches in batch.items():
+            expected = api.search_airports(query, language, 5)
+            assert [match.to_dict() for match in matches] == expected
+    assert batch["xyz"] == []
+    assert batch["JFK"][0].code == "JFK"
+
+
+def test_limit_includes_exact_code_match(api):
+    """Test that an exact code match counts towards the limit."""
+    assert [airport["code"] for airport in api.search_airports("new", limit=1)] == ["NEW"]
+    assert api.search_airports("lon", limit=0) == []
+
+
+def test_matches_are_cached_and_immutable(api):
+    """Test the per (code, language) match cache."""
+    first = api.search_many(["heathrow"], Language.CHINESE)["heathrow"][0]
+    second = api.resolve_codes(["lhr"], Language.CHINESE)["lhr"]
+    assert first is second
+    assert isinstance(first, AirportMatch) and first.name == "伦敦希思罗机场"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.name = "changed"
+    english = api.resolve_codes(["LHR"])["LHR"]
+    assert english.name == "London Heathrow Airport" and english is not first
+
+
+def test_resolve_codes(api):
+    """Test code resolution, including airports without translations."""
+    resolved = api.resolve_codes(["PEK", "ZZZ", "LCY"])
+    assert resolved["PEK"].city == "Beijing"
+    assert resolved["ZZZ"] is None
+    assert resolved["LCY"].code == "LCY" and resolved["LCY"].name_cn == ""
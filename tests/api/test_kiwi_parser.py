@@ -0,0 +1,144 @@
+"""Tests for the Kiwi itinerary parser."""
+
+from datetime import datetime
+
+import pytest
+
+from fli.api.kiwi_parser import (
+    DEFAULT_AIRLINE,
+    DEFAULT_AIRPORT,
+    lookup_airline,
+    lookup_airport,
+    parse_kiwi_datetime,
+    parse_oneway_itinerary,
+    parse_roundtrip_itinerary,
+)
+from fli.models import Airline, Airport
+from fli.models.google_flights.base import Language, LocalizationConfig
+
+
+def make_segment(src, dst, dep, arr, carrier="BA", code="123", duration=3600, hidden=None):
+    """Build a raw Kiwi sector segment."""
+    return {
+        "segment": {
+            "source": {"localTime": dep, "station": {"code": src, "name": src}},
+            "destination": {"localTime": arr, "station": {"code": dst, "name": dst}},
+            "hiddenDestination": hidden,
+            "carrier": {"code": carrier, "name": carrier},
+            "code": code,
+            "duration": duration,
+        }
+    }
+
+
+@pytest.fixture
+def oneway_itinerary():
+    """Create a raw two-segment one-way itinerary."""
+    return {
+        "id": "abc",
+        "price": {"amount": "512.5"},
+        "duration": 7 * 3600,
+        "travelHack": {"isTrueHiddenCity": True, "isThrowawayTicket": False},
+        "sector": {
+            "sectorSegments": [
+                make_segment("LHR", "FRA", "2030-06-01T08:00:00", "2030-06-01T10:00:00"),
+                make_segment(
+                    "FRA",
+                    "PEK",
+                    "2030-06-01T11:00:00.000",
+                    "2030-06-02T03:00:00Z",
+                    carrier="LH",
+                    code="720",
+                    duration=5 * 3600,
+                    hidden={"code": "PVG", "name": "Shanghai"},
+                ),
+            ]
+        },
+    }
+
+
+def test_lookup_known_and_unknown_codes():
+    """Test cached enum lookups with known, numeric and unknown codes."""
+    assert lookup_airline("BA") == Airline.BA
+    assert lookup_airline("9C") == Airline._9C
+    assert lookup_airline("") == DEFAULT_AIRLINE
+    assert lookup_airline("???") == DEFAULT_AIRLINE
+    assert lookup_airport("LHR") == Airport.LHR
+    assert lookup_airport("ZZZZ") == DEFAULT_AIRPORT
+
+
+def test_parse_kiwi_datetime_formats():
+    """Test that all Kiwi timestamp variants parse with fromisoformat."""
+    expected = datetime(2030, 6, 1, 8, 0)
+    assert parse_kiwi_datetime("2030-06-01T08:00:00") == expected
+    assert parse_kiwi_datetime("2030-06-01 08:00:00") == expected
+    assert parse_kiwi_datetime("2030-06-01T08:00:00.000") == expected
+    assert isinstance(parse_kiwi_datetime("garbage"), datetime)
+
+
+def test_parse_kiwi_datetime_z_suffix_is_naive():
+    """Test a trailing ``Z`` parses to the same naive datetime as before."""
+    parsed = parse_kiwi_datetime("2030-06-01T08:00:00Z")
+    assert parsed == datetime(2030, 6, 1, 8, 0)
+    assert parsed.tzinfo is None
+    assert parsed < datetime(2030, 6, 2)
+
+
+def test_parse_oneway_itinerary(oneway_itinerary):
+    """Test one-way itinerary conversion into a FlightResult."""
+    result = parse_oneway_itinerary(oneway_itinerary)
+
+    assert result.price == 512.5
+    assert result.duration == 420
+    assert result.stops == 1
+    assert [leg.departure_airport for leg in result.legs] == [Airport.LHR, Airport.FRA]
+    assert result.legs[1].airline == Airline.LH
+    assert result.legs[1].duration == 300
+    assert result.hidden_city_info["is_hidden_city"] is True
+    assert result.hidden_city_info["hidden_destination_code"] == "PVG"
+    assert len(result.hidden_city_info["route_segments"]) == 2
+
+
+def test_parse_oneway_itinerary_localizes_hidden_destination(oneway_itinerary):
+    """Test that the hidden destination name is localized."""
+    config = LocalizationConfig(language=Language.CHINESE)
+    result = parse_oneway_itinerary(oneway_itinerary, config)
+    assert result.hidden_city_info["hidden_destination_name"] == "上海浦东国际机场"
+
+
+def test_parse_oneway_itinerary_without_segments():
+    """Test that itineraries without segments are skipped."""
+    assert parse_oneway_itinerary({"id": "x", "sector": {"sectorSegments": []}}) is None
+
+
+def test_parse_roundtrip_itinerary():
+    """Test round-trip itinerary conversion into an outbound/inbound pair."""
+    itinerary = {
+        "price": {"amount": 800},
+        "outbound": {
+            "duration": 7200,
+            "sectorSegments": [
+                make_segment("JFK", "LAX", "2030-06-01T08:00:00", "2030-06-01T10:00:00")
+            ],
+        },
+        "inbound": {
+            "duration": 7200,
+            "sectorSegments": [
+                make_segment("LAX", "JFK", "2030-06-08T08:00:00", "2030-06-08T16:00:00")
+            ],
+        },
+    }
+
+    outbound, inbound = parse_roundtrip_itinerary(itinerary)
+
+    assert outbound.price == inbound.price == 400
+    assert outbound.duration == 120
+    assert outbound.legs[0].departure_airport == Airport.JFK
+    assert inbound.legs[0].departure_airport == Airport.LAX
+    assert inbound.hidden_city_info["direction"] == "inbound"
+    assert inbound.hidden_city_info["total_price"] == 800
+
+
+def test_parse_roundtrip_itinerary_missing_direction():
+    """Test that return itineraries missing a direction are skipped."""
+    assert parse_roundtrip_itinerary({"price": {"amount": 1}, "outbound": {}}) is None
@@ -0,0 +1,103 @@
+"""Tests for retries and circuit breaking of Kiwi GraphQL requests."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from fli.api.kiwi_flights import KIWI_GRAPHQL_ENDPOINT, KiwiFlightsAPI
+from fli.cli.commands.search import build_flight_filters
+from fli.core.resilience import CircuitBreakers, CircuitOpenError, RetryBudget
+from fli.models import TripType
+from fli.search import SearchKiwiFlights
+
+
+class ScriptedClient:
+    """Async HTTP client stand-in answering with scripted statuses or errors."""
+
+    def __init__(self, outcomes):
+        """Store the outcomes, consumed one per request."""
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def post(self, url, **kwargs):
+        """Return the next scripted response or raise the next scripted error."""
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(status_code=outcome)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting."""
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr("fli.api.kiwi_flights.asyncio.sleep", fake_sleep)
+    return waits
+
+
+def make_api(budget=None, threshold=5):
+    """Create an API wrapper with its own retry budget and breakers."""
+    return KiwiFlightsAPI(
+        retry_budget=budget or RetryBudget(),
+        breakers=CircuitBreakers(failure_threshold=threshold),
+    )
+
+
+def post(api, client):
+    """Send one request through the wrapper."""
+    return asyncio.run(api._post(client, KIWI_GRAPHQL_ENDPOINT, {}, "oneway", page=1))
+
+
+def test_transient_failures_are_retried(sleeps):
+    """Test errors and 5xx responses are retried with backoff until a success."""
+    client = ScriptedClient([httpx.ConnectError("down"), 503, 200])
+    assert post(make_api(), client).status_code == 200
+    assert client.calls == 3
+    assert sleeps == [1, 2]
+
+
+def test_client_errors_are_not_retried(sleeps):
+    """Test a 400 response is returned as is."""
+    client = ScriptedClient([400])
+    assert post(make_api(), client).status_code == 400
+    assert sleeps == []
+
+
+def test_retries_stop_when_budget_is_spent(sleeps):
+    """Test the last transient response is returned once the budget is spent."""
+    client = ScriptedClient([502, 502])
+    api = make_api(RetryBudget(ratio=0, min_per_second=0.1))
+    assert post(api, client).status_code == 502
+    assert client.calls == 2
+
+
+def test_open_circuit_fails_fast(sleeps):
+    """Test an open circuit rejects requests without sending them."""
+    api = make_api(threshold=3)
+    client = ScriptedClient([500, 500, 500])
+    assert post(api, client).status_code == 500
+
+    with pytest.raises(CircuitOpenError):
+        post(api, ScriptedClient([200]))
+
+
+@pytest.mark.parametrize("trip_type", [TripType.ONE_WAY, TripType.ROUND_TRIP])
+def test_search_raises_when_circuit_is_open(trip_type):
+    """Test a searcher raises ``CircuitOpenError`` rather than reporting no flights."""
+    api = make_api(threshold=1)
+    api.breakers.for_url(KIWI_GRAPHQL_ENDPOINT).record_failure()
+    search = object.__new__(SearchKiwiFlights)
+    search.__init__()
+    search.kiwi_client = api
+    return_date = "2030-06-08" if trip_type == TripType.ROUND_TRIP else None
+    filters = build_flight_filters(trip_type, "JFK", "LHR", "2030-06-01", return_date=return_date)
+
+    with pytest.raises(CircuitOpenError):
+        search.search(filters)
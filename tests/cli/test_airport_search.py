@@ -0,0 +1,24 @@
+"""Tests for the airport search command."""
+
+import importlib
+
+import pytest
+
+from fli.cli.commands.airport_search import airport_search_command
+
+
+@pytest.fixture
+def displayed(monkeypatch):
+    """Capture the airports the command would display."""
+    shown = []
+    module = importlib.import_module("fli.cli.commands.airport_search")
+    monkeypatch.setattr(
+        module, "display_airport_results", lambda airports, language: shown.extend(airports)
+    )
+    return shown
+
+
+def test_airport_search_falls_back_to_fuzzy(displayed):
+    """Test that the CLI finds misspelt airports the library only finds with fuzzy=True."""
+    airport_search_command("heathrw", limit=3)
+    assert displayed[0]["code"] == "LHR"
@@ -0,0 +1,135 @@
+"""Tests for the batch command."""
+
+import importlib
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from typer.testing import CliRunner
+
+from fli.cli.commands.batch import BatchRunner, load_queries
+from fli.cli.main import app
+from fli.models import Airline, Airport, FlightLeg, FlightResult, TripType
+from fli.search import DatePrice, SearchCache
+
+
+class FakeSearcher:
+    """Searcher stand-in that records the filters it receives."""
+
+    calls = []
+
+    def __init__(self, localization_config=None, client=None, cache=None):
+        """Keep the injected dependencies."""
+        self.client = client
+        self.cache = cache
+
+    def search(self, filters, top_n=5):
+        """Return a canned result for the query kind."""
+        FakeSearcher.calls.append((filters, self.client, self.cache))
+        segment = filters.flight_segments[0]
+        departure = datetime.strptime(segment.travel_date, "%Y-%m-%d")
+        if hasattr(filters, "from_date"):
+            return [DatePrice(date=(departure,), price=99.0)]
+        if segment.departure_airport[0][0] == Airport.LAX:
+            raise ValueError("boom")
+        return [
+            FlightResult(
+                price=299.99,
+                duration=180,
+                stops=0,
+                legs=[
+                    FlightLeg(
+                        airline=Airline.DL,
+                        flight_number="DL123",
+                        departure_airport=Airport.JFK,
+                        arrival_airport=Airport.LHR,
+                        departure_datetime=departure,
+                        arrival_datetime=departure + timedelta(hours=3),
+                        duration=180,
+                    )
+                ],
+            )
+        ]
+
+
+@pytest.fixture
+def fake_searchers(monkeypatch):
+    """Replace the searchers used by the batch runner."""
+    # The package re-exports the command function under the module's name
+    module = importlib.import_module("fli.cli.commands.batch")
+    FakeSearcher.calls = []
+    monkeypatch.setattr(module, "SearchFlights", FakeSearcher)
+    monkeypatch.setattr(module, "SearchDates", FakeSearcher)
+    return FakeSearcher
+
+
+@pytest.fixture
+def travel_date():
+    """Return a future travel date."""
+    return (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+
+
+def test_load_queries_csv_and_jsonl(tmp_path):
+    """Test loading specs from CSV and JSONL files."""
+    csv_file = tmp_path / "queries.csv"
+    csv_file.write_text("from,to,date,stops\nJFK,LHR,2030-01-01,\n")
+    jsonl_file = tmp_path / "queries.jsonl"
+    jsonl_file.write_text('{"from": "JFK", "to": "LHR"}\n\n{"from": "SFO", "to": "NRT"}\n')
+
+    assert load_queries(str(csv_file)) == [
+        {"from": "JFK", "to": "LHR", "date": "2030-01-01", "stops": ""}
+    ]
+    assert [spec["from"] for spec in load_queries(str(jsonl_file))] == ["JFK", "SFO"]
+
+
+def test_runner_shares_client_and_cache(fake_searchers, travel_date):
+    """Test that every query uses the same client and cache and errors are recorded."""
+    client = object()
+    cache = SearchCache()
+    runner = BatchRunner(concurrency=3, client=client, cache=cache)
+    records = runner.run(
+        [
+            {"id": "a", "from": "JFK", "to": "LHR", "date": travel_date},
+            {"from": "JFK", "to": "LHR", "from_date": travel_date, "to_date": travel_date},
+            {"from": "LAX", "to": "LHR", "date": travel_date},
+            {"from": "JFK", "to": "LHR", "date": travel_date, "stops": "nope"},
+        ]
+    )
+
+    by_index = {record["index"]: record for record in records}
+    assert by_index[0]["status"] == "ok" and by_index[0]["id"] == "a"
+    assert by_index[0]["type"] == "search"
+    assert by_index[0]["results"][0]["legs"][0]["departure_airport"] == "JFK"
+    assert by_index[1]["type"] == "cheap"
+    assert by_index[1]["results"] == [{"date": travel_date, "price": 99.0}]
+    assert by_index[2]["status"] == "error" and by_index[2]["error"] == "boom"
+    assert by_index[3]["status"] == "error"
+    assert all(c is client and k is cache for _, c, k in fake_searchers.calls)
+
+
+def test_batch_command_streams_ndjson(runner_cli, fake_searchers, tmp_path, travel_date):
+    """Test that the command writes one NDJSON record per query."""
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text(
+        "\n".join(
+            json.dumps({"id": str(i), "from": "JFK", "to": "LHR", "date": travel_date})
+            for i in range(5)
+        )
+    )
+    output = tmp_path / "out.ndjson"
+
+    result = runner_cli.invoke(
+        app, ["batch", str(queries), "-j", "2", "-o", str(output), "--no-progress"]
+    )
+    assert result.exit_code == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["id"] for record in records) == ["0", "1", "2", "3", "4"]
+    assert all(record["status"] == "ok" for record in records)
+    assert fake_searchers.calls[0][0].trip_type == TripType.ONE_WAY
+
+
+@pytest.fixture
+def runner_cli():
+    """Return a CliRunner instance."""
+    return CliRunner()
@@ -0,0 +1,146 @@
+"""Tests for machine-readable CLI output."""
+
+import csv
+import importlib
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from typer.testing import CliRunner
+
+from fli.cli.enums import OutputFormat
+from fli.cli.main import app
+from fli.cli.output import write_results
+from fli.models import Airline, Airport, FlightLeg, FlightResult, TripType
+from fli.search import DatePrice
+
+
+def make_flight(price, departure=datetime(2030, 6, 1, 8)):
+    """Create a two-leg flight result."""
+    return FlightResult(
+        price=price,
+        duration=300,
+        stops=1,
+        legs=[
+            FlightLeg(
+                airline=Airline.UA,
+                flight_number="UA1",
+                departure_airport=Airport.JFK,
+                arrival_airport=Airport.ORD,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=2),
+                duration=120,
+            ),
+            FlightLeg(
+                airline=Airline.UA,
+                flight_number="UA2",
+                departure_airport=Airport.ORD,
+                arrival_airport=Airport.LAX,
+                departure_datetime=departure + timedelta(hours=3),
+                arrival_datetime=departure + timedelta(hours=5),
+                duration=120,
+            ),
+        ],
+    )
+
+
+def test_ndjson_and_json():
+    """Test NDJSON lines and JSON arrays use codes and ISO timestamps."""
+    flights = [make_flight(100.0), make_flight(200.0)]
+
+    stream = io.StringIO()
+    assert write_results(flights, OutputFormat.NDJSON, stream) == 2
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [record["price"] for record in records] == [100.0, 200.0]
+    assert records[0]["legs"][1]["arrival_airport"] == "LAX"
+    assert records[0]["legs"][0]["departure_datetime"] == "2030-06-01T08:00:00"
+
+    stream = io.StringIO()
+    write_results(iter(flights), OutputFormat.JSON, stream)
+    assert [record["price"] for record in json.loads(stream.getvalue())] == [100.0, 200.0]
+
+    stream = io.StringIO()
+    write_results([], OutputFormat.JSON, stream)
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_csv_flights_pairs_and_dates():
+    """Test CSV rows for one-way flights, round-trip pairs and calendar prices."""
+    stream = io.StringIO()
+    write_results([make_flight(100.0)], OutputFormat.CSV, stream)
+    row = next(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert row["departure_airport"] == "JFK" and row["arrival_airport"] == "LAX"
+    assert row["flight_numbers"] == "UA1 UA2"
+
+    stream = io.StringIO()
+    write_results([(make_flight(100.0), make_flight(150.0))], OutputFormat.CSV, stream)
+    row = next(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert float(row["price"]) == 250.0 and float(row["return_price"]) == 150.0
+
+    stream = io.StringIO()
+    write_results(
+        [DatePrice(date=(datetime(2030, 6, 1), datetime(2030, 6, 8)), price=99.5)],
+        OutputFormat.CSV,
+        stream,
+    )
+    assert stream.getvalue().splitlines() == [
+        "date,return_date,price",
+        "2030-06-01,2030-06-08,99.5",
+    ]
+
+
+def test_multi_city_itineraries():
+    """Test itineraries of three or more legs are written with a legs list and total price."""
+    itinerary = (make_flight(100.0), make_flight(150.0), make_flight(200.0))
+
+    stream = io.StringIO()
+    write_results([itinerary], OutputFormat.NDJSON, stream)
+    record = json.loads(stream.getvalue())
+    assert record["price"] == 450.0
+    assert [leg["price"] for leg in record["legs"]] == [100.0, 150.0, 200.0]
+
+    stream = io.StringIO()
+    write_results([itinerary], OutputFormat.CSV, stream)
+    row = next(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert float(row["price"]) == 450.0
+    assert float(row["leg3_price"]) == 200.0 and row["leg3_flight_numbers"] == "UA1 UA2"
+
+    stream = io.StringIO()
+    write_results([itinerary[:2]], OutputFormat.JSON, stream, TripType.MULTI_CITY)
+    assert [leg["price"] for leg in json.loads(stream.getvalue())[0]["legs"]] == [100.0, 150.0]
+
+
+def test_table_format_is_rejected():
+    """Test that the table format cannot be written as data."""
+    with pytest.raises(ValueError):
+        write_results([], OutputFormat.TABLE, io.StringIO())
+
+
+def test_search_format_skips_rich(monkeypatch):
+    """Test that --format writes data to stdout without rendering tables."""
+    module = importlib.import_module("fli.cli.commands.search")
+
+    class FakeSearchFlights:
+        """SearchFlights stand-in returning canned flights."""
+
+        def __init__(self, localization_config=None):
+            """Ignore the localization config."""
+
+        def search(self, filters):
+            """Return two flights."""
+            return [make_flight(100.0), make_flight(200.0)]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rich rendering should be skipped")
+
+    monkeypatch.setattr(module, "SearchFlights", FakeSearchFlights)
+    monkeypatch.setattr(module, "display_flight_results", fail)
+
+    date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+    result = CliRunner().invoke(app, ["search", "JFK", "LAX", date, "--format", "ndjson"])
+    assert result.exit_code == 0
+    assert len(result.stdout.splitlines()) == 2
+
+    result = CliRunner().invoke(app, ["search", "JFK", "LAX", date, "--format", "xml"])
+    assert result.exit_code == 2
@@ -2,10 +2,12 @@ from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 
 import pytest
+from rich.console import Console
 from typer import BadParameter
 
 from fli.cli.enums import DayOfWeek
 from fli.cli.utils import (
+    display_flight_results,
     filter_dates_by_days,
     filter_flights_by_airlines,
     filter_flights_by_time,
@@ -186,3 +188,39 @@ def test_filter_dates_by_days():
     # No day filters should return all dates
     result = filter_dates_by_days(dates, [], TripType.ONE_WAY)
     assert len(result) == 2
+
+
+def test_two_leg_multi_city_is_not_shown_as_round_trip(monkeypatch):
+    """Test a two-leg multi-city itinerary is labelled by leg, not outbound and return."""
+    departure = datetime(2030, 6, 1, 8)
+    itinerary = tuple(
+        FlightResult(
+            price=100.0,
+            duration=120,
+            stops=0,
+            legs=[
+                FlightLeg(
+                    airline=Airline.BA,
+                    flight_number=f"BA{number}",
+                    departure_airport=origin,
+                    arrival_airport=destination,
+                    departure_datetime=departure + timedelta(days=3 * number),
+                    arrival_datetime=departure + timedelta(days=3 * number, hours=2),
+                    duration=120,
+                )
+            ],
+        )
+        for number, (origin, destination) in enumerate(
+            [(Airport.JFK, Airport.LHR), (Airport.CDG, Airport.JFK)]
+        )
+    )
+    console = Console(record=True, width=200)
+    monkeypatch.setattr("fli.cli.utils.console", console)
+
+    display_flight_results([itinerary], trip_type=TripType.MULTI_CITY)
+    output = console.export_text()
+    assert "Multi-city Flight Option" in output
+    assert "Round-trip" not in output and "Outbound" not in output
+
+    display_flight_results([itinerary], trip_type=TripType.ROUND_TRIP)
+    assert "Round-trip Flight Option" in console.export_text()
@@ -0,0 +1,66 @@
+"""Tests for the pluggable JSON decoding helpers."""
+
+import json
+
+import pytest
+
+from fli.core import jsonio
+
+
+def google_response(payload, prefix=")]}'\n"):
+    """Build a Google-style response body with an embedded JSON payload."""
+    inner = json.dumps(payload) if payload is not None else None
+    return (prefix + json.dumps([["wrb.fr", None, inner]])).encode()
+
+
+@pytest.fixture(params=list(jsonio.BACKENDS))
+def backend(request):
+    """Run a test with every installed backend."""
+    previous = jsonio.backend_name()
+    jsonio.set_backend(request.param)
+    yield request.param
+    jsonio.set_backend(previous)
+
+
+def test_stdlib_backend_always_available():
+    """Test the standard library backend is always registered, last."""
+    assert list(jsonio.BACKENDS)[-1] == "json"
+
+
+def test_set_backend_rejects_unknown():
+    """Test selecting a missing backend fails with the available names."""
+    with pytest.raises(ValueError, match="available"):
+        jsonio.set_backend("simdjson")
+
+
+def test_xssi_offset():
+    """Test the prefix is skipped like ``str.lstrip`` did."""
+    assert jsonio.xssi_offset(b")]}'\n[1]") == 4
+    assert jsonio.xssi_offset(")]}'\n[1]") == 4
+    assert jsonio.xssi_offset(b"[1]") == 0
+    assert jsonio.xssi_offset(b"") == 0
+
+
+def test_loads_bytes_and_str(backend):
+    """Test decoding bytes and text gives the same value."""
+    document = {"data": {"items": [1, 2.5, "猫", None, True]}}
+    raw = json.dumps(document, ensure_ascii=False)
+    assert jsonio.loads(raw.encode()) == document
+    assert jsonio.loads(raw) == document
+
+
+def test_loads_embedded(backend):
+    """Test the embedded Google payload is decoded from the response bytes."""
+    payload = [None, [[["2030-06-01", None], [[None, 123]]]], [[1, 2]]]
+    assert jsonio.loads_embedded(google_response(payload)) == payload
+    assert jsonio.loads_embedded(google_response(payload).decode()) == payload
+
+
+def test_loads_embedded_without_payload(backend):
+    """Test responses without a payload decode to None."""
+    assert jsonio.loads_embedded(google_response(None)) is None
+
+
+def test_loads_xssi_without_prefix(backend):
+    """Test bodies without the prefix are decoded as-is."""
+    assert jsonio.loads_xssi(b'[[null, null, "x"]]') == [[None, None, "x"]]
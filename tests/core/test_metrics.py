@@ -0,0 +1,88 @@
+"""Tests for the metrics registry."""
+
+import pytest
+
+from fli.core.metrics import (
+    CACHE_HIT_RATIO,
+    HTTP_REQUESTS,
+    HTTP_RETRIES,
+    PARSE_FAILURES,
+    REGISTRY,
+    MetricsRegistry,
+    record_request,
+)
+from fli.search import SearchCache, SearchFlights
+from fli.search.client import retry_sleep
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test from empty global metrics."""
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def test_counter_and_exposition():
+    """Test labelled counters and their text rendering."""
+    registry = MetricsRegistry()
+    counter = registry.counter("fli_test_total", "Test counter.", ("host",))
+    counter.inc(host="a")
+    counter.inc(2, host='b"c')
+
+    assert counter.value(host="a") == 1
+    assert registry.counter("fli_test_total", "Again.", ("host",)) is counter
+    text = registry.exposition()
+    assert "# HELP fli_test_total Test counter.\n# TYPE fli_test_total counter" in text
+    assert 'fli_test_total{host="a"} 1\n' in text
+    assert 'fli_test_total{host="b\\"c"} 2\n' in text
+
+    with pytest.raises(ValueError):
+        counter.inc(host="a", status="200")
+    with pytest.raises(ValueError):
+        counter.inc(-1, host="a")
+    with pytest.raises(ValueError):
+        registry.gauge("fli_test_total", "Clash.")
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram bucket, sum and count samples."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("fli_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    text = registry.exposition()
+    assert 'fli_latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'fli_latency_seconds_bucket{le="1"} 3\n' in text
+    assert 'fli_latency_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "fli_latency_seconds_sum 4.05\n" in text
+    assert "fli_latency_seconds_count 4\n" in text
+
+
+def test_requests_retries_and_cache_ratio(monkeypatch):
+    """Test the metrics fed by the client and the search cache."""
+    record_request("https://www.google.com/_/Flights?x=1", "POST", 200, 0.2)
+    record_request("https://www.google.com/_/Flights", "POST", "error", 1.5)
+    monkeypatch.setattr("fli.search.client.time.sleep", lambda seconds: None)
+    retry_sleep(1)
+
+    cache = SearchCache(name="test")
+    cache.get("k")
+    cache.set("k", 1)
+    cache.get("k")
+    cache.get("k")
+
+    assert HTTP_REQUESTS.value(host="www.google.com", method="POST", status="200") == 1
+    assert HTTP_REQUESTS.value(host="www.google.com", method="POST", status="error") == 1
+    assert HTTP_RETRIES.value() == 1
+    assert CACHE_HIT_RATIO.value(cache="test") == pytest.approx(2 / 3)
+    assert 'fli_cache_hit_ratio{cache="test"} 0.666' in REGISTRY.exposition()
+
+
+def test_leg_parse_failures_are_counted():
+    """Test that unparseable flight legs are counted instead of printed."""
+    flight = [[None, None, [["broken"]], None, None, None, None, None, None, 300], [[None, 99]]]
+    result = SearchFlights._parse_flights_data(flight)
+    assert result.legs == []
+    assert PARSE_FAILURES.value(source="google_flights", kind="leg") == 1
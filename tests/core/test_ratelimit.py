@@ -0,0 +1,105 @@
+"""Tests for the token-bucket rate limiter."""
+
+import asyncio
+import multiprocessing
+
+import pytest
+
+from fli.core.metrics import RATE_LIMIT_WAITS
+from fli.core.ratelimit import SharedTokenBucket, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep advances time."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        """Get the current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock instead of sleeping."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_then_wait():
+    """Test a full bucket serves a burst, then paces requests at the rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_refill_is_capped_at_burst():
+    """Test idle time never accumulates more than the burst size."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+    clock.now = 60
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_waits_are_counted():
+    """Test waits are recorded in the rate-limit metrics."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, clock=clock, sleep=clock.sleep)
+    before = RATE_LIMIT_WAITS.value()
+    bucket.acquire()
+    bucket.acquire()
+    assert RATE_LIMIT_WAITS.value() == before + 1
+
+
+def test_acquire_async(monkeypatch):
+    """Test the async variant waits without blocking the loop."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, burst=1, clock=clock)
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr("fli.core.ratelimit.asyncio.sleep", fake_sleep)
+
+    async def run():
+        return [await bucket.acquire_async() for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.0, pytest.approx(0.25), pytest.approx(0.25)]
+    assert waits == [pytest.approx(0.25), pytest.approx(0.25)]
+
+
+def test_rate_must_be_positive():
+    """Test a zero rate is rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def _take_all(bucket, results):
+    """Take as many tokens as are available right now, reporting the count."""
+    results.put(sum(bucket.try_acquire() for _ in range(10)))
+
+
+def test_shared_bucket_spans_processes():
+    """Test processes sharing a bucket draw from a single budget."""
+    context = multiprocessing.get_context("spawn")
+    bucket = SharedTokenBucket(rate=0.01, burst=5, mp_context=context)
+    assert bucket.try_acquire()
+
+    results = context.Queue()
+    workers = [context.Process(target=_take_all, args=(bucket, results)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert results.get() + results.get() == 4
+    assert not bucket.try_acquire()
@@ -0,0 +1,107 @@
+"""Tests for retry budgets and circuit breakers."""
+
+import pytest
+
+from fli.core.metrics import CIRCUIT_REJECTIONS, CIRCUIT_STATE
+from fli.core.resilience import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    CircuitState,
+    RetryBudget,
+    is_transient,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Get the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Create a fake clock."""
+    return FakeClock()
+
+
+def test_transient_statuses():
+    """Test which outcomes count as transient failures."""
+    assert is_transient(None)
+    assert is_transient(503)
+    assert is_transient(429)
+    assert not is_transient(404)
+    assert not is_transient(200)
+
+
+def test_budget_scales_with_traffic(clock):
+    """Test retries are capped to a fraction of recent requests."""
+    budget = RetryBudget(ratio=0.2, min_per_second=0, window=10, clock=clock)
+    for _ in range(10):
+        budget.record_request()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+
+def test_budget_floor_and_window(clock):
+    """Test the floor allows some retries and old events leave the window."""
+    budget = RetryBudget(ratio=0, min_per_second=0.1, window=10, clock=clock)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    clock.now = 10.5
+    assert budget.try_spend()
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    """Test the circuit opens at the threshold and rejects requests until the timeout."""
+    breaker = CircuitBreaker("api.test", failure_threshold=3, reset_timeout=30, clock=clock)
+    breaker.record(500)
+    breaker.record(200)  # a success resets the count
+    for _ in range(3):
+        breaker.before_request()
+        breaker.record(None)
+
+    assert breaker.state is CircuitState.OPEN
+    assert CIRCUIT_STATE.value(host="api.test") == 2
+    before = CIRCUIT_REJECTIONS.value(host="api.test")
+    clock.now = 10
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_request()
+    assert error.value.retry_after == pytest.approx(20)
+    assert CIRCUIT_REJECTIONS.value(host="api.test") == before + 1
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    """Test one probe is let through after the timeout and decides the next state."""
+    breaker = CircuitBreaker("probe.test", failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 10
+    breaker.before_request()
+    breaker.record(404)
+    assert breaker.state is CircuitState.CLOSED
+    breaker.before_request()
+
+
+def test_registry_keeps_one_breaker_per_host():
+    """Test breakers are shared per host and configured by the registry."""
+    breakers = CircuitBreakers(failure_threshold=2)
+    first = breakers.for_url("https://www.google.com/a")
+    assert breakers.for_url("https://www.google.com/b?x=1") is first
+    assert breakers.for_host("api.skypicker.com") is not first
+    assert first.failure_threshold == 2
+    assert first.host == "www.google.com"
@@ -0,0 +1,146 @@
+"""Tests for the tracing spans."""
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+from typer.testing import CliRunner
+
+from fli.cli.main import app
+from fli.core.tracing import (
+    NULL_SPAN,
+    RecordingTracer,
+    TraceCollector,
+    get_tracer,
+    span,
+    use_tracer,
+)
+from fli.search.client import retry_sleep
+from fli.search.lazy import LazyFlightList
+
+
+def test_disabled_tracer_returns_null_span():
+    """Test that spans are free while no tracer is installed."""
+    assert not get_tracer().enabled
+    with span("flights.search", trip_type="ONE_WAY") as s:
+        s.set(count=3)
+    assert s is NULL_SPAN
+
+
+def test_nested_spans_track_self_time():
+    """Test parent/child links and self time accounting."""
+    collector = TraceCollector()
+    with use_tracer(collector):
+        with span("outer"):
+            with span("inner", page=1) as inner:
+                inner.set(count=2)
+    assert get_tracer() is not collector
+
+    inner, outer = collector.spans
+    assert inner.parent is outer
+    assert inner.attrs == {"page": 1, "count": 2}
+    assert outer.child_time == inner.duration
+    assert abs(outer.self_time - (outer.duration - inner.duration)) < 1e-9
+    assert collector.wall_time() == outer.duration
+
+
+def test_errors_are_recorded_and_hooks_called():
+    """Test that failed spans are marked and delivered to hooks."""
+    seen = []
+    tracer = RecordingTracer(hooks=[seen.append])
+    with use_tracer(tracer):
+        try:
+            with span("http.request", method="GET"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    assert [(s.name, s.error) for s in seen] == [("http.request", "ValueError")]
+
+
+def test_spans_nest_per_task():
+    """Test that concurrent asyncio tasks do not become each other's parents."""
+
+    async def worker(name):
+        with span(name):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        with span("kiwi.search"):
+            await asyncio.gather(worker("kiwi.request"), worker("kiwi.request"))
+
+    collector = TraceCollector()
+    with use_tracer(collector):
+        asyncio.run(main())
+
+    root = next(s for s in collector.spans if s.name == "kiwi.search")
+    requests = [s for s in collector.spans if s.name == "kiwi.request"]
+    assert len(requests) == 2
+    assert all(s.parent is root for s in requests)
+
+
+def test_report_lists_stages():
+    """Test the text breakdown."""
+    collector = TraceCollector()
+    with use_tracer(collector):
+        with span("dates.search"):
+            for _ in range(3):
+                with span("dates.chunk"):
+                    pass
+
+    stats = collector.summary()
+    assert stats["dates.chunk"].count == 3
+    report = collector.report()
+    assert "dates.search" in report
+    assert "dates.chunk" in report
+    assert "wall time" in report
+
+
+def test_client_retry_backoff_is_traced(monkeypatch):
+    """Test that tenacity backoff sleeps are recorded as their own stage."""
+    monkeypatch.setattr("fli.search.client.time.sleep", lambda seconds: None)
+    collector = TraceCollector()
+    with use_tracer(collector):
+        retry_sleep(0.5)
+    assert [s.name for s in collector.spans] == ["http.retry_backoff"]
+
+
+def test_flight_parsing_is_traced():
+    """Test each lazily parsed flight is recorded once as a ``flights.parse`` span."""
+    flights = LazyFlightList([["a"], ["b"], ["c"]], lambda raw: raw[0])
+    collector = TraceCollector()
+    with use_tracer(collector):
+        with span("flights.search"):
+            assert [flights[0], flights[1], flights[0]] == ["a", "b", "a"]
+
+    parses = [s for s in collector.spans if s.name == "flights.parse"]
+    assert len(parses) == 2
+    assert all(s.parent.name == "flights.search" for s in parses)
+
+
+def test_search_profile_prints_breakdown(monkeypatch):
+    """Test that ``fli search --profile`` reports stages on stderr only."""
+    module = importlib.import_module("fli.cli.commands.search")
+
+    class FakeSearchFlights:
+        """SearchFlights stand-in that opens spans like the real searcher."""
+
+        def __init__(self, localization_config=None):
+            """Ignore the localization config."""
+
+        def search(self, filters):
+            """Return no flights after tracing two stages."""
+            with span("flights.search"):
+                with span("http.request", method="POST"):
+                    pass
+            return []
+
+    monkeypatch.setattr(module, "SearchFlights", FakeSearchFlights)
+    date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+    result = CliRunner(mix_stderr=False).invoke(
+        app, ["search", "JFK", "LAX", date, "--format", "json", "--profile"]
+    )
+    assert result.exit_code == 1
+    assert "http.request" in result.stderr
+    assert "flights.search" in result.stderr
+    assert "http.request" not in result.stdout
+    assert not get_tracer().enabled
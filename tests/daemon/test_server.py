@@ -0,0 +1,193 @@
+"""Tests for the search daemon and CLI forwarding."""
+
+import asyncio
+import importlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from fli.cli.commands.batch import BatchRunner
+from fli.daemon import DaemonClient, forward_cli
+from fli.daemon.client import parse_address
+from fli.daemon.server import SearchDaemon
+from fli.models import Airline, Airport, FlightLeg, FlightResult
+
+
+def make_flight(departure):
+    """Create a one-leg flight result."""
+    return FlightResult(
+        price=120.0,
+        duration=60,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=Airline.DL,
+                flight_number="DL1",
+                departure_airport=Airport.JFK,
+                arrival_airport=Airport.BOS,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=1),
+                duration=60,
+            )
+        ],
+    )
+
+
+class SlowSearcher:
+    """Searcher stand-in that counts calls and takes a while to answer."""
+
+    calls = 0
+    instances = 0
+    barrier = None
+    lock = threading.Lock()
+
+    def __init__(self, localization_config=None, client=None, cache=None, **kwargs):
+        """Count the instance and ignore the injected dependencies."""
+        with SlowSearcher.lock:
+            SlowSearcher.instances += 1
+
+    def search(self, filters, top_n=5):
+        """Return a single flight after a short delay."""
+        with SlowSearcher.lock:
+            SlowSearcher.calls += 1
+        if SlowSearcher.barrier is not None:
+            SlowSearcher.barrier.wait(timeout=5)
+        time.sleep(0.2)
+        departure = datetime.strptime(filters.flight_segments[0].travel_date, "%Y-%m-%d")
+        return [make_flight(departure)]
+
+
+@pytest.fixture
+def travel_date():
+    """Return a future travel date."""
+    return (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def daemon(monkeypatch, tmp_path):
+    """Run a daemon with fake searchers on a background event loop."""
+    for name in ("fli.cli.commands.batch", "fli.cli.commands.search"):
+        monkeypatch.setattr(importlib.import_module(name), "SearchFlights", SlowSearcher)
+    SlowSearcher.calls = SlowSearcher.instances = 0
+    SlowSearcher.barrier = None
+
+    address = str(tmp_path / "fli.sock")
+    server = SearchDaemon(address, runner=BatchRunner(concurrency=4, client=object()))
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_until_complete, args=(server.serve_forever(),))
+    thread.start()
+    yield server
+    DaemonClient(address).shutdown()
+    thread.join(timeout=5)
+    loop.close()
+
+
+def test_parse_address():
+    """Test Unix socket and TCP address parsing."""
+    assert parse_address("/tmp/fli.sock") == ("unix", "/tmp/fli.sock")
+    assert parse_address("unix:/tmp/a:1") == ("unix", "/tmp/a:1")
+    assert parse_address("127.0.0.1:8743") == ("tcp", ("127.0.0.1", 8743))
+
+
+def test_health_airports_and_errors(daemon):
+    """Test the JSON endpoints."""
+    client = DaemonClient(daemon.address)
+    assert client.is_running()
+    assert client.request("GET", "/health")[1]["pid"] > 0
+    assert any(airport["code"] == "LHR" for airport in client.airports("LHR"))
+    assert client.request("GET", "/airports/LHR")[1]["code"] == "LHR"
+    resolved = client.resolve_airports(["heathrow", "北京"], ["pek", "ZZZ"], "zh-cn", limit=2)
+    assert resolved["results"]["heathrow"][0]["code"] == "LHR"
+    assert len(resolved["results"]["北京"]) == 2
+    assert resolved["codes"] == {"pek": resolved["codes"]["pek"], "ZZZ": None}
+    assert resolved["codes"]["pek"]["name"] == "北京首都国际机场"
+    assert client.request("GET", "/nope")[0] == 404
+    assert client.request("GET", "/search")[0] == 405
+    assert "# TYPE fli_http_requests_total counter" in client.metrics()
+
+
+def test_identical_searches_are_coalesced(daemon, travel_date):
+    """Test that concurrent identical queries share one search."""
+    client = DaemonClient(daemon.address)
+    spec = {"from": "JFK", "to": "BOS", "date": travel_date}
+    records = [None] * 3
+
+    def request(i):
+        records[i] = client.search({**spec, "id": str(i)})
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SlowSearcher.calls == 1
+    assert sorted(record["id"] for record in records) == ["0", "1", "2"]
+    assert all(record["results"][0]["legs"][0]["arrival_airport"] == "BOS" for record in records)
+
+
+def test_forward_cli(daemon, travel_date, capsys, monkeypatch):
+    """Test that CLI invocations run on the daemon and fall back when it is absent."""
+    monkeypatch.delenv("FLI_NO_DAEMON", raising=False)
+    exit_code = forward_cli(["JFK", "BOS", travel_date, "--format", "ndjson"], daemon.address)
+    assert exit_code == 0
+    record = json.loads(capsys.readouterr().out)
+    assert record["legs"][0]["flight_number"] == "DL1"
+
+    assert forward_cli(["search", "XXX", "BOS", travel_date], daemon.address) == 1
+    assert "Error" in capsys.readouterr().out
+
+    assert forward_cli(["batch", "queries.csv"], daemon.address) is None
+    assert forward_cli(["search", "JFK", "BOS", travel_date], daemon.address + ".missing") is None
+
+
+def test_forwarded_cli_uses_daemon_searchers(daemon, travel_date, capsys, monkeypatch):
+    """Test forwarded commands reuse the runner's searchers and coalesce duplicates."""
+    monkeypatch.delenv("FLI_NO_DAEMON", raising=False)
+    argv = ["search", "JFK", "BOS", travel_date, "--format", "ndjson"]
+    exit_codes = [None] * 3
+
+    def forward(i):
+        exit_codes[i] = forward_cli(argv, daemon.address)
+
+    threads = [threading.Thread(target=forward, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert exit_codes == [0, 0, 0]
+    assert SlowSearcher.calls == 1
+    assert len(capsys.readouterr().out.splitlines()) == 3
+
+    DaemonClient(daemon.address).search({"from": "JFK", "to": "BOS", "date": travel_date})
+    assert SlowSearcher.instances == 1
+
+
+def test_forwarded_cli_runs_concurrently(daemon, travel_date, monkeypatch):
+    """Test different forwarded commands run side by side with separate output."""
+    monkeypatch.delenv("FLI_NO_DAEMON", raising=False)
+    # Both searches must be in flight at once to get past the barrier
+    SlowSearcher.barrier = threading.Barrier(2)
+    later = (datetime.now() + timedelta(days=31)).strftime("%Y-%m-%d")
+    client = DaemonClient(daemon.address, timeout=None)
+    responses = {}
+
+    def forward(date):
+        argv = ["search", "JFK", "BOS", date, "--format", "ndjson"]
+        responses[date] = client.request("POST", "/cli", {"argv": argv})[1]
+
+    threads = [threading.Thread(target=forward, args=(date,)) for date in (travel_date, later)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for date, response in responses.items():
+        assert response["exit_code"] == 0, response["stderr"]
+        record = json.loads(response["stdout"])
+        assert record["legs"][0]["departure_datetime"].startswith(date)
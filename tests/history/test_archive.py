@@ -0,0 +1,161 @@
+"""Tests for the memory-mapped result archive."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from fli.history import ResultArchive
+from fli.models import Airline, Airport, FlightLeg, FlightResult
+from fli.models.columnar import FlightTable
+
+OBSERVED = datetime(2030, 5, 1, 12, tzinfo=UTC)
+
+
+def make_flight(price, origin=Airport.JFK, destination=Airport.LHR, day=date(2030, 6, 1)):
+    """Create a one-leg flight."""
+    departure = datetime(day.year, day.month, day.day, 9)
+    return FlightResult(
+        price=price,
+        duration=420,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=Airline.BA,
+                flight_number=f"BA{int(price)}",
+                departure_airport=origin,
+                arrival_airport=destination,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=7),
+                duration=420,
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Create a writable archive in a temporary directory."""
+    with ResultArchive(tmp_path / "archive", writable=True) as store:
+        yield store
+
+
+def test_append_and_read_back(archive):
+    """Test a snapshot decodes back to the appended models."""
+    results = [make_flight(300.0), make_flight(250.0)]
+
+    assert archive.append(results, observed_at=OBSERVED) == 0
+
+    assert len(archive) == 1
+    assert archive.results(0) == results
+    assert archive.snapshot_info(0) == ("JFK-LHR", date(2030, 6, 1), None, OBSERVED)
+    assert isinstance(archive.flight_records, np.memmap)
+
+
+def test_long_flight_numbers_are_not_truncated(archive):
+    """Test flight numbers longer than eight characters survive the archive."""
+    flight = make_flight(300.0)
+    flight.legs[0].flight_number = "BA1234567890"
+
+    archive.append([flight], observed_at=OBSERVED)
+    assert archive.results(0)[0].legs[0].flight_number == "BA1234567890"
+
+    flight.legs[0].flight_number = "X" * 17
+    with pytest.raises(ValueError, match="longer than 16"):
+        archive.append([flight], observed_at=OBSERVED)
+    assert len(archive) == 1
+
+
+def test_round_trip_pairs_keep_return_date(archive):
+    """Test pairs are stored as one item and give the snapshot its return date."""
+    outbound = make_flight(300.0)
+    inbound = make_flight(200.0, Airport.LHR, Airport.JFK, date(2030, 6, 8))
+
+    archive.append([(outbound, inbound)], observed_at=OBSERVED)
+
+    assert archive.results(0) == [(outbound, inbound)]
+    assert archive.snapshot_info(0)[2] == date(2030, 6, 8)
+    np.testing.assert_array_equal(archive.item_prices(0), [500.0])
+
+
+def test_codes_are_stored_once(archive):
+    """Test repeated codes share string table entries across snapshots."""
+    archive.append([make_flight(300.0)], observed_at=OBSERVED)
+    archive.append([make_flight(300.0)], observed_at=OBSERVED + timedelta(hours=1))
+
+    assert sorted(archive.strings) == ["BA", "BA300", "JFK", "JFK-LHR", "LHR"]
+    assert archive.leg_records.dtype.itemsize == 36
+
+
+def test_find_by_route_date_and_time(archive):
+    """Test the index finds snapshots by route, travel date and observation window."""
+    for hours in (2, 0, 1):
+        archive.append([make_flight(100.0 + hours)], observed_at=OBSERVED + timedelta(hours=hours))
+    archive.append(
+        [make_flight(90.0, day=date(2030, 6, 2))], observed_at=OBSERVED + timedelta(hours=5)
+    )
+    archive.append([make_flight(80.0, Airport.JFK, Airport.CDG)], observed_at=OBSERVED)
+
+    # Ordered by observation time within the travel date
+    assert archive.find("JFK-LHR", date(2030, 6, 1)).tolist() == [1, 2, 0]
+    assert archive.find("JFK-LHR").tolist() == [1, 2, 0, 3]
+    assert archive.find("JFK-CDG").tolist() == [4]
+    assert archive.find("LHR-JFK").tolist() == []
+    assert archive.find(
+        "JFK-LHR", date(2030, 6, 1), since=OBSERVED + timedelta(minutes=30)
+    ).tolist() == [2, 0]
+    assert archive.find("JFK-LHR", until=OBSERVED + timedelta(hours=1)).tolist() == [1]
+
+
+def test_cheapest_series(archive):
+    """Test the cheapest price per snapshot, skipping empty snapshots."""
+    archive.append([make_flight(300.0), make_flight(280.0)], observed_at=OBSERVED)
+    archive.append(
+        [], route="JFK-LHR", travel_date=date(2030, 6, 1), observed_at=OBSERVED + timedelta(1)
+    )
+    archive.append([make_flight(260.0)], observed_at=OBSERVED + timedelta(2))
+
+    observed, prices = archive.cheapest("JFK-LHR", date(2030, 6, 1))
+
+    assert prices.tolist() == [280.0, 260.0]
+    assert observed[0] == np.datetime64("2030-05-01T12:00:00")
+    assert len(archive.table(1)) == 0
+
+
+def test_reopen_and_refresh(archive):
+    """Test readers see the data on reopen, and later appends after a refresh."""
+    archive.append(FlightTable.from_results([make_flight(300.0)]), observed_at=OBSERVED)
+
+    reader = ResultArchive(archive.path)
+    assert reader.results(0)[0].price == 300.0
+    with pytest.raises(PermissionError):
+        reader.append([make_flight(1.0)])
+
+    archive.append([make_flight(150.0, Airport.JFK, Airport.CDG)], observed_at=OBSERVED)
+    assert len(reader) == 1
+    reader.refresh()
+    assert reader.results(1)[0].legs[0].arrival_airport == Airport.CDG
+
+
+def test_partial_trailing_record_is_ignored(archive):
+    """Test an interrupted append does not corrupt existing or later snapshots."""
+    archive.append([make_flight(300.0)], observed_at=OBSERVED)
+    with open(archive.path / "legs.bin", "ab") as handle:
+        handle.write(b"\x01\x02\x03")
+    archive.close()
+
+    assert len(archive.leg_records) == 1
+    archive.append([make_flight(200.0)], observed_at=OBSERVED)
+    assert archive.results(1)[0].price == 200.0
+
+
+def test_empty_results_need_route(archive):
+    """Test an empty snapshot without a route or travel date is rejected."""
+    with pytest.raises(ValueError):
+        archive.append([])
+
+
+def test_missing_archive(tmp_path):
+    """Test opening a missing archive read-only fails."""
+    with pytest.raises(FileNotFoundError):
+        ResultArchive(tmp_path / "missing")
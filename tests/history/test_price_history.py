@@ -0,0 +1,117 @@
+"""Tests for the SQLite price history store."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from fli.history import PriceHistory, route_key
+from fli.models import Airline, Airport, FlightLeg, FlightResult, SeatType
+from fli.search.dates import DatePrice
+
+
+@pytest.fixture
+def history():
+    """Create an in-memory history store."""
+    with PriceHistory() as store:
+        yield store
+
+
+@pytest.fixture
+def now():
+    """Return a fixed, recent observation time."""
+    return datetime.now(UTC).replace(microsecond=0)
+
+
+def test_route_key():
+    """Test route keys from enums and strings."""
+    assert route_key(Airport.JFK, Airport.LHR) == "JFK-LHR"
+    assert route_key("jfk", "lhr") == "JFK-LHR"
+
+
+def test_record_dates_and_stats(history, now):
+    """Test bulk append of calendar prices and min/median/latest queries."""
+    travel = datetime(2030, 6, 1)
+    for hours, price in [(3, 300.0), (2, 250.5), (1, 280.0)]:
+        history.record_dates(
+            [
+                DatePrice(date=(travel,), price=price),
+                DatePrice(date=(travel + timedelta(1),), price=1),
+            ],
+            Airport.JFK,
+            Airport.LHR,
+            observed_at=now - timedelta(hours=hours),
+        )
+
+    stats = history.stats("JFK-LHR", travel.date(), days=1)
+    assert stats.count == 3
+    assert stats.min == 250.5
+    assert stats.median == 280.0
+    assert stats.latest == 280.0
+    assert stats.last_observed_at == now - timedelta(hours=1)
+
+    series = history.history("JFK-LHR", travel.date())
+    assert [price for _, price in series] == [300.0, 250.5, 280.0]
+
+
+def test_stats_window_excludes_old_observations(history, now):
+    """Test that the look-back window filters old observations."""
+    travel = date(2030, 6, 1)
+    history.record("JFK-LHR", travel, 100.0, observed_at=now - timedelta(days=10))
+    history.record("JFK-LHR", travel, 200.0, observed_at=now - timedelta(days=1))
+
+    assert history.stats("JFK-LHR", travel, days=3).count == 1
+    assert history.stats("JFK-LHR", travel, days=30).min == 100.0
+    assert history.stats("JFK-LHR", date(2030, 6, 2)) is None
+
+
+def test_filters_by_cabin_provider_and_return_date(history, now):
+    """Test series separation by cabin, provider and return date."""
+    travel = date(2030, 6, 1)
+    history.record("JFK-LHR", travel, 100.0, observed_at=now)
+    history.record("JFK-LHR", travel, 900.0, cabin=SeatType.BUSINESS, observed_at=now)
+    history.record("JFK-LHR", travel, 90.0, provider="kiwi", observed_at=now)
+    history.record("JFK-LHR", travel, 400.0, return_date=date(2030, 6, 8), observed_at=now)
+
+    assert history.stats("JFK-LHR", travel, cabin=SeatType.BUSINESS).min == 900.0
+    assert history.stats("JFK-LHR", travel, provider="kiwi").min == 90.0
+    assert history.stats("JFK-LHR", travel, return_date=date(2030, 6, 8)).count == 1
+    assert history.stats("JFK-LHR", travel).count == 4
+
+    by_date = history.route_stats("JFK-LHR", cabin=SeatType.ECONOMY, provider="google")
+    assert set(by_date) == {(travel, None), (travel, date(2030, 6, 8))}
+
+
+def test_record_flights_keeps_cheapest_per_date(history, now):
+    """Test that flight results are reduced to the cheapest fare per route/date."""
+
+    def flight(price):
+        return FlightResult(
+            price=price,
+            duration=120,
+            stops=0,
+            legs=[
+                FlightLeg(
+                    airline=Airline.BA,
+                    flight_number="1",
+                    departure_airport=Airport.JFK,
+                    arrival_airport=Airport.LHR,
+                    departure_datetime=datetime(2030, 6, 1, 8),
+                    arrival_datetime=datetime(2030, 6, 1, 10),
+                    duration=120,
+                )
+            ],
+        )
+
+    assert history.record_flights([flight(500), flight(450)], observed_at=now) == 1
+    assert history.stats("JFK-LHR", date(2030, 6, 1)).min == 450
+
+
+def test_persistence(tmp_path, now):
+    """Test that observations survive reopening the database."""
+    path = tmp_path / "fares.db"
+    with PriceHistory(path) as store:
+        store.record("JFK-LHR", date(2030, 6, 1), 123.45, observed_at=now)
+    with PriceHistory(path) as store:
+        store.record("JFK-LHR", date(2030, 6, 1), 99.0, observed_at=now + timedelta(seconds=5))
+        assert store.stats("JFK-LHR", date(2030, 6, 1)).min == 99.0
+        assert store.stats("JFK-LHR", date(2030, 6, 1)).count == 2
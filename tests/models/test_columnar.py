@@ -0,0 +1,89 @@
+"""Tests for the columnar flight tables."""
+
+import pickle
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from fli.models import Airline, Airport, FlightLeg, FlightResult, to_compact
+from fli.models.columnar import FLIGHT_DTYPE, LEG_DTYPE, FlightTable
+
+
+def make_result(price, legs=1, departure=datetime(2030, 6, 1, 8)):
+    """Create a flight result with the given number of legs."""
+    route = [Airport.JFK, Airport.ORD, Airport.LAX, Airport.SFO][: legs + 1]
+    return FlightResult(
+        price=price,
+        duration=150 * legs,
+        stops=legs - 1,
+        legs=[
+            FlightLeg(
+                airline=Airline._3U,
+                flight_number=f"3U{index}",
+                departure_airport=route[index],
+                arrival_airport=route[index + 1],
+                departure_datetime=departure + timedelta(hours=3 * index),
+                arrival_datetime=departure + timedelta(hours=3 * index + 2, minutes=30),
+                duration=150,
+            )
+            for index in range(legs)
+        ],
+    )
+
+
+def mixed_results():
+    """One-way flights followed by a round-trip pair."""
+    return [
+        make_result(300.0, legs=2),
+        make_result(120.0),
+        (make_result(200.0, legs=3), make_result(180.0)),
+    ]
+
+
+def test_round_trip_through_models():
+    """Test flights and pairs survive conversion to arrays and back."""
+    results = mixed_results()
+    table = FlightTable.from_results(results)
+
+    assert len(table) == 3
+    assert table.flights.dtype == FLIGHT_DTYPE
+    assert table.legs.dtype == LEG_DTYPE
+    assert len(table.flights) == 4
+    assert len(table.legs) == 7
+    assert table.to_models() == results
+    assert table.to_compact() == to_compact(results)
+
+
+def test_compact_input_matches_model_input():
+    """Test tables built from compact records equal those built from models."""
+    results = mixed_results()
+    assert FlightTable.from_results(to_compact(results)) == FlightTable.from_results(results)
+
+
+def test_item_prices_sum_pairs():
+    """Test each item's price is the sum of its flights' prices."""
+    table = FlightTable.from_results(mixed_results())
+    np.testing.assert_array_equal(table.item_prices(), [300.0, 120.0, 380.0])
+    assert table.item_prices().argmin() == 1
+
+
+def test_leg_codes_are_iata():
+    """Test legs store plain IATA codes, including digit-leading airline codes."""
+    table = FlightTable.from_results([make_result(100.0)])
+    assert table.legs[0]["airline"] == "3U"
+    assert table.legs[0]["departure_airport"] == "JFK"
+
+
+def test_empty_table():
+    """Test empty and missing results give an empty table."""
+    assert len(FlightTable.from_results(None)) == 0
+    assert FlightTable.from_results([]).to_models() == []
+
+
+def test_pickles_smaller_than_models():
+    """Test the table pickles to less than the models it replaces."""
+    results = [make_result(100.0 + index, legs=2) for index in range(50)]
+    table = FlightTable.from_results(results)
+    payload = pickle.dumps(table)
+    assert pickle.loads(payload) == table
+    assert len(payload) < len(pickle.dumps(results))
@@ -0,0 +1,113 @@
+"""Tests for the compact flight records."""
+
+import dataclasses
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from fli.models import (
+    Airline,
+    Airport,
+    CompactResult,
+    FlightLeg,
+    FlightResult,
+    TripType,
+    from_compact,
+    to_compact,
+)
+from fli.models.compact import from_epoch, to_epoch
+from fli.search import SearchCache, SearchKiwiFlights
+
+
+def make_result(price=250.0, departure=datetime(2030, 6, 1, 8), hidden_city_info=None):
+    """Create a two-leg flight result."""
+    return FlightResult(
+        price=price,
+        duration=330,
+        stops=1,
+        legs=[
+            FlightLeg(
+                airline=Airline.UA,
+                flight_number="UA100",
+                departure_airport=Airport.JFK,
+                arrival_airport=Airport.ORD,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=2, minutes=30),
+                duration=150,
+            ),
+            FlightLeg(
+                airline=Airline._3U,
+                flight_number="3U8",
+                departure_airport=Airport.ORD,
+                arrival_airport=Airport.LAX,
+                departure_datetime=departure + timedelta(hours=3),
+                arrival_datetime=departure + timedelta(hours=5, minutes=30),
+                duration=150,
+            ),
+        ],
+        hidden_city_info=hidden_city_info,
+    )
+
+
+def test_epoch_round_trip():
+    """Test naive and aware datetime conversion."""
+    moment = datetime(2030, 6, 1, 8, 45)
+    assert from_epoch(to_epoch(moment)) == moment
+    aware = datetime(2030, 6, 1, 10, 45, tzinfo=timezone(timedelta(hours=2)))
+    assert to_epoch(aware) == to_epoch(moment)
+
+
+def test_result_round_trip_and_interning():
+    """Test conversion in both directions and shared code strings."""
+    result = make_result()
+    compact = CompactResult.from_model(result)
+
+    assert compact.legs[1].airline == "3U"
+    assert compact.legs[0].arrival_airport is compact.legs[1].departure_airport
+    assert compact.legs[0].departure_datetime == datetime(2030, 6, 1, 8)
+    assert compact.to_model() == result
+
+    assert not hasattr(compact, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        compact.price = 1.0
+
+
+def test_hidden_city_info_is_rebuilt_from_legs():
+    """Test that route segments are dropped and regenerated from the legs."""
+    info = {
+        "is_hidden_city": True,
+        "hidden_destination_code": "LAX",
+        "hidden_destination_name": "Los Angeles",
+        "is_throwaway": False,
+        "route_segments": [{"from": "JFK"}, {"from": "ORD"}],
+    }
+    compact = CompactResult.from_model(make_result(hidden_city_info=info))
+    assert compact.hidden_city.destination_code == "LAX"
+    assert compact.hidden_city.direction is None
+
+    rebuilt = compact.to_model().hidden_city_info
+    assert rebuilt["is_throwaway"] is False
+    assert "direction" not in rebuilt
+    assert [segment["from"] for segment in rebuilt["route_segments"]] == ["JFK", "ORD"]
+    assert rebuilt["route_segments"][1]["duration"] == 150 * 60
+
+
+def test_pairs_and_searcher_option(monkeypatch):
+    """Test list conversion of round-trip pairs and the searchers' compact option."""
+    pairs = [(make_result(100.0), make_result(120.0))]
+    compact = to_compact(pairs)
+    assert isinstance(compact[0], tuple) and compact[0][1].price == 120.0
+    assert from_compact(compact) == pairs
+    assert to_compact(None) is None
+
+    async def fake_search(filters, top_n):
+        return pairs
+
+    cache = SearchCache()
+    search = SearchKiwiFlights(cache=cache, compact=True)
+    monkeypatch.setattr(search, "_async_search", fake_search)
+    filters = SimpleNamespace(trip_type=TripType.ROUND_TRIP, encode=lambda: "encoded")
+    assert search.search(filters) == compact
+    assert search.search(filters) == compact
+    assert cache.stats.hits == 1
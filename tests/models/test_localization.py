@@ -0,0 +1,83 @@
+"""Tests for the shared localization tables."""
+
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+import pytest
+
+from fli.models import Airline, Airport, FlightLeg, FlightResult
+from fli.models.google_flights import base
+from fli.models.google_flights.base import (
+    Currency,
+    Language,
+    LocalizationConfig,
+    LocalizedLeg,
+)
+
+
+def make_result(airline, origin, destination, price=100.0):
+    """Create a single-leg flight result."""
+    departure = datetime(2030, 6, 1, 8)
+    return FlightResult(
+        price=price,
+        duration=120,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=airline,
+                flight_number="X1",
+                departure_airport=origin,
+                arrival_airport=destination,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=2),
+                duration=120,
+            )
+        ],
+    )
+
+
+def test_tables_are_shared_and_read_only():
+    """Test that the tables are module-level, immutable and loaded once."""
+    chinese = LocalizationConfig(language=Language.CHINESE, currency=Currency.CNY)
+    assert chinese.get_text("total_price") == "总价格"
+    assert chinese.get_text("unknown_key") == "unknown_key"
+    assert LocalizationConfig().get_text("total_price") == "Total Price"
+    assert chinese.currency_symbol == "¥" and LocalizationConfig().currency_symbol == "$"
+    assert isinstance(base._TEXTS[Language.CHINESE], MappingProxyType)
+    with pytest.raises(TypeError):
+        base._TEXTS[Language.CHINESE]["total_price"] = "changed"
+
+    assert chinese.get_airline_name("CA", "Air China") == "中国国际航空"
+    assert LocalizationConfig(language=Language.CHINESE).get_airline_name("CA", "x") == (
+        "中国国际航空"
+    )
+    assert base._chinese_airline_names.cache_info().currsize == 1
+    assert not hasattr(chinese, "_airline_translations")
+
+
+def test_names_fall_back_to_english():
+    """Test the English fallbacks for untranslated codes and the English language."""
+    chinese = LocalizationConfig(language=Language.CHINESE)
+    assert chinese.get_airport_name("PEK", "Beijing") == "北京首都国际机场"
+    assert chinese.get_airport_name("ZZZ", "Nowhere") == "Nowhere"
+    assert chinese.get_airline_name("??", "Unknown Air") == "Unknown Air"
+    assert LocalizationConfig().get_airport_name("PEK", "Beijing") == "Beijing"
+
+
+def test_localize_results_matches_single_lookups():
+    """Test the bulk path for one-way results and round-trip pairs."""
+    outbound = make_result(Airline.CA, Airport.PEK, Airport.JFK)
+    inbound = make_result(Airline.UA, Airport.JFK, Airport.PEK)
+    chinese = LocalizationConfig(language=Language.CHINESE)
+
+    localized = chinese.localize_results([outbound, (outbound, inbound)])
+    assert localized[0] == (
+        (LocalizedLeg("中国国际航空", "北京首都国际机场", "纽约肯尼迪国际机场"),),
+    )
+    assert len(localized[1]) == 2
+    assert localized[1][1][0] == LocalizedLeg(
+        "美国联合航空", "纽约肯尼迪国际机场", "北京首都国际机场"
+    )
+
+    english = LocalizationConfig().localize_results([outbound], lambda airport: airport.name)
+    assert english == [((LocalizedLeg(Airline.CA.value, "PEK", "JFK"),),)]
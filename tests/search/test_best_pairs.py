@@ -0,0 +1,163 @@
+"""Tests for best-first round-trip pairing."""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from fli.models import (
+    Airline,
+    Airport,
+    FlightLeg,
+    FlightResult,
+    FlightSearchFilters,
+    FlightSegment,
+    PassengerInfo,
+    TripType,
+)
+from fli.search import SearchFlights
+
+
+class RecordingFilters(FlightSearchFilters):
+    """Filters whose encoding is just the selected outbound flight number."""
+
+    def encode(self, enhanced_search: bool = False) -> str:
+        """Encode the selected outbound flight instead of the Google Flights payload."""
+        selected = self.flight_segments[0].selected_flight
+        return json.dumps(selected.legs[0].flight_number if selected is not None else None)
+
+
+def make_flight(number, price, origin=Airport.JFK, destination=Airport.LHR):
+    """Create a single-leg flight."""
+    departure = datetime(2030, 6, 1, 9)
+    return FlightResult(
+        price=price,
+        duration=420,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=Airline.BA,
+                flight_number=number,
+                departure_airport=origin,
+                arrival_airport=destination,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=7),
+                duration=420,
+            )
+        ],
+    )
+
+
+def make_filters(trip_type=TripType.ROUND_TRIP):
+    """Create JFK-LHR round-trip filters."""
+    return RecordingFilters(
+        trip_type=trip_type,
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=[
+            FlightSegment(
+                departure_airport=[[Airport.JFK, 0]],
+                arrival_airport=[[Airport.LHR, 0]],
+                travel_date="2030-06-01",
+            ),
+            FlightSegment(
+                departure_airport=[[Airport.LHR, 0]],
+                arrival_airport=[[Airport.JFK, 0]],
+                travel_date="2030-06-08",
+            ),
+        ],
+    )
+
+
+class FakeShopping:
+    """Answer outbound and return requests from canned price tables."""
+
+    def __init__(self, outbound, returns):
+        """Store the outbound prices and the return prices of each outbound."""
+        self.outbound = outbound
+        self.returns = returns
+        self.requests = []
+
+    def __call__(self, url, encoded_filters):
+        """Return the outbound flights, or the returns of the selected outbound."""
+        selected = json.loads(encoded_filters)
+        self.requests.append(selected)
+        if selected is None:
+            return [make_flight(f"O{i}", price) for i, price in enumerate(self.outbound)]
+        return [
+            make_flight(f"{selected}R{j}", price, Airport.LHR, Airport.JFK)
+            for j, price in enumerate(self.returns[int(selected[1:])])
+        ]
+
+
+def make_searcher(shopping):
+    """Create a searcher whose shopping requests go to ``shopping``."""
+    searcher = object.__new__(SearchFlights)
+    searcher.__init__(client=object())
+    searcher._fetch_flights = shopping
+    return searcher
+
+
+def brute_force(shopping, top_k):
+    """Get the ``top_k`` cheapest pair totals over every outbound."""
+    totals = sorted(
+        outbound + inbound
+        for i, outbound in enumerate(shopping.outbound)
+        for inbound in shopping.returns[i]
+    )
+    return totals[:top_k]
+
+
+def test_best_pairs_stops_early():
+    """Test return searches stop once no remaining outbound can beat the K-th pair."""
+    outbound = [500, 100, 300, 120, 900, 110, 700, 650]
+    shopping = FakeShopping(outbound, [[200, 210, 400]] * len(outbound))
+    pairs = make_searcher(shopping).search_best_pairs(make_filters(), top_k=3)
+
+    totals = [a.price + b.price for a, b in pairs]
+    assert totals == brute_force(shopping, 3) == [300, 310, 310]
+    # After the 100 and 110 outbounds the third best is 310, and 120 + 200 cannot beat it
+    assert shopping.requests == [None, "O1", "O5"]
+
+
+def test_best_pairs_matches_brute_force():
+    """Test the result is exact when every outbound shares the cheapest return fare."""
+    rng = random.Random(5)
+    for _ in range(30):
+        outbound = [rng.randint(50, 500) for _ in range(rng.randint(1, 10))]
+        returns = [[80] + [rng.randint(80, 400) for _ in range(4)] for _ in outbound]
+        shopping = FakeShopping(outbound, returns)
+        top_k = rng.randint(1, 8)
+        pairs = make_searcher(shopping).search_best_pairs(make_filters(), top_k=top_k)
+        assert [a.price + b.price for a, b in pairs] == brute_force(shopping, top_k)
+
+
+def test_best_pairs_respects_max_outbound():
+    """Test at most ``max_outbound`` return searches are made."""
+    outbound = [100, 200, 300, 400]
+    shopping = FakeShopping(outbound, [[50]] * len(outbound))
+    pairs = make_searcher(shopping).search_best_pairs(make_filters(), top_k=10, max_outbound=2)
+
+    assert len(pairs) == 2
+    assert shopping.requests == [None, "O0", "O1"]
+
+
+def test_best_pairs_no_outbound():
+    """Test None is returned when the outbound search finds nothing."""
+    searcher = make_searcher(lambda url, encoded_filters: None)
+    assert searcher.search_best_pairs(make_filters()) is None
+
+
+def test_best_pairs_requires_round_trip():
+    """Test one-way filters are rejected."""
+    with pytest.raises(ValueError):
+        make_searcher(FakeShopping([], [])).search_best_pairs(make_filters(TripType.ONE_WAY))
+
+
+@pytest.mark.parametrize("top_k", [0, -1])
+def test_best_pairs_rejects_non_positive_top_k(top_k):
+    """Test ``top_k`` below 1 is rejected before any request is made."""
+    shopping = FakeShopping([100], [[50]])
+    with pytest.raises(ValueError, match="top_k"):
+        make_searcher(shopping).search_best_pairs(make_filters(), top_k=top_k)
+    assert shopping.requests == []
@@ -0,0 +1,99 @@
+"""Tests for SearchCache."""
+
+import threading
+
+from fli.search import Freshness, SearchCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+def test_hit_miss_and_expiry():
+    """Test TTL expiry and hit/miss accounting."""
+    clock = FakeClock()
+    cache = SearchCache(ttl=10, clock=clock)
+    assert cache.get("k") is None
+    cache.set("k", [1, 2])
+    assert cache.get("k") == [1, 2]
+
+    clock.now = 10
+    assert cache.get("k") is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+    assert cache.stats.hit_ratio == 1 / 3
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = SearchCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_stale_entry_served_while_refreshing_once():
+    """Test a stale entry is returned at once and refreshed by a single background call."""
+    clock = FakeClock()
+    cache = SearchCache(ttl=10, stale_ttl=60, clock=clock)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(len(calls))
+        if len(calls) > 1:
+            release.wait(5)
+        return f"v{len(calls)}"
+
+    assert cache.get_or_load("k", loader) == ("v1", Freshness())
+
+    clock.now = 15
+    first = cache.get_or_load("k", loader)
+    second = cache.get_or_load("k", loader)
+    assert first == second == ("v1", Freshness(15, cached=True, stale=True, revalidating=True))
+    assert cache.get("k") is None  # plain lookups only return fresh entries
+
+    release.set()
+    cache.close()
+    assert len(calls) == 2
+    assert cache.get_or_load("k", loader) == ("v2", Freshness(0, cached=True))
+    assert (cache.stats.hits, cache.stats.stale_hits) == (3, 2)
+
+
+def test_failed_refresh_keeps_stale_entry():
+    """Test a refresh error leaves the stale entry servable until its window ends."""
+    clock = FakeClock()
+    cache = SearchCache(ttl=10, stale_ttl=20, clock=clock)
+    cache.set("k", "old")
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    clock.now = 12
+    assert cache.get_or_load("k", failing)[0] == "old"
+    cache.close()
+    assert cache.get_or_load("k", failing) == ("old", Freshness(12, True, True, False))
+
+    clock.now = 30
+    assert cache.get_or_load("k", lambda: "new") == ("new", Freshness())
+
+
+def test_freshness_combine():
+    """Test combining keeps the oldest age and any stale or revalidating flag."""
+    combined = Freshness.combine(
+        [Freshness(), Freshness(30, cached=True, stale=True, revalidating=True), Freshness(5)]
+    )
+    assert combined == Freshness(30, cached=True, stale=True, revalidating=True)
+    assert Freshness.combine([]) == Freshness()
@@ -0,0 +1,232 @@
+"""Tests for the HTTP client's per-thread and pooled transports."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from curl_cffi.const import CurlHttpVersion, CurlOpt
+
+from fli.cli.commands.search import build_flight_filters
+from fli.core.ratelimit import TokenBucket
+from fli.core.resilience import CircuitBreakers, CircuitOpenError, RetryBudget
+from fli.models import DateSearchFilters, TripType
+from fli.search import SearchContext, SearchDates, SearchFlights
+from fli.search.client import Client, RequestFailedError
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echo request bodies back over keep-alive connections, counting connections."""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    requests = 0
+
+    def do_POST(self):
+        """Echo the body, or answer with the error status it asks for."""
+        type(self).requests += 1
+        self.connections.add(self.client_address)
+        body = self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.send_response({b"fail=1": 500, b"missing=1": 404}.get(body, 200))
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture(scope="module")
+def url():
+    """Serve the echo handler on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/echo"
+    server.shutdown()
+
+
+@pytest.fixture
+def limiter():
+    """Create a limiter that never makes tests wait."""
+    return TokenBucket(rate=10_000)
+
+
+def test_pooled_client_serves_threads(url, limiter):
+    """Test concurrent threads share the pool and get their own responses."""
+    client = Client(limiter=limiter, pool_size=4)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            bodies = list(
+                executor.map(lambda i: client.post(url, data=f"n={i}").content, range(16))
+            )
+        assert bodies == [f"n={i}".encode() for i in range(16)]
+        assert client._sessions == []
+        assert client._pool_thread.name == "fli-http-pool"
+    finally:
+        client.close()
+    assert client._pool is None
+
+
+def test_pool_reuses_connections(url, limiter):
+    """Test sequential requests on the pool reuse a kept-alive connection."""
+    EchoHandler.connections.clear()
+    client = Client(limiter=limiter, pool_size=2)
+    try:
+        for i in range(5):
+            client.post(url, data=f"n={i}")
+    finally:
+        client.close()
+    assert len(EchoHandler.connections) == 1
+
+
+def test_async_requests(url, limiter):
+    """Test coroutines await pooled requests, even on a per-thread client."""
+    client = Client(limiter=limiter)
+
+    async def run():
+        responses = await asyncio.gather(*(client.post_async(url, data=f"n={i}") for i in range(5)))
+        return [response.content for response in responses]
+
+    try:
+        assert asyncio.run(run()) == [f"n={i}".encode() for i in range(5)]
+    finally:
+        client.close()
+
+
+def test_async_errors_are_retried_then_raised(url, limiter, monkeypatch):
+    """Test failed async requests retry with the shared policy and then raise."""
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("fli.search.client.retry_sleep_async", fake_sleep)
+    client = Client(limiter=limiter, retry_budget=RetryBudget(), breakers=CircuitBreakers())
+    try:
+        with pytest.raises(Exception, match="POST request failed"):
+            asyncio.run(client.post_async(url, data="fail=1"))
+    finally:
+        client.close()
+    assert len(sleeps) == 2
+
+
+def test_session_options():
+    """Test HTTP/2 and keep-alive settings reach the curl options."""
+    options = Client(pool_size=6, keepalive=30)._session_options()
+    assert options["http_version"] == CurlHttpVersion.V2TLS
+    assert options["curl_options"][CurlOpt.MAXCONNECTS] == 6
+    assert options["curl_options"][CurlOpt.TCP_KEEPIDLE] == 30
+
+    plain = Client(http2=False, keepalive=None)._session_options()
+    assert plain["http_version"] == CurlHttpVersion.V1_1
+    assert CurlOpt.TCP_KEEPALIVE not in plain["curl_options"]
+
+
+def test_context_creates_pooled_client():
+    """Test a context's pool size is passed to the client it creates."""
+    with SearchContext(pool_size=3) as context:
+        assert context.client.pool_size == 3
+
+
+def failing_client(limiter, monkeypatch, budget):
+    """Create a client with its own breakers and the given budget, sleeping instantly."""
+    monkeypatch.setattr("fli.search.client.time.sleep", lambda seconds: None)
+    return Client(
+        limiter=limiter,
+        retry_budget=budget,
+        breakers=CircuitBreakers(failure_threshold=3, reset_timeout=60),
+    )
+
+
+def test_spent_budget_stops_retries(url, limiter, monkeypatch):
+    """Test a failed request is not retried once the retry budget is spent."""
+    client = failing_client(limiter, monkeypatch, RetryBudget(ratio=0, min_per_second=0.1))
+    EchoHandler.requests = 0
+    try:
+        with pytest.raises(Exception, match="POST request failed"):
+            client.post(url, data="fail=1")
+        with pytest.raises(Exception, match="POST request failed"):
+            client.post(url, data="fail=1")
+    finally:
+        client.close()
+    # One retry in the budget: 2 attempts for the first request, 1 for the second
+    assert EchoHandler.requests == 3
+
+
+def test_open_circuit_fails_fast(url, limiter, monkeypatch):
+    """Test repeated failures open the host's circuit and later calls never hit it."""
+    client = failing_client(limiter, monkeypatch, RetryBudget())
+    EchoHandler.requests = 0
+    try:
+        with pytest.raises(Exception, match="POST request failed"):
+            client.post(url, data="fail=1")
+        assert EchoHandler.requests == 3
+        with pytest.raises(CircuitOpenError):
+            client.post(url, data="n=1")
+    finally:
+        client.close()
+    assert EchoHandler.requests == 3
+
+
+def test_client_errors_do_not_trip_the_breaker(url, limiter, monkeypatch):
+    """Test answered requests, even failed ones, keep the circuit closed."""
+    monkeypatch.setattr("fli.search.client.time.sleep", lambda seconds: None)
+    breakers = CircuitBreakers(failure_threshold=1)
+    client = Client(limiter=limiter, retry_budget=RetryBudget(), breakers=breakers)
+    try:
+        with pytest.raises(Exception, match="404"):
+            client.post(url, data="missing=1")
+    finally:
+        client.close()
+    assert breakers.for_url(url).state.name == "CLOSED"
+
+
+def test_client_errors_are_not_retried(url, limiter, monkeypatch):
+    """Test a 4xx response fails at once without spending the retry budget."""
+    budget = RetryBudget(ratio=0, min_per_second=0.1)
+    client = failing_client(limiter, monkeypatch, budget)
+    EchoHandler.requests = 0
+    try:
+        with pytest.raises(RequestFailedError, match="404") as error:
+            client.post(url, data="missing=1")
+    finally:
+        client.close()
+    assert error.value.status == 404
+    assert EchoHandler.requests == 1
+    assert budget.try_spend()
+
+
+class OpenCircuitClient:
+    """Client stand-in whose host circuit is open."""
+
+    def post(self, url, **kwargs):
+        """Fail fast like a client with an open breaker."""
+        raise CircuitOpenError("www.google.com", 12.0)
+
+
+@pytest.mark.parametrize("trip_type", [TripType.ONE_WAY, TripType.ROUND_TRIP])
+def test_searchers_surface_open_circuit(trip_type):
+    """Test searches re-raise ``CircuitOpenError`` instead of wrapping it."""
+    flights = object.__new__(SearchFlights)
+    flights.__init__(client=OpenCircuitClient())
+    return_date = "2030-06-08" if trip_type == TripType.ROUND_TRIP else None
+    filters = build_flight_filters(trip_type, "JFK", "LHR", "2030-06-01", return_date=return_date)
+    with pytest.raises(CircuitOpenError) as error:
+        flights.search(filters)
+    assert error.value.retry_after == 12.0
+
+    dates = object.__new__(SearchDates)
+    dates.__init__(client=OpenCircuitClient())
+    with pytest.raises(CircuitOpenError):
+        dates.search(
+            DateSearchFilters(
+                trip_type=trip_type,
+                passenger_info=filters.passenger_info,
+                flight_segments=filters.flight_segments,
+                from_date="2030-06-01",
+                to_date="2030-06-10",
+                duration=7 if trip_type == TripType.ROUND_TRIP else None,
+            )
+        )
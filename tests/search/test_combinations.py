@@ -0,0 +1,128 @@
+"""Tests for the cheapest-combination optimizer."""
+
+import random
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from fli.cli.commands.search import build_flight_filters
+from fli.models import Airline, Airport, FlightLeg, FlightResult, TripType
+from fli.search import CombinationOptimizer, TripStructure
+from fli.search.combinations import smallest_pair_sums, split_round_trip
+
+
+def make_result(price, origin=Airport.JFK, destination=Airport.LHR):
+    """Create a single-leg flight result."""
+    departure = datetime(2030, 6, 1, 8)
+    return FlightResult(
+        price=price,
+        duration=420,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=Airline.BA,
+                flight_number="BA1",
+                departure_airport=origin,
+                arrival_airport=destination,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=7),
+                duration=420,
+            )
+        ],
+    )
+
+
+class FakeSearcher:
+    """Searcher returning canned one-way and round-trip results by trip direction."""
+
+    def __init__(self, outbound, inbound, round_trips, barrier=None, fail=()):
+        """Store the canned prices."""
+        self.results = {
+            "outbound": [make_result(price) for price in outbound],
+            "return": [make_result(price, Airport.LHR, Airport.JFK) for price in inbound],
+            "round_trip": [
+                (make_result(a), make_result(b, Airport.LHR, Airport.JFK)) for a, b in round_trips
+            ],
+        }
+        self.barrier = barrier
+        self.fail = set(fail)
+
+    def search(self, filters, top_n=5):
+        """Return the canned results for the searched direction."""
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        if filters.trip_type == TripType.ROUND_TRIP:
+            kind = "round_trip"
+        elif filters.flight_segments[0].departure_airport[0][0] == Airport.JFK:
+            kind = "outbound"
+        else:
+            kind = "return"
+        if kind in self.fail:
+            raise RuntimeError(f"{kind} failed")
+        return self.results[kind]
+
+
+@pytest.fixture
+def filters():
+    """Round-trip filters from JFK to LHR."""
+    return build_flight_filters(
+        TripType.ROUND_TRIP, "JFK", "LHR", "2030-06-01", return_date="2030-06-08"
+    )
+
+
+def test_smallest_pair_sums_matches_brute_force():
+    """Test the lazy heap enumeration against sorting every pair."""
+    rng = random.Random(11)
+    for _ in range(50):
+        a = sorted(rng.randint(1, 50) for _ in range(rng.randint(0, 8)))
+        b = sorted(rng.randint(1, 50) for _ in range(rng.randint(0, 8)))
+        pairs = list(smallest_pair_sums(a, b))
+        assert sorted(pairs) == [(i, j) for i in range(len(a)) for j in range(len(b))]
+        sums = [a[i] + b[j] for i, j in pairs]
+        assert sums == sorted(sums)
+
+
+def test_split_round_trip(filters):
+    """Test deriving one-way filters from round-trip filters."""
+    outbound, inbound = split_round_trip(filters)
+    assert outbound.trip_type == inbound.trip_type == TripType.ONE_WAY
+    assert outbound.flight_segments[0].departure_airport[0][0] == Airport.JFK
+    assert inbound.flight_segments[0].departure_airport[0][0] == Airport.LHR
+    with pytest.raises(ValueError):
+        split_round_trip(outbound)
+
+
+def test_two_one_ways_across_providers_win(filters):
+    """Test merging both structures from two providers, with all searches concurrent."""
+    barrier = threading.Barrier(6)
+    google = FakeSearcher([300, 350], [320, 400], [(250, 250), (260, 270)], barrier)
+    kiwi = FakeSearcher([280], [500], [(300, 300)], barrier)
+    report = CombinationOptimizer(google, kiwi).search(filters, top_k=4)
+
+    assert [option.price for option in report.options] == [500, 530, 600, 600]
+    best = report.best
+    assert best.structure == TripStructure.ROUND_TRIP and best.outbound_provider == "google"
+    mixed, kiwi_round_trip = report.options[2:]
+    assert mixed.description == "two one-ways (kiwi + google)"
+    assert kiwi_round_trip.description == "round trip (kiwi)"
+    assert report.best_two_one_ways == 600 and report.savings == 100
+    assert report.summary().startswith("Cheapest: round trip (google) at 500.00")
+
+    cheap = FakeSearcher([100], [120], [(200, 200)])
+    report = CombinationOptimizer(cheap).search(filters)
+    assert report.best.description == "two one-ways (google + google)"
+    assert "saving 180.00 over the best round trip" in report.summary()
+
+
+def test_partial_and_total_failure(filters):
+    """Test that failed searches are reported and only fail the search if all fail."""
+    searcher = FakeSearcher([100], [120], [(200, 200)], fail={"return"})
+    report = CombinationOptimizer(searcher).search(filters)
+    assert [option.structure for option in report.options] == [TripStructure.ROUND_TRIP]
+    assert report.best_two_one_ways is None and report.savings is None
+    assert "google.return" in report.errors
+
+    failing = FakeSearcher([], [], [], fail={"outbound", "return", "round_trip"})
+    with pytest.raises(RuntimeError):
+        CombinationOptimizer(failing).search(filters)
@@ -0,0 +1,112 @@
+"""Tests for the shared search context."""
+
+import threading
+
+import pytest
+
+from fli.search import SearchCache, SearchContext, SearchDates, SearchFlights, SearchKiwiFlights
+from fli.search.client import DEFAULT_LIMITER, Client
+
+
+def make(searcher_class, **kwargs):
+    """Create a searcher without going through a patched ``__new__``."""
+    searcher = object.__new__(searcher_class)
+    searcher.__init__(**kwargs)
+    return searcher
+
+
+def test_searchers_share_context_resources():
+    """Test searchers bound to a context use its client, cache and Kiwi limiter."""
+    with SearchContext(name="tenant-a", cache=True, kiwi_rate_limit=2) as context:
+        flights = make(SearchFlights, context=context)
+        dates = make(SearchDates, context=context)
+        kiwi = make(SearchKiwiFlights, context=context)
+
+        assert flights.client is dates.client is context.client
+        assert flights.cache is dates.cache is kiwi.cache is context.cache
+        assert context.cache.name == "tenant-a"
+        assert kiwi.kiwi_client.limiter is context.kiwi_limiter
+        assert context.limiter is not DEFAULT_LIMITER
+
+
+def test_explicit_cache_is_used():
+    """Test an empty cache passed to the context is kept and shared with its searchers."""
+    cache = SearchCache(stale_ttl=600)
+    with SearchContext(cache=cache) as context:
+        assert context.cache is cache
+        assert make(SearchFlights, context=context).cache is cache
+    with SearchContext(cache=False) as context:
+        assert context.cache is None
+
+
+def test_explicit_arguments_override_context():
+    """Test a client or cache passed explicitly wins over the context's."""
+    client, cache = Client(), SearchCache()
+    with SearchContext(cache=True) as context:
+        flights = make(SearchFlights, client=client, cache=cache, context=context)
+        assert flights.client is client
+        assert flights.cache is cache
+
+
+def test_contexts_are_isolated():
+    """Test two contexts get separate clients and rate limiters."""
+    with SearchContext(name="a", rate_limit=5) as first, SearchContext(name="b") as second:
+        assert first.client is not second.client
+        assert first.limiter is not second.limiter
+        assert first.limiter.rate == 5
+
+
+def test_default_searchers_keep_shared_client():
+    """Test searchers without a context still use the process-wide client."""
+    flights = make(SearchFlights)
+    assert flights.client.limiter is DEFAULT_LIMITER
+    assert flights.context is None
+
+
+def test_map_runs_on_worker_pool():
+    """Test map runs calls on the context's named worker threads, in order."""
+    with SearchContext(name="pool", max_workers=2) as context:
+        names = list(context.map(lambda _: threading.current_thread().name, range(4)))
+    assert all(name.startswith("fli-pool") for name in names)
+
+
+def test_run_async_uses_background_loop():
+    """Test coroutines run on the context's event loop thread."""
+
+    async def thread_name():
+        return threading.current_thread().name
+
+    with SearchContext(name="loop") as context:
+        assert context.run_async(thread_name()) == "fli-loop-loop"
+        assert context.run_async(thread_name()) == "fli-loop-loop"
+
+
+def test_close_shuts_everything_down():
+    """Test closing stops the pools and loop and rejects further use."""
+    context = SearchContext(name="closing")
+    context.submit(lambda: None).result()
+    context.run_async(_noop())
+    loop_thread = context._loop_thread
+
+    context.close()
+    context.close()
+
+    assert context.closed
+    assert not loop_thread.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        context.submit(lambda: None)
+    with pytest.raises(RuntimeError, match="closed"):
+        context.run_async(_noop())
+
+
+def test_close_keeps_injected_client():
+    """Test an injected client is left open for its owner."""
+    client = Client()
+    session = client._client
+    with SearchContext(client=client):
+        pass
+    assert client._sessions == [session]
+
+
+async def _noop():
+    """Do nothing asynchronously."""
@@ -0,0 +1,139 @@
+"""Tests for the array-backed DateCalendar results of SearchDates."""
+
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fli.models import Airport, DateSearchFilters, FlightSegment, PassengerInfo
+from fli.models.google_flights.base import TripType
+from fli.search import DateCalendar, DatePrice, Freshness, SearchCache, SearchDates
+
+ONE_WAY_ITEMS = [
+    ["2030-01-01", None, [[None, 120.5]]],
+    ["2030-01-02", None, [[None, None]]],
+    ["2030-01-03", None, [[None, 99]]],
+    ["2030-01-04", None, None],
+    ["2030-01-05", None, [[None, 99]]],
+]
+
+
+def calendar_response(items):
+    """Wrap calendar items the way the GetCalendarGraph endpoint does."""
+    inner = json.dumps([None, items])
+    return ")]}'\n" + json.dumps([[None, None, inner]])
+
+
+class FakeClient:
+    """HTTP client stand-in returning a canned calendar response."""
+
+    def __init__(self, items):
+        """Store the items to return."""
+        self.text = calendar_response(items)
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        """Return the canned response."""
+        self.calls += 1
+        return SimpleNamespace(
+            text=self.text, content=self.text.encode(), raise_for_status=lambda: None
+        )
+
+
+def make_search_dates(**kwargs):
+    """Build SearchDates without going through ``__new__``.
+
+    The CLI fixtures monkeypatch ``SearchDates.__new__``, and CPython keeps the patched slot
+    after the fixture is undone, so constructing the class normally fails in later tests.
+    """
+    search = object.__new__(SearchDates)
+    search.__init__(**kwargs)
+    return search
+
+
+def make_filters():
+    """Create one-way date search filters."""
+    start = datetime.now() + timedelta(days=30)
+    return DateSearchFilters(
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=[
+            FlightSegment(
+                departure_airport=[[Airport.PHX, 0]],
+                arrival_airport=[[Airport.SFO, 0]],
+                travel_date=start.strftime("%Y-%m-%d"),
+            )
+        ],
+        from_date=start.strftime("%Y-%m-%d"),
+        to_date=(start + timedelta(days=10)).strftime("%Y-%m-%d"),
+    )
+
+
+def test_from_items_single_pass():
+    """Test that unpriced items are skipped and arrays are typed and read-only."""
+    calendar = DateCalendar.from_items(ONE_WAY_ITEMS, TripType.ONE_WAY)
+
+    assert len(calendar) == 3
+    assert calendar.departure.dtype == np.dtype("datetime64[D]")
+    assert calendar.prices.dtype == np.float32
+    assert calendar.returns is None
+    with pytest.raises(ValueError):
+        calendar.prices[0] = 1.0
+
+
+def test_lazy_date_prices_and_sorting():
+    """Test DatePrice materialization, slicing and price ordering."""
+    calendar = DateCalendar.from_items(ONE_WAY_ITEMS, TripType.ONE_WAY)
+
+    assert calendar[0] == DatePrice(date=(datetime(2030, 1, 1),), price=120.5)
+    assert isinstance(calendar[1:], DateCalendar)
+    cheapest = calendar.cheapest(2)
+    assert [item.date[0].day for item in cheapest] == [3, 5]
+    assert list(calendar) == calendar.to_date_prices()
+
+
+def test_round_trip_and_concatenate():
+    """Test return dates and joining chunked calendars."""
+    items = [["2030-01-01", "2030-01-08", [[None, 300]]]]
+    calendar = DateCalendar.from_items(items, TripType.ROUND_TRIP)
+    joined = DateCalendar.concatenate([calendar, calendar], TripType.ROUND_TRIP)
+
+    assert len(joined) == 2
+    assert joined[1].date == (datetime(2030, 1, 1), datetime(2030, 1, 8))
+    assert len(DateCalendar.concatenate([], TripType.ONE_WAY)) == 0
+
+
+def test_search_calendar_and_search():
+    """Test both search entry points and that the calendar is cached as arrays."""
+    client = FakeClient(ONE_WAY_ITEMS)
+    cache = SearchCache()
+    search = make_search_dates(client=client, cache=cache)
+
+    calendar = search.search_calendar(make_filters())
+    assert calendar.prices.tolist() == [120.5, 99.0, 99.0]
+
+    results = search.search(make_filters())
+    assert [result.price for result in results] == [120.5, 99.0, 99.0]
+    assert client.calls == 1
+    assert cache.stats.hits == 1
+
+
+def test_search_results_report_freshness():
+    """Test results carry their freshness and a stale calendar is served from the cache."""
+    now = [0.0]
+    client = FakeClient(ONE_WAY_ITEMS)
+    cache = SearchCache(ttl=10, stale_ttl=60, clock=lambda: now[0])
+    search = make_search_dates(client=client, cache=cache)
+
+    assert search.search_calendar(make_filters()).freshness == Freshness()
+
+    now[0] = 25
+    calendar = search.search_calendar(make_filters())
+    results = search.search(make_filters())
+    assert calendar.prices.tolist() == [120.5, 99.0, 99.0]
+    assert calendar.freshness.stale and calendar.freshness.age == 25
+    assert results.freshness.cached and len(results) == 3
+    cache.close()
+    assert client.calls == 2
+    assert search.search_calendar(make_filters()).freshness == Freshness(0, cached=True)
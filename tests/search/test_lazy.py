@@ -0,0 +1,214 @@
+"""Tests for lazily parsed flight results."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from fli.cli.commands.search import build_flight_filters
+from fli.models import Airport, TripType
+from fli.search import SearchFlights
+from fli.search.lazy import LazyFlightList, as_lazy, raw_duration, raw_price, raw_stops
+
+
+def raw_leg(origin, destination, number):
+    """Build a raw leg array in the shopping response layout."""
+    leg = [None] * 23
+    leg[3], leg[6] = origin, destination
+    leg[8], leg[10] = [9, 0], [11, 30]
+    leg[11] = 150
+    leg[20], leg[21] = [2030, 6, 1], [2030, 6, 1]
+    leg[22] = ["BA", number]
+    return leg
+
+
+def raw_flight(price, duration=150, legs=1):
+    """Build a raw flight array with the given price and number of legs."""
+    route = ["JFK", "LHR", "CDG", "FRA"][: legs + 1]
+    leg_data = [raw_leg(route[i], route[i + 1], f"{price}-{i}") for i in range(len(route) - 1)]
+    return [[None, None, leg_data, None, None, None, None, None, None, duration], [[None, price]]]
+
+
+class CountingParser:
+    """Parse raw flights with the real parser, counting the calls."""
+
+    def __init__(self):
+        """Start counting from zero."""
+        self.calls = 0
+
+    def __call__(self, data):
+        """Parse one raw flight."""
+        self.calls += 1
+        return SearchFlights._parse_flights_data(data)
+
+
+@pytest.fixture
+def parser():
+    """Create a counting parser."""
+    return CountingParser()
+
+
+@pytest.fixture
+def flights(parser):
+    """Lazy list of six flights in shuffled price order."""
+    raw = [
+        raw_flight(400, 300, legs=2),
+        raw_flight(120),
+        raw_flight(900, 100),
+        raw_flight(250, 600, legs=3),
+        raw_flight(120, 90),
+        raw_flight(300),
+    ]
+    return LazyFlightList(raw, parser)
+
+
+def test_raw_keys_match_parsed_values():
+    """Test the cheap keys agree with the fully parsed result."""
+    data = raw_flight(250, 600, legs=3)
+    result = SearchFlights._parse_flights_data(data)
+    assert (raw_price(data), raw_duration(data), raw_stops(data)) == (
+        result.price,
+        result.duration,
+        result.stops,
+    )
+    assert result.legs[0].departure_airport == Airport.JFK
+
+
+def test_nothing_parsed_until_accessed(flights, parser):
+    """Test items are parsed on index access and only once."""
+    assert len(flights) == 6
+    assert parser.calls == 0
+    assert flights[2].price == 900
+    assert flights[2] is flights[2]
+    assert parser.calls == 1
+    assert flights.parsed_count == 1
+
+
+def test_top_parses_only_n(flights, parser):
+    """Test the cheapest flights are found without parsing the others."""
+    top = flights.top(3)
+    assert [flight.price for flight in top] == [120, 120, 250]
+    # Ties keep their original order
+    assert top[0].duration == 150
+    assert parser.calls == 3
+
+
+def test_sort_by_cheap_keys(flights, parser):
+    """Test sorting by price, duration or stops parses nothing."""
+    flights.sort(key="duration")
+    assert [flights.value(i, "duration") for i in range(len(flights))] == [
+        90,
+        100,
+        150,
+        150,
+        300,
+        600,
+    ]
+    flights.sort(key="stops", reverse=True)
+    assert flights.value(0, "stops") == 2
+    assert parser.calls == 0
+
+
+def test_sort_with_callable_key(flights):
+    """Test callable keys work like ``list.sort``."""
+    flights.sort(key=lambda flight: -flight.price)
+    assert [flight.price for flight in flights] == [900, 400, 300, 250, 120, 120]
+
+
+def test_sort_rejects_unknown_key(flights):
+    """Test unknown cheap keys are rejected."""
+    with pytest.raises(ValueError):
+        flights.sort(key="airline")
+
+
+def test_slices_and_copies_share_parsed_results(flights, parser):
+    """Test views are lazy and a flight is parsed once however it is reached."""
+    head = flights[:2]
+    assert isinstance(head, LazyFlightList)
+    assert parser.calls == 0
+    ordered = flights.sorted_by("price")
+    assert [flight.price for flight in head] == [400, 120]
+    assert ordered[0] is flights[1]
+    assert parser.calls == 2
+    # The original order is untouched by sorted_by
+    assert flights.value(0, "price") == 400
+
+
+def test_equality_with_list(flights):
+    """Test the lazy list compares equal to the parsed list."""
+    parsed = [SearchFlights._parse_flights_data(data) for data in (raw_flight(400, 300, legs=2),)]
+    assert flights[:1] == parsed
+    assert flights[:1] != []
+
+
+def test_as_lazy_wraps_parsed_results(flights):
+    """Test parsed results are wrapped and lazy lists are returned unchanged."""
+    assert as_lazy(flights) is flights
+    wrapped = as_lazy(list(flights[:3]))
+    assert wrapped.top(1)[0].price == 120
+    assert wrapped.value(0, "price") == 400
+
+
+def test_missing_values_sort_last(parser):
+    """Test flights with a malformed price sort after priced ones."""
+    broken = raw_flight(None)
+    flights = LazyFlightList([broken, raw_flight(100)], parser)
+    flights.sort()
+    assert flights.value(0, "price") == 100
+    assert flights.value(1, "price") == float("inf")
+    assert parser.calls == 0
+
+
+class FakeClient:
+    """HTTP client answering every shopping request with the same flights."""
+
+    def __init__(self, raw_flights):
+        """Build the response body."""
+        inner = json.dumps([None, None, [raw_flights], None])
+        self.content = (")]}'\n" + json.dumps([["wrb.fr", None, inner]])).encode()
+
+    def post(self, url, **kwargs):
+        """Return the canned response."""
+        return SimpleNamespace(content=self.content, raise_for_status=lambda: None)
+
+
+def test_round_trip_parses_only_paired_outbounds(parser):
+    """Test a round-trip search parses the top_n outbounds, not the whole response."""
+    raw = [raw_flight(price) for price in (500, 100, 300, 200, 400)]
+    searcher = object.__new__(SearchFlights)
+    searcher.__init__(client=FakeClient(raw))
+    searcher._parse_flights_data = parser
+    filters = build_flight_filters(
+        TripType.ROUND_TRIP, "JFK", "LHR", "2030-06-01", return_date="2030-06-08"
+    )
+
+    pairs = searcher.search(filters, top_n=2)
+
+    assert len(pairs) == 2 * len(raw)
+    # 2 outbound flights plus every flight of the two return responses
+    assert parser.calls == 2 + 2 * len(raw)
+
+
+def test_one_way_search_returns_parsed_list(parser):
+    """Test one-way results are returned as a plain list of parsed flights."""
+    searcher = object.__new__(SearchFlights)
+    searcher.__init__(client=FakeClient([raw_flight(price) for price in (300, 100, 200)]))
+    searcher._parse_flights_data = parser
+    filters = build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01")
+
+    flights = searcher.search(filters)
+
+    assert isinstance(flights, list)
+    assert [flight.price for flight in flights] == [300, 100, 200]
+    assert parser.calls == 3
+
+
+def test_one_way_parse_errors_are_wrapped():
+    """Test a flight that fails to parse fails the search like other search errors."""
+    searcher = object.__new__(SearchFlights)
+    searcher.__init__(client=FakeClient([raw_flight(100)]))
+    searcher._parse_flights_data = lambda raw: 1 / 0
+    filters = build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01")
+
+    with pytest.raises(Exception, match="Search failed"):
+        searcher.search(filters)
@@ -0,0 +1,200 @@
+"""Tests for multi-city search."""
+
+import itertools
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from fli.models import (
+    Airline,
+    Airport,
+    FlightLeg,
+    FlightResult,
+    FlightSearchFilters,
+    FlightSegment,
+    PassengerInfo,
+    TripType,
+)
+from fli.search import SearchCache, SearchFlights
+from fli.search.cache import load_through
+
+ROUTE = [Airport.JFK, Airport.LHR, Airport.CDG, Airport.JFK]
+PRICES = {
+    # leg -> prices of the options offered for that leg
+    0: [300, 100, 200],
+    1: [80, 50, 400],
+    2: [500, 250, 260],
+}
+
+
+class RecordingFilters(FlightSearchFilters):
+    """Filters whose encoding lists the flight numbers already selected."""
+
+    def encode(self, enhanced_search: bool = False) -> str:
+        """Encode the selected flights instead of the Google Flights payload."""
+        return json.dumps(
+            [
+                segment.selected_flight.legs[0].flight_number
+                for segment in self.flight_segments
+                if segment.selected_flight is not None
+            ]
+        )
+
+
+def make_flight(leg, index, price):
+    """Create a single-leg flight for a multi-city leg."""
+    departure = datetime(2030, 6, 1 + 3 * leg, 9)
+    return FlightResult(
+        price=price,
+        duration=120,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=Airline.BA,
+                flight_number=f"L{leg}F{index}",
+                departure_airport=ROUTE[leg],
+                arrival_airport=ROUTE[leg + 1],
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=2),
+                duration=120,
+            )
+        ],
+    )
+
+
+def make_filters(legs=3):
+    """Create multi-city filters visiting the first ``legs + 1`` airports of the route."""
+    return RecordingFilters(
+        trip_type=TripType.MULTI_CITY,
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=[
+            FlightSegment(
+                departure_airport=[[ROUTE[leg], 0]],
+                arrival_airport=[[ROUTE[leg + 1], 0]],
+                travel_date=f"2030-06-{1 + 3 * leg:02d}",
+            )
+            for leg in range(legs)
+        ],
+    )
+
+
+class FakeShopping:
+    """Answer shopping requests with the options of the next unselected leg."""
+
+    def __init__(self, fail=()):
+        """Start with no recorded requests."""
+        self.requests = []
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+
+    def __call__(self, url, encoded_filters):
+        """Return the next leg's options, or raise for partials listed in ``fail``."""
+        selected = tuple(json.loads(encoded_filters))
+        with self.lock:
+            self.requests.append(selected)
+        if selected in self.fail:
+            raise RuntimeError("leg search failed")
+        leg = len(selected)
+        return [make_flight(leg, index, price) for index, price in enumerate(PRICES[leg])]
+
+
+def make_searcher(shopping):
+    """Create a searcher whose shopping requests go to ``shopping``."""
+    searcher = object.__new__(SearchFlights)
+    searcher.__init__(client=object())
+    searcher._fetch_flights = shopping
+    return searcher
+
+
+def brute_force(legs):
+    """Get every complete itinerary's total price, cheapest first."""
+    return sorted(sum(prices) for prices in itertools.product(*(PRICES[leg] for leg in legs)))
+
+
+def test_trip_type_alias():
+    """Test the old private member name still resolves to the multi-city trip type."""
+    assert TripType._MULTI_CITY is TripType.MULTI_CITY
+
+
+def test_multi_city_returns_cheapest_itineraries():
+    """Test itineraries chain the legs in order and come back cheapest first."""
+    shopping = FakeShopping()
+    results = make_searcher(shopping).search(make_filters(), top_n=3)
+
+    assert all(len(itinerary) == 3 for itinerary in results)
+    for itinerary in results:
+        assert [flight.legs[0].departure_airport for flight in itinerary] == ROUTE[:3]
+    totals = [sum(flight.price for flight in itinerary) for itinerary in results]
+    assert totals == sorted(totals)
+    assert totals[0] == brute_force(range(3))[0]
+
+
+def test_multi_city_freshness_covers_concurrent_legs():
+    """Test the freshness of leg requests fanned out to threads reaches the results."""
+    now = [0.0]
+    cache = SearchCache(ttl=10, stale_ttl=60, clock=lambda: now[0])
+    shopping = FakeShopping()
+    searcher = make_searcher(
+        lambda url, encoded: load_through(cache, encoded, lambda: shopping(url, encoded))
+    )
+    assert not searcher.search(make_filters(), top_n=2).freshness.cached
+
+    now[0] = 20
+    cache.set("[]", shopping("", "[]"))  # only the later, concurrent legs are stale
+    results = searcher.search(make_filters(), top_n=2)
+    cache.close()
+    assert results.freshness.stale and results.freshness.age == 20
+
+
+def test_multi_city_beam_bounds_requests():
+    """Test each level only extends the kept partial itineraries."""
+    shopping = FakeShopping()
+    make_searcher(shopping).search(make_filters(), top_n=2)
+
+    assert len(shopping.requests) == 1 + 2 * 2
+    levels = sorted(shopping.requests, key=len)
+    assert levels[0] == ()
+    # The two cheapest first legs are extended, the 300 option is pruned
+    assert {request for request in levels if len(request) == 1} == {("L0F1",), ("L0F2",)}
+
+
+def test_multi_city_wide_beam_is_exhaustive():
+    """Test a beam as wide as the tree finds the exact top itineraries."""
+    shopping = FakeShopping()
+    results = make_searcher(shopping).search(make_filters(), top_n=9)
+
+    totals = [sum(flight.price for flight in itinerary) for itinerary in results]
+    assert totals == brute_force(range(3))[:9]
+
+
+def test_multi_city_drops_failed_partials():
+    """Test a failed leg search only removes that partial itinerary."""
+    shopping = FakeShopping(fail={("L0F1",)})
+    results = make_searcher(shopping).search(make_filters(2), top_n=2)
+
+    assert results
+    assert all(itinerary[0].legs[0].flight_number == "L0F2" for itinerary in results)
+
+
+def test_multi_city_raises_when_first_leg_fails():
+    """Test the error surfaces when no partial itinerary survives."""
+    shopping = FakeShopping(fail={()})
+    with pytest.raises(Exception, match="leg search failed"):
+        make_searcher(shopping).search(make_filters(), top_n=2)
+
+
+def test_multi_city_needs_two_segments():
+    """Test a single-segment multi-city search is rejected."""
+    with pytest.raises(ValueError):
+        make_searcher(FakeShopping()).search(make_filters(1))
+
+
+def test_multi_city_encodes_selected_flights():
+    """Test the real encoding includes the flights chosen for earlier legs."""
+    filters = FlightSearchFilters(**make_filters(2).model_dump())
+    assert "L0F0" not in filters.encode()
+
+    filters.flight_segments[0].selected_flight = make_flight(0, 0, 100)
+    assert "L0F0" in filters.encode()
@@ -0,0 +1,124 @@
+"""Tests for nearby-airport expansion and the Kiwi per-pair search."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from fli.cli.commands.search import build_flight_filters
+from fli.models import Airline, Airport, FlightLeg, FlightResult, TripType
+from fli.search import SearchKiwiFlights, expand_nearby, nearby_airports
+
+
+def codes(entries):
+    """Get the airport codes of a segment end."""
+    return [entry[0].name for entry in entries]
+
+
+def make_result(origin, destination, price):
+    """Create a single-leg flight result."""
+    departure = datetime(2030, 6, 1, 8)
+    return FlightResult(
+        price=price,
+        duration=420,
+        stops=0,
+        legs=[
+            FlightLeg(
+                airline=Airline.BA,
+                flight_number="BA1",
+                departure_airport=getattr(Airport, origin),
+                arrival_airport=getattr(Airport, destination),
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=7),
+                duration=420,
+            )
+        ],
+    )
+
+
+def test_nearby_airports_prefers_major_airports():
+    """Test that the centre comes first and airfields are skipped."""
+    airports = nearby_airports(Airport.JFK, 40)
+    assert airports == [Airport.JFK, Airport.LGA, Airport.EWR]
+    assert len(nearby_airports(Airport.LHR, 200, max_airports=3)) == 3
+
+
+def test_expand_round_trip_without_overlap():
+    """Test that both segments are expanded and never gain their other end's airports."""
+    filters = build_flight_filters(
+        TripType.ROUND_TRIP, "JFK", "LHR", "2030-06-01", return_date="2030-06-08"
+    )
+    expanded = expand_nearby(filters, 100)
+    outbound, inbound = expanded.flight_segments
+    assert codes(outbound.departure_airport)[:3] == ["JFK", "LGA", "EWR"]
+    assert codes(outbound.arrival_airport)[0] == "LHR"
+    assert "LGW" in codes(outbound.arrival_airport)
+    assert codes(inbound.departure_airport) == codes(outbound.arrival_airport)
+    assert codes(inbound.arrival_airport) == codes(outbound.departure_airport)
+    assert not set(codes(outbound.departure_airport)) & set(codes(outbound.arrival_airport))
+    # The original filters are untouched
+    assert codes(filters.flight_segments[0].departure_airport) == ["JFK"]
+
+    origin_only = expand_nearby(filters, 100, destination=False)
+    assert codes(origin_only.flight_segments[0].arrival_airport) == ["LHR"]
+
+
+def test_build_filters_with_nearby_km():
+    """Test that the CLI filter builder expands airports when asked to."""
+    filters = build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01", nearby_km=40)
+    assert codes(filters.flight_segments[0].departure_airport) == ["JFK", "LGA", "EWR"]
+
+
+class FakeKiwiClient:
+    """Kiwi API stand-in returning one itinerary per pair, failing for some pairs."""
+
+    def __init__(self, prices, failing=()):
+        """Store the price for each pair."""
+        self.prices = prices
+        self.failing = set(failing)
+        self.active = 0
+        self.peak = 0
+
+    async def search_oneway_hidden_city(self, origin, destination, **kwargs):
+        """Return a single canned itinerary for the pair."""
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if (origin, destination) in self.failing:
+            raise RuntimeError("boom")
+        return {"success": True, "itineraries": [(origin, destination)]}
+
+
+@pytest.fixture
+def kiwi_search(monkeypatch):
+    """Create a Kiwi searcher whose itinerary parser reads the fake itineraries."""
+    monkeypatch.setattr(
+        "fli.search.flights.parse_oneway_itinerary",
+        lambda itinerary, config: make_result(*itinerary, fake.prices[itinerary]),
+    )
+    fake = FakeKiwiClient({})
+    search = SearchKiwiFlights()
+    search.kiwi_client = fake
+    return search, fake
+
+
+def test_kiwi_searches_each_pair_and_merges_by_price(kiwi_search):
+    """Test the per-pair fan-out, price merge and partial-failure handling."""
+    search, fake = kiwi_search
+    filters = expand_nearby(
+        build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01"), 100, max_airports=3
+    )
+    origins = codes(filters.flight_segments[0].departure_airport)
+    destinations = codes(filters.flight_segments[0].arrival_airport)
+    pairs = [(origin, destination) for origin in origins for destination in destinations]
+    fake.prices.update({pair: 500.0 + number for number, pair in enumerate(reversed(pairs))})
+    fake.failing.add(pairs[-1])
+
+    results = search.search(filters, top_n=3)
+    assert [result.price for result in results] == [501.0, 502.0, 503.0]
+    assert fake.peak <= SearchKiwiFlights.MAX_CONCURRENT_PAIRS
+
+    fake.failing.update(pairs)
+    with pytest.raises(Exception, match="boom"):
+        search.search(filters)
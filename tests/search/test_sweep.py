@@ -0,0 +1,138 @@
+"""Tests for the multi-process sweep runner."""
+
+import json
+import multiprocessing
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fli.cli.commands.search import build_flight_filters
+from fli.core.ratelimit import SharedTokenBucket
+from fli.models import Airport, DateSearchFilters, FlightSegment, PassengerInfo, TripType
+from fli.models.columnar import FlightTable
+from fli.search import DateCalendar, SweepRunner
+
+PRICES = (500, 100, 300)
+
+
+def raw_flight(price):
+    """Build a one-leg raw flight in the shopping response layout."""
+    leg = [None] * 23
+    leg[3], leg[6] = "JFK", "LHR"
+    leg[8], leg[10] = [9, 0], [21, 0]
+    leg[11] = 420
+    leg[20], leg[21] = [2030, 6, 1], [2030, 6, 1]
+    leg[22] = ["BA", str(price)]
+    return [[None, None, [leg], None, None, None, None, None, None, 420], [[None, price]]]
+
+
+def wrap(inner):
+    """Wrap an inner payload the way the Google Flights endpoints do."""
+    return (")]}'\n" + json.dumps([["wrb.fr", None, json.dumps(inner)]])).encode()
+
+
+class FakeClient:
+    """Worker client answering shopping and calendar requests with canned data.
+
+    Defined at module level so the pool can send the class to spawned workers.
+    """
+
+    SHOPPING = wrap([None, None, [[raw_flight(price) for price in PRICES]], None])
+    CALENDAR = wrap(
+        [None, [["2030-01-01", None, [[None, 120.5]]], ["2030-01-02", None, [[None, 99]]]]]
+    )
+
+    def __init__(self, limiter=None):
+        """Keep the shared limiter like the real client."""
+        self.limiter = limiter
+
+    def post(self, url, **kwargs):
+        """Return the canned response for the endpoint, taking a token first."""
+        assert isinstance(self.limiter, SharedTokenBucket)
+        self.limiter.acquire()
+        content = self.CALENDAR if "GetCalendarGraph" in url else self.SHOPPING
+        return SimpleNamespace(content=content, raise_for_status=lambda: None)
+
+
+def date_filters():
+    """Create one-way calendar filters."""
+    start = datetime.now() + timedelta(days=30)
+    return DateSearchFilters(
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=[
+            FlightSegment(
+                departure_airport=[[Airport.JFK, 0]],
+                arrival_airport=[[Airport.LHR, 0]],
+                travel_date=start.strftime("%Y-%m-%d"),
+            )
+        ],
+        from_date=start.strftime("%Y-%m-%d"),
+        to_date=(start + timedelta(days=10)).strftime("%Y-%m-%d"),
+    )
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Two spawned workers sharing a generous rate limit.
+
+    Spawned workers start from a fresh interpreter, so they are not affected by the CLI
+    fixtures that patch the searcher classes in this process.
+    """
+    with SweepRunner(
+        processes=2,
+        rate_limit=1000,
+        top_n=2,
+        client_factory=FakeClient,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as runner:
+        yield runner
+
+
+def test_results_come_back_in_order_as_arrays(runner):
+    """Test flight and calendar queries return tables and calendars in input order."""
+    one_way = build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01")
+    round_trip = build_flight_filters(
+        TripType.ROUND_TRIP, "JFK", "LHR", "2030-06-01", return_date="2030-06-08"
+    )
+
+    results = runner.run([one_way, date_filters(), round_trip], chunksize=1)
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert all(result.ok for result in results)
+
+    flights, calendar, pairs = (result.data for result in results)
+    assert isinstance(flights, FlightTable)
+    assert sorted(flights.item_prices()) == sorted(PRICES)
+    assert isinstance(calendar, DateCalendar)
+    np.testing.assert_array_equal(calendar.prices, [120.5, 99])
+    # Two outbound flights paired with each of the three returns
+    assert len(pairs) == 2 * len(PRICES)
+    assert all(isinstance(item, tuple) for item in pairs.to_models())
+
+
+def test_failures_are_reported_per_query(runner):
+    """Test a bad query yields an error result without stopping the others."""
+    one_way = build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01")
+
+    bad, good = runner.run(["JFK-LHR", one_way])
+
+    assert not bad.ok
+    assert bad.data is None
+    assert "Unsupported sweep query" in bad.error
+    assert good.ok
+
+
+def test_workers_cache_repeated_queries():
+    """Test a worker answers a repeated query from its cache instead of the network."""
+    context = multiprocessing.get_context("spawn")
+    one_way = build_flight_filters(TripType.ONE_WAY, "JFK", "LHR", "2030-06-01")
+    with SweepRunner(processes=1, client_factory=FakeClient, mp_context=context) as runner:
+        # Requests are counted by the tokens they take from a bucket that never refills
+        runner.limiter = SharedTokenBucket(rate=1e-9, burst=10, mp_context=context)
+        first, second = runner.run([one_way, one_way])
+
+    assert first.ok and second.ok
+    assert first.data == second.data
+    assert round(runner.limiter._tokens) == 9
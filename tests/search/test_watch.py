@@ -0,0 +1,195 @@
+"""Tests for FareWatcher."""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from fli.models import (
+    Airport,
+    DateSearchFilters,
+    FlightSegment,
+    PassengerInfo,
+)
+from fli.search import ChangeType, DatePrice, FareWatcher
+
+
+class FakeSearchDates:
+    """SearchDates stand-in that serves prices from a mutable dict."""
+
+    def __init__(self, prices):
+        """Initialize with a date -> price mapping."""
+        self.prices = prices
+        self.calls = []
+
+    def search(self, filters):
+        """Return the prices within the requested window."""
+        start = filters.parsed_from_date.date()
+        end = filters.parsed_to_date.date()
+        self.calls.append((start, end))
+        return [
+            DatePrice(date=(datetime.combine(day, datetime.min.time()),), price=price)
+            for day, price in self.prices.items()
+            if start <= day <= end
+        ]
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start at the current time."""
+        self.now = datetime.now().timestamp()
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+@pytest.fixture
+def start_date():
+    """Return the first watched date."""
+    return (datetime.now() + timedelta(days=10)).date()
+
+
+@pytest.fixture
+def filters(start_date):
+    """Create a 100-day one-way calendar search."""
+    return DateSearchFilters(
+        passenger_info=PassengerInfo(adults=1),
+        flight_segments=[
+            FlightSegment(
+                departure_airport=[[Airport.JFK, 0]],
+                arrival_airport=[[Airport.LHR, 0]],
+                travel_date=start_date.strftime("%Y-%m-%d"),
+            )
+        ],
+        from_date=start_date.strftime("%Y-%m-%d"),
+        to_date=(start_date + timedelta(days=99)).strftime("%Y-%m-%d"),
+    )
+
+
+def test_coalesce_uses_minimal_windows():
+    """Test greedy coalescing of due dates into 61-day windows."""
+    base = date(2030, 1, 1)
+    dates = [base, base + timedelta(days=30), base + timedelta(days=61), base + timedelta(200)]
+    assert FareWatcher.coalesce(dates) == [
+        (base, base + timedelta(days=30)),
+        (base + timedelta(days=61), base + timedelta(days=61)),
+        (base + timedelta(days=200), base + timedelta(days=200)),
+    ]
+    assert FareWatcher.coalesce([]) == []
+
+
+def test_first_poll_is_baseline(filters, start_date):
+    """Test that the first poll covers the range in two requests without events."""
+    searcher = FakeSearchDates({start_date: 100.0})
+    watcher = FareWatcher(filters, searcher=searcher, clock=FakeClock())
+
+    assert watcher.poll() == []
+    assert len(searcher.calls) == 2
+    assert watcher.due_dates() == []
+
+
+def test_only_stale_dates_are_requeried(filters, start_date):
+    """Test that volatile dates are refreshed sooner than flat ones."""
+    clock = FakeClock()
+    searcher = FakeSearchDates({start_date: 100.0, start_date + timedelta(days=80): 300.0})
+    events = []
+    watcher = FareWatcher(
+        filters,
+        searcher=searcher,
+        on_change=events.append,
+        min_interval=60,
+        max_interval=3600,
+        clock=clock,
+    )
+    watcher.poll()
+
+    clock.now += 3600
+    searcher.prices[start_date] = 80.0
+    watcher.poll()
+    assert [event.change_type for event in events] == [ChangeType.PRICE_DROP]
+    assert events[0].old_price == 100.0 and events[0].new_price == 80.0
+
+    # Only the volatile date is due before the max interval elapses again
+    clock.now += 1200
+    assert watcher.due_dates() == [start_date]
+    searcher.calls.clear()
+    watcher.poll()
+    assert searcher.calls == [(start_date, start_date)]
+
+
+def test_new_and_unavailable_dates(filters, start_date):
+    """Test new-date and unavailable-date events."""
+    clock = FakeClock()
+    later = start_date + timedelta(days=5)
+    searcher = FakeSearchDates({start_date: 100.0})
+    watcher = FareWatcher(filters, searcher=searcher, clock=clock, min_interval=60, max_interval=60)
+    watcher.poll()
+
+    clock.now += 61
+    searcher.prices = {later: 120.0}
+    changes = {change.travel_date: change.change_type for change in watcher.poll()}
+    assert changes == {start_date: ChangeType.DATE_UNAVAILABLE, later: ChangeType.NEW_DATE}
+
+
+def test_run_delivers_events_to_queue(filters, start_date):
+    """Test that run() feeds the asyncio queue."""
+    clock = FakeClock()
+    searcher = FakeSearchDates({start_date: 100.0})
+
+    async def scenario():
+        queue = asyncio.Queue()
+        stop = asyncio.Event()
+        watcher = FareWatcher(
+            filters, searcher=searcher, queue=queue, clock=clock, min_interval=0, max_interval=0
+        )
+        watcher.poll()
+        searcher.prices[start_date] = 150.0
+        task = asyncio.create_task(watcher.run(stop=stop, max_sleep=0.01))
+        event = await asyncio.wait_for(queue.get(), timeout=5)
+        stop.set()
+        await task
+        return event
+
+    event = asyncio.run(scenario())
+    assert event.change_type == ChangeType.PRICE_RISE
+    assert event.route == "JFK-LHR"
+
+
+def test_run_survives_failed_refresh(filters, start_date, caplog):
+    """Test a failed refresh is logged and retried instead of ending the watch."""
+    clock = FakeClock()
+    searcher = FakeSearchDates({start_date: 100.0})
+    search = searcher.search
+    failures = []
+
+    def flaky_search(filters):
+        """Raise the queued failures before searching normally."""
+        if failures:
+            raise failures.pop()
+        return search(filters)
+
+    searcher.search = flaky_search
+
+    async def scenario():
+        queue = asyncio.Queue()
+        stop = asyncio.Event()
+        watcher = FareWatcher(
+            filters, searcher=searcher, queue=queue, clock=clock, min_interval=0, max_interval=0
+        )
+        watcher.poll()
+        searcher.prices[start_date] = 80.0
+        failures.append(ConnectionError("network down"))
+        task = asyncio.create_task(watcher.run(stop=stop, max_sleep=0.01, retry_delay=0.01))
+        event = await asyncio.wait_for(queue.get(), timeout=5)
+        stop.set()
+        await task
+        return event
+
+    with caplog.at_level(logging.WARNING, logger="fli.search.watch"):
+        event = asyncio.run(scenario())
+    assert event.change_type == ChangeType.PRICE_DROP
+    assert "network down" in caplog.text